@@ -8,7 +8,9 @@ from dotenv import load_dotenv
 try:
     from backend.modules.login.fastapi_login import get_user_from_token
     from backend.database.dbconnect import sqlite_engine
+    from backend.modules.security import auth_cache
 except ImportError:  # When running Flask app.py directly inside backend
+    from modules.security import auth_cache  # type: ignore
     from sqlalchemy import create_engine  # type: ignore
     engine = create_engine(os.getenv('SQLITE_DATABASE_URL'))  # type: ignore
     Session = sessionmaker(bind=engine)  # type: ignore
@@ -43,7 +45,16 @@ async def get_permissions(
     if not user_id:
         raise HTTPException(status_code=400, detail="User ID is required")
     
-    # Check if user id exists in the database
+    permissions_list = auth_cache.get_permissions(
+        user_id, module_name, lambda: _load_permissions(user_id, module_name)
+    )
+    if permissions_list is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return {'permissions': permissions_list}
+
+
+def _load_permissions(user_id: int, module_name: str):
+    """Resolve role permissions of a user on a module; None if the user is unknown."""
     session = Session()
     try:
         user_check = session.execute(
@@ -52,7 +63,7 @@ async def get_permissions(
         ).fetchone()
         
         if not user_check:
-            raise HTTPException(status_code=404, detail="User not found")
+            return None
         
         # Get the user's permissions
         query = """
@@ -88,7 +99,6 @@ async def get_permissions(
                 'can_delete': permission.can_delete
             })
         
-        return {'permissions': permissions_list}
+        return permissions_list
     finally:
         session.close()
-
@@ -18,6 +18,7 @@ from backend.modules.login.fastapi_login import (
 )
 from backend.database.dbconnect import sqlite_engine
 from backend.modules.logger import info, error
+from backend.modules.security import auth_cache
 
 load_dotenv()
 
@@ -47,7 +48,11 @@ def get_current_user(request: Request):
 
 
 def check_admin_permission(user_id: int) -> bool:
-    """Check if user has admin role"""
+    """Check if user has admin role (cached in auth_cache)"""
+    return auth_cache.is_admin(user_id, lambda: _load_admin_flag(user_id))
+
+
+def _load_admin_flag(user_id: int) -> bool:
     session = Session()
     try:
         result = session.execute(
@@ -368,6 +373,7 @@ async def approve_user(
             {'user_id': user_id, 'approved_by': admin_user.user_id}
         )
         session.commit()
+        auth_cache.invalidate_user(user_id)
 
         return {'message': 'User approved successfully'}
     except HTTPException:
@@ -532,6 +538,7 @@ async def update_user(
                 )
 
         session.commit()
+        auth_cache.invalidate_user(user_id)
         return {'message': 'User updated successfully'}
     except HTTPException:
         raise
@@ -564,6 +571,7 @@ async def update_user_status(
             {'user_id': user_id, 'is_active': payload.is_active}
         )
         session.commit()
+        auth_cache.invalidate_user(user_id)
 
         return {'message': 'User status updated successfully'}
     except HTTPException:
@@ -716,6 +724,7 @@ async def delete_user(
             {'user_id': user_id}
         )
         session.commit()
+        auth_cache.invalidate_user(user_id)
 
         return {'message': 'User deleted successfully'}
     except HTTPException:
@@ -765,6 +774,7 @@ async def reset_user_password(
             }
         )
         session.commit()
+        auth_cache.invalidate_user(user_id)
 
         return {'message': 'Password reset successfully'}
     except HTTPException:
@@ -866,6 +876,7 @@ async def create_role(
         )
         role_id = result.fetchone()[0]
         session.commit()
+        auth_cache.invalidate_permissions()
 
         return {
             'message': 'Role created successfully',
@@ -921,6 +932,7 @@ async def update_role(
                 params
             )
             session.commit()
+            auth_cache.invalidate_permissions()
 
         return {'message': 'Role updated successfully'}
     except HTTPException:
@@ -965,6 +977,7 @@ async def delete_role(
             {'role_id': role_id}
         )
         session.commit()
+        auth_cache.invalidate_permissions()
 
         return {'message': 'Role deleted successfully'}
     except HTTPException:
@@ -1151,6 +1164,7 @@ async def create_module(
 
         module_id = result.fetchone()[0]
         session.commit()
+        auth_cache.invalidate_permissions()
 
         return {
             'message': 'Module created successfully',
@@ -1217,6 +1231,7 @@ async def update_module(
                 params
             )
             session.commit()
+            auth_cache.invalidate_permissions()
 
         return {'message': 'Module updated successfully'}
     except HTTPException:
@@ -1249,6 +1264,7 @@ async def delete_module(
             {'module_id': module_id}
         )
         session.commit()
+        auth_cache.invalidate_permissions()
 
         return {'message': 'Module deleted successfully'}
     except HTTPException:
@@ -2,5 +2,13 @@
 Common utilities shared across DWTOOL modules.
 """
 
-from .id_provider import next_id, refresh_id_config  # noqa: F401
+_ID_PROVIDER_EXPORTS = ("next_id", "next_ids", "refresh_id_config")
 
+
+def __getattr__(name):
+    # Loaded on first use: the logger reads its settings from common.env_config
+    # and id_provider logs through the logger.
+    if name in _ID_PROVIDER_EXPORTS:
+        from . import id_provider
+        return getattr(id_provider, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
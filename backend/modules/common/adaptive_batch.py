@@ -0,0 +1,209 @@
+"""
+Adaptive batch sizing for bulk loads (mapper batches, file upload chunks and
+insert batches).
+
+A BatchSizeController starts from the configured batch size. After each batch
+it moves the size toward the number of rows that would take ``target_seconds``
+at the observed per-row cost (fetch + transform + write), within
+[min_size, max_size]. The per-row cost is smoothed and a single step changes
+the size by at most 2x, so one slow batch does not collapse it. While resident
+memory is above the ceiling the size is halved instead, whatever the latency.
+
+Enabled with ADAPTIVE_BATCH_ENABLED; see env.template for the bounds.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from typing import Callable, Optional
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.common.env_config import env_float, env_int
+    from backend.modules.logger import info, debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.env_config import env_float, env_int  # type: ignore
+    from modules.logger import info, debug  # type: ignore
+
+try:
+    import psutil  # optional
+except ImportError:
+    psutil = None
+
+
+_MAX_STEP = 2.0
+# Memory above this fraction of the ceiling stops growth
+_MEMORY_HEADROOM = 0.8
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it cannot be read."""
+    if psutil is not None:
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            return None
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+    return None
+
+
+class BatchSizeController:
+    """Per-load batch size that converges on a target batch latency."""
+
+    def __init__(
+        self,
+        initial_size: int,
+        min_size: int = 100,
+        max_size: int = 100000,
+        target_seconds: float = 2.0,
+        memory_ceiling_mb: Optional[float] = None,
+        name: str = 'batch',
+        smoothing: float = 0.5,
+        rss_reader: Callable[[], Optional[int]] = current_rss_bytes,
+    ):
+        self.min_size = max(1, int(min_size))
+        self.max_size = max(self.min_size, int(max_size))
+        self.target_seconds = float(target_seconds)
+        self.memory_ceiling_bytes = (
+            int(float(memory_ceiling_mb) * 1024 * 1024) if memory_ceiling_mb else None
+        )
+        self.name = name
+        self.smoothing = min(1.0, max(0.0, float(smoothing)))
+        self._rss_reader = rss_reader
+        self._size = self._clamp(int(initial_size))
+        self._seconds_per_row: Optional[float] = None
+        self.batches = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.smallest = self._size
+        self.largest = self._size
+        self.last_rss_bytes: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        """Rows to request for the next batch."""
+        return self._size
+
+    def record(
+        self,
+        rows: int,
+        fetch_seconds: float = 0.0,
+        transform_seconds: float = 0.0,
+        write_seconds: float = 0.0
+    ) -> int:
+        """Record a finished batch and return the size for the next one."""
+        elapsed = fetch_seconds + transform_seconds + write_seconds
+        self.batches += 1
+        self.rows += rows
+        self.seconds += elapsed
+        if rows <= 0:
+            return self._size
+
+        per_row = elapsed / rows
+        if self._seconds_per_row is None:
+            self._seconds_per_row = per_row
+        else:
+            self._seconds_per_row += self.smoothing * (per_row - self._seconds_per_row)
+
+        rss = self._rss_reader() if self.memory_ceiling_bytes else None
+        self.last_rss_bytes = rss
+        previous = self._size
+        if rss is not None and rss >= self.memory_ceiling_bytes:
+            proposed = previous / _MAX_STEP
+            reason = f"resident memory {rss / 1048576:.0f} MB over {self.memory_ceiling_bytes / 1048576:.0f} MB ceiling"
+        else:
+            if self._seconds_per_row > 0:
+                proposed = self.target_seconds / self._seconds_per_row
+            else:
+                proposed = previous * _MAX_STEP
+            proposed = min(max(proposed, previous / _MAX_STEP), previous * _MAX_STEP)
+            if rss is not None and rss >= self.memory_ceiling_bytes * _MEMORY_HEADROOM:
+                proposed = min(proposed, previous)
+            reason = (
+                f"{elapsed:.2f}s for {rows} rows "
+                f"(fetch {fetch_seconds:.2f}s, transform {transform_seconds:.2f}s, write {write_seconds:.2f}s), "
+                f"target {self.target_seconds:.2f}s"
+            )
+
+        new_size = self._clamp(int(proposed))
+        # Ignore changes under 10% so the size settles instead of jittering
+        if new_size != previous and abs(new_size - previous) >= previous * 0.1:
+            self._size = new_size
+            self.smallest = min(self.smallest, new_size)
+            self.largest = max(self.largest, new_size)
+            info(f"[AdaptiveBatch] {self.name}: batch size {previous} -> {new_size} ({reason})")
+        else:
+            debug(f"[AdaptiveBatch] {self.name}: batch size stays {previous} ({reason})")
+        return self._size
+
+    def summary(self) -> str:
+        """One-line description of what the controller converged to."""
+        average = self.seconds / self.batches if self.batches else 0.0
+        return (
+            f"{self.name}: converged to {self._size} rows per batch after {self.batches} batches "
+            f"({self.rows} rows, range {self.smallest}-{self.largest}, "
+            f"avg {average:.2f}s per batch, target {self.target_seconds:.2f}s)"
+        )
+
+    def log_summary(self) -> None:
+        if self.batches:
+            info(f"[AdaptiveBatch] {self.summary()}")
+
+    def _clamp(self, size: int) -> int:
+        return min(self.max_size, max(self.min_size, size))
+
+
+class BatchTimer:
+    """Accumulates fetch/transform/write time for the current batch."""
+
+    __slots__ = ('fetch', 'transform', 'write', '_started')
+
+    def __init__(self):
+        self.fetch = 0.0
+        self.transform = 0.0
+        self.write = 0.0
+        self._started = time.perf_counter()
+
+    def lap(self) -> float:
+        """Seconds since the previous lap (or since the timer was created)."""
+        now = time.perf_counter()
+        elapsed = now - self._started
+        self._started = now
+        return elapsed
+
+
+def batch_size_controller(
+    name: str,
+    initial_size: int,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None
+) -> Optional[BatchSizeController]:
+    """
+    Build a controller from the ADAPTIVE_BATCH_* settings, or return None when
+    adaptive sizing is disabled (the caller then keeps its static size).
+    ``min_size``/``max_size`` further restrict the configured bounds, e.g. for
+    a database that caps its batch size.
+    """
+    if os.getenv('ADAPTIVE_BATCH_ENABLED', 'false').strip().lower() not in ('true', '1', 'yes', 'y'):
+        return None
+    env_min = env_int('ADAPTIVE_BATCH_MIN_ROWS', 500)
+    env_max = env_int('ADAPTIVE_BATCH_MAX_ROWS', 200000)
+    lower = max(env_min, min_size) if min_size is not None else env_min
+    upper = min(env_max, max_size) if max_size is not None else env_max
+    controller = BatchSizeController(
+        initial_size,
+        min_size=min(lower, upper),
+        max_size=upper,
+        target_seconds=env_float('ADAPTIVE_BATCH_TARGET_SECONDS', 2.0),
+        memory_ceiling_mb=env_float('ADAPTIVE_BATCH_MEMORY_CEILING_MB', 0.0) or None,
+        name=name,
+    )
+    info(f"[AdaptiveBatch] {name}: starting at {controller.size} rows "
+         f"(bounds {controller.min_size}-{controller.max_size}, target {controller.target_seconds:.2f}s)")
+    return controller
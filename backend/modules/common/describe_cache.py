@@ -0,0 +1,95 @@
+"""
+Shared cache of SQL result-set descriptions.
+
+The mapper's column extraction and the report/dashboard column pickers learn a
+query's columns by running it wrapped in ``WHERE 1=0`` on its source and
+reading ``cursor.description``. Against remote warehouses that costs a new
+connection and a round trip even for zero rows, on every dialog open. The
+descriptions are now cached per (connection id, hash of the query with
+whitespace collapsed) so repeat requests do not touch the source; callers
+check the cache before opening a connection.
+
+Entries expire after DESCRIBE_CACHE_TTL_SECONDS (default 600, 0 disables the
+cache). Saving a query through create_update_sql drops the entries of both
+its previous and new text on this worker; other workers see edits once the
+TTL elapses (edited text hashes differently, so only re-saved identical text
+can be served stale).
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+try:
+    from backend.modules.common.ttl_cache import TTLCache
+    from backend.modules.logger import debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.ttl_cache import TTLCache  # type: ignore
+    from modules.logger import debug  # type: ignore
+
+
+def _ttl_from_env() -> float:
+    try:
+        return float(os.getenv("DESCRIBE_CACHE_TTL_SECONDS", "600"))
+    except ValueError:
+        return 600.0
+
+
+# (connection id, sql hash) -> (db type, description rows)
+_describe_cache = TTLCache(ttl_seconds=_ttl_from_env(), max_entries=2000)
+
+_MISSING = object()
+
+
+def sql_hash(sql: Any) -> str:
+    """Hash of ``sql`` with whitespace collapsed and trailing semicolons removed."""
+    text = re.sub(r"\s+", " ", str(sql or "")).strip().rstrip(";").strip()
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _key(connection_id: Any, sql: Any) -> Tuple[Optional[str], str]:
+    return (str(connection_id) if connection_id is not None else None, sql_hash(sql))
+
+
+def cached_description(connection_id: Optional[int], sql: Any) -> Optional[Tuple[str, List[tuple]]]:
+    """(db type, description) cached for ``sql`` on the connection (None = metadata), if any."""
+    cached = _describe_cache.get(_key(connection_id, sql), _MISSING)
+    if cached is _MISSING:
+        return None
+    debug(f"[describe_cache] hit for connection {connection_id}")
+    return cached
+
+
+def store_description(connection_id: Optional[int], sql: Any, db_type: str, description: Sequence[Any]) -> List[tuple]:
+    """Cache a cursor description (copied to plain tuples) and return the copy."""
+    rows = [tuple(column) for column in description or []]
+    if rows:
+        _describe_cache.set(_key(connection_id, sql), (db_type, rows))
+    return rows
+
+
+def describe(
+    connection_id: Optional[int],
+    sql: Any,
+    loader: Callable[[], Tuple[str, Sequence[Any]]],
+) -> Tuple[str, List[tuple]]:
+    """Cached (db type, description) of ``sql``; ``loader`` runs the describe query on a miss."""
+    cached = cached_description(connection_id, sql)
+    if cached is not None:
+        return cached
+    db_type, description = loader()
+    return db_type, store_description(connection_id, sql, db_type, description)
+
+
+def invalidate_sql(*sql_texts: Any) -> int:
+    """Drop cached descriptions of the given queries on every connection; returns the count."""
+    hashes = {sql_hash(sql) for sql in sql_texts if sql}
+    if not hashes:
+        return 0
+    return _describe_cache.invalidate_where(lambda key: key[1] in hashes)
+
+
+def clear_describe_cache() -> None:
+    _describe_cache.clear()
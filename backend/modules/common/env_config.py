@@ -0,0 +1,31 @@
+"""
+Numeric settings read from environment variables.
+
+Unset, blank or unparsable values fall back to the default, so a typo in .env
+never stops a module from importing.
+"""
+from __future__ import annotations
+
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    """Integer value of environment variable ``name``, or ``default``."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def env_float(name: str, default: float) -> float:
+    """Float value of environment variable ``name``, or ``default``."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
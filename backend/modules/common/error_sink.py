@@ -0,0 +1,137 @@
+"""
+Bounded collector for row-level load errors (DMS_JOBERR, DMS_FLUPLD_ERR).
+
+An ErrorSink is created once per run. Callers ``add`` each rejected row with an
+error code; the first ERROR_SINK_MAX_ROWS rows keep their full payload and are
+handed to the sink's writer in lists of ERROR_SINK_FLUSH_ROWS (the writer
+inserts them with one array-bound executemany). Rows over the cap are only
+counted, so a batch with 100k rejects costs a few metadata round trips and a
+bounded amount of memory. Callers also ``flush`` at batch boundaries and
+``close`` the sink at the end of the run, which logs the per-code totals.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.logger import info, warning
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.logger import info, warning  # type: ignore
+
+
+_ERROR_CODE_PATTERN = re.compile(r"([A-Z]+-\d+)")
+
+
+def error_sink_max_rows() -> int:
+    """Full error payloads kept per run (ERROR_SINK_MAX_ROWS, 0 = no limit)."""
+    try:
+        return max(0, int(os.getenv("ERROR_SINK_MAX_ROWS", "1000")))
+    except ValueError:
+        return 1000
+
+
+def error_sink_flush_rows() -> int:
+    """Pending rows that trigger a bulk write (ERROR_SINK_FLUSH_ROWS)."""
+    try:
+        return max(1, int(os.getenv("ERROR_SINK_FLUSH_ROWS", "500")))
+    except ValueError:
+        return 500
+
+
+def error_code(message: Any, default: Optional[str] = None) -> Optional[str]:
+    """Database error code (ORA-01438, ...) found in ``message``, else ``default``."""
+    match = _ERROR_CODE_PATTERN.search(str(message or ""))
+    return match.group(1) if match else default
+
+
+class ErrorSink:
+    """Caps, counts and bulk-writes the rejected rows of one run."""
+
+    def __init__(
+        self,
+        writer: Callable[[List[Dict[str, Any]]], None],
+        name: str = "errors",
+        max_rows: Optional[int] = None,
+        flush_rows: Optional[int] = None,
+        raise_errors: bool = False,
+    ):
+        self.writer = writer
+        self.raise_errors = raise_errors
+        self.name = name
+        self.max_rows = error_sink_max_rows() if max_rows is None else max_rows
+        self.flush_rows = error_sink_flush_rows() if flush_rows is None else max(1, flush_rows)
+        self._lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.kept = 0
+        self.written = 0
+        self.write_failures = 0
+
+    @property
+    def dropped(self) -> int:
+        """Rows counted but not kept because the cap was reached."""
+        return self.total - self.kept
+
+    def add(self, code: Optional[str], row: Dict[str, Any]) -> None:
+        """Record one rejected row; writes pending rows once ``flush_rows`` are waiting."""
+        with self._lock:
+            self.total += 1
+            self.counts[code or "UNKNOWN"] += 1
+            if self.max_rows and self.kept >= self.max_rows:
+                return
+            self.kept += 1
+            self._pending.append(row)
+            full = len(self._pending) >= self.flush_rows
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write pending rows in one call to the writer; returns the rows written."""
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        try:
+            self.writer(rows)
+        except Exception as exc:
+            if self.raise_errors:
+                raise
+            # Error logging is best effort; never fail the load over it
+            self.write_failures += len(rows)
+            warning(f"[ErrorSink] Could not write {len(rows)} {self.name} rows: {exc}")
+            return 0
+        with self._lock:
+            self.written += len(rows)
+        return len(rows)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": self.total,
+                "kept": self.kept,
+                "dropped": self.total - self.kept,
+                "written": self.written,
+                "by_code": dict(self.counts),
+            }
+
+    def close(self) -> Dict[str, Any]:
+        """Flush what is left and log the run's totals per error code."""
+        self.flush()
+        summary = self.summary()
+        if summary["total"]:
+            by_code = ", ".join(f"{code}={count}" for code, count in self.counts.most_common())
+            message = (
+                f"[ErrorSink] {self.name}: {summary['total']} rejected rows ({by_code}); "
+                f"{summary['written']} written"
+            )
+            if summary["dropped"]:
+                warning(f"{message}, {summary['dropped']} over the ERROR_SINK_MAX_ROWS cap of {self.max_rows} only counted")
+            else:
+                info(message)
+        return summary
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import re
 import threading
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from typing import Deque, Dict, List, Optional, Tuple
 
 # Support both FastAPI (package import) and legacy Flask (relative import) contexts
 try:
@@ -39,6 +40,8 @@ class _IdConfig:
 
 _config_cache: Optional[_IdConfig] = None
 _block_cache: Dict[str, Tuple[int, int]] = {}
+# Sequence values fetched ahead by next_id(..., prefetch=N), per entity
+_prefetch_cache: Dict[str, Deque[int]] = {}
 
 
 class IdProviderError(Exception):
@@ -133,7 +136,7 @@ def _detect_db_type(cursor) -> str:
             _CONFIG_LOCK.release()
 
 
-def next_id(cursor, entity_name: str) -> int:
+def next_id(cursor, entity_name: str, prefetch: int = 0) -> int:
     """
     Generate the next identifier for the given entity.
     
@@ -143,55 +146,84 @@ def next_id(cursor, entity_name: str) -> int:
         cursor: Database cursor with access to DMS_PARAMS/DMS_IDPOOL (metadata DB).
                Must be Oracle or PostgreSQL connection.
         entity_name: Logical entity/sequence name (e.g., 'DMS_PRCLOGSEQ').
+        prefetch: In SEQUENCE mode, fetch this many values in one round trip and
+               serve the following calls from a per-entity buffer. Buffered values
+               are lost when the process exits, so only use it for entities where
+               gaps and out-of-order IDs across processes are acceptable (error and
+               log rows). TABLE_COUNTER mode always buffers a DMS_IDPOOL block.
 
     Returns:
         Integer identifier.
     """
-    info(f"next_id called for entity: {entity_name}")
+    debug(f"next_id called for entity: {entity_name}")
     if not cursor:
         error("Cursor is None in next_id")
         raise IdProviderError("Cursor is required to generate IDs")
 
     entity_key = entity_name.upper()
-    info(f"Getting config for entity: {entity_key}")
-    try:
-        config = _get_config(cursor)
-        info(f"Config retrieved: default_mode={config.default_mode}, block_size={config.block_size}")
-    except Exception as e:
-        error(f"Error getting config: {str(e)}", exc_info=True)
-        raise
-    
-    mode = config.resolve_mode(entity_key).upper()
-    info(f"Resolved mode for {entity_key}: {mode}")
+    mode, config = _resolve_mode(cursor, entity_key)
 
     if mode == "SEQUENCE":
-        info(f"Using SEQUENCE mode for {entity_name}")
+        if prefetch and prefetch > 1:
+            return _next_prefetched_value(cursor, entity_name, prefetch)
         return _next_sequence_value(cursor, entity_name)
     if mode == "TABLE_COUNTER":
-        info(f"Using TABLE_COUNTER mode for {entity_key}")
         return _next_table_counter_value(cursor, entity_key, config.block_size)
 
     error(f"Unsupported ID generation mode: {mode}")
     raise IdProviderError(f"Unsupported ID generation mode: {mode}. Supported: SEQUENCE, TABLE_COUNTER")
 
 
+def next_ids(cursor, entity_name: str, count: int) -> List[int]:
+    """
+    Generate ``count`` identifiers for the given entity in one round trip.
+
+    SEQUENCE mode selects all values from the sequence in a single statement
+    (CONNECT BY LEVEL on Oracle, generate_series on PostgreSQL); TABLE_COUNTER
+    mode serves them from the cached DMS_IDPOOL block and reserves one block
+    large enough for the remainder. Values are returned in ascending order.
+    """
+    if not cursor:
+        error("Cursor is None in next_ids")
+        raise IdProviderError("Cursor is required to generate IDs")
+    if count <= 0:
+        return []
+
+    entity_key = entity_name.upper()
+    mode, config = _resolve_mode(cursor, entity_key)
+
+    if mode == "SEQUENCE":
+        return _next_sequence_values(cursor, entity_name, count)
+    if mode == "TABLE_COUNTER":
+        return _next_table_counter_values(cursor, entity_key, config.block_size, count)
+
+    error(f"Unsupported ID generation mode: {mode}")
+    raise IdProviderError(f"Unsupported ID generation mode: {mode}. Supported: SEQUENCE, TABLE_COUNTER")
+
+
+def _resolve_mode(cursor, entity_key: str) -> Tuple[str, _IdConfig]:
+    try:
+        config = _get_config(cursor)
+    except Exception as e:
+        error(f"Error getting config: {str(e)}", exc_info=True)
+        raise
+    mode = config.resolve_mode(entity_key).upper()
+    debug(f"Resolved ID mode for {entity_key}: {mode}")
+    return mode, config
+
+
 def _get_config(cursor) -> _IdConfig:
     global _config_cache
-    info("_get_config called")
     if _config_cache:
-        info("Using cached config")
         return _config_cache
 
-    info("Acquiring config lock...")
     with _CONFIG_LOCK:
-        info("Config lock acquired")
         if _config_cache:
-            info("Config was loaded by another thread, using cached config")
+            debug("Config was loaded by another thread, using cached config")
             return _config_cache
-        info("Loading config from database...")
+        info("Loading ID provider config from database...")
         try:
             _config_cache = _load_config(cursor)
-            info("Config loaded successfully")
             return _config_cache
         except Exception as e:
             error(f"Error in _load_config: {str(e)}", exc_info=True)
@@ -315,17 +347,14 @@ def _next_sequence_value(cursor, sequence_name: str) -> int:
     """
     try:
         db_type = _detect_db_type(cursor)
-        info(f"Getting next sequence value for {sequence_name} on {db_type}")
         sequence_identifier = _sanitize_identifier(sequence_name)
         
         if db_type == "ORACLE":
             query = f"SELECT {sequence_identifier}.NEXTVAL FROM dual"
-            info(f"Executing Oracle sequence query: {query}")
             cursor.execute(query)
         elif db_type == "POSTGRESQL":
             # PostgreSQL uses nextval('sequence_name') function
             query = f"SELECT nextval('{sequence_identifier}')"
-            info(f"Executing PostgreSQL sequence query: {query}")
             cursor.execute(query)
         else:
             raise IdProviderError(f"Unsupported database type for sequences: {db_type}")
@@ -334,13 +363,61 @@ def _next_sequence_value(cursor, sequence_name: str) -> int:
         if not row or row[0] is None:
             raise IdProviderError(f"Sequence {sequence_name} returned no value")
         seq_value = int(row[0])
-        info(f"Sequence {sequence_name} returned value: {seq_value}")
+        debug(f"Sequence {sequence_name} returned value: {seq_value}")
         return seq_value
     except Exception as e:
         error(f"Error getting next sequence value for {sequence_name}: {str(e)}", exc_info=True)
         raise
 
 
+def _next_sequence_values(cursor, sequence_name: str, count: int) -> List[int]:
+    """
+    Get ``count`` values from a sequence with a single query. Supports Oracle and PostgreSQL.
+    """
+    try:
+        db_type = _detect_db_type(cursor)
+        sequence_identifier = _sanitize_identifier(sequence_name)
+
+        if db_type == "ORACLE":
+            cursor.execute(
+                f"SELECT {sequence_identifier}.NEXTVAL FROM dual CONNECT BY LEVEL <= :count",
+                {"count": count},
+            )
+        elif db_type == "POSTGRESQL":
+            cursor.execute(
+                f"SELECT nextval('{sequence_identifier}') FROM generate_series(1, %s)",
+                (count,),
+            )
+        else:
+            raise IdProviderError(f"Unsupported database type for sequences: {db_type}")
+
+        values = sorted(int(row[0]) for row in cursor.fetchall() if row and row[0] is not None)
+        if len(values) != count:
+            raise IdProviderError(
+                f"Sequence {sequence_name} returned {len(values)} values, expected {count}"
+            )
+        debug(f"Sequence {sequence_name} returned {count} values: {values[0]}..{values[-1]}")
+        return values
+    except Exception as e:
+        error(f"Error getting {count} sequence values for {sequence_name}: {str(e)}", exc_info=True)
+        raise
+
+
+def _next_prefetched_value(cursor, sequence_name: str, prefetch: int) -> int:
+    key = sequence_name.upper()
+    with _BLOCK_LOCK:
+        buffered = _prefetch_cache.get(key)
+        if buffered:
+            return buffered.popleft()
+
+    values = _next_sequence_values(cursor, sequence_name, prefetch)
+    with _BLOCK_LOCK:
+        # Another thread may have refilled meanwhile; both batches are valid values
+        buffered = _prefetch_cache.setdefault(key, deque())
+        buffered.extend(values[1:])
+    return values[0]
+
+
 _IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z0-9_.\$]+$")
 
 
@@ -365,9 +442,32 @@ def _next_table_counter_value(cursor, entity_key: str, default_block_size: int)
     return start
 
 
-def _reserve_block(cursor, entity_key: str, default_block_size: int) -> Tuple[int, int]:
+def _next_table_counter_values(cursor, entity_key: str, default_block_size: int, count: int) -> List[int]:
+    values: List[int] = []
+    with _BLOCK_LOCK:
+        cached = _block_cache.get(entity_key)
+        if cached:
+            next_value, max_value = cached
+            take = min(count, max_value - next_value + 1)
+            if take > 0:
+                values.extend(range(next_value, next_value + take))
+                _block_cache[entity_key] = (next_value + take, max_value)
+
+    remaining = count - len(values)
+    if remaining:
+        start, end = _reserve_block(cursor, entity_key, default_block_size, min_size=remaining)
+        values.extend(range(start, start + remaining))
+        with _BLOCK_LOCK:
+            _block_cache[entity_key] = (start + remaining, end)
+    return values
+
+
+def _reserve_block(cursor, entity_key: str, default_block_size: int, min_size: int = 1) -> Tuple[int, int]:
     """
     Reserve a block of IDs from DMS_IDPOOL table. Supports Oracle and PostgreSQL.
+
+    The block spans at least ``min_size`` IDs even when the configured block
+    size is smaller; the stored block size is left unchanged.
     """
     db_type = _detect_db_type(cursor)
     effective_block_size = max(default_block_size, 1)
@@ -423,7 +523,7 @@ def _reserve_block(cursor, entity_key: str, default_block_size: int) -> Tuple[in
         block_size = block_size or effective_block_size
 
     next_start = int(current_value) + 1
-    next_end = next_start + int(block_size) - 1
+    next_end = next_start + max(int(block_size), min_size) - 1
 
     # Update the counter
     if db_type == "ORACLE":
@@ -4,6 +4,9 @@ import io
 import json
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 from datetime import date, datetime, timedelta
 from decimal import Decimal
@@ -11,9 +14,80 @@ from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from backend.database.dbconnect import create_metadata_connection
 from backend.modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name
+from backend.modules.common.env_config import env_int
+from backend.modules.logger import debug, warning
 from backend.modules.reports.report_service import ReportMetadataService, ReportServiceError
 
 
+# Upper bound on widget queries running at once for a single export.
+EXPORT_MAX_WORKERS = max(1, env_int("DASHBOARD_EXPORT_MAX_WORKERS", 8))
+# Widget queries allowed at once against the same source connection.
+EXPORT_PER_CONNECTION_LIMIT = max(1, env_int("DASHBOARD_EXPORT_PER_CONNECTION_LIMIT", 2))
+# DMS_DASH_EXPORT_LOG.MSG is VARCHAR2(2000) on Oracle, which counts bytes.
+EXPORT_LOG_MESSAGE_LIMIT = 2000
+CHART_SAMPLE_ROWS = 30
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        if value is None or value == "":
+            return None
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _truncate_utf8(text: str, limit_bytes: int) -> str:
+    encoded = text.encode("utf-8")
+    if len(encoded) <= limit_bytes:
+        return text
+    # Cut on a byte boundary, dropping a multi-byte character split by the cut
+    return encoded[:limit_bytes - 3].decode("utf-8", errors="ignore") + "..."
+
+
+def _first_numeric_column(columns: List[str], rows: List[Dict[str, Any]]) -> Optional[str]:
+    for column in columns:
+        for row in rows:
+            number_value = _to_float(row.get(column))
+            if number_value is not None:
+                return column
+    return None
+
+
+def _prepare_widget_render(widget: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Precompute everything the PDF/PPT renderers derive from a widget's rows,
+    in one pass per widget; the document itself is assembled in the caller.
+    """
+    columns = widget.get("columns", [])
+    rows = widget.get("rows", [])
+    x_column = columns[0] if columns else None
+    y_column = _first_numeric_column(columns[1:] if len(columns) > 1 else columns, rows)
+    kpi_column = _first_numeric_column(columns, rows)
+
+    chart_labels: List[str] = []
+    chart_values: List[float] = []
+    if x_column and y_column:
+        for row in rows[:CHART_SAMPLE_ROWS]:
+            chart_labels.append(str(row.get(x_column, "")))
+            chart_values.append(_to_float(row.get(y_column)) or 0.0)
+
+    # Raw rows are not sent back; renderers only need the derived values.
+    prepared = {key: value for key, value in widget.items() if key != "rows"}
+    prepared.update({
+        "chartXColumn": x_column,
+        "chartYColumn": y_column,
+        "chartLabels": chart_labels,
+        "chartValues": chart_values,
+        "kpiColumn": kpi_column,
+        "kpiTotal": (
+            sum(_to_float(row.get(kpi_column)) or 0.0 for row in rows) if kpi_column else None
+        ),
+        "cells": [[str(row.get(column, "")) for column in columns] for row in rows],
+    })
+    return prepared
+
+
 class DashboardCreatorError(Exception):
     def __init__(
         self,
@@ -856,44 +930,97 @@ class DashboardCreatorService:
         if not widgets:
             raise DashboardCreatorError("Dashboard has no widgets to export", code="NO_WIDGETS_TO_EXPORT")
 
-        export_widgets: List[Dict[str, Any]] = []
+        effective_limit = max(1, min(int(row_limit), 2000))
+        jobs: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
         for widget in widgets:
             sql_payload = self._resolve_widget_sql(widget)
             if not (sql_payload.get("sqlText") or "").strip():
                 continue
-
-            result = self.report_service._run_preview_query(
-                connection_id=self._to_int(sql_payload.get("connectionId")),
-                sql_text=str(sql_payload.get("sqlText")),
-                row_limit=max(1, min(int(row_limit), 2000)),
-                parameters={},
-            )
+            jobs.append((widget, sql_payload))
+
+        # Widgets on the same source connection share a semaphore so one slow
+        # database is not hit by every worker at once.
+        connection_limits: Dict[Optional[int], threading.Semaphore] = {}
+        for _, sql_payload in jobs:
+            connection_id = self._to_int(sql_payload.get("connectionId"))
+            connection_limits.setdefault(connection_id, threading.Semaphore(EXPORT_PER_CONNECTION_LIMIT))
+
+        def _run_widget(widget: Dict[str, Any], sql_payload: Dict[str, Any]) -> Dict[str, Any]:
+            connection_id = self._to_int(sql_payload.get("connectionId"))
+            with connection_limits[connection_id]:
+                started = time.perf_counter()
+                result = self.report_service._run_preview_query(
+                    connection_id=connection_id,
+                    sql_text=str(sql_payload.get("sqlText")),
+                    row_limit=effective_limit,
+                    parameters={},
+                )
+                query_ms = int((time.perf_counter() - started) * 1000)
 
             rows = result.get("rows", [])
             safe_rows = [
                 {column: self._json_safe(value) for column, value in row.items()}
                 for row in rows
             ]
+            return {
+                "widgetName": widget.get("widgetName") or "Widget",
+                "widgetType": widget.get("widgetType") or "TABLE",
+                "columns": result.get("columns", []),
+                "rows": safe_rows,
+                "rowCount": len(safe_rows),
+                "sourceDbType": result.get("dbType"),
+                "connectionId": connection_id,
+                "queryMs": query_ms,
+            }
 
-            export_widgets.append(
-                {
-                    "widgetName": widget.get("widgetName") or "Widget",
-                    "widgetType": widget.get("widgetType") or "TABLE",
-                    "columns": result.get("columns", []),
-                    "rows": safe_rows,
-                    "rowCount": len(safe_rows),
-                    "sourceDbType": result.get("dbType"),
-                }
-            )
+        started = time.perf_counter()
+        export_widgets: List[Dict[str, Any]] = []
+        if jobs:
+            max_workers = min(EXPORT_MAX_WORKERS, len(jobs))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dash-export") as executor:
+                futures = [executor.submit(_run_widget, widget, sql_payload) for widget, sql_payload in jobs]
+                # Results are read in widget order; the first failure propagates as before.
+                export_widgets = [future.result() for future in futures]
+        query_wall_ms = int((time.perf_counter() - started) * 1000)
 
         if not export_widgets:
             raise DashboardCreatorError("No widget datasets generated for export", code="NO_WIDGET_DATA")
 
+        debug(
+            f"[DashboardCreator] Export data for dashboard {dashboard_id}: "
+            f"{len(export_widgets)} widgets on {len(connection_limits)} connections in {query_wall_ms} ms"
+        )
         return {
             "dashboard": dashboard,
             "widgets": export_widgets,
+            "queryWallMs": query_wall_ms,
         }
 
+    def _prepare_render_data(self, widgets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Derive chart series, KPI totals and table cells for every widget.
+
+        This stays in-process: the reportlab/pptx drawing that follows cannot
+        be shipped to worker processes, and pickling the rows there and back
+        costs about as much as the derivation itself.
+        """
+        return [_prepare_widget_render(widget) for widget in widgets]
+
+    def _format_export_timings(self, export_payload: Dict[str, Any], render_ms: int) -> str:
+        widgets = export_payload.get("widgets") or []
+        query_total_ms = sum(int(widget.get("queryMs") or 0) for widget in widgets)
+        parts = [
+            f"Queries {export_payload.get('queryWallMs', 0)} ms wall / {query_total_ms} ms total, "
+            f"render {render_ms} ms"
+        ]
+        for widget in widgets:
+            connection_id = widget.get("connectionId")
+            parts.append(
+                f"{widget.get('widgetName')}: {widget.get('queryMs', 0)} ms, "
+                f"{widget.get('rowCount', 0)} rows, conn {connection_id if connection_id is not None else 'metadata'}"
+            )
+        return _truncate_utf8(" | ".join(parts), EXPORT_LOG_MESSAGE_LIMIT)
+
     def _render_pdf_bytes(self, export_payload: Dict[str, Any]) -> bytes:
         try:
             from reportlab.lib import colors
@@ -912,7 +1039,7 @@ class DashboardCreatorService:
             ) from exc
 
         dashboard = export_payload["dashboard"]
-        widgets = export_payload["widgets"]
+        widgets = self._prepare_render_data(export_payload["widgets"])
 
         output = io.BytesIO()
         document = SimpleDocTemplate(output, pagesize=landscape(letter))
@@ -939,34 +1066,14 @@ class DashboardCreatorService:
             colors.HexColor("#F97316"),
         ]
 
-        def _to_float(value: Any) -> Optional[float]:
-            try:
-                if value is None or value == "":
-                    return None
-                return float(value)
-            except (TypeError, ValueError):
+        def _build_chart_drawing(widget_type: str, widget: Dict[str, Any]) -> Optional[Drawing]:
+            x_column = widget.get("chartXColumn")
+            y_column = widget.get("chartYColumn")
+            if not x_column or not y_column or not widget.get("cells"):
                 return None
 
-        def _first_numeric_column(columns: List[str], rows: List[Dict[str, Any]]) -> Optional[str]:
-            for column in columns:
-                for row in rows:
-                    number_value = _to_float(row.get(column))
-                    if number_value is not None:
-                        return column
-            return None
-
-        def _build_chart_drawing(widget_type: str, columns: List[str], rows: List[Dict[str, Any]]) -> Optional[Drawing]:
-            if not columns or not rows:
-                return None
-
-            x_column = columns[0]
-            y_column = _first_numeric_column(columns[1:] if len(columns) > 1 else columns, rows)
-            if not y_column:
-                return None
-
-            sample_rows = rows[:20]
-            labels = [str(row.get(x_column, ""))[:24] for row in sample_rows]
-            values = [(_to_float(row.get(y_column)) or 0.0) for row in sample_rows]
+            labels = [label[:24] for label in widget["chartLabels"][:20]]
+            values = widget["chartValues"][:20]
 
             drawing = Drawing(720, 280)
             drawing.add(String(12, 262, f"{widget_type} chart: {y_column} by {x_column}", fontSize=10, fillColor=colors.HexColor("#334155")))
@@ -1029,7 +1136,7 @@ class DashboardCreatorService:
 
         for index, widget in enumerate(widgets, start=1):
             columns = widget.get("columns", [])
-            rows = widget.get("rows", [])
+            rows = widget.get("cells", [])
             row_count = int(widget.get("rowCount") or len(rows) or 0)
             source_db = widget.get("sourceDbType") or "-"
             widget_name = widget.get("widgetName") or f"Widget {index}"
@@ -1039,7 +1146,7 @@ class DashboardCreatorService:
             story.append(Paragraph(f"Rows: {row_count} | Source DB: {source_db}", styles["Normal"]))
 
             if widget_type in {"BAR", "LINE", "AREA", "PIE"}:
-                chart_drawing = _build_chart_drawing(widget_type, columns, rows)
+                chart_drawing = _build_chart_drawing(widget_type, widget)
                 if chart_drawing:
                     story.append(chart_drawing)
                 else:
@@ -1050,9 +1157,9 @@ class DashboardCreatorService:
                     continue
 
             if widget_type == "KPI":
-                metric_column = _first_numeric_column(columns, rows)
+                metric_column = widget.get("kpiColumn")
                 if metric_column:
-                    total_value = sum(_to_float(row.get(metric_column)) or 0.0 for row in rows)
+                    total_value = widget["kpiTotal"]
                     kpi_table = Table(
                         [[f"KPI ({metric_column})"], [f"{total_value:,.2f}"]],
                         colWidths=[740],
@@ -1116,9 +1223,10 @@ class DashboardCreatorService:
                             summary = f"Rows: 0 | Columns {col_start}-{col_end} | Source DB: {source_db}"
                         story.append(Paragraph(summary, styles["Normal"]))
 
+                        col_offset = col_chunk_index * max_cols_per_page
                         table_data = [col_chunk]
                         for row in row_chunk:
-                            table_data.append([str(row.get(column, "")) for column in col_chunk])
+                            table_data.append(row[col_offset:col_offset + len(col_chunk)])
 
                         table = Table(table_data, repeatRows=1)
                         table.setStyle(
@@ -1164,7 +1272,7 @@ class DashboardCreatorService:
             ) from exc
 
         dashboard = export_payload["dashboard"]
-        widgets = export_payload["widgets"]
+        widgets = self._prepare_render_data(export_payload["widgets"])
 
         presentation = Presentation()
 
@@ -1177,22 +1285,6 @@ class DashboardCreatorService:
         slide_width = presentation.slide_width
         slide_height = presentation.slide_height
 
-        def _to_float(value: Any) -> Optional[float]:
-            try:
-                if value is None or value == "":
-                    return None
-                return float(value)
-            except (TypeError, ValueError):
-                return None
-
-        def _first_numeric_column(columns: List[str], rows: List[Dict[str, Any]]) -> Optional[str]:
-            for column in columns:
-                for row in rows:
-                    number_value = _to_float(row.get(column))
-                    if number_value is not None:
-                        return column
-            return None
-
         margin = Inches(0.4)
         content_left = margin
         content_width = slide_width - (2 * margin)
@@ -1208,7 +1300,7 @@ class DashboardCreatorService:
             widget_name = widget.get("widgetName") or "Widget"
             widget_type = str(widget.get("widgetType") or "TABLE").upper()
             columns = widget.get("columns", [])
-            rows = widget.get("rows", [])
+            rows = widget.get("cells", [])
             source_db = widget.get("sourceDbType") or "-"
             total_row_count = int(widget.get("rowCount") or len(rows) or 0)
 
@@ -1219,8 +1311,8 @@ class DashboardCreatorService:
                 "PIE": XL_CHART_TYPE.PIE,
             }
 
-            x_column = columns[0] if columns else None
-            y_column = _first_numeric_column(columns[1:] if len(columns) > 1 else columns, rows)
+            x_column = widget.get("chartXColumn")
+            y_column = widget.get("chartYColumn")
 
             if widget_type in chart_type_map and x_column and y_column and rows:
                 slide = presentation.slides.add_slide(presentation.slide_layouts[5])
@@ -1231,15 +1323,9 @@ class DashboardCreatorService:
                 text_frame.text = f"Rows: {total_row_count} | Source DB: {source_db}"
                 text_frame.paragraphs[0].font.size = Pt(11)
 
-                chart_labels = []
-                chart_values = []
-                for row in rows[:30]:
-                    chart_labels.append(str(row.get(x_column, "")))
-                    chart_values.append(_to_float(row.get(y_column)) or 0.0)
-
                 chart_data = CategoryChartData()
-                chart_data.categories = chart_labels
-                chart_data.add_series(y_column, chart_values)
+                chart_data.categories = widget["chartLabels"]
+                chart_data.add_series(y_column, widget["chartValues"])
 
                 chart_shape = slide.shapes.add_chart(
                     chart_type_map[widget_type],
@@ -1262,9 +1348,9 @@ class DashboardCreatorService:
                 text_frame.text = f"Rows: {total_row_count} | Source DB: {source_db}"
                 text_frame.paragraphs[0].font.size = Pt(11)
 
-                metric_column = _first_numeric_column(columns, rows)
+                metric_column = widget.get("kpiColumn")
                 if metric_column:
-                    total_value = sum(_to_float(row.get(metric_column)) or 0.0 for row in rows)
+                    total_value = widget["kpiTotal"]
                     kpi_box = slide.shapes.add_textbox(content_left, table_top, content_width, table_height)
                     kpi_frame = kpi_box.text_frame
                     kpi_frame.clear()
@@ -1336,9 +1422,10 @@ class DashboardCreatorService:
                             if header_cell.text_frame.paragraphs:
                                 header_cell.text_frame.paragraphs[0].font.size = Pt(9)
 
+                        col_offset = col_chunk_index * max_cols_per_slide
                         for row_index, row in enumerate(row_chunk, start=1):
                             for column_index, column_name in enumerate(col_chunk):
-                                value = str(row.get(column_name, ""))
+                                value = row[col_offset + column_index]
                                 max_len = 80
                                 table.cell(row_index, column_index).text = value[:max_len]
                                 if table.cell(row_index, column_index).text_frame.paragraphs:
@@ -1514,6 +1601,7 @@ class DashboardCreatorService:
             export_payload = self._collect_export_data(dashboard_id, row_limit=row_limit_value)
             dashboard_name = export_payload["dashboard"].get("dashboardName") or "dashboard"
 
+            render_started = time.perf_counter()
             if normalized_format == "PDF":
                 content = self._render_pdf_bytes(export_payload)
                 media_type = "application/pdf"
@@ -1522,6 +1610,7 @@ class DashboardCreatorService:
                 content = self._render_ppt_bytes(export_payload)
                 media_type = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
                 extension = "pptx"
+            render_ms = int((time.perf_counter() - render_started) * 1000)
 
             safe_name = self._safe_file_name(dashboard_name)
             file_name = f"{safe_name}.{extension}"
@@ -1531,7 +1620,7 @@ class DashboardCreatorService:
                 export_format=normalized_format,
                 username=username,
                 status="SUCCESS",
-                message=None,
+                message=self._format_export_timings(export_payload, render_ms),
                 file_name=file_name,
                 file_size_bytes=len(content),
             )
@@ -0,0 +1,586 @@
+"""
+Precomputed dashboard metrics.
+
+The dashboard endpoints used to aggregate the whole of DMS_JOBLOG/DMS_PRCLOG on
+every page view. ``DashboardMetricsStore`` keeps the same aggregates in memory
+and a background thread refreshes them incrementally:
+
+- Finished runs (DMS_PRCLOG status PC/FL) are folded into the aggregates once,
+  using ENDDT as a watermark. The last ``DASHBOARD_METRICS_OVERLAP_SECONDS`` are
+  re-read every cycle (and de-duplicated by PRCID) so late commits and runs whose
+  PRCID was allocated out of order are not missed.
+- Runs that are still in progress are re-read every cycle and overlaid on top
+  of the folded totals, because their DMS_JOBLOG rows keep changing.
+- DMS_JOBLOG rows without a DMS_PRCLOG run (purged or never logged) count
+  towards the processed rows, as in the live query. They are folded once, with
+  their PRCDT as a second watermark re-read over the same overlap and
+  de-duplicated by JOBLOGID. A run's DMS_PRCLOG row is written before its
+  DMS_JOBLOG rows, so a row does not turn from orphan into run row.
+- Only the latest ``DASHBOARD_METRICS_MAX_DURATION_SAMPLES`` run durations are
+  kept per job for ``jobs_executed_duration``. A period reaching back past the
+  dropped samples (``ALL`` included) is answered by the live query instead, so
+  results stay exact.
+- The mapping/job/schedule counts behind ``all_metrics`` come from small
+  configuration tables and are simply recomputed every cycle.
+
+The whole state is rebuilt from scratch every ``DASHBOARD_METRICS_REBUILD_SECONDS``
+to pick up purged or corrected history. Setting
+``DASHBOARD_METRICS_REFRESH_SECONDS`` to 0 disables the store; the endpoints then
+query the metadata database directly as before.
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from backend.modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name
+    from backend.modules.common.env_config import env_float, env_int
+    from backend.modules.logger import info, warning, debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name  # type: ignore
+    from modules.common.env_config import env_float, env_int  # type: ignore
+    from modules.logger import info, warning, debug  # type: ignore
+
+
+TERMINAL_STATUSES = ("PC", "FL")
+
+
+def _default_connection():
+    try:
+        from backend.database.dbconnect import create_metadata_connection
+    except ImportError:  # When running Flask app.py directly inside backend
+        from database.dbconnect import create_metadata_connection  # type: ignore
+    return create_metadata_connection()
+
+
+def _table_ref(cursor, db_type: str, schema: str, table_name: str) -> str:
+    """Schema-qualified table reference, honouring PostgreSQL quoted identifiers."""
+    if db_type == "POSTGRESQL":
+        schema_lower = schema.lower() if schema else 'public'
+        actual = get_postgresql_table_name(cursor, schema_lower, table_name)
+        ref = f'"{actual}"' if actual != actual.lower() else actual
+        return f'{schema_lower}.{ref}' if schema else ref
+    return f"{schema}.{table_name}" if schema else table_name
+
+
+def _seconds_between(start, end) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    delta = end - start
+    if isinstance(delta, timedelta):
+        return delta.total_seconds()
+    # Oracle DATE arithmetic yields fractional days
+    return float(delta) * 86400
+
+
+def _as_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return None
+
+
+@dataclass
+class _MaprefStats:
+    """Running totals for one mapping reference."""
+    joblog_rows: int = 0
+    src_sum: float = 0
+    src_count: int = 0
+    trg_sum: float = 0
+    trg_count: int = 0
+    dur_max: Optional[float] = None
+    dur_min: Optional[float] = None
+    dur_sum: float = 0
+    dur_count: int = 0
+    succeeded: int = 0
+    failed: int = 0
+
+
+class _Aggregates:
+    """Additive aggregates over a set of runs and their DMS_JOBLOG rows."""
+
+    def __init__(self, max_duration_samples: int = 5000):
+        self.max_duration_samples = max(1, max_duration_samples)
+        # keyed by DMS_JOBLOG.MAPREF (jobs_overview / average run duration)
+        self.by_log_mapref: Dict[str, _MaprefStats] = defaultdict(_MaprefStats)
+        # keyed by DMS_PRCLOG.MAPREF (success/failure counts)
+        self.by_run_mapref: Dict[str, _MaprefStats] = defaultdict(_MaprefStats)
+        # DMS_JOBLOG.MAPREF -> day -> [srcrows, trgrows]
+        self.daily: Dict[str, Dict[date, List[float]]] = defaultdict(dict)
+        # DMS_PRCLOG.MAPREF -> [(prcdt, joblog mapref, run seconds)]
+        self.durations: Dict[str, List[Tuple[Any, str, Optional[float]]]] = defaultdict(list)
+        # DMS_PRCLOG.MAPREF -> PRCDT of the newest duration sample dropped by the cap
+        self.trimmed_through: Dict[str, Any] = {}
+
+    def add_run(self, run_mapref: str, status: str) -> None:
+        stats = self.by_run_mapref[run_mapref]
+        if status == 'PC':
+            stats.succeeded += 1
+        elif status == 'FL':
+            stats.failed += 1
+
+    def add_joblog_row(self, row: Dict[str, Any]) -> None:
+        log_mapref = row['log_mapref']
+        srcrows, trgrows = row['srcrows'], row['trgrows']
+
+        day = _as_date(row['prcdt'])
+        if day is not None:
+            bucket = self.daily[log_mapref].setdefault(day, [0, 0])
+            bucket[0] += srcrows or 0
+            bucket[1] += trgrows or 0
+
+        # The overview/duration queries join DMS_PRCLOG on sessionid as well
+        if not row['session_match']:
+            return
+
+        stats = self.by_log_mapref[log_mapref]
+        stats.joblog_rows += 1
+        if srcrows is not None:
+            stats.src_sum += srcrows
+            stats.src_count += 1
+        if trgrows is not None:
+            stats.trg_sum += trgrows
+            stats.trg_count += 1
+
+        duration = row['duration']
+        if duration is not None:
+            stats.dur_sum += duration
+            stats.dur_count += 1
+            stats.dur_max = duration if stats.dur_max is None else max(stats.dur_max, duration)
+            stats.dur_min = duration if stats.dur_min is None else min(stats.dur_min, duration)
+
+        run_mapref = row['run_mapref']
+        samples = self.durations[run_mapref]
+        samples.append((row['prcdt'], log_mapref, duration))
+        # Trim in steps so the sort is amortised over many appends
+        if len(samples) > self.max_duration_samples + self.max_duration_samples // 4:
+            samples.sort(key=_sample_order)
+            newest_dropped = samples[-self.max_duration_samples - 1][0]
+            previous = self.trimmed_through.get(run_mapref)
+            self.trimmed_through[run_mapref] = newest_dropped if previous is None else \
+                max(previous, newest_dropped or previous)
+            del samples[:-self.max_duration_samples]
+
+
+def _sample_order(sample: Tuple[Any, str, Optional[float]]):
+    return (sample[0] is not None, sample[0] or datetime.min)
+
+
+def _merge_stats(left: Optional[_MaprefStats], right: Optional[_MaprefStats]) -> _MaprefStats:
+    merged = _MaprefStats()
+    for part in (left, right):
+        if part is None:
+            continue
+        merged.joblog_rows += part.joblog_rows
+        merged.src_sum += part.src_sum
+        merged.src_count += part.src_count
+        merged.trg_sum += part.trg_sum
+        merged.trg_count += part.trg_count
+        merged.dur_sum += part.dur_sum
+        merged.dur_count += part.dur_count
+        merged.succeeded += part.succeeded
+        merged.failed += part.failed
+        for attr, pick in (('dur_max', max), ('dur_min', min)):
+            value = getattr(part, attr)
+            if value is not None:
+                current = getattr(merged, attr)
+                setattr(merged, attr, value if current is None else pick(current, value))
+    return merged
+
+
+class DashboardMetricsStore:
+    """In-memory, incrementally refreshed dashboard aggregates."""
+
+    def __init__(
+        self,
+        config_loader: Callable[[Any, Any], List[Any]],
+        refresh_seconds: Optional[float] = None,
+        overlap_seconds: Optional[float] = None,
+        rebuild_seconds: Optional[float] = None,
+        connection_factory: Callable[[], Any] = _default_connection,
+        max_duration_samples: Optional[int] = None,
+    ):
+        """
+        Args:
+            config_loader: ``fn(connection, cursor) -> rows`` producing the
+                ``all_metrics`` result (recomputed every cycle)
+            refresh_seconds: Refresh interval; 0 disables the store
+            overlap_seconds: How far behind the ENDDT watermark to re-read
+            rebuild_seconds: Interval between full rebuilds
+            connection_factory: Metadata connection factory
+            max_duration_samples: Run durations kept per job
+        """
+        self._config_loader = config_loader
+        self.refresh_seconds = env_float("DASHBOARD_METRICS_REFRESH_SECONDS", 30) \
+            if refresh_seconds is None else refresh_seconds
+        self.overlap_seconds = env_float("DASHBOARD_METRICS_OVERLAP_SECONDS", 300) \
+            if overlap_seconds is None else overlap_seconds
+        self.rebuild_seconds = env_float("DASHBOARD_METRICS_REBUILD_SECONDS", 21600) \
+            if rebuild_seconds is None else rebuild_seconds
+        self.max_duration_samples = env_int("DASHBOARD_METRICS_MAX_DURATION_SAMPLES", 5000) \
+            if max_duration_samples is None else max_duration_samples
+        self._connection_factory = connection_factory
+
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._reset_state()
+
+    @property
+    def enabled(self) -> bool:
+        return self.refresh_seconds > 0
+
+    @property
+    def is_warm(self) -> bool:
+        return self._last_refresh is not None
+
+    def _reset_state(self) -> None:
+        self._folded = _Aggregates(self.max_duration_samples)
+        self._open = _Aggregates(self.max_duration_samples)
+        self._folded_prcids: Dict[Any, Any] = {}
+        self._watermark = None
+        self._folded_joblogids: Dict[Any, Any] = {}
+        self._orphan_watermark = None
+        self._config_rows: List[Any] = []
+        self._last_refresh: Optional[float] = None
+        self._last_rebuild: Optional[float] = None
+        self._db_clock_offset = timedelta(0)
+
+    # ------------------------------------------------------------------
+    # Background refresher
+    # ------------------------------------------------------------------
+    def ensure_started(self) -> None:
+        """Start the refresher thread on first use (no-op when disabled)."""
+        if not self.enabled or self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="dashboard-metrics-refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as exc:
+                warning(f"[DashboardMetrics] Refresh failed: {exc}")
+            if self._stop_event.wait(self.refresh_seconds):
+                return
+
+    def refresh(self) -> None:
+        """Run one refresh cycle (full rebuild when due)."""
+        started = time.monotonic()
+        full_rebuild = (
+            self._last_rebuild is None
+            or (self.rebuild_seconds > 0 and started - self._last_rebuild >= self.rebuild_seconds)
+        )
+        since = None if full_rebuild else self._since()
+        orphan_since = None if full_rebuild else self._orphan_since()
+
+        connection = self._connection_factory()
+        cursor = connection.cursor()
+        try:
+            db_type = _detect_db_type(connection)
+            schema = (os.getenv("DMS_SCHEMA", "")).strip()
+            prclog = _table_ref(cursor, db_type, schema, 'DMS_PRCLOG')
+            joblog = _table_ref(cursor, db_type, schema, 'DMS_JOBLOG')
+
+            config_rows = self._config_loader(connection, cursor)
+            db_now = self._fetch_db_now(cursor, db_type)
+            finished_runs = self._fetch_runs(cursor, db_type, prclog, since, finished=True)
+            finished_logs = self._fetch_joblog_rows(cursor, db_type, prclog, joblog, since, finished=True)
+            open_runs = self._fetch_runs(cursor, db_type, prclog, None, finished=False)
+            open_logs = self._fetch_joblog_rows(cursor, db_type, prclog, joblog, None, finished=False)
+            orphan_logs = self._fetch_orphan_joblog_rows(cursor, db_type, prclog, joblog, orphan_since)
+        finally:
+            cursor.close()
+            connection.close()
+
+        open_aggregates = _Aggregates(self.max_duration_samples)
+        for run in open_runs:
+            open_aggregates.add_run(run['run_mapref'], run['status'])
+        for row in open_logs:
+            open_aggregates.add_joblog_row(row)
+
+        with self._lock:
+            if full_rebuild:
+                self._folded = _Aggregates(self.max_duration_samples)
+                self._folded_prcids = {}
+                self._watermark = None
+                self._folded_joblogids = {}
+                self._orphan_watermark = None
+            new_prcids = set()
+            for run in finished_runs:
+                prcid = run['prcid']
+                if prcid in self._folded_prcids:
+                    continue
+                new_prcids.add(prcid)
+                self._folded_prcids[prcid] = run['enddt']
+                self._folded.add_run(run['run_mapref'], run['status'])
+                if run['enddt'] is not None and (self._watermark is None or run['enddt'] > self._watermark):
+                    self._watermark = run['enddt']
+            for row in finished_logs:
+                if row['prcid'] in new_prcids:
+                    self._folded.add_joblog_row(row)
+            for row in orphan_logs:
+                joblogid = row['joblogid']
+                if joblogid in self._folded_joblogids:
+                    continue
+                self._folded_joblogids[joblogid] = row['prcdt']
+                self._folded.add_joblog_row(row)
+                if row['prcdt'] is not None and (self._orphan_watermark is None or row['prcdt'] > self._orphan_watermark):
+                    self._orphan_watermark = row['prcdt']
+            self._prune_folded_prcids()
+
+            self._open = open_aggregates
+            self._config_rows = config_rows
+            if db_now is not None:
+                self._db_clock_offset = db_now - datetime.now()
+            now = time.monotonic()
+            self._last_refresh = now
+            if full_rebuild:
+                self._last_rebuild = now
+
+        message = (
+            f"[DashboardMetrics] {'Rebuilt' if full_rebuild else 'Refreshed'} in "
+            f"{time.monotonic() - started:.2f}s: {len(new_prcids)} new finished run(s), "
+            f"{len(open_runs)} open run(s)"
+        )
+        if full_rebuild:
+            info(message)
+        else:
+            debug(message)
+
+    def _since(self):
+        if self._watermark is None:
+            return None
+        return self._watermark - timedelta(seconds=self.overlap_seconds)
+
+    def _orphan_since(self):
+        if self._orphan_watermark is None:
+            return None
+        return self._orphan_watermark - timedelta(seconds=self.overlap_seconds)
+
+    def _prune_folded_prcids(self) -> None:
+        """Only runs and orphan DMS_JOBLOG rows inside the overlap window need de-duplication."""
+        since = self._since()
+        if since is not None:
+            self._folded_prcids = {
+                prcid: enddt for prcid, enddt in self._folded_prcids.items()
+                if enddt is None or enddt >= since
+            }
+        orphan_since = self._orphan_since()
+        if orphan_since is not None:
+            self._folded_joblogids = {
+                joblogid: prcdt for joblogid, prcdt in self._folded_joblogids.items()
+                if prcdt is None or prcdt >= orphan_since
+            }
+
+    @staticmethod
+    def _fetch_db_now(cursor, db_type: str):
+        try:
+            if db_type == "POSTGRESQL":
+                cursor.execute("SELECT LOCALTIMESTAMP")
+            else:
+                cursor.execute("SELECT SYSDATE FROM DUAL")
+            row = cursor.fetchone()
+            return row[0] if row and isinstance(row[0], datetime) else None
+        except Exception as exc:
+            debug(f"[DashboardMetrics] Could not read database clock: {exc}")
+            return None
+
+    @staticmethod
+    def _status_filter(db_type: str, since, finished: bool) -> Tuple[str, Any]:
+        status_list = ", ".join(f"'{status}'" for status in TERMINAL_STATUSES)
+        if not finished:
+            return f"(p.status IS NULL OR p.status NOT IN ({status_list}))", None
+        condition = f"p.status IN ({status_list})"
+        if since is None:
+            return condition, None
+        if db_type == "POSTGRESQL":
+            return f"{condition} AND p.enddt >= %s", (since,)
+        return f"{condition} AND p.enddt >= :since", {'since': since}
+
+    def _fetch_runs(self, cursor, db_type, prclog, since, finished: bool) -> List[Dict[str, Any]]:
+        condition, params = self._status_filter(db_type, since, finished)
+        query = f"""
+            SELECT p.prcid, p.mapref, p.status, p.enddt
+            FROM {prclog} p
+            WHERE {condition}
+        """
+        if params is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query, params)
+        return [
+            {'prcid': prcid, 'run_mapref': mapref, 'status': status, 'enddt': enddt}
+            for prcid, mapref, status, enddt in cursor.fetchall()
+        ]
+
+    def _fetch_joblog_rows(self, cursor, db_type, prclog, joblog, since, finished: bool) -> List[Dict[str, Any]]:
+        condition, params = self._status_filter(db_type, since, finished)
+        return self._query_joblog_rows(cursor, prclog, joblog, f"p.prcid IS NOT NULL AND {condition}", params)
+
+    def _fetch_orphan_joblog_rows(self, cursor, db_type, prclog, joblog, since) -> List[Dict[str, Any]]:
+        """DMS_JOBLOG rows without a DMS_PRCLOG run, from ``since`` on (PRCDT)."""
+        if since is None:
+            return self._query_joblog_rows(cursor, prclog, joblog, "p.prcid IS NULL", None)
+        if db_type == "POSTGRESQL":
+            return self._query_joblog_rows(cursor, prclog, joblog, "p.prcid IS NULL AND l.prcdt >= %s", (since,))
+        return self._query_joblog_rows(
+            cursor, prclog, joblog, "p.prcid IS NULL AND l.prcdt >= :since", {'since': since}
+        )
+
+    @staticmethod
+    def _query_joblog_rows(cursor, prclog, joblog, condition, params) -> List[Dict[str, Any]]:
+        query = f"""
+            SELECT l.joblogid, l.prcid, l.mapref, l.prcdt, l.srcrows, l.trgrows,
+                   l.sessionid, p.sessionid, p.mapref, p.strtdt, p.enddt
+            FROM {joblog} l
+            LEFT JOIN {prclog} p ON p.prcid = l.prcid
+            WHERE {condition}
+        """
+        if params is None:
+            cursor.execute(query)
+        else:
+            cursor.execute(query, params)
+        rows = []
+        for (joblogid, prcid, log_mapref, prcdt, srcrows, trgrows,
+             log_session, run_session, run_mapref, strtdt, enddt) in cursor.fetchall():
+            rows.append({
+                'joblogid': joblogid,
+                'prcid': prcid,
+                'log_mapref': log_mapref,
+                'run_mapref': run_mapref,
+                'prcdt': prcdt,
+                'srcrows': srcrows,
+                'trgrows': trgrows,
+                'session_match': run_session is not None and log_session == run_session,
+                'duration': _seconds_between(strtdt, enddt),
+            })
+        return rows
+
+    # ------------------------------------------------------------------
+    # Readers (return None when the store cannot answer)
+    # ------------------------------------------------------------------
+    def _db_now(self) -> datetime:
+        return datetime.now() + self._db_clock_offset
+
+    def all_metrics(self) -> Optional[List[Any]]:
+        if not self.is_warm:
+            return None
+        with self._lock:
+            return [list(row) for row in self._config_rows]
+
+    def jobs_overview(self) -> Optional[List[List[Any]]]:
+        if not self.is_warm:
+            return None
+        with self._lock:
+            maprefs = set(self._folded.by_log_mapref) | set(self._open.by_log_mapref)
+            rows = []
+            for mapref in sorted(maprefs, key=str):
+                stats = _merge_stats(self._folded.by_log_mapref.get(mapref), self._open.by_log_mapref.get(mapref))
+                if not stats.joblog_rows:
+                    continue
+                rows.append([
+                    mapref,
+                    stats.joblog_rows,
+                    stats.src_sum / stats.src_count if stats.src_count else None,
+                    float(math.ceil(stats.trg_sum / stats.trg_count)) if stats.trg_count else None,
+                    stats.dur_max,
+                    stats.dur_min,
+                ])
+            return rows
+
+    def jobs_processed_rows(self, mapref: str, period: str) -> Optional[List[List[Any]]]:
+        if not self.is_warm:
+            return None
+        period = (period or 'DAY').upper()
+        today = self._db_now().date()
+        days_back = {'DAY': 0, 'WEEK': 6, 'MONTH': 29}
+        start = None if period == 'ALL' else today - timedelta(days=days_back.get(period, 0))
+        with self._lock:
+            totals: Dict[date, List[float]] = {}
+            for source in (self._folded.daily.get(mapref, {}), self._open.daily.get(mapref, {})):
+                for day, (src, trg) in source.items():
+                    if start is not None and day < start:
+                        continue
+                    bucket = totals.setdefault(day, [0, 0])
+                    bucket[0] += src
+                    bucket[1] += trg
+        return [
+            [mapref, day.strftime('%Y-%m-%d'), src, trg]
+            for day, (src, trg) in sorted(totals.items())
+        ]
+
+    def jobs_executed_duration(self, mapref: str, period: str) -> Optional[List[List[Any]]]:
+        if not self.is_warm:
+            return None
+        cutoff = None
+        if (period or '').upper() != 'ALL':
+            try:
+                cutoff = self._db_now() - timedelta(days=float(period))
+            except (TypeError, ValueError):
+                return None
+        with self._lock:
+            trimmed = [
+                aggregates.trimmed_through[mapref] for aggregates in (self._folded, self._open)
+                if mapref in aggregates.trimmed_through
+            ]
+            entries = list(self._folded.durations.get(mapref, ())) + list(self._open.durations.get(mapref, ()))
+        # Runs older than the kept samples were dropped; the live query answers exactly
+        if trimmed and (cutoff is None or any(through is not None and cutoff <= through for through in trimmed)):
+            return None
+        if cutoff is not None:
+            entries = [entry for entry in entries if entry[0] is not None and entry[0] >= cutoff]
+        entries.sort(key=lambda entry: (entry[0] is None, entry[0] or datetime.min))
+        return [
+            [prcdt.isoformat() if hasattr(prcdt, 'isoformat') else prcdt, log_mapref, duration]
+            for prcdt, log_mapref, duration in entries
+        ]
+
+    def jobs_average_run_duration(self) -> Optional[List[List[Any]]]:
+        if not self.is_warm:
+            return None
+        with self._lock:
+            maprefs = set(self._folded.by_log_mapref) | set(self._open.by_log_mapref)
+            rows = []
+            for mapref in sorted(maprefs, key=str):
+                stats = _merge_stats(self._folded.by_log_mapref.get(mapref), self._open.by_log_mapref.get(mapref))
+                if not stats.joblog_rows:
+                    continue
+                rows.append([mapref, stats.dur_sum / stats.dur_count if stats.dur_count else None])
+            return rows
+
+    def jobs_successful_failed(self) -> Optional[List[List[Any]]]:
+        if not self.is_warm:
+            return None
+        with self._lock:
+            rows = []
+            for mapref in sorted(self._folded.by_run_mapref, key=str):
+                stats = self._folded.by_run_mapref[mapref]
+                if stats.succeeded or stats.failed:
+                    rows.append([mapref, stats.failed, stats.succeeded])
+            return rows
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Query
 from backend.database.dbconnect import create_metadata_connection
 from backend.modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name
+from backend.modules.dashboard.dashboard_metrics_store import DashboardMetricsStore
 import os
 import dotenv
 from decimal import Decimal
@@ -36,82 +37,100 @@ def process_rows(rows):
     return processed_rows
 
 
+def _query_all_metrics(connection, cursor):
+    """Mapping/job/flow/schedule counts behind /all_metrics"""
+    # Detect database type
+    db_type = _detect_db_type(connection)
+    schema = (os.getenv("DMS_SCHEMA", "")).strip()
+    
+    # Get table references for PostgreSQL (handles case sensitivity)
+    if db_type == "POSTGRESQL":
+        schema_lower = schema.lower() if schema else 'public'
+        dms_mapr_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_MAPR')
+        dms_job_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOB')
+        dms_jobflw_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOBFLW')
+        dms_jobsch_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOBSCH')
+        
+        # Quote table names if they contain uppercase letters
+        dms_mapr_ref = f'"{dms_mapr_table}"' if dms_mapr_table != dms_mapr_table.lower() else dms_mapr_table
+        dms_job_ref = f'"{dms_job_table}"' if dms_job_table != dms_job_table.lower() else dms_job_table
+        dms_jobflw_ref = f'"{dms_jobflw_table}"' if dms_jobflw_table != dms_jobflw_table.lower() else dms_jobflw_table
+        dms_jobsch_ref = f'"{dms_jobsch_table}"' if dms_jobsch_table != dms_jobsch_table.lower() else dms_jobsch_table
+        
+        schema_prefix = f'{schema_lower}.' if schema else ''
+        dms_mapr_full = f'{schema_prefix}{dms_mapr_ref}'
+        dms_job_full = f'{schema_prefix}{dms_job_ref}'
+        dms_jobflw_full = f'{schema_prefix}{dms_jobflw_ref}'
+        dms_jobsch_full = f'{schema_prefix}{dms_jobsch_ref}'
+        
+        # PostgreSQL: Use LEFT JOIN
+        query = f""" 
+            SELECT COUNT(m.mapref) AS total_mappings
+                  ,SUM(CASE WHEN m.lgvrfyflg = 'Y' THEN 1 ELSE 0 END) AS logic_verified
+                  ,SUM(CASE WHEN m.stflg = 'A' THEN 1 ELSE 0 END) AS active_mappings
+                  ,SUM(CASE WHEN j.mapref IS NOT NULL THEN 1 ELSE 0 END) AS total_jobs
+                  ,SUM(CASE WHEN j.stflg = 'A' THEN 1 ELSE 0 END) AS Active_jobs
+                  ,SUM(CASE WHEN f.mapref IS NOT NULL THEN 1 ELSE 0 END) AS job_flow_created
+                  ,SUM(CASE WHEN s.mapref IS NOT NULL THEN 1 ELSE 0 END) AS schedule_created
+            FROM {dms_mapr_full} m
+            LEFT JOIN {dms_job_full} j ON j.mapref = m.mapref AND j.curflg = m.curflg
+            LEFT JOIN {dms_jobflw_full} f ON f.mapref = j.mapref AND f.jobid = j.jobid AND f.curflg = 'Y'
+            LEFT JOIN {dms_jobsch_full} s ON s.jobflwid = f.jobflwid AND s.curflg = 'Y'
+            WHERE m.curflg = 'Y'
+        """
+    else:  # Oracle
+        schema_prefix = f"{schema}." if schema else ""
+        dms_mapr_full = f"{schema_prefix}DMS_MAPR"
+        dms_job_full = f"{schema_prefix}DMS_JOB"
+        dms_jobflw_full = f"{schema_prefix}DMS_JOBFLW"
+        dms_jobsch_full = f"{schema_prefix}DMS_JOBSCH"
+        
+        # Oracle: Use (+) outer join syntax
+        query = f""" 
+            SELECT COUNT(m.mapref) AS total_mappings
+                  ,SUM(CASE WHEN m.lgvrfyflg = 'Y' THEN 1 ELSE 0 END) AS logic_verified
+                  ,SUM(CASE WHEN m.stflg = 'A' THEN 1 ELSE 0 END) AS active_mappings
+                  ,SUM(CASE WHEN j.mapref IS NOT NULL THEN 1 ELSE 0 END) AS total_jobs
+                  ,SUM(CASE WHEN j.stflg = 'A' THEN 1 ELSE 0 END) AS Active_jobs
+                  ,SUM(CASE WHEN f.mapref IS NOT NULL THEN 1 ELSE 0 END) AS job_flow_created
+                  ,SUM(CASE WHEN s.mapref IS NOT NULL THEN 1 ELSE 0 END) AS schedule_created
+            FROM {dms_mapr_full} m, {dms_job_full} j, {dms_jobflw_full} f, {dms_jobsch_full} s
+            WHERE m.curflg = 'Y'
+            AND   j.mapref (+) = m.mapref
+            AND   j.curflg (+) = m.curflg
+            AND   f.mapref (+) = j.mapref
+            AND   f.jobid (+) = j.jobid
+            AND   f.curflg (+) = 'Y'
+            AND   s.jobflwid (+) = f.jobflwid
+            AND   s.curflg (+) = 'Y'
+        """
+
+    cursor.execute(query)
+    return cursor.fetchall()
+
+
+metrics_store = DashboardMetricsStore(config_loader=_query_all_metrics)
+
+
+def _precomputed(name, *args):
+    """Return rows from the metrics store, or None when it cannot answer yet."""
+    metrics_store.ensure_started()
+    rows = getattr(metrics_store, name)(*args)
+    return process_rows(rows) if rows is not None else None
+
+
 @router.get("/all_metrics")
 async def all_metrics():
     """Get all dashboard metrics"""
+    precomputed = _precomputed("all_metrics")
+    if precomputed is not None:
+        return precomputed
+
     connection = create_metadata_connection()
     cursor = connection.cursor()
     
     try:
-        # Detect database type
-        db_type = _detect_db_type(connection)
-        schema = (os.getenv("DMS_SCHEMA", "")).strip()
-        
-        # Get table references for PostgreSQL (handles case sensitivity)
-        if db_type == "POSTGRESQL":
-            schema_lower = schema.lower() if schema else 'public'
-            dms_mapr_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_MAPR')
-            dms_job_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOB')
-            dms_jobflw_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOBFLW')
-            dms_jobsch_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOBSCH')
-            
-            # Quote table names if they contain uppercase letters
-            dms_mapr_ref = f'"{dms_mapr_table}"' if dms_mapr_table != dms_mapr_table.lower() else dms_mapr_table
-            dms_job_ref = f'"{dms_job_table}"' if dms_job_table != dms_job_table.lower() else dms_job_table
-            dms_jobflw_ref = f'"{dms_jobflw_table}"' if dms_jobflw_table != dms_jobflw_table.lower() else dms_jobflw_table
-            dms_jobsch_ref = f'"{dms_jobsch_table}"' if dms_jobsch_table != dms_jobsch_table.lower() else dms_jobsch_table
-            
-            schema_prefix = f'{schema_lower}.' if schema else ''
-            dms_mapr_full = f'{schema_prefix}{dms_mapr_ref}'
-            dms_job_full = f'{schema_prefix}{dms_job_ref}'
-            dms_jobflw_full = f'{schema_prefix}{dms_jobflw_ref}'
-            dms_jobsch_full = f'{schema_prefix}{dms_jobsch_ref}'
-            
-            # PostgreSQL: Use LEFT JOIN
-            query = f""" 
-                SELECT COUNT(m.mapref) AS total_mappings
-                      ,SUM(CASE WHEN m.lgvrfyflg = 'Y' THEN 1 ELSE 0 END) AS logic_verified
-                      ,SUM(CASE WHEN m.stflg = 'A' THEN 1 ELSE 0 END) AS active_mappings
-                      ,SUM(CASE WHEN j.mapref IS NOT NULL THEN 1 ELSE 0 END) AS total_jobs
-                      ,SUM(CASE WHEN j.stflg = 'A' THEN 1 ELSE 0 END) AS Active_jobs
-                      ,SUM(CASE WHEN f.mapref IS NOT NULL THEN 1 ELSE 0 END) AS job_flow_created
-                      ,SUM(CASE WHEN s.mapref IS NOT NULL THEN 1 ELSE 0 END) AS schedule_created
-                FROM {dms_mapr_full} m
-                LEFT JOIN {dms_job_full} j ON j.mapref = m.mapref AND j.curflg = m.curflg
-                LEFT JOIN {dms_jobflw_full} f ON f.mapref = j.mapref AND f.jobid = j.jobid AND f.curflg = 'Y'
-                LEFT JOIN {dms_jobsch_full} s ON s.jobflwid = f.jobflwid AND s.curflg = 'Y'
-                WHERE m.curflg = 'Y'
-            """
-        else:  # Oracle
-            schema_prefix = f"{schema}." if schema else ""
-            dms_mapr_full = f"{schema_prefix}DMS_MAPR"
-            dms_job_full = f"{schema_prefix}DMS_JOB"
-            dms_jobflw_full = f"{schema_prefix}DMS_JOBFLW"
-            dms_jobsch_full = f"{schema_prefix}DMS_JOBSCH"
-            
-            # Oracle: Use (+) outer join syntax
-            query = f""" 
-                SELECT COUNT(m.mapref) AS total_mappings
-                      ,SUM(CASE WHEN m.lgvrfyflg = 'Y' THEN 1 ELSE 0 END) AS logic_verified
-                      ,SUM(CASE WHEN m.stflg = 'A' THEN 1 ELSE 0 END) AS active_mappings
-                      ,SUM(CASE WHEN j.mapref IS NOT NULL THEN 1 ELSE 0 END) AS total_jobs
-                      ,SUM(CASE WHEN j.stflg = 'A' THEN 1 ELSE 0 END) AS Active_jobs
-                      ,SUM(CASE WHEN f.mapref IS NOT NULL THEN 1 ELSE 0 END) AS job_flow_created
-                      ,SUM(CASE WHEN s.mapref IS NOT NULL THEN 1 ELSE 0 END) AS schedule_created
-                FROM {dms_mapr_full} m, {dms_job_full} j, {dms_jobflw_full} f, {dms_jobsch_full} s
-                WHERE m.curflg = 'Y'
-                AND   j.mapref (+) = m.mapref
-                AND   j.curflg (+) = m.curflg
-                AND   f.mapref (+) = j.mapref
-                AND   f.jobid (+) = j.jobid
-                AND   f.curflg (+) = 'Y'
-                AND   s.jobflwid (+) = f.jobflwid
-                AND   s.curflg (+) = 'Y'
-            """
-
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        return process_rows(rows)
+        return process_rows(_query_all_metrics(connection, cursor))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
@@ -122,6 +141,10 @@ async def all_metrics():
 @router.get("/jobs_overview")
 async def jobs_overview():
     """Get jobs overview metrics"""
+    precomputed = _precomputed("jobs_overview")
+    if precomputed is not None:
+        return precomputed
+
     connection = create_metadata_connection()
     cursor = connection.cursor()
     
@@ -199,6 +222,10 @@ async def jobs_processed_rows(
     period: str = Query("DAY", description="Period: DAY, WEEK, MONTH, or ALL")
 ):
     """Get processed rows for a specific job"""
+    precomputed = _precomputed("jobs_processed_rows", mapref, period)
+    if precomputed is not None:
+        return precomputed
+
     connection = create_metadata_connection()
     cursor = connection.cursor()
     
@@ -319,6 +346,10 @@ async def jobs_executed_duration(
     period: str = Query("7", description="Period in days or 'ALL'")
 ):
     """Get executed duration for a specific job"""
+    precomputed = _precomputed("jobs_executed_duration", mapref, period)
+    if precomputed is not None:
+        return precomputed
+
     connection = create_metadata_connection()
     cursor = connection.cursor()
     
@@ -425,6 +456,10 @@ async def jobs_executed_duration(
 @router.get("/jobs_average_run_duration")
 async def jobs_average_run_duration():
     """Get average run duration for all jobs"""
+    precomputed = _precomputed("jobs_average_run_duration")
+    if precomputed is not None:
+        return precomputed
+
     connection = create_metadata_connection()
     cursor = connection.cursor()
     
@@ -491,6 +526,10 @@ async def jobs_average_run_duration():
 @router.get("/jobs_successful_failed")
 async def jobs_successful_failed():
     """Get successful and failed job counts"""
+    precomputed = _precomputed("jobs_successful_failed")
+    if precomputed is not None:
+        return precomputed
+
     connection = create_metadata_connection()
     cursor = connection.cursor()
     
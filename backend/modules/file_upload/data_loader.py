@@ -2,11 +2,14 @@
 Data Loader Service for File Upload Module
 Handles data loading with different strategies: INSERT, TRUNCATE_LOAD, UPSERT.
 """
+import time
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, date
+from backend.modules.common.adaptive_batch import BatchSizeController
 from backend.modules.common.db_table_utils import _detect_db_type
+from backend.modules.common.error_sink import error_sink_max_rows
 from backend.modules.file_upload.table_creator import _quote_identifier
 from backend.modules.logger import info, error, warning, debug
 
@@ -31,7 +34,8 @@ def load_data(
     column_mappings: List[Dict[str, Any]],
     load_mode: str = LoadMode.INSERT,
     batch_size: int = 1000,
-    username: Optional[str] = None
+    username: Optional[str] = None,
+    batch_sizer: Optional[BatchSizeController] = None
 ) -> Dict[str, Any]:
     """
     Load data into target table with specified load mode.
@@ -45,6 +49,8 @@ def load_data(
         load_mode: Load mode (INSERT, TRUNCATE_LOAD, UPSERT)
         batch_size: Number of rows per batch
         username: Username for audit columns
+        batch_sizer: Optional adaptive controller; when given, each batch uses its
+            current size and reports its write time (batch_size is ignored)
         
     Returns:
         Dictionary with execution results:
@@ -130,20 +136,23 @@ def load_data(
         
         # Process in batches
         total_rows = len(dataframe)
-        num_batches = (total_rows + batch_size - 1) // batch_size
         
         all_rows_successful = 0
         all_rows_failed = 0
         all_errors = []
+        error_cap = error_sink_max_rows()
         
-        for batch_num in range(num_batches):
-            start_idx = batch_num * batch_size
-            end_idx = min(start_idx + batch_size, total_rows)
+        batch_num = 0
+        start_idx = 0
+        while start_idx < total_rows:
+            current_batch_size = batch_sizer.size if batch_sizer is not None else batch_size
+            end_idx = min(start_idx + current_batch_size, total_rows)
+            batch_started = time.perf_counter()
             batch_df = dataframe.iloc[start_idx:end_idx].copy()
             
-            debug(f"Processing batch {batch_num + 1}/{num_batches} (rows {start_idx + 1}-{end_idx})")
-            debug(f"[load_data] Batch DataFrame shape: {batch_df.shape}")
-            debug(f"[load_data] Batch DataFrame columns: {list(batch_df.columns)}")
+            debug("Processing batch %s (rows %s-%s of %s)", batch_num + 1, start_idx + 1, end_idx, total_rows)
+            debug("[load_data] Batch DataFrame shape: %s", batch_df.shape)
+            debug(lambda: f"[load_data] Batch DataFrame columns: {list(batch_df.columns)}")
             if len(batch_df) > 0 and 'COD_ACCT_NO' in batch_df.columns:
                 info(f"[load_data] Batch COD_ACCT_NO first value: '{batch_df.iloc[0]['COD_ACCT_NO']}'")
             
@@ -160,7 +169,13 @@ def load_data(
             
             all_rows_successful += result['rows_successful']
             all_rows_failed += result['rows_failed']
-            all_errors.extend(result['errors'])
+            # Only the first ERROR_SINK_MAX_ROWS payloads are kept; the failed-row counts cover all
+            all_errors.extend(result['errors'][:error_cap - len(all_errors)] if error_cap else result['errors'])
+            
+            if batch_sizer is not None:
+                batch_sizer.record(end_idx - start_idx, write_seconds=time.perf_counter() - batch_started)
+            batch_num += 1
+            start_idx = end_idx
         
         connection.commit()
         
@@ -290,7 +305,7 @@ def _insert_batch(
         placeholders = ", ".join(["?"] * len(target_columns))
     
     insert_sql = f"INSERT INTO {table_ref} ({columns_str}) VALUES ({placeholders})"
-    debug(f"[_insert_batch] INSERT SQL: {insert_sql}")
+    debug("[_insert_batch] INSERT SQL: %s", insert_sql)
     
     rows_successful = 0
     rows_failed = 0
@@ -528,7 +543,7 @@ def _insert_batch(
                 'error_message': str(e)
             }
             errors.append(error_record)
-            warning(f"Error inserting row {row_idx}: {str(e)}")
+            warning("Error inserting row %s: %s", row_idx, e, rate_key="file_upload.insert_row_error")
     
     return {
         'rows_successful': rows_successful,
@@ -691,7 +706,7 @@ def _upsert_batch(
                 'error_message': str(e)
             }
             errors.append(error_record)
-            warning(f"Error upserting row {row_idx}: {str(e)}")
+            warning("Error upserting row %s: %s", row_idx, e, rate_key="file_upload.upsert_row_error")
     
     return {
         'rows_successful': rows_successful,
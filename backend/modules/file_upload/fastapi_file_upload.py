@@ -3,7 +3,6 @@ FastAPI Router for File Upload Module
 Provides endpoints for file upload, configuration, and data loading.
 """
 import os
-import tempfile
 import pandas as pd
 from typing import List, Dict, Any, Optional
 from pathlib import Path
@@ -31,6 +30,7 @@ from .file_upload_service import (
 )
 from .file_upload_executor import FileUploadExecutor, LoadMode, get_file_upload_config
 from .table_creator import _check_table_exists
+from .upload_spool import UploadTooLargeError, head_preview_file, spool_upload
 
 router = APIRouter(tags=["file_upload"])
 
@@ -41,6 +41,11 @@ parser_manager = FileParserManager()
 UPLOAD_DIR = os.path.join("data", "file_uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# File types previewed from the head of the file instead of a full parse
+LINE_ORIENTED_FILE_TYPES = {'CSV', 'TSV'}
+# Non line-oriented files up to this size also get full-file statistics (row count)
+FULL_FILE_INFO_MAX_BYTES = 1024 * 1024 * 50
+
 
 # ===== Pydantic Models =====
 
@@ -102,9 +107,10 @@ async def upload_file(
     """
     Upload and parse a file (CSV, Excel, JSON, etc.).
     Returns file information, columns, and preview data.
-    Optimized to only read first few rows for preview without saving entire file.
+    The upload is streamed to disk in chunks (with SHA-256 and size limit checked
+    on the way), and preview/column detection only reads the head of the stored file.
     """
-    temp_file_path = None
+    stored = None
     try:
         # Validate file
         if not file.filename:
@@ -114,104 +120,16 @@ async def upload_file(
         preview_rows = max(1, min(200, int(preview_rows)))  # Clamp between 1 and 200
         
         file_ext = Path(file.filename).suffix.lower()
-        file_type = parser_manager.detect_file_type(file.filename)
-        
-        # Optimize based on file type:
-        # - CSV: Read only enough bytes to get first N rows (much faster)
-        # - Excel/JSON: May need more structure, but limit to reasonable size for preview
-        if file_type == 'CSV':
-            # For CSV, read only enough to get first N rows
-            # Estimate: average row is ~200-500 bytes, read preview_rows * 1000 bytes per row for safety
-            estimated_bytes_per_row = 1000
-            max_bytes = min(preview_rows * estimated_bytes_per_row, 1024 * 1024 * 2)  # Max 2MB for preview (increased for 200 rows)
-            
-            # Read chunks until we have enough rows or hit max bytes
-            preview_data = b''
-            total_read = 0
-            target_rows = preview_rows + 1  # +1 for header
-            
-            # Reset file pointer to start (if possible)
-            try:
-                await file.seek(0)
-            except Exception:
-                # If seek fails, file might be a stream - that's okay, we'll read from current position
-                pass
-            
-            chunk_size = 16384  # 16KB chunks for better performance
-            while total_read < max_bytes:
-                chunk = await file.read(chunk_size)
-                if not chunk:
-                    break
-                preview_data += chunk
-                total_read += len(chunk)
-                
-                # Count complete rows (handle both \n and \r\n)
-                # Count \r\n as single line breaks, standalone \n as line breaks
-                text_preview = preview_data.decode('utf-8', errors='ignore')
-                # Count lines more accurately
-                line_count = text_preview.count('\n')
-                if '\r\n' in text_preview:
-                    # Adjust for Windows line endings - \r\n counts as one line break
-                    line_count = text_preview.count('\r\n') + (text_preview.count('\n') - text_preview.count('\r\n'))
-                
-                # Stop if we have enough rows
-                if line_count >= target_rows:
-                    break
-            
-            # Create a temporary file with just the preview portion
-            with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=file_ext, dir=UPLOAD_DIR) as temp_file:
-                temp_file.write(preview_data)
-                temp_file_path = temp_file.name
-            
-            info(f"CSV preview optimized: Read only {total_read:,} bytes for {preview_rows} rows preview of {file.filename}")
-        elif file_type in ['EXCEL', 'XLSX', 'XLS']:
-            # For Excel files, we need to read enough to parse the structure
-            # But we can limit to first 5MB which should be enough for header + preview_rows
-            max_bytes_for_preview = 1024 * 1024 * 5  # 5MB max
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext, dir=UPLOAD_DIR) as temp_file:
-                chunk_size = 8192
-                bytes_written = 0
-                await file.seek(0)
-                
-                while bytes_written < max_bytes_for_preview:
-                    chunk = await file.read(chunk_size)
-                    if not chunk:
-                        break
-                    temp_file.write(chunk)
-                    bytes_written += len(chunk)
-                
-                temp_file_path = temp_file.name
-            
-            info(f"Excel preview optimized: Read {bytes_written} bytes for preview of {file.filename}")
-        else:
-            # For other formats (JSON, Parquet, etc.), we need to be more careful
-            # JSON files must be complete to parse, so we read the full file
-            # but the parser will limit the data it processes
-            # For very large files, we'll still limit the read to prevent memory issues
-            max_bytes_for_preview = 1024 * 1024 * 50  # 50MB max for JSON/Parquet (increased from 5MB)
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext, dir=UPLOAD_DIR) as temp_file:
-                chunk_size = 8192
-                bytes_written = 0
-                await file.seek(0)
-                
-                while bytes_written < max_bytes_for_preview:
-                    chunk = await file.read(chunk_size)
-                    if not chunk:
-                        break
-                    temp_file.write(chunk)
-                    bytes_written += len(chunk)
-                
-                temp_file_path = temp_file.name
-            
-            info(f"File preview: Read {bytes_written} bytes for preview of {file.filename}")
         
-        # Get file info (lightweight operation - just file stats)
-        file_info = parser_manager.get_file_info(temp_file_path)
+        try:
+            stored = await spool_upload(file, UPLOAD_DIR, suffix=file_ext)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        
+        info(f"Stored upload {file.filename}: {stored.size_bytes:,} bytes (sha256 {stored.sha256[:12]})")
         
-        # Get columns and preview in one efficient operation
-        # preview_file already only reads the first N rows, so this is optimized
         try:
-            preview_df = parser_manager.preview_file(temp_file_path, rows=preview_rows)
+            file_info, preview_df = _preview_stored_file(stored.path, preview_rows)
             columns = list(preview_df.columns)
             preview = preview_df.to_dict('records')
         except (MemoryError, ValueError) as e:
@@ -236,18 +154,25 @@ async def upload_file(
                 else:
                     row[key] = str(value)
         
-        return FileUploadResponse(
+        response = FileUploadResponse(
             success=True,
             message=f"File uploaded and parsed successfully: {file.filename}",
             file_info={
                 **file_info,
                 "original_filename": file.filename,
-                "saved_path": temp_file_path
+                "saved_path": stored.path,
+                "size_bytes": stored.size_bytes,
+                "sha256": stored.sha256,
             },
             columns=columns,
             preview=preview
         )
+        # The stored file is kept - it becomes flpth when the configuration is saved
+        stored = None
+        return response
     
+    except HTTPException:
+        raise
     except ValueError as e:
         error(f"File parsing error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -255,9 +180,40 @@ async def upload_file(
         error(f"Error uploading file: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error uploading file: {str(e)}")
     finally:
-        # Note: We keep the file for now - it will be used when saving configuration
-        # In production, you might want to clean up old files periodically
-        pass
+        # An upload that could not be previewed is never referenced again
+        if stored is not None:
+            try:
+                os.remove(stored.path)
+            except OSError:
+                pass
+
+
+def _preview_stored_file(file_path: str, preview_rows: int):
+    """
+    Return (file_info, preview DataFrame) for a stored file without parsing all of it.
+    Line-oriented files are previewed from a memory-mapped head slice; other formats
+    need their full structure, so the parser reads the stored file directly and the
+    full-file statistics are only computed for files small enough to parse.
+    """
+    file_type = parser_manager.detect_file_type(file_path)
+    if file_type in LINE_ORIENTED_FILE_TYPES:
+        with head_preview_file(file_path, max_lines=preview_rows + 1) as head_path:
+            file_info = parser_manager.get_file_info(head_path)
+            file_info["file_path"] = file_path
+            preview_df = parser_manager.preview_file(head_path, rows=preview_rows)
+        return file_info, preview_df
+
+    preview_df = parser_manager.preview_file(file_path, rows=preview_rows)
+    if os.path.getsize(file_path) <= FULL_FILE_INFO_MAX_BYTES:
+        file_info = parser_manager.get_file_info(file_path)
+    else:
+        file_info = {
+            "column_count": len(preview_df.columns),
+            "columns": list(preview_df.columns),
+            "file_path": file_path,
+            "file_type": file_type,
+        }
+    return file_info, preview_df
 
 
 @router.get("/get-all-uploads")
@@ -472,7 +428,11 @@ async def preview_file(
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail=f"File not found: {file_path}")
         
-        preview_df = parser_manager.preview_file(file_path, rows=rows)
+        if parser_manager.detect_file_type(file_path) in LINE_ORIENTED_FILE_TYPES:
+            with head_preview_file(file_path, max_lines=rows + 1) as head_path:
+                preview_df = parser_manager.preview_file(head_path, rows=rows)
+        else:
+            preview_df = parser_manager.preview_file(file_path, rows=rows)
         preview = preview_df.to_dict('records')
         
         # Convert preview values to strings for JSON serialization
@@ -10,7 +10,9 @@ from datetime import datetime
 import pandas as pd
 
 from backend.database.dbconnect import create_metadata_connection, create_target_connection
+from backend.modules.common.adaptive_batch import batch_size_controller
 from backend.modules.common.db_table_utils import _detect_db_type
+from backend.modules.common.error_sink import ErrorSink, error_code
 from backend.modules.logger import info, error, warning
 
 from .file_upload_service import get_file_upload_details
@@ -134,6 +136,12 @@ class FileUploadExecutor:
                 batch_size = 1000
                 warning(f"Batch size capped at 1000 for Oracle database")
             
+            # Optional adaptive sizing within the same bounds (batch_size is the start)
+            batch_sizer = batch_size_controller(
+                f"file upload {flupldref} inserts", batch_size,
+                min_size=100, max_size=1000 if target_db_type == "ORACLE" else 100000
+            )
+            
             # Step 10: Load data
             info(f"Loading data using mode: {load_mode}, batch size: {batch_size}")
             load_result = load_data(
@@ -144,8 +152,11 @@ class FileUploadExecutor:
                 column_mappings,
                 load_mode=load_mode,
                 batch_size=batch_size,
-                username=username
+                username=username,
+                batch_sizer=batch_sizer
             )
+            if batch_sizer is not None:
+                batch_sizer.log_summary()
 
             # Step 11: Record execution history & error rows in metadata DB
             try:
@@ -547,36 +558,31 @@ class FileUploadExecutor:
                             VALUES (%s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
                         """
 
+                def _write_error_rows(rows: List[Dict[str, Any]]) -> None:
+                    # One array-bound insert per flush
+                    if db_type == "ORACLE":
+                        cursor.executemany(insert_sql, [list(row["params"]) for row in rows])
+                    else:
+                        cursor.executemany(insert_sql, [row["params"] for row in rows])
+
+                # Written in the DMS_FLUPLD_RUN transaction, so a failed write rolls both back
+                error_sink = ErrorSink(_write_error_rows, name=f"DMS_FLUPLD_ERR {flupldref}", raise_errors=True)
                 for err in errors:
                     row_index = int(err.get("row_index", -1))
                     row_data = err.get("row_data") or {}
                     row_json = json.dumps(row_data, default=str)
                     full_message = str(err.get("error_message") or "")
-                    m = re.search(r"([A-Z]+-\d+)", full_message)
-                    error_code = m.group(1) if m else None
-
-                    if db_type == "ORACLE":
-                        params = [
-                            flupldref,
-                            runid,
-                            row_index,
-                            row_json,
-                            error_code,
-                            full_message,
-                            username or "SYSTEM",
-                        ]
-                    else:
-                        params = (
-                            flupldref,
-                            runid,
-                            row_index,
-                            row_json,
-                            error_code,
-                            full_message,
-                            username or "SYSTEM",
-                        )
-
-                    cursor.execute(insert_sql, params)
+                    code = error_code(full_message)
+                    error_sink.add(code, {"params": (
+                        flupldref,
+                        runid,
+                        row_index,
+                        row_json,
+                        code,
+                        full_message,
+                        username or "SYSTEM",
+                    )})
+                error_sink.close()
 
             except Exception as e:
                 error(f"Error inserting into DMS_FLUPLD_ERR: {str(e)}", exc_info=True)
@@ -11,8 +11,10 @@ from datetime import datetime
 import pandas as pd
 
 from backend.database.dbconnect import create_metadata_connection, create_target_connection
+from backend.modules.common.adaptive_batch import BatchSizeController, BatchTimer, batch_size_controller
 from backend.modules.common.db_table_utils import _detect_db_type
-from backend.modules.logger import info, error, warning
+from backend.modules.common.error_sink import error_sink_max_rows
+from backend.modules.logger import info, error, warning, debug
 
 from .file_upload_service import get_file_upload_details
 from .file_parser import FileParserManager
@@ -169,132 +171,67 @@ class StreamingFileExecutor:
             total_rows_successful = 0
             total_rows_failed = 0
             all_errors = []
+            error_cap = error_sink_max_rows()
             chunk_number = 0
             is_first_chunk = True
             
-            # Use chunked reading if parser supports it (CSV)
-            if file_type.upper() == 'CSV' and hasattr(parser, 'parse_chunked'):
-                # Stream CSV in chunks
-                for chunk_df in parser.parse_chunked(file_path, parse_options, chunk_size=self.chunk_size):
-                    chunk_number += 1
-                    info(f"[Streaming] Processing chunk {chunk_number} ({len(chunk_df)} rows)")
-                    
-                    # Transform chunk
-                    transformed_chunk = self._transform_data(chunk_df, column_mappings)
-                    
-                    # Load chunk to database
-                    chunk_result = load_data(
-                        target_conn,
-                        trgschm,
-                        trgtblnm,
-                        transformed_chunk,
-                        column_mappings,
-                        load_mode=LoadMode.INSERT if not is_first_chunk else load_mode,  # Only truncate on first chunk
-                        batch_size=batch_size,
-                        username=username
-                    )
-                    
-                    total_rows_processed += chunk_result['rows_processed']
-                    total_rows_successful += chunk_result['rows_successful']
-                    total_rows_failed += chunk_result['rows_failed']
-                    all_errors.extend(chunk_result['errors'])
-                    
-                    is_first_chunk = False
-                    
-                    # Log progress
-                    info(f"[Streaming] Chunk {chunk_number} complete: {chunk_result['rows_successful']} successful, {chunk_result['rows_failed']} failed")
-                    
-                    # Release memory
-                    del chunk_df
-                    del transformed_chunk
-            else:
-                # For non-CSV or parsers without chunked support, use iterator approach
-                # Parse file and process in chunks using pandas chunking
-                if file_type.upper() == 'CSV':
-                    # Use pandas read_csv with chunksize
-                    chunk_iterator = pd.read_csv(
-                        file_path,
-                        chunksize=self.chunk_size,
-                        skiprows=hdrrwcnt,
-                        engine='python'  # More compatible engine
-                    )
-                    
-                    for chunk_df in chunk_iterator:
-                        chunk_number += 1
-                        info(f"[Streaming] Processing chunk {chunk_number} ({len(chunk_df)} rows)")
-                        
-                        # Transform chunk
-                        transformed_chunk = self._transform_data(chunk_df, column_mappings)
-                        
-                        # Load chunk to database
-                        chunk_result = load_data(
-                            target_conn,
-                            trgschm,
-                            trgtblnm,
-                            transformed_chunk,
-                            column_mappings,
-                            load_mode=LoadMode.INSERT if not is_first_chunk else load_mode,
-                            batch_size=batch_size,
-                            username=username
-                        )
-                        
-                        total_rows_processed += chunk_result['rows_processed']
-                        total_rows_successful += chunk_result['rows_successful']
-                        total_rows_failed += chunk_result['rows_failed']
-                        all_errors.extend(chunk_result['errors'])
-                        
-                        is_first_chunk = False
-                        
-                        info(f"[Streaming] Chunk {chunk_number} complete: {chunk_result['rows_successful']} successful, {chunk_result['rows_failed']} failed")
-                        
-                        # Release memory
-                        del chunk_df
-                        del transformed_chunk
-                else:
-                    # For Excel, JSON, etc., fall back to full parse but warn
-                    warning(f"[Streaming] File type {file_type} doesn't support chunked parsing, using full parse (may use more memory)")
-                    dataframe = self.parser_manager.parse_file(file_path, parse_options)
-                    info(f"[Streaming] Parsed {len(dataframe)} rows from file")
-                    
-                    # Process in chunks from full DataFrame
-                    total_rows = len(dataframe)
-                    num_chunks = (total_rows + self.chunk_size - 1) // self.chunk_size
-                    
-                    for chunk_num in range(num_chunks):
-                        chunk_number += 1
-                        start_idx = chunk_num * self.chunk_size
-                        end_idx = min(start_idx + self.chunk_size, total_rows)
-                        chunk_df = dataframe.iloc[start_idx:end_idx].copy()
-                        
-                        info(f"[Streaming] Processing chunk {chunk_number}/{num_chunks} (rows {start_idx + 1}-{end_idx})")
-                        
-                        # Transform chunk
-                        transformed_chunk = self._transform_data(chunk_df, column_mappings)
-                        
-                        # Load chunk to database
-                        chunk_result = load_data(
-                            target_conn,
-                            trgschm,
-                            trgtblnm,
-                            transformed_chunk,
-                            column_mappings,
-                            load_mode=LoadMode.INSERT if not is_first_chunk else load_mode,
-                            batch_size=batch_size,
-                            username=username
-                        )
-                        
-                        total_rows_processed += chunk_result['rows_processed']
-                        total_rows_successful += chunk_result['rows_successful']
-                        total_rows_failed += chunk_result['rows_failed']
-                        all_errors.extend(chunk_result['errors'])
-                        
-                        is_first_chunk = False
-                        
-                        info(f"[Streaming] Chunk {chunk_number} complete: {chunk_result['rows_successful']} successful, {chunk_result['rows_failed']} failed")
-                        
-                        # Release memory
-                        del chunk_df
-                        del transformed_chunk
+            # Optional adaptive sizing: chunk_size and batch_size are the starting
+            # sizes, later chunks/batches are sized from measured time and memory
+            chunk_sizer = batch_size_controller(f"file upload {flupldref} chunks", self.chunk_size)
+            batch_sizer = batch_size_controller(
+                f"file upload {flupldref} inserts", batch_size,
+                min_size=100, max_size=1000 if target_db_type == "ORACLE" else 100000
+            )
+            
+            chunks = self._iter_file_chunks(parser, file_path, file_type, parse_options, hdrrwcnt, chunk_sizer)
+            while True:
+                chunk_timer = BatchTimer()
+                chunk_df = next(chunks, None)
+                if chunk_df is None:
+                    break
+                chunk_timer.fetch = chunk_timer.lap()
+                chunk_number += 1
+                info(f"[Streaming] Processing chunk {chunk_number} ({len(chunk_df)} rows)")
+                
+                # Transform chunk
+                transformed_chunk = self._transform_data(chunk_df, column_mappings)
+                chunk_timer.transform = chunk_timer.lap()
+                
+                # Load chunk to database
+                chunk_result = load_data(
+                    target_conn,
+                    trgschm,
+                    trgtblnm,
+                    transformed_chunk,
+                    column_mappings,
+                    load_mode=LoadMode.INSERT if not is_first_chunk else load_mode,  # Only truncate on first chunk
+                    batch_size=batch_size,
+                    username=username,
+                    batch_sizer=batch_sizer
+                )
+                chunk_timer.write = chunk_timer.lap()
+                
+                total_rows_processed += chunk_result['rows_processed']
+                total_rows_successful += chunk_result['rows_successful']
+                total_rows_failed += chunk_result['rows_failed']
+                # Only the first ERROR_SINK_MAX_ROWS payloads are kept; the failed-row counts cover all
+                all_errors.extend(chunk_result['errors'][:error_cap - len(all_errors)] if error_cap else chunk_result['errors'])
+                
+                is_first_chunk = False
+                
+                # Log progress
+                info(f"[Streaming] Chunk {chunk_number} complete: {chunk_result['rows_successful']} successful, {chunk_result['rows_failed']} failed")
+                
+                if chunk_sizer is not None:
+                    chunk_sizer.record(len(chunk_df), chunk_timer.fetch, chunk_timer.transform, chunk_timer.write)
+                
+                # Release memory
+                del chunk_df
+                del transformed_chunk
+            
+            for sizer in (chunk_sizer, batch_sizer):
+                if sizer is not None:
+                    sizer.log_summary()
             
             # Step 10: Record execution history & errors
             try:
@@ -356,6 +293,56 @@ class StreamingFileExecutor:
                 except:
                     pass
     
+    def _iter_file_chunks(
+        self,
+        parser,
+        file_path: str,
+        file_type: str,
+        parse_options: Dict[str, Any],
+        hdrrwcnt: int,
+        chunk_sizer: Optional[BatchSizeController] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield the file as DataFrame chunks. The size of each chunk is read when
+        it is requested, so an adaptive chunk_sizer takes effect on the next chunk.
+        """
+        def next_size() -> int:
+            return chunk_sizer.size if chunk_sizer is not None else self.chunk_size
+        
+        # Use chunked reading if parser supports it (CSV)
+        if file_type.upper() == 'CSV' and hasattr(parser, 'parse_chunked'):
+            yield from parser.parse_chunked(file_path, parse_options, chunk_size=self.chunk_size)
+        elif file_type.upper() == 'CSV':
+            # Use pandas read_csv with chunksize; get_chunk() takes a size per call
+            reader = pd.read_csv(
+                file_path,
+                chunksize=self.chunk_size,
+                skiprows=hdrrwcnt,
+                engine='python'  # More compatible engine
+            )
+            try:
+                while True:
+                    try:
+                        yield reader.get_chunk(next_size())
+                    except StopIteration:
+                        return
+            finally:
+                reader.close()
+        else:
+            # For Excel, JSON, etc., fall back to full parse but warn
+            warning(f"[Streaming] File type {file_type} doesn't support chunked parsing, using full parse (may use more memory)")
+            dataframe = self.parser_manager.parse_file(file_path, parse_options)
+            info(f"[Streaming] Parsed {len(dataframe)} rows from file")
+            
+            # Process in chunks from full DataFrame
+            total_rows = len(dataframe)
+            start_idx = 0
+            while start_idx < total_rows:
+                end_idx = min(start_idx + next_size(), total_rows)
+                debug(f"[Streaming] Chunk rows {start_idx + 1}-{end_idx} of {total_rows}")
+                yield dataframe.iloc[start_idx:end_idx].copy()
+                start_idx = end_idx
+    
     def _transform_data(
         self,
         dataframe: pd.DataFrame,
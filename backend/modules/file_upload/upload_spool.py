@@ -0,0 +1,138 @@
+"""
+Upload Spooling
+Streams uploaded files straight to disk with an incremental checksum and size
+limit, and serves preview/column detection from memory-mapped head reads so
+multi-GB uploads never have to be held in worker memory.
+"""
+import hashlib
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.common.env_config import env_int
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.env_config import env_int  # type: ignore
+
+
+# Largest accepted upload in bytes (0 disables the limit)
+MAX_UPLOAD_BYTES = max(0, env_int("FILE_UPLOAD_MAX_BYTES", 10 * 1024 * 1024 * 1024))
+# Size of each read from the request body while spooling
+UPLOAD_CHUNK_BYTES = max(64 * 1024, env_int("FILE_UPLOAD_CHUNK_BYTES", 1024 * 1024))
+# Largest head slice used for previewing line-oriented files
+PREVIEW_HEAD_MAX_BYTES = 2 * 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured size limit."""
+
+    def __init__(self, limit_bytes: int):
+        super().__init__(f"File exceeds the maximum upload size of {limit_bytes:,} bytes")
+        self.limit_bytes = limit_bytes
+
+
+@dataclass
+class SpooledUpload:
+    """A fully received upload stored on disk."""
+    path: str
+    size_bytes: int
+    sha256: str
+
+
+async def spool_upload(
+    upload,
+    dest_dir: str,
+    suffix: str = "",
+    max_bytes: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> SpooledUpload:
+    """
+    Stream ``upload`` (anything with an async ``read(size)``, e.g. FastAPI's
+    UploadFile) into a new file in ``dest_dir``.
+
+    The SHA-256 and size are computed while writing, so the stored file never
+    has to be read back. A partial file is removed if the limit is exceeded
+    or the stream fails.
+    """
+    limit = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    chunk_size = chunk_size or UPLOAD_CHUNK_BYTES
+    digest = hashlib.sha256()
+    size_bytes = 0
+
+    os.makedirs(dest_dir, exist_ok=True)
+    temp_file = tempfile.NamedTemporaryFile(mode="wb", delete=False, suffix=suffix, dir=dest_dir)
+    try:
+        with temp_file:
+            try:
+                await upload.seek(0)
+            except Exception:
+                # Non-seekable streams are read from their current position
+                pass
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                size_bytes += len(chunk)
+                if limit and size_bytes > limit:
+                    raise UploadTooLargeError(limit)
+                digest.update(chunk)
+                temp_file.write(chunk)
+    except BaseException:
+        _remove_quietly(temp_file.name)
+        raise
+
+    return SpooledUpload(path=temp_file.name, size_bytes=size_bytes, sha256=digest.hexdigest())
+
+
+def read_head(file_path: str, max_lines: Optional[int] = None, max_bytes: int = PREVIEW_HEAD_MAX_BYTES) -> bytes:
+    """
+    Return the first ``max_lines`` lines (or ``max_bytes``, whichever is
+    shorter) of a file through a memory map, without reading the rest.
+    """
+    with open(file_path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b""
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            end = min(len(mapped), max_bytes)
+            if max_lines is not None:
+                position = 0
+                for _ in range(max_lines):
+                    newline = mapped.find(b"\n", position, end)
+                    if newline < 0:
+                        # Hit the byte cap mid-line: drop the partial line
+                        if end < len(mapped) and position:
+                            end = position
+                        break
+                    position = newline + 1
+                else:
+                    end = position
+            return mapped[:end]
+
+
+@contextmanager
+def head_preview_file(file_path: str, max_lines: Optional[int] = None, max_bytes: int = PREVIEW_HEAD_MAX_BYTES) -> Iterator[str]:
+    """
+    Yield the path of a temporary copy of the file's head so path-based
+    parsers can preview/detect columns of a large file cheaply.
+    """
+    suffix = os.path.splitext(file_path)[1]
+    head = read_head(file_path, max_lines=max_lines, max_bytes=max_bytes)
+    with tempfile.NamedTemporaryFile(
+        mode="wb", delete=False, suffix=suffix, dir=os.path.dirname(os.path.abspath(file_path))
+    ) as temp_file:
+        temp_file.write(head)
+    try:
+        yield temp_file.name
+    finally:
+        _remove_quietly(temp_file.name)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
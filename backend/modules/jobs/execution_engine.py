@@ -24,6 +24,13 @@ try:
         SchedulerRepositoryError,
     )
     from backend.modules.jobs.scheduler_models import QueueRequest
+    from backend.modules.jobs.history_backfill import (
+        BACKFILL_PARALLEL,
+        BackfillProgress,
+        HistorySlice,
+        JobFlowSession,
+        plan_history_backfill,
+    )
     from backend.modules.common.db_adapter import get_db_adapter
 except ImportError:  # When running Flask app.py directly inside backend
     from modules.common.db_table_utils import (  # type: ignore
@@ -38,6 +45,13 @@ except ImportError:  # When running Flask app.py directly inside backend
         SchedulerRepositoryError,
     )
     from modules.jobs.scheduler_models import QueueRequest  # type: ignore
+    from modules.jobs.history_backfill import (  # type: ignore
+        BACKFILL_PARALLEL,
+        BackfillProgress,
+        HistorySlice,
+        JobFlowSession,
+        plan_history_backfill,
+    )
     from modules.common.db_adapter import get_db_adapter  # type: ignore
 
 
@@ -82,7 +96,17 @@ class JobExecutionEngine:
     # ------------------------------------------------------------------ #
     # Job flow execution
     # ------------------------------------------------------------------ #
-    def _execute_job_flow(self, mapref: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_job_flow(
+        self,
+        mapref: str,
+        payload: Dict[str, Any],
+        shared: Optional[JobFlowSession] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the job flow of ``mapref`` once. ``shared`` (history backfills)
+        supplies the already loaded job flow and compiled code, and keeps the
+        source/target connections open across runs when it reuses connections.
+        """
         # Handle both payload structures:
         # 1. payload = {"params": {...}} (nested)
         # 2. payload = {...} (params directly, for immediate jobs)
@@ -100,7 +124,12 @@ class JobExecutionEngine:
         target_conn = None
         
         with self._db_connection() as (conn, cursor):
-            job_flow = self._load_job_flow(cursor, mapref)
+            if shared is not None and shared.job_flow:
+                job_flow = shared.job_flow
+            else:
+                job_flow = self._load_job_flow(cursor, mapref)
+                if shared is not None:
+                    shared.job_flow = job_flow
             if not job_flow:
                 raise SchedulerRepositoryError(f"No active job flow found for {mapref}")
 
@@ -129,16 +158,25 @@ class JobExecutionEngine:
                 except ImportError:  # When running Flask app.py directly inside backend
                     from database.dbconnect import create_target_connection  # type: ignore
 
-                source_conn = create_target_connection(sqlconid)
+                if shared is not None and shared.source_conn is not None:
+                    source_conn = shared.source_conn
+                else:
+                    source_conn = create_target_connection(sqlconid)
                 if not source_conn:
                     raise SchedulerRepositoryError(
                         f"Source connection ID {sqlconid} not found or inactive for {mapref}."
                     )
-                target_conn = create_target_connection(trgconid)
+                if shared is not None and shared.target_conn is not None:
+                    target_conn = shared.target_conn
+                else:
+                    target_conn = create_target_connection(trgconid)
                 if not target_conn:
                     raise SchedulerRepositoryError(
                         f"Target connection ID {trgconid} not found or inactive for {mapref}."
                     )
+                if shared is not None and shared.reuse_connections:
+                    # Closed by the backfill once all of its slices have run
+                    shared.source_conn, shared.target_conn = source_conn, target_conn
             except SchedulerRepositoryError:
                 raise
             except Exception as e:
@@ -333,11 +371,16 @@ class JobExecutionEngine:
                 
                 debug(f"Executing Python code (first 200 chars): {code[:200]}")
                 
-                namespace: Dict[str, Any] = {}
+                # Backfill slices compile the job once and reuse its namespace
+                cached_namespace = shared.namespaces.get(code) if shared is not None else None
+                namespace: Dict[str, Any] = cached_namespace if cached_namespace is not None else {}
                 try:
-                    debug(f"Executing Python code (length: {len(code)} characters)")
-                    exec(code, namespace)
-                    debug(f"Python code executed successfully, checking for execute_job function...")
+                    if cached_namespace is None:
+                        debug(f"Executing Python code (length: {len(code)} characters)")
+                        exec(code, namespace)
+                        debug(f"Python code executed successfully, checking for execute_job function...")
+                        if shared is not None:
+                            shared.namespaces[code] = namespace
                 except SyntaxError as e:
                     error(f"Syntax error in DWLOGIC for {mapref}: {e}")
                     error(f"Code snippet (lines {e.lineno-5 if e.lineno > 5 else 1}-{e.lineno+5}):")
@@ -606,6 +649,10 @@ class JobExecutionEngine:
                         log_conn.commit()
                     raise
                 finally:
+                    if shared is not None and shared.reuse_connections:
+                        # Shared connections stay open for the next backfill slice
+                        source_conn = target_conn = None
+
                     # Close source connection if it was created
                     if source_conn and source_conn != conn:
                         try:
@@ -629,20 +676,54 @@ class JobExecutionEngine:
         start_date = datetime.fromisoformat(start_date_str).date()
         end_date = datetime.fromisoformat(end_date_str).date()
 
-        current_date = start_date
-        runs = 0
-        while current_date <= end_date:
-            params = {
-                "param1": current_date.strftime("%d-%b-%Y"),
-                "truncate_flag": truncate_flag if runs == 0 else "N",
-            }
+        with self._db_connection() as (_conn, cursor):
+            job_flow = self._load_job_flow(cursor, request.mapref)
+        if not job_flow:
+            raise SchedulerRepositoryError(f"No active job flow found for {request.mapref}")
+
+        plan = plan_history_backfill(start_date, end_date, truncate_flag, job_flow.get("TRGTBTYP"))
+        session = JobFlowSession(job_flow=job_flow, reuse_connections=plan.mode != BACKFILL_PARALLEL)
+        progress = BackfillProgress(request.mapref, plan)
+        info(
+            f"History backfill for {request.mapref}: {len(plan.slices)} day slices, {plan.mode.lower()} "
+            f"(target type {job_flow.get('TRGTBTYP') or 'unknown'}, workers {plan.max_workers})"
+        )
+
+        def run_slice(history_slice: HistorySlice) -> None:
             info(
-                f"Executing history slice {current_date} for {request.mapref} (truncate={params['truncate_flag']})"
+                f"Executing history slice {history_slice.day} for {request.mapref} "
+                f"(truncate={history_slice.truncate_flag})"
             )
-            self._execute_job_flow(request.mapref, {"params": params})
-            current_date += timedelta(days=1)
-            runs += 1
-        return {"status": "SUCCESS", "runs": runs}
+            started = datetime.now()
+            try:
+                result = self._execute_job_flow(request.mapref, {"params": history_slice.params}, session)
+            except Exception as exc:
+                progress.record(history_slice, error_message=str(exc), started=started)
+                raise
+            progress.record(history_slice, result, started=started)
+
+        try:
+            if plan.mode == BACKFILL_PARALLEL:
+                pending = list(plan.slices)
+                if pending[0].truncate_flag == "Y":
+                    run_slice(pending.pop(0))  # the truncate must land before any other day
+                with ThreadPoolExecutor(max_workers=plan.max_workers, thread_name_prefix="backfill") as executor:
+                    futures = [executor.submit(run_slice, history_slice) for history_slice in pending]
+                    for future in futures:
+                        with suppress(Exception):
+                            future.result()
+                failed = progress.failed
+                if failed:
+                    raise SchedulerRepositoryError(
+                        f"History backfill for {request.mapref} failed for {len(failed)} of "
+                        f"{len(plan.slices)} days: {', '.join(entry['date'] for entry in failed[:10])}"
+                    )
+            else:
+                for history_slice in plan.slices:
+                    run_slice(history_slice)
+        finally:
+            session.close()
+        return {"status": "SUCCESS", "runs": len(plan.slices), "mode": plan.mode, "slices": progress.as_list()}
 
     def _execute_report_job(self, request: QueueRequest) -> Dict[str, Any]:
         # Support both FastAPI (package import) and legacy Flask (relative import) contexts
@@ -47,6 +47,7 @@ from backend.modules.jobs.pkgdwprc_python import (
     SchedulerRepositoryError,
     SchedulerError,
 )
+from backend.modules.jobs.job_dag import dependency_plan
 from backend.modules.helper_functions import _get_table_ref
 from fastapi.responses import JSONResponse
 
@@ -1731,6 +1732,108 @@ async def get_error_details(job_id: str):
             conn.close()
 
 
+@router.get("/get_job_stage_profile/{mapref}")
+async def get_job_stage_profile(mapref: str, joblogid: Optional[int] = Query(None)):
+    """
+    Get the stage timing breakdown (DMS_JOBSTGPRF) of a mapper job run:
+    wall/CPU seconds, calls, round trips and rows per stage, slowest first.
+    Defaults to the latest profiled run of the mapping when no joblogid is given.
+    """
+    conn = None
+    try:
+        conn = create_metadata_connection()
+        cursor = conn.cursor()
+        db_type = _detect_db_type(conn)
+
+        if db_type == "POSTGRESQL":
+            schema = (os.getenv("DMS_SCHEMA", "") or "").strip()
+            schema_lower = schema.lower() if schema else "public"
+            dms_jobstgprf_ref = get_postgresql_table_name(
+                cursor, schema_lower, "DMS_JOBSTGPRF"
+            )
+            dms_jobstgprf_ref = (
+                f'"{dms_jobstgprf_ref}"'
+                if dms_jobstgprf_ref != dms_jobstgprf_ref.lower()
+                else dms_jobstgprf_ref
+            )
+            schema_prefix = f"{schema_lower}." if schema else ""
+            mapref_bind, joblogid_bind = "%s", "%s"
+            make_params = lambda *values: tuple(values)
+        else:
+            oracle_schema = os.getenv("DMS_SCHEMA", "") or ""
+            schema_prefix = f"{oracle_schema}." if oracle_schema else ""
+            dms_jobstgprf_ref = "DMS_JOBSTGPRF"
+            mapref_bind, joblogid_bind = ":mapref", ":joblogid"
+            make_params = lambda *values: dict(zip(("mapref", "joblogid"), values))
+        dms_jobstgprf_full = f"{schema_prefix}{dms_jobstgprf_ref}"
+
+        if joblogid is None:
+            cursor.execute(
+                f"SELECT MAX(JOBLOGID) FROM {dms_jobstgprf_full} WHERE MAPREF = {mapref_bind}",
+                make_params(mapref),
+            )
+            row = cursor.fetchone()
+            joblogid = row[0] if row else None
+            if joblogid is None:
+                return {"mapref": mapref, "joblogid": None, "stages": []}
+
+        cursor.execute(
+            f"""
+            SELECT STAGE, WALLSEC, CPUSEC, CALLS, RNDTRPS, ROWSCNT, RECCRDT
+            FROM {dms_jobstgprf_full}
+            WHERE MAPREF = {mapref_bind} AND JOBLOGID = {joblogid_bind}
+            ORDER BY WALLSEC DESC
+            """,
+            make_params(mapref, joblogid),
+        )
+        rows = cursor.fetchall()
+        total_wall = sum(float(row[1] or 0) for row in rows)
+        stages = [
+            {
+                "stage": stage,
+                "wall_seconds": float(wallsec or 0),
+                "cpu_seconds": float(cpusec or 0),
+                "calls": int(calls or 0),
+                "round_trips": int(rndtrps or 0),
+                "rows": int(rowscnt or 0),
+                "wall_pct": round(100 * float(wallsec or 0) / total_wall, 1) if total_wall else 0.0,
+            }
+            for stage, wallsec, cpusec, calls, rndtrps, rowscnt, _ in rows
+        ]
+        return {
+            "mapref": mapref,
+            "joblogid": joblogid,
+            "recorded_at": rows[0][6] if rows else None,
+            "stages": stages,
+        }
+    except Exception as e:
+        error(f"Error in get_job_stage_profile: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
+@router.get("/get_dependency_plan")
+async def get_dependency_plan(mapref: Optional[str] = Query(None)):
+    """
+    Get the job dependency DAG (DMS_JOBSCH.DPND_JOBSCHID and DMS_JOBDPND),
+    or the part downstream of mapref, with each job's expected duration from
+    recent successful runs and the critical path through it.
+    """
+    conn = None
+    try:
+        conn = create_metadata_connection()
+        cursor = conn.cursor()
+        return dependency_plan(cursor, mapref)
+    except Exception as e:
+        error(f"Error in get_dependency_plan: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+
 @router.get("/scheduler-status")
 async def get_scheduler_status():
     """
@@ -0,0 +1,143 @@
+"""
+Planning and bookkeeping for history (backfill) jobs.
+
+A history request replays a job flow once per day between start_date and
+end_date. Fact and mart targets (FCT/MRT) take the day slices concurrently,
+at most HISTORY_BACKFILL_MAX_WORKERS at a time; the first slice runs alone
+when it truncates the target. Dimensions (and unknown target types) keep the
+day order, since SCD2 versions depend on it, but all slices share one job flow
+load, one compiled job and one pair of source/target connections.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.logger import info
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.logger import info  # type: ignore
+
+
+BACKFILL_PARALLEL = "PARALLEL"
+BACKFILL_ORDERED = "ORDERED"
+
+# Target types whose day slices are independent of each other
+PARALLEL_TARGET_TYPES = {"FCT", "MRT"}
+
+
+@dataclass(frozen=True)
+class HistorySlice:
+    index: int
+    day: date
+    truncate_flag: str = "N"
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """Job flow params for this day (the generated code reads param1)."""
+        return {"param1": self.day.strftime("%d-%b-%Y"), "truncate_flag": self.truncate_flag}
+
+
+@dataclass
+class BackfillPlan:
+    mode: str
+    slices: List[HistorySlice]
+    max_workers: int = 1
+
+
+def history_backfill_workers() -> int:
+    """Concurrent day slices for FCT/MRT backfills (HISTORY_BACKFILL_MAX_WORKERS, 1 = serial)."""
+    try:
+        return max(1, int(os.getenv("HISTORY_BACKFILL_MAX_WORKERS", "4")))
+    except ValueError:
+        return 4
+
+
+def plan_history_backfill(
+    start_date: date,
+    end_date: date,
+    truncate_flag: str = "N",
+    target_type: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> BackfillPlan:
+    """One slice per day; only the first slice carries the truncate flag."""
+    slices = []
+    current = start_date
+    while current <= end_date:
+        slices.append(HistorySlice(len(slices), current, truncate_flag if not slices else "N"))
+        current += timedelta(days=1)
+
+    workers = history_backfill_workers() if max_workers is None else max(1, max_workers)
+    if (target_type or "").upper() in PARALLEL_TARGET_TYPES and workers > 1 and len(slices) > 1:
+        return BackfillPlan(BACKFILL_PARALLEL, slices, workers)
+    return BackfillPlan(BACKFILL_ORDERED, slices, 1)
+
+
+@dataclass
+class JobFlowSession:
+    """
+    Setup shared by the slices of one backfill: the loaded job flow, compiled
+    job namespaces (by code) and, for ordered backfills, the source and target
+    connections. The engine leaves shared connections open; close() ends them.
+    """
+    job_flow: Optional[Dict[str, Any]] = None
+    reuse_connections: bool = False
+    source_conn: Any = None
+    target_conn: Any = None
+    namespaces: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def close(self) -> None:
+        for connection in {id(c): c for c in (self.source_conn, self.target_conn) if c is not None}.values():
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self.source_conn = None
+        self.target_conn = None
+
+
+class BackfillProgress:
+    """Per-slice outcome of a backfill, logged as the slices finish."""
+
+    def __init__(self, mapref: str, plan: BackfillPlan):
+        self.mapref = mapref
+        self.total = len(plan.slices)
+        self.mode = plan.mode
+        self._lock = threading.Lock()
+        self._slices: Dict[int, Dict[str, Any]] = {}
+
+    def record(self, history_slice: HistorySlice, result: Optional[Dict[str, Any]] = None,
+               error_message: Optional[str] = None, started: Optional[datetime] = None) -> None:
+        result = result or {}
+        job_result = result.get("result") or {}
+        entry = {
+            "date": history_slice.day.isoformat(),
+            "status": "FAILED" if error_message else result.get("status", "SUCCESS"),
+            "prcid": result.get("prcid"),
+            "source_rows": job_result.get("source_rows"),
+            "target_rows": job_result.get("target_rows"),
+            "seconds": round((datetime.now() - started).total_seconds(), 3) if started else None,
+        }
+        if error_message:
+            entry["error"] = error_message
+        with self._lock:
+            self._slices[history_slice.index] = entry
+            done = len(self._slices)
+            failed = sum(1 for value in self._slices.values() if value["status"] == "FAILED")
+        info(
+            f"[Backfill] {self.mapref} slice {history_slice.day} {entry['status']} "
+            f"({done}/{self.total} done, {failed} failed, {self.mode.lower()})"
+        )
+
+    @property
+    def failed(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [value for value in self._slices.values() if value["status"] == "FAILED"]
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._slices[index] for index in sorted(self._slices)]
@@ -0,0 +1,321 @@
+"""
+Dependency DAG of scheduled jobs.
+
+Edges come from DMS_JOBSCH.DPND_JOBSCHID (one parent per schedule) and from
+DMS_JOBDPND (any number of parents per child, so children can fan in). When a
+job succeeds, the scheduler queues each child whose parents have all succeeded
+since the child last started (JobDag.ready_cycle, from the latest DMS_PRCLOG
+run of every job). The queued DMS_PRCREQ request is named after that cycle, so
+a fan-in child is queued once however many parents - on however many
+scheduler nodes - finish. Children run like any other request, independent
+branches concurrently on the scheduler workers; a failed job's descendants are
+not queued. There is no separate DAG executor, per-connection job limit or
+failure policy: concurrency is the scheduler's worker count, and a failure
+simply stops its branch. Expected durations from recent DMS_PRCLOG runs give
+the critical path of a DAG.
+
+Databases without DMS_JOBDPND (doc/database_migration_add_job_dependencies.sql
+not yet applied) fall back to DPND_JOBSCHID edges only.
+"""
+from __future__ import annotations
+
+import os
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name
+    from backend.modules.logger import warning
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name  # type: ignore
+    from modules.logger import warning  # type: ignore
+
+
+RUN_SUCCESS = "PC"  # DMS_PRCLOG.STATUS of a completed run
+
+# (status, start, end) of a job's latest DMS_PRCLOG run
+LatestRun = Tuple[Optional[str], Optional[datetime], Optional[datetime]]
+
+
+class DagCycleError(ValueError):
+    """Raised when job dependencies form a cycle."""
+
+
+class JobDag:
+    """Jobs (maprefs) and their parent -> child dependencies."""
+
+    def __init__(self, edges: Iterable[Tuple[str, str]] = (), nodes: Iterable[str] = ()):
+        self.parents: Dict[str, Set[str]] = {}
+        self.children: Dict[str, Set[str]] = {}
+        for node in nodes:
+            self._add_node(node)
+        for parent, child in edges:
+            if parent == child:
+                raise DagCycleError(f"{parent} depends on itself")
+            self._add_node(parent)
+            self._add_node(child)
+            self.parents[child].add(parent)
+            self.children[parent].add(child)
+        self.order = self._topological_order()
+
+    def _add_node(self, node: str) -> None:
+        self.parents.setdefault(node, set())
+        self.children.setdefault(node, set())
+
+    def _topological_order(self) -> List[str]:
+        remaining = {node: len(parents) for node, parents in self.parents.items()}
+        queue = deque(sorted(node for node, count in remaining.items() if count == 0))
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for child in sorted(self.children[node]):
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    queue.append(child)
+        if len(order) != len(remaining):
+            cycle = sorted(node for node, count in remaining.items() if count > 0)
+            raise DagCycleError(f"Job dependencies form a cycle through: {', '.join(cycle)}")
+        return order
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self.order)
+
+    @property
+    def edges(self) -> List[Tuple[str, str]]:
+        return [(parent, child) for parent in self.order for child in sorted(self.children[parent])]
+
+    def descendants(self, node: str) -> Set[str]:
+        found: Set[str] = set()
+        stack = list(self.children.get(node, ()))
+        while stack:
+            current = stack.pop()
+            if current not in found:
+                found.add(current)
+                stack.extend(self.children[current])
+        return found
+
+    def subgraph(self, nodes: Iterable[str]) -> 'JobDag':
+        keep = set(nodes)
+        return JobDag(
+            edges=[(parent, child) for parent, child in self.edges if parent in keep and child in keep],
+            nodes=keep,
+        )
+
+    def ready_cycle(self, child: str, latest_runs: Dict[str, LatestRun]) -> Optional[datetime]:
+        """
+        If every parent of ``child`` has completed successfully since the
+        child's latest run started, the end of the last of those parent runs
+        (it identifies the cycle); otherwise None.
+        """
+        child_run = latest_runs.get(child)
+        since = child_run[1] if child_run else None
+        ends = []
+        for parent in self.parents.get(child, ()):
+            status, _, ended = latest_runs.get(parent) or (None, None, None)
+            if status != RUN_SUCCESS or ended is None or (since is not None and ended <= since):
+                return None
+            ends.append(ended)
+        return max(ends) if ends else None
+
+    def with_edge(self, parent: str, child: str) -> 'JobDag':
+        """This DAG plus one edge (raises DagCycleError if it closes a cycle)."""
+        return JobDag(edges=self.edges + [(parent, child)], nodes=self.order)
+
+    def critical_path(self, durations: Dict[str, float], default: float = 0.0) -> Tuple[List[str], float]:
+        """Longest chain by expected duration, and its total seconds."""
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for node in self.order:
+            best_parent = max(self.parents[node], key=lambda parent: finish[parent], default=None)
+            start = finish[best_parent] if best_parent else 0.0
+            finish[node] = start + float(durations.get(node, default) or 0.0)
+            previous[node] = best_parent
+        if not finish:
+            return [], 0.0
+        node: Optional[str] = max(self.order, key=lambda name: finish[name])
+        total = finish[node]
+        path = []
+        while node:
+            path.append(node)
+            node = previous[node]
+        return list(reversed(path)), round(total, 3)
+
+
+# ---------------------------------------------------------------------- #
+# Loading from the metadata tables
+# ---------------------------------------------------------------------- #
+def _table(cursor, db_type: str, table_name: str) -> str:
+    schema = os.getenv('DMS_SCHEMA', 'TRG')
+    if db_type == "POSTGRESQL":
+        schema_lower = schema.lower() if schema else 'public'
+        actual = get_postgresql_table_name(cursor, schema_lower, table_name)
+        # Quote table name if it contains uppercase letters (was created with quotes)
+        table_ref = f'"{actual}"' if actual != actual.lower() else actual
+        return f'{schema_lower}.{table_ref}' if schema else table_ref
+    return f'{schema}.{table_name}' if schema else table_name
+
+
+# db_type -> whether DMS_JOBDPND exists (checked once per database type)
+_dependency_table: Dict[str, bool] = {}
+
+
+def _rollback_quietly(cursor) -> None:
+    # A failed statement leaves a PostgreSQL transaction aborted; clear it for the next one
+    try:
+        cursor.connection.rollback()
+    except Exception:
+        pass
+
+
+def has_dependency_table(cursor, db_type: Optional[str] = None) -> bool:
+    """
+    Whether DMS_JOBDPND exists. Without it (migration not applied) only the
+    DMS_JOBSCH.DPND_JOBSCHID edges are used: one parent per child.
+    """
+    db_type = db_type or _detect_db_type(cursor.connection)
+    if db_type not in _dependency_table:
+        try:
+            cursor.execute(
+                f"SELECT parent_mapref, child_mapref FROM {_table(cursor, db_type, 'DMS_JOBDPND')} WHERE 1 = 0"
+            )
+            cursor.fetchall()
+            _dependency_table[db_type] = True
+        except Exception as e:
+            _rollback_quietly(cursor)
+            warning(f"[JobDag] DMS_JOBDPND is not available, using DPND_JOBSCHID dependencies only "
+                    f"(run doc/database_migration_add_job_dependencies.sql): {e}")
+            _dependency_table[db_type] = False
+    return _dependency_table[db_type]
+
+
+_JOBSCH_COLUMNS = ("MAPREF", "JOBSCHID", "DPND_JOBSCHID", "CURFLG", "SCHFLG")
+
+
+def _fetch_edges(cursor, db_type: str, query: str) -> List[Tuple[str, str]]:
+    """
+    Run an edge query whose DMS_JOBSCH columns are {MAPREF}-style
+    placeholders. PostgreSQL tables created with quoted names have quoted
+    uppercase columns; if those do not exist the unquoted ones are used.
+    """
+    for quoted in ((True, False) if db_type == "POSTGRESQL" else (False,)):
+        columns = {name: f'"{name}"' if quoted else name.lower() for name in _JOBSCH_COLUMNS}
+        try:
+            cursor.execute(query.format(**columns))
+            return list(cursor.fetchall())
+        except Exception:
+            if not quoted:
+                raise
+            _rollback_quietly(cursor)
+    return []
+
+
+def load_job_dag(cursor) -> JobDag:
+    """DAG of the active, enabled schedules' dependencies."""
+    db_type = _detect_db_type(cursor.connection)
+    jobsch = _table(cursor, db_type, 'DMS_JOBSCH')
+    edges = set(_fetch_edges(cursor, db_type, f"""
+        SELECT parent.{{MAPREF}}, child.{{MAPREF}}
+        FROM {jobsch} child
+        JOIN {jobsch} parent
+          ON child.{{DPND_JOBSCHID}} = parent.{{JOBSCHID}}
+        WHERE parent.{{CURFLG}} = 'Y'
+          AND child.{{CURFLG}} = 'Y'
+          AND child.{{SCHFLG}} = 'Y'
+    """))
+    if has_dependency_table(cursor, db_type):
+        jobdpnd = _table(cursor, db_type, 'DMS_JOBDPND')
+        edges.update(_fetch_edges(cursor, db_type, f"""
+            SELECT dpnd.parent_mapref, dpnd.child_mapref
+            FROM {jobdpnd} dpnd
+            JOIN {jobsch} child
+              ON child.{{MAPREF}} = dpnd.child_mapref
+            WHERE dpnd.curflg = 'Y'
+              AND child.{{CURFLG}} = 'Y'
+              AND child.{{SCHFLG}} = 'Y'
+        """))
+    return JobDag(edges=sorted(edges))
+
+
+def load_latest_runs(cursor, maprefs: Iterable[str]) -> Dict[str, LatestRun]:
+    """(status, start, end) of each job's most recent DMS_PRCLOG run."""
+    maprefs = list(maprefs)
+    if not maprefs:
+        return {}
+    db_type = _detect_db_type(cursor.connection)
+    prclog = _table(cursor, db_type, 'DMS_PRCLOG')
+    query = f"""
+        SELECT mapref, status, strtdt, enddt
+        FROM (
+            SELECT mapref, status, strtdt, enddt,
+                   ROW_NUMBER() OVER (PARTITION BY mapref ORDER BY strtdt DESC) AS rn
+            FROM {prclog}
+            WHERE mapref IN ({{binds}})
+        ) latest
+        WHERE rn = 1
+    """
+    if db_type == "POSTGRESQL":
+        cursor.execute(query.format(binds=", ".join(["%s"] * len(maprefs))), tuple(maprefs))
+    else:
+        cursor.execute(
+            query.format(binds=", ".join(f":m{index}" for index in range(len(maprefs)))),
+            {f"m{index}": mapref for index, mapref in enumerate(maprefs)},
+        )
+    return {mapref: (status, started, ended) for mapref, status, started, ended in cursor.fetchall()}
+
+
+def load_expected_durations(cursor, maprefs: Iterable[str], recent_runs: int = 10) -> Dict[str, float]:
+    """Average seconds of each job's last ``recent_runs`` successful DMS_PRCLOG runs."""
+    maprefs = list(maprefs)
+    if not maprefs:
+        return {}
+    db_type = _detect_db_type(cursor.connection)
+    prclog = _table(cursor, db_type, 'DMS_PRCLOG')
+    query = f"""
+        SELECT mapref, strtdt, enddt
+        FROM (
+            SELECT mapref, strtdt, enddt,
+                   ROW_NUMBER() OVER (PARTITION BY mapref ORDER BY strtdt DESC) AS rn
+            FROM {prclog}
+            WHERE status = 'PC'
+              AND enddt IS NOT NULL
+              AND mapref IN ({{binds}})
+        ) recent
+        WHERE rn <= {int(recent_runs)}
+    """
+    if db_type == "POSTGRESQL":
+        cursor.execute(query.format(binds=", ".join(["%s"] * len(maprefs))), tuple(maprefs))
+    else:
+        cursor.execute(
+            query.format(binds=", ".join(f":m{index}" for index in range(len(maprefs)))),
+            {f"m{index}": mapref for index, mapref in enumerate(maprefs)},
+        )
+    totals: Dict[str, List[float]] = {}
+    for mapref, started, ended in cursor.fetchall():
+        if started and ended:
+            totals.setdefault(mapref, []).append((ended - started).total_seconds())
+    return {mapref: round(sum(values) / len(values), 3) for mapref, values in totals.items()}
+
+
+def dependency_plan(cursor, mapref: Optional[str] = None) -> Dict[str, Any]:
+    """
+    The dependency DAG (or the part downstream of ``mapref``) with expected
+    job durations and the critical path.
+    """
+    dag = load_job_dag(cursor)
+    if mapref:
+        dag = dag.subgraph(dag.descendants(mapref) | {mapref})
+    durations = load_expected_durations(cursor, dag.nodes)
+    path, seconds = dag.critical_path(durations)
+    return {
+        "nodes": [
+            {"mapref": node, "parents": sorted(dag.parents[node]), "expected_seconds": durations.get(node)}
+            for node in dag.order
+        ],
+        "edges": [{"parent": parent, "child": child} for parent, child in dag.edges],
+        "critical_path": path,
+        "critical_path_seconds": seconds,
+    }
@@ -306,15 +306,19 @@ from decimal import Decimal
 # Import external modules for common functionality
 try:
     from backend.modules.mapper.mapper_job_executor import execute_mapper_job
-    from backend.modules.mapper.mapper_transformation_utils import map_row_to_target_columns, generate_hash
+    from backend.modules.mapper.mapper_combination_runner import execute_combinations
+    from backend.modules.mapper.mapper_transformation_utils import StandardTransformation, map_row_to_target_columns, generate_hash
     from backend.modules.logger import debug
 except ImportError:  # Fallback for Flask-style imports
     from modules.mapper.mapper_job_executor import execute_mapper_job  # type: ignore
-    from modules.mapper.mapper_transformation_utils import map_row_to_target_columns, generate_hash  # type: ignore
+    from modules.mapper.mapper_combination_runner import execute_combinations  # type: ignore
+    from modules.mapper.mapper_transformation_utils import StandardTransformation, map_row_to_target_columns, generate_hash  # type: ignore
     from modules.logger import debug  # type: ignore
 
 # Note: Parallel processing is configured via job_config['parallel_config']
 # The execute_mapper_job function will use parallel processing if enabled and conditions are met
+# Independent combinations run concurrently when session_params['parallel_combinations']
+# or MAPPER_COMBINATION_PARALLEL is enabled (see mapper_combination_runner)
 
 # Job configuration
 MAPREF = "{mapref}"
@@ -409,18 +413,12 @@ def execute_job(metadata_connection, source_connection, target_connection, sessi
     }}
     
     # Transformation function: maps source row to target columns
-    def transformation_func(source_row: Dict[str, Any]) -> Dict[str, Any]:
-        """Transform source row to target column format"""
-        return map_row_to_target_columns(source_row, COLUMN_SOURCE_MAPPING, ALL_COLUMNS)
+    # (the executor compiles it to a tuple projector)
+    transformation_func = StandardTransformation(COLUMN_SOURCE_MAPPING, ALL_COLUMNS)
     
-    # Process each combination sequentially
-    total_source_rows = 0
-    total_target_rows = 0
-    total_error_rows = 0
-    last_status = 'SUCCESS'
-    should_stop = False  # Flag to stop processing remaining combinations
-    
-    # Execute ETL logic for each combination
+    # Combinations in generated order; the runner plans which of them can run
+    # concurrently and aggregates their results
+    combinations = [
 ''')
     
     # NEW: Detect target database type for DBTYP filtering (Phase 3)
@@ -561,66 +559,37 @@ def execute_job(metadata_connection, source_connection, target_connection, sessi
         # Replace newlines and handle special characters
         maplogic_for_code = maplogic_sql_escaped.replace('\\', '\\\\').replace('"', '\\"')
         
+        # Target columns mapped by this combination (index 5: jd.trgclnm)
+        combo_columns = sorted({str(detail[5]).upper() for detail in combo_details if detail[5]})
+        
         code_parts.append(f'''
         # ===== Combination {idx}: {mapcmbcd if mapcmbcd else 'DEFAULT'} (SCD Type {scdtyp}) =====
-    if not should_stop:
-        debug("Processing combination: {mapcmbcd if mapcmbcd else 'DEFAULT'} (SCD Type {scdtyp})")
-        
-        # Set connection IDs from first combination (for thread-safe parallel processing)
-        if {idx} == 1:
-            job_config['source_conn_id'] = {repr(sqlconid) if sqlconid else 'None'}
-            job_config['target_conn_id'] = {repr(trgconid) if trgconid else 'None'}
-        
-        # Source SQL for this combination
-        source_sql_{idx} = """{maplogic_for_code}"""
-        
-        # Update job config with SCD type for this combination
-        job_config['scd_type'] = {scdtyp}
-        
-        # Execute this combination using external module
-        result_{idx} = execute_mapper_job(
-            metadata_connection,
-            source_connection,
-            target_connection,
-            job_config,
-            source_sql_{idx},
-            transformation_func,
-            checkpoint_config,
-            session_params
-        )
-        
-        # Accumulate results
-        if result_{idx}.get('status') == 'STOPPED':
-            last_status = 'STOPPED'
-            should_stop = True
-        elif result_{idx}.get('status') == 'ERROR':
-            last_status = 'ERROR'
-            print(f"ERROR in combination {idx}: {{result_{idx}.get('error_message', 'Unknown error')}}")
-            # Continue to next combination (don't set should_stop, allow next combination to run)
-        else:
-            total_source_rows += result_{idx}.get('source_rows', 0)
-            total_target_rows += result_{idx}.get('target_rows', 0)
-            total_error_rows += result_{idx}.get('error_rows', 0)
-            
-            print(f"Combination {idx} completed: {{result_{idx}.get('source_rows', 0)}} source, {{result_{idx}.get('target_rows', 0)}} target rows")
+        {{
+            'index': {idx},
+            'code': {repr(mapcmbcd) if mapcmbcd else 'None'},
+            'scd_type': {scdtyp},
+            'source_sql': """{maplogic_for_code}""",
+            'columns': {combo_columns},
+            'source_conn_id': {repr(sqlconid) if sqlconid else 'None'},
+            'target_conn_id': {repr(trgconid) if trgconid else 'None'},
+        }},
 ''')
     
     # Footer - simplified return statement (after all combinations processed)
     code_parts.append(f'''
-    # All combinations processed
-    print(f"All combinations completed for {{MAPREF}}")
-    print(f"  Total source rows: {{total_source_rows}}")
-    print(f"  Total target rows: {{total_target_rows}}")
-    print(f"  Total error rows: {{total_error_rows}}")
+    ]
     
-    # Return final results
-    return {{
-        'status': last_status,
-        'source_rows': total_source_rows,
-        'target_rows': total_target_rows,
-        'error_rows': total_error_rows,
-        'message': 'Job completed successfully' if last_status == 'SUCCESS' else f'Job ended with status: {{last_status}}'
-    }}
+    # Execute all combinations and return the aggregated results
+    return execute_combinations(
+        metadata_connection,
+        source_connection,
+        target_connection,
+        job_config,
+        combinations,
+        transformation_func,
+        checkpoint_config,
+        session_params
+    )
 
 
 if __name__ == '__main__':
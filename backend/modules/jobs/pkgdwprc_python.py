@@ -9,6 +9,7 @@ service.  The actual execution engine runs inside
 
 from __future__ import annotations
 
+import hashlib
 import json
 import uuid
 from dataclasses import dataclass, field
@@ -24,6 +25,7 @@ try:
         get_postgresql_table_name,
     )
     from backend.modules.jobs.scheduler_frequency import build_trigger
+    from backend.modules.jobs.job_dag import DagCycleError, has_dependency_table, load_job_dag
 except ImportError:  # Fallback for Flask-style imports
     from modules.logger import info, error, warning, debug  # type: ignore
     from modules.common.id_provider import next_id as get_next_id  # type: ignore
@@ -32,6 +34,7 @@ except ImportError:  # Fallback for Flask-style imports
         get_postgresql_table_name,
     )
     from modules.jobs.scheduler_frequency import build_trigger  # type: ignore
+    from modules.jobs.job_dag import DagCycleError, has_dependency_table, load_job_dag  # type: ignore
 import os
 
 ALLOWED_FREQUENCY_CODES = {"ID", "DL", "WK", "FN", "MN", "HY", "YR"}
@@ -140,6 +143,27 @@ def _serialize_payload(payload: Dict[str, Any]) -> str:
     return json.dumps(payload, default=str)
 
 
+def schedule_request_id(source: str, schedule_id: Any, fire_time: Optional[datetime]) -> str:
+    """
+    REQUEST_ID of one firing of a schedule. Every scheduler node firing the same
+    schedule for the same time derives the same id, and the DMS_PRCREQ primary
+    key lets only the first insert through.
+    """
+    if isinstance(fire_time, datetime):
+        if fire_time.tzinfo is not None:
+            from datetime import timezone as dt_timezone
+            fire_time = fire_time.astimezone(dt_timezone.utc)
+        stamp = fire_time.strftime("%Y%m%d%H%M%S")
+    else:
+        stamp = str(fire_time or "INITIAL")
+    request_id = f"{source}:{schedule_id}:{stamp}"
+    if len(request_id) > 64:
+        # Long keys (maprefs) are hashed so the firing time stays part of the id
+        digest = hashlib.sha1(str(schedule_id).encode("utf-8")).hexdigest()[:24]
+        request_id = f"{source}:{digest}:{stamp}"[:64]
+    return request_id
+
+
 def _calculate_next_run_time(
     frequency_code: str,
     frequency_day: Optional[str],
@@ -435,6 +459,7 @@ class JobSchedulerService:
 
             self.connection.commit()
             info(f"Job schedule created for {request.mapref} (jobschid={jobschid})")
+            self.queue_schedule_refresh(request.mapref)
             return ScheduleResult(
                 job_schedule_id=jobschid,
                 replaced_job_schedule_id=replaced_jobschid,
@@ -460,6 +485,12 @@ class JobSchedulerService:
             child_schedule = self._fetch_active_schedule(cursor, child_mapref)
             if not parent_schedule or not child_schedule:
                 raise SchedulerValidationError("Both mappings must have active schedules.")
+            try:
+                load_job_dag(cursor).with_edge(parent_mapref, child_mapref)
+            except DagCycleError as exc:
+                raise SchedulerValidationError(str(exc)) from exc
+            # Without DMS_JOBDPND a child keeps a single parent in DPND_JOBSCHID
+            fan_in = has_dependency_table(cursor, self.db_type)
 
             # Get table reference for PostgreSQL (handles case sensitivity)
             if self.db_type == "POSTGRESQL":
@@ -476,6 +507,30 @@ class JobSchedulerService:
                     """,
                     (parent_schedule["JOBSCHID"], child_schedule["JOBSCHID"]),
                 )
+                # A child may depend on several parents (fan-in); DPND_JOBSCHID keeps the latest
+                if fan_in:
+                    dms_jobdpnd_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOBDPND')
+                    dms_jobdpnd_ref = f'"{dms_jobdpnd_table}"' if dms_jobdpnd_table != dms_jobdpnd_table.lower() else dms_jobdpnd_table
+                    dms_jobdpnd_full = f'{schema_prefix}{dms_jobdpnd_ref}'
+                    cursor.execute(
+                        f"""
+                        INSERT INTO {dms_jobdpnd_full} (parent_mapref, child_mapref, reccrdt, recupdt, curflg)
+                        SELECT %s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Y'
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM {dms_jobdpnd_full}
+                            WHERE parent_mapref = %s AND child_mapref = %s
+                        )
+                        """,
+                        (parent_mapref, child_mapref, parent_mapref, child_mapref),
+                    )
+                    cursor.execute(
+                        f"""
+                        UPDATE {dms_jobdpnd_full}
+                        SET curflg = 'Y', recupdt = CURRENT_TIMESTAMP
+                        WHERE parent_mapref = %s AND child_mapref = %s AND curflg <> 'Y'
+                        """,
+                        (parent_mapref, child_mapref),
+                    )
             else:  # Oracle
                 schema_prefix = f'{self.schema}.' if self.schema else ''
                 cursor.execute(
@@ -489,8 +544,30 @@ class JobSchedulerService:
                         "child_jobschid": child_schedule["JOBSCHID"],
                     },
                 )
+                # A child may depend on several parents (fan-in); DPND_JOBSCHID keeps the latest
+                if fan_in:
+                    cursor.execute(
+                        f"""
+                        INSERT INTO {schema_prefix}DMS_JOBDPND (parent_mapref, child_mapref, reccrdt, recupdt, curflg)
+                        SELECT :parent_mapref, :child_mapref, SYSTIMESTAMP, SYSTIMESTAMP, 'Y' FROM dual
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM {schema_prefix}DMS_JOBDPND
+                            WHERE parent_mapref = :parent_mapref AND child_mapref = :child_mapref
+                        )
+                        """,
+                        {"parent_mapref": parent_mapref, "child_mapref": child_mapref},
+                    )
+                    cursor.execute(
+                        f"""
+                        UPDATE {schema_prefix}DMS_JOBDPND
+                        SET curflg = 'Y', recupdt = SYSTIMESTAMP
+                        WHERE parent_mapref = :parent_mapref AND child_mapref = :child_mapref AND curflg <> 'Y'
+                        """,
+                        {"parent_mapref": parent_mapref, "child_mapref": child_mapref},
+                    )
             self.connection.commit()
             info(f"Dependency saved: {parent_mapref} -> {child_mapref}")
+            self.queue_schedule_refresh(child_mapref)
         except SchedulerError:
             self.connection.rollback()
             raise
@@ -572,6 +649,7 @@ class JobSchedulerService:
             self.connection.commit()
             action_text = "enabled" if action == "E" else "disabled"
             info(f"Schedule {action_text} for {mapref}")
+            self.queue_schedule_refresh(mapref)
         except SchedulerError:
             self.connection.rollback()
             raise
@@ -584,11 +662,12 @@ class JobSchedulerService:
     # ------------------------------------------------------------------ #
     # Queue helpers for immediate / history / stop operations
     # ------------------------------------------------------------------ #
-    def queue_immediate_job(self, request: ImmediateJobRequest) -> str:
+    def queue_immediate_job(self, request: ImmediateJobRequest, request_id: Optional[str] = None) -> Optional[str]:
         return self._insert_queue_request(
             mapref=request.mapref,
             request_type=request.request_type,
             payload=request.params,
+            request_id=request_id,
         )
 
     def queue_history_job(self, request: HistoryJobRequest) -> str:
@@ -603,7 +682,9 @@ class JobSchedulerService:
             payload=payload,
         )
 
-    def queue_report_request(self, report_id: int, payload: Optional[Dict[str, Any]] = None) -> str:
+    def queue_report_request(
+        self, report_id: int, payload: Optional[Dict[str, Any]] = None, request_id: Optional[str] = None
+    ) -> Optional[str]:
         if not report_id:
             raise SchedulerValidationError("Report ID is required.")
         normalized_payload = payload.copy() if payload else {}
@@ -613,9 +694,12 @@ class JobSchedulerService:
             mapref=mapref,
             request_type=JobRequestType.REPORT,
             payload=normalized_payload,
+            request_id=request_id,
         )
 
-    def queue_file_upload_request(self, flupldref: str, payload: Optional[Dict[str, Any]] = None) -> str:
+    def queue_file_upload_request(
+        self, flupldref: str, payload: Optional[Dict[str, Any]] = None, request_id: Optional[str] = None
+    ) -> Optional[str]:
         if not flupldref:
             raise SchedulerValidationError("File upload reference is required.")
         normalized_payload = payload.copy() if payload else {}
@@ -625,8 +709,25 @@ class JobSchedulerService:
             mapref=mapref,
             request_type=JobRequestType.FILE_UPLOAD,
             payload=normalized_payload,
+            request_id=request_id,
         )
 
+    def queue_schedule_refresh(self, mapref: str) -> Optional[str]:
+        """
+        Ask the scheduler to pick up a schedule change now rather than at its
+        next refresh. Best effort: the schedule write is already committed and
+        the scheduler's periodic check finds it anyway.
+        """
+        try:
+            return self._insert_queue_request(
+                mapref=mapref,
+                request_type=JobRequestType.REFRESH_SCHEDULE,
+                payload={"reason": "SCHEDULE_CHANGED"},
+            )
+        except SchedulerError as exc:
+            warning(f"Could not queue schedule refresh for {mapref}: {exc}")
+            return None
+
     def request_job_stop(self, mapref: str, start_timestamp: datetime, force: str = "N") -> str:
         payload = {
             "start_timestamp": start_timestamp.isoformat(),
@@ -738,12 +839,19 @@ class JobSchedulerService:
         mapref: str,
         request_type: JobRequestType,
         payload: Optional[Dict[str, Any]] = None,
-    ) -> str:
+        request_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Insert a NEW request. With an explicit ``request_id`` (a schedule firing
+        or dependency run) the insert is idempotent: if another scheduler node
+        already queued that id, nothing is inserted and None is returned.
+        """
         if not mapref:
             raise SchedulerValidationError("Mapping reference is required.")
+        idempotent = request_id is not None
         cursor = self.connection.cursor()
         try:
-            request_id = str(uuid.uuid4())
+            request_id = request_id or str(uuid.uuid4())
             
             # Get table reference for PostgreSQL (handles case sensitivity)
             if self.db_type == "POSTGRESQL":
@@ -772,6 +880,7 @@ class JobSchedulerService:
                         'NEW',
                         CURRENT_TIMESTAMP
                     )
+                    {"ON CONFLICT (request_id) DO NOTHING" if idempotent else ""}
                     """,
                     (
                         request_id,
@@ -808,11 +917,18 @@ class JobSchedulerService:
                         "payload": _serialize_payload(payload or {}),
                     },
                 )
+            if idempotent and cursor.rowcount == 0:
+                self.connection.rollback()
+                info(f"{request_type.value} request {request_id} for mapref {mapref} is already queued")
+                return None
             self.connection.commit()
             info(f"Queued {request_type.value} request {request_id} for mapref {mapref}")
             return request_id
         except Exception as exc:
             self.connection.rollback()
+            if idempotent and "ORA-00001" in str(exc):
+                info(f"{request_type.value} request {request_id} for mapref {mapref} is already queued")
+                return None
             raise SchedulerRepositoryError(str(exc)) from exc
         finally:
             cursor.close()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
 from apscheduler.triggers.cron import CronTrigger
@@ -107,3 +107,20 @@ def build_trigger(schedule_row: Dict[str, Any], timezone: str):
         end_date=enddt,
     )
 
+
+
+def last_fire_time(trigger, now: datetime, lookback: timedelta = timedelta(hours=1)) -> Optional[datetime]:
+    """
+    Latest fire time of ``trigger`` at or before ``now`` (searched ``lookback`` back).
+
+    Every scheduler node evaluating the same trigger gets the same value, so it
+    identifies one firing no matter which node runs it or how late it starts.
+    """
+    fire_time = None
+    candidate = trigger.get_next_fire_time(None, now - lookback)
+    while candidate is not None and candidate <= now:
+        if fire_time is not None and candidate <= fire_time:
+            break
+        fire_time = candidate
+        candidate = trigger.get_next_fire_time(candidate, candidate + timedelta(microseconds=1))
+    return fire_time
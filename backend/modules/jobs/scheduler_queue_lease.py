@@ -0,0 +1,396 @@
+"""
+Lease-based consumption of the DMS_PRCREQ queue.
+
+A scheduler node claims NEW requests atomically (row locks with SKIP LOCKED,
+then a conditional UPDATE), so several nodes can share one queue. A claim
+stores the node id in CLAIMED_BY and a lease expiry in LEASE_EXPIRES_AT, and
+counts the attempt in ATTEMPTS. While a request runs, the node renews
+HEARTBEAT_AT / LEASE_EXPIRES_AT every SCHEDULER_HEARTBEAT_SECONDS. Requests
+whose lease has expired (their node died) are put back to NEW, or marked
+FAILED once they have used SCHEDULER_MAX_ATTEMPTS attempts.
+
+Claims made before the lease columns existed (LEASE_EXPIRES_AT NULL) are
+never reclaimed. Until the lease migration has run, the store detects the
+missing columns once and claims with a plain conditional update (no lease,
+nothing to renew or reclaim), so the queue keeps working.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name
+    from backend.modules.common.env_config import env_int
+    from backend.modules.logger import info, warning, debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name  # type: ignore
+    from modules.common.env_config import env_int  # type: ignore
+    from modules.logger import info, warning, debug  # type: ignore
+
+
+def scheduler_node_id() -> str:
+    """SCHEDULER_NODE_ID, or host:pid (CLAIMED_BY holds at most 64 characters)."""
+    node_id = os.getenv("SCHEDULER_NODE_ID") or f"{socket.gethostname()}:{os.getpid()}"
+    return node_id[:64]
+
+
+@dataclass
+class LeaseSettings:
+    lease_seconds: int = 120
+    heartbeat_seconds: int = 30
+    max_attempts: int = 3
+
+    @classmethod
+    def from_env(cls) -> 'LeaseSettings':
+        lease_seconds = max(10, env_int("SCHEDULER_LEASE_SECONDS", 120))
+        heartbeat_seconds = env_int("SCHEDULER_HEARTBEAT_SECONDS", 0) or lease_seconds // 4
+        return cls(
+            lease_seconds=lease_seconds,
+            # A lease must survive at least one missed heartbeat
+            heartbeat_seconds=max(1, min(heartbeat_seconds, lease_seconds // 2)),
+            max_attempts=max(1, env_int("SCHEDULER_MAX_ATTEMPTS", 3)),
+        )
+
+
+def _read_lob(value):
+    """Helper function to read Oracle LOB objects."""
+    if value is None:
+        return None
+    if hasattr(value, "read"):
+        data = value.read()
+        if isinstance(data, bytes):
+            return data.decode("utf-8")
+        return data
+    return value
+
+
+class QueueLeaseStore:
+    """Claims, renews and reclaims DMS_PRCREQ leases for one scheduler node."""
+
+    def __init__(self, node_id: Optional[str] = None, settings: Optional[LeaseSettings] = None):
+        self.node_id = node_id or scheduler_node_id()
+        self.settings = settings or LeaseSettings.from_env()
+        self._tables: Dict[str, Tuple[str, bool]] = {}
+        self._lease_columns: Dict[str, bool] = {}
+
+    # -------------------------------------------------------------- #
+    # SQL helpers
+    # -------------------------------------------------------------- #
+    def _table(self, cursor, db_type: str) -> Tuple[str, bool]:
+        """(table reference, quoted upper-case columns) for DMS_PRCREQ."""
+        schema = os.getenv("DMS_SCHEMA", "TRG")
+        cached = self._tables.get(db_type)
+        if cached:
+            return cached
+        if db_type == "POSTGRESQL":
+            schema_lower = schema.lower() if schema else "public"
+            table = get_postgresql_table_name(cursor, schema_lower, "DMS_PRCREQ")
+            quoted = table != table.lower()
+            table_ref = f'"{table}"' if quoted else table
+            resolved = (f"{schema_lower}.{table_ref}" if schema else table_ref, quoted)
+        else:
+            resolved = (f"{schema}.DMS_PRCREQ" if schema else "DMS_PRCREQ", False)
+        self._tables[db_type] = resolved
+        return resolved
+
+    def has_lease_columns(self, cursor, db_type: str) -> bool:
+        """Whether DMS_PRCREQ has the lease columns (checked once per database type)."""
+        if db_type not in self._lease_columns:
+            table, quoted = self._table(cursor, db_type)
+            c = self._columns(db_type, quoted)
+            try:
+                cursor.execute(
+                    f"SELECT {c('LEASE_EXPIRES_AT')}, {c('HEARTBEAT_AT')}, {c('ATTEMPTS')} FROM {table} WHERE 1 = 0"
+                )
+                cursor.fetchall()
+                self._lease_columns[db_type] = True
+            except Exception as e:
+                try:
+                    cursor.connection.rollback()
+                except Exception:
+                    pass
+                warning(f"[QueueLease] DMS_PRCREQ has no lease columns, claiming without leases "
+                        f"(run doc/database_migration_scheduler_queue_leases.sql): {e}")
+                self._lease_columns[db_type] = False
+        return self._lease_columns[db_type]
+
+    @staticmethod
+    def _columns(db_type: str, quoted: bool) -> Callable[[str], str]:
+        if db_type != "POSTGRESQL":
+            return lambda name: name
+        return (lambda name: f'"{name}"') if quoted else (lambda name: name.lower())
+
+    @staticmethod
+    def _later(db_type: str, placeholder: str) -> str:
+        """Timestamp ``placeholder`` seconds from now."""
+        if db_type == "POSTGRESQL":
+            return f"CURRENT_TIMESTAMP + ({placeholder} * INTERVAL '1 second')"
+        return f"SYSTIMESTAMP + NUMTODSINTERVAL({placeholder}, 'SECOND')"
+
+    # -------------------------------------------------------------- #
+    # Lease operations (the caller commits)
+    # -------------------------------------------------------------- #
+    def claim(self, cursor, limit: int = 25) -> List[Tuple[Any, str, str, Optional[str]]]:
+        """
+        Claim up to ``limit`` NEW requests for this node, oldest first.
+        Returns (request_id, mapref, request_type, payload) tuples.
+        """
+        db_type = _detect_db_type(cursor.connection)
+        table, quoted = self._table(cursor, db_type)
+        c = self._columns(db_type, quoted)
+        leased = self.has_lease_columns(cursor, db_type)
+
+        if db_type == "POSTGRESQL":
+            lease = (
+                f""",
+                    {c('HEARTBEAT_AT')} = CURRENT_TIMESTAMP,
+                    {c('LEASE_EXPIRES_AT')} = {self._later(db_type, '%s')},
+                    {c('ATTEMPTS')} = COALESCE({c('ATTEMPTS')}, 0) + 1"""
+                if leased else ""
+            )
+            cursor.execute(
+                f"""
+                UPDATE {table}
+                SET {c('STATUS')} = 'PROCESSING',
+                    {c('CLAIMED_AT')} = CURRENT_TIMESTAMP,
+                    {c('CLAIMED_BY')} = %s{lease}
+                WHERE {c('REQUEST_ID')} IN (
+                    SELECT {c('REQUEST_ID')}
+                    FROM {table}
+                    WHERE {c('STATUS')} = 'NEW'
+                    ORDER BY {c('REQUESTED_AT')}
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING {c('REQUEST_ID')}, {c('MAPREF')}, {c('REQUEST_TYPE')}, {c('PAYLOAD')}, {c('REQUESTED_AT')}
+                """,
+                (self.node_id, self.settings.lease_seconds, limit) if leased else (self.node_id, limit),
+            )
+            rows = sorted(cursor.fetchall(), key=lambda row: (row[4] is None, row[4]))
+            return [(row[0], row[1], row[2], _read_lob(row[3])) for row in rows]
+
+        # Oracle: SKIP LOCKED only locks the rows actually fetched, so fetch
+        # the batch from the cursor instead of limiting the query
+        cursor.execute(
+            f"""
+            SELECT REQUEST_ID, MAPREF, REQUEST_TYPE, PAYLOAD
+            FROM {table}
+            WHERE STATUS = 'NEW'
+            ORDER BY REQUESTED_AT
+            FOR UPDATE SKIP LOCKED
+            """
+        )
+        rows = [(row[0], row[1], row[2], _read_lob(row[3])) for row in cursor.fetchmany(limit)]
+        if rows:
+            lease = (
+                f""",
+                    HEARTBEAT_AT = SYSTIMESTAMP,
+                    LEASE_EXPIRES_AT = {self._later(db_type, ':lease_seconds')},
+                    ATTEMPTS = NVL(ATTEMPTS, 0) + 1"""
+                if leased else ""
+            )
+            params = []
+            for row in rows:
+                bind = {"claimed_by": self.node_id, "request_id": row[0]}
+                if leased:
+                    bind["lease_seconds"] = self.settings.lease_seconds
+                params.append(bind)
+            cursor.executemany(
+                f"""
+                UPDATE {table}
+                SET STATUS = 'PROCESSING',
+                    CLAIMED_AT = SYSTIMESTAMP,
+                    CLAIMED_BY = :claimed_by{lease}
+                WHERE REQUEST_ID = :request_id
+                  AND STATUS = 'NEW'
+                """,
+                params,
+            )
+        return rows
+
+    def renew(self, cursor, request_ids: List[Any]) -> int:
+        """Extend the leases this node holds on ``request_ids``; returns rows renewed."""
+        if not request_ids:
+            return 0
+        db_type = _detect_db_type(cursor.connection)
+        if not self.has_lease_columns(cursor, db_type):
+            return len(request_ids)
+        table, quoted = self._table(cursor, db_type)
+        c = self._columns(db_type, quoted)
+        if db_type == "POSTGRESQL":
+            query = f"""
+                UPDATE {table}
+                SET {c('HEARTBEAT_AT')} = CURRENT_TIMESTAMP,
+                    {c('LEASE_EXPIRES_AT')} = {self._later(db_type, '%s')}
+                WHERE {c('REQUEST_ID')} = %s
+                  AND {c('CLAIMED_BY')} = %s
+                  AND {c('STATUS')} = 'PROCESSING'
+            """
+            params = [(self.settings.lease_seconds, request_id, self.node_id) for request_id in request_ids]
+        else:
+            query = f"""
+                UPDATE {table}
+                SET HEARTBEAT_AT = SYSTIMESTAMP,
+                    LEASE_EXPIRES_AT = {self._later(db_type, ':lease_seconds')}
+                WHERE REQUEST_ID = :request_id
+                  AND CLAIMED_BY = :claimed_by
+                  AND STATUS = 'PROCESSING'
+            """
+            params = [
+                {"lease_seconds": self.settings.lease_seconds, "request_id": request_id, "claimed_by": self.node_id}
+                for request_id in request_ids
+            ]
+        cursor.executemany(query, params)
+        return cursor.rowcount if isinstance(cursor.rowcount, int) and cursor.rowcount >= 0 else len(request_ids)
+
+    def reclaim_expired(self, cursor) -> Tuple[int, int]:
+        """
+        Put requests with expired leases back to NEW, or FAILED once they used
+        all attempts. Returns (requeued, failed).
+        """
+        db_type = _detect_db_type(cursor.connection)
+        if not self.has_lease_columns(cursor, db_type):
+            return 0, 0
+        table, quoted = self._table(cursor, db_type)
+        c = self._columns(db_type, quoted)
+        now = "CURRENT_TIMESTAMP" if db_type == "POSTGRESQL" else "SYSTIMESTAMP"
+        attempts = f"COALESCE({c('ATTEMPTS')}, 0)"
+        expired = (
+            f"{c('STATUS')} = 'PROCESSING' AND {c('LEASE_EXPIRES_AT')} IS NOT NULL "
+            f"AND {c('LEASE_EXPIRES_AT')} < {now}"
+        )
+        if db_type == "POSTGRESQL":
+            max_attempts, message = "%s", "%s"
+            params: Any = (self.settings.max_attempts,)
+        else:
+            max_attempts, message = ":max_attempts", ":message"
+            params = {"max_attempts": self.settings.max_attempts}
+
+        failure = json.dumps({
+            "status": "FAILED",
+            "message": f"Lease expired {self.settings.max_attempts} times; the scheduler node running "
+                       f"the request stopped renewing it",
+        })
+        if db_type == "POSTGRESQL":
+            cursor.execute(
+                f"""
+                UPDATE {table}
+                SET {c('STATUS')} = 'FAILED',
+                    {c('COMPLETED_AT')} = {now},
+                    {c('RESULT_PAYLOAD')} = {message}
+                WHERE {expired} AND {attempts} >= {max_attempts}
+                """,
+                (failure, self.settings.max_attempts),
+            )
+        else:
+            cursor.execute(
+                f"""
+                UPDATE {table}
+                SET STATUS = 'FAILED',
+                    COMPLETED_AT = {now},
+                    RESULT_PAYLOAD = {message}
+                WHERE {expired} AND {attempts} >= {max_attempts}
+                """,
+                dict(params, message=failure),
+            )
+        failed = max(cursor.rowcount or 0, 0)
+
+        cursor.execute(
+            f"""
+            UPDATE {table}
+            SET {c('STATUS')} = 'NEW',
+                {c('CLAIMED_AT')} = NULL,
+                {c('CLAIMED_BY')} = NULL,
+                {c('HEARTBEAT_AT')} = NULL,
+                {c('LEASE_EXPIRES_AT')} = NULL
+            WHERE {expired} AND {attempts} < {max_attempts}
+            """,
+            params,
+        )
+        requeued = max(cursor.rowcount or 0, 0)
+        if requeued or failed:
+            warning(f"[QueueLease] Expired leases: {requeued} request(s) requeued, {failed} failed after "
+                    f"{self.settings.max_attempts} attempts")
+        return requeued, failed
+
+    def owner_condition(self, db_type: str, quoted: bool = False) -> str:
+        """
+        WHERE condition (one bind: node id) that limits a completion update to
+        requests still claimed by this node. A reclaimed request is NEW again
+        (CLAIMED_BY cleared) or claimed by another attempt, so it never matches.
+        """
+        c = self._columns(db_type, quoted)
+        placeholder = "%s" if db_type == "POSTGRESQL" else ":claimed_by"
+        return f"{c('CLAIMED_BY')} = {placeholder}"
+
+
+class LeaseHeartbeat:
+    """
+    Background thread renewing the leases of the requests this node is running.
+    ``connection_factory`` opens a metadata connection for each renewal round.
+    """
+
+    def __init__(self, store: QueueLeaseStore, connection_factory: Callable[[], Any]):
+        self.store = store
+        self._connection_factory = connection_factory
+        self._active: Set[Any] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, request_id: Any) -> None:
+        with self._lock:
+            self._active.add(request_id)
+
+    def release(self, request_id: Any) -> None:
+        with self._lock:
+            self._active.discard(request_id)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="queue-lease-heartbeat", daemon=True)
+            self._thread.start()
+            info(f"[QueueLease] Node {self.store.node_id}: lease {self.store.settings.lease_seconds}s, "
+                 f"heartbeat every {self.store.settings.heartbeat_seconds}s, "
+                 f"max {self.store.settings.max_attempts} attempts")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def beat(self) -> int:
+        """Renew all active leases once; returns rows renewed."""
+        with self._lock:
+            request_ids = list(self._active)
+        if not request_ids:
+            return 0
+        connection = self._connection_factory()
+        cursor = connection.cursor()
+        try:
+            renewed = self.store.renew(cursor, request_ids)
+            connection.commit()
+            if renewed < len(request_ids):
+                warning(f"[QueueLease] Renewed {renewed} of {len(request_ids)} leases; the rest were "
+                        f"reclaimed or completed elsewhere")
+            else:
+                debug(f"[QueueLease] Renewed {renewed} leases")
+            return renewed
+        finally:
+            try:
+                cursor.close()
+            finally:
+                connection.close()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.store.settings.heartbeat_seconds):
+            try:
+                self.beat()
+            except Exception as e:
+                warning(f"[QueueLease] Heartbeat failed: {e}")
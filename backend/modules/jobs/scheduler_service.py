@@ -27,50 +27,64 @@ from apscheduler.triggers.interval import IntervalTrigger
 # Support both FastAPI (package import) and legacy Flask (relative import) contexts
 try:
     from backend.database.dbconnect import create_metadata_connection
-    from backend.modules.logger import info, error, debug, warning
+    from backend.modules.logger import info, error, debug, warning, log_context
     from backend.modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name
     from backend.modules.jobs.pkgdwprc_python import (
         JobRequestType,
         JobSchedulerService,
         ImmediateJobRequest,
         _calculate_next_run_time,
+        schedule_request_id,
     )
     from backend.modules.jobs.scheduler_models import SchedulerConfig, QueueRequest
     from backend.modules.jobs.execution_engine import JobExecutionEngine
-    from backend.modules.jobs.scheduler_frequency import build_trigger
+    from backend.modules.jobs.job_dag import (
+        load_expected_durations,
+        load_job_dag,
+        load_latest_runs,
+    )
+    from backend.modules.jobs.scheduler_frequency import build_trigger, last_fire_time
+    from backend.modules.jobs.scheduler_queue_lease import LeaseHeartbeat, QueueLeaseStore
+    from backend.modules.jobs.scheduler_sync import ScheduleSyncState, read_schedule_watermark, schedule_fingerprint
+    from backend.modules.jobs.scheduler_worker_pool import (
+        ISOLATED_REQUEST_TYPES,
+        create_worker_pool,
+        execute_queue_request,
+    )
 except ImportError:  # When running Flask app.py directly inside backend
     # Fallback imports for legacy Flask-style context
     try:
         from database.dbconnect import create_metadata_connection  # type: ignore
-        from modules.logger import info, error, debug, warning  # type: ignore
+        from modules.logger import info, error, debug, warning, log_context  # type: ignore
         from modules.common.db_table_utils import _detect_db_type, get_postgresql_table_name  # type: ignore
         from modules.jobs.pkgdwprc_python import (  # type: ignore
             JobRequestType,
             JobSchedulerService,
             ImmediateJobRequest,
             _calculate_next_run_time,
+            schedule_request_id,
         )
         from modules.jobs.scheduler_models import SchedulerConfig, QueueRequest  # type: ignore
         from modules.jobs.execution_engine import JobExecutionEngine  # type: ignore
-        from modules.jobs.scheduler_frequency import build_trigger  # type: ignore
+        from modules.jobs.job_dag import (  # type: ignore
+            load_expected_durations,
+            load_job_dag,
+            load_latest_runs,
+        )
+        from modules.jobs.scheduler_frequency import build_trigger, last_fire_time  # type: ignore
+        from modules.jobs.scheduler_queue_lease import LeaseHeartbeat, QueueLeaseStore  # type: ignore
+        from modules.jobs.scheduler_sync import ScheduleSyncState, read_schedule_watermark, schedule_fingerprint  # type: ignore
+        from modules.jobs.scheduler_worker_pool import (  # type: ignore
+            ISOLATED_REQUEST_TYPES,
+            create_worker_pool,
+            execute_queue_request,
+        )
     except ImportError:
         # As a last resort, re-raise to surface the real import problem
         raise
 import os
 
 
-def _read_lob(value):
-    """Helper function to read Oracle LOB objects."""
-    if value is None:
-        return None
-    if hasattr(value, "read"):
-        data = value.read()
-        if isinstance(data, bytes):
-            return data.decode("utf-8")
-        return data
-    return value
-
-
 class SchedulerService:
     def __init__(self, config: Optional[SchedulerConfig] = None):
         # Allow timezone to be overridden via env (e.g., DMS_TIMEZONE=Asia/Kolkata)
@@ -91,8 +105,17 @@ class SchedulerService:
         self.scheduler = BackgroundScheduler(timezone=self.config.timezone)
         self.executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
         self.engine = JobExecutionEngine()
+        # Worker processes for jobs/reports/uploads (None: run them on executor threads)
+        self.worker_pool = create_worker_pool(self.config.max_workers)
+        # Leases on claimed DMS_PRCREQ rows, renewed while their requests run
+        self.lease_store = QueueLeaseStore()
+        self.heartbeat = LeaseHeartbeat(self.lease_store, create_metadata_connection)
         self._stop_event = threading.Event()
         self._scheduled_job_ids = set()
+        # Change detection for DMS_JOBSCH and resolved metadata table references
+        self.sync_state = ScheduleSyncState()
+        self._sync_lock = threading.Lock()
+        self._table_refs: Dict[Tuple[str, str], str] = {}
 
     def start(self) -> None:
         info("=" * 80)
@@ -101,8 +124,15 @@ class SchedulerService:
         info(f"Queue poll interval: {self.config.poll_interval_seconds} seconds")
         info(f"Max workers: {self.config.max_workers}")
         info(f"Timezone: {self.config.timezone}")
+        info(f"Process isolation: {'enabled' if self.worker_pool else 'disabled'}")
+        info(f"Scheduler node: {self.lease_store.node_id}")
         info("=" * 80)
         
+        # Start worker processes up front so the first requests don't pay for it
+        if self.worker_pool:
+            self.worker_pool.start()
+        self.heartbeat.start()
+        
         # Add sync_schedules job - this runs periodically to refresh schedules from DB
         sync_job = self.scheduler.add_job(
             self._sync_schedules,
@@ -223,15 +253,33 @@ class SchedulerService:
         self._stop_event.set()
         self.scheduler.shutdown(wait=False)
         self.executor.shutdown(wait=True)
+        if self.worker_pool:
+            self.worker_pool.shutdown()
+        self.heartbeat.stop()
 
     # ------------------------------------------------------------------ #
     # Schedule sync + queue polling
     # ------------------------------------------------------------------ #
-    def _sync_schedules(self) -> None:
+    def _sync_schedules(self, force: bool = False) -> None:
+        """
+        Refresh APScheduler jobs from DMS_JOBSCH, then queue due report and
+        file upload schedules. ``force`` re-reads DMS_JOBSCH even when its
+        watermark has not moved.
+        """
+        with self._sync_lock:
+            self._sync_job_schedules(force)
+            self._sync_report_schedules()
+            self._sync_flupld_schedules()
+
+    def request_schedule_refresh(self) -> None:
+        """Re-read DMS_JOBSCH now instead of at the next refresh interval."""
+        self.sync_state.request_refresh()
+        self.executor.submit(self._sync_schedules)
+
+    def _sync_job_schedules(self, force: bool = False) -> None:
         """
-        Refresh APScheduler jobs from DMS_JOBSCH.  This is a placeholder that
-        simply logs the desire to sync; the concrete implementation will map
-        frequency codes to APScheduler triggers.
+        Refresh APScheduler jobs from DMS_JOBSCH. Only schedules added, changed
+        or removed since the last sync touch APScheduler (see scheduler_sync).
         """
         debug("[_sync_schedules] Starting schedule synchronization...")
         try:
@@ -242,15 +290,13 @@ class SchedulerService:
                 
                 debug(f"[_sync_schedules] Database type: {db_type}, Schema: {schema}")
                 
-                # Get table reference for PostgreSQL (handles case sensitivity)
+                dms_jobsch_full = self._metadata_table(cursor, db_type, 'DMS_JOBSCH')
+                watermark = read_schedule_watermark(cursor, db_type, dms_jobsch_full)
+                if not self.sync_state.needs_full_sync(watermark, force):
+                    debug(f"[_sync_schedules] DMS_JOBSCH unchanged {watermark}; {len(self._scheduled_job_ids)} jobs kept")
+                    return
+
                 if db_type == "POSTGRESQL":
-                    schema_lower = schema.lower() if schema else 'public'
-                    dms_jobsch_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOBSCH')
-                    # Quote table name if it contains uppercase letters (was created with quotes)
-                    dms_jobsch_ref = f'"{dms_jobsch_table}"' if dms_jobsch_table != dms_jobsch_table.lower() else dms_jobsch_table
-                    schema_prefix = f'{schema_lower}.' if schema else ''
-                    dms_jobsch_full = f'{schema_prefix}{dms_jobsch_ref}'
-                    
                     debug(f"[_sync_schedules] PostgreSQL table: {dms_jobsch_full}")
                     
                     # PostgreSQL is case-sensitive for column names
@@ -283,12 +329,11 @@ class SchedulerService:
                             error(f"[_sync_schedules] Both queries failed. Uppercase error: {e}, Lowercase error: {e2}")
                             return
                 else:  # Oracle
-                    schema_prefix = f'{schema}.' if schema else ''
                     cursor.execute(
                         f"""
                         SELECT jobschid, mapref, frqcd, frqdd, frqhh, frqmi,
                                strtdt, enddt, schflg
-                        FROM {schema_prefix}DMS_JOBSCH
+                        FROM {dms_jobsch_full}
                         WHERE curflg = 'Y'
                         """
                     )
@@ -306,6 +351,7 @@ class SchedulerService:
                 debug(f"[_sync_schedules] Found {len(rows)} schedule records in DMS_JOBSCH")
 
             desired_jobs = {}
+            fingerprints = {}
             for row in rows:
                 record = {columns[i]: row[i] for i in range(len(columns))}
                 job_id = f"schedule:{record['JOBSCHID']}"
@@ -315,6 +361,7 @@ class SchedulerService:
                 
                 if schflg == "Y":
                     desired_jobs[job_id] = record
+                    fingerprints[job_id] = schedule_fingerprint(record)
                     debug(f"[_sync_schedules] Added to desired_jobs: {job_id} for {record.get('MAPREF')}")
                 else:
                     debug(f"[_sync_schedules] Skipping {job_id} - SCHFLG is not 'Y' (value: {schflg})")
@@ -327,6 +374,7 @@ class SchedulerService:
                 try:
                     self.scheduler.remove_job(job_id)
                     self._scheduled_job_ids.remove(job_id)
+                    self.sync_state.forget(job_id)
                     debug(f"[_sync_schedules] Removed schedule job {job_id}")
                     removed_count += 1
                 except Exception as e:
@@ -345,6 +393,11 @@ class SchedulerService:
             now = datetime.now(scheduler_tz)
             
             for job_id, record in desired_jobs.items():
+                if job_id in self._scheduled_job_ids and self.sync_state.changed(job_id, fingerprints[job_id]):
+                    # Frequency, dates or flags edited in place: replace the trigger below
+                    info(f"[_sync_schedules] Schedule {job_id} changed, replacing its trigger")
+                    self._scheduled_job_ids.discard(job_id)
+                    rescheduled_count += 1
                 if job_id in self._scheduled_job_ids:
                     # Check if we need to update the job (e.g., if schedule changed or time has passed)
                     try:
@@ -450,14 +503,10 @@ class SchedulerService:
                         replace_existing=True,
                     )
                     self._scheduled_job_ids.add(job_id)
+                    self.sync_state.remember(job_id, fingerprints[job_id])
                     added_count += 1
                     
-                    # Wait a moment for APScheduler to calculate next_run_time
-                    import time
-                    time.sleep(0.2)
-                    
-                    # Get the job again to check next_run_time
-                    job = self.scheduler.get_job(job_id)
+                    # The scheduler is running, so add_job has computed next_run_time
                     next_run = getattr(job, 'next_run_time', None) if job else None
                     next_run_str = str(next_run) if next_run else 'Not scheduled yet'
                     
@@ -517,44 +566,43 @@ class SchedulerService:
                         "but none are currently registered in APScheduler."
                     )
             
+            self.sync_state.mark_synced(watermark)
             debug(f"[_sync_schedules] Schedule sync complete. Total scheduled jobs: {len(self._scheduled_job_ids)}")
 
         except Exception as e:
             import traceback
             error(f"[_sync_schedules] Unexpected error during schedule sync: {e}\nTraceback: {traceback.format_exc()}")
 
-        self._sync_report_schedules()
-        self._sync_flupld_schedules()
-
     def _sync_report_schedules(self) -> None:
+        """Queue the active DMS_RPRT_SCHD schedules that are due."""
         with self._db_cursor() as cursor:
             connection = cursor.connection
             db_type = _detect_db_type(connection)
-            schema = os.getenv('DMS_SCHEMA', 'TRG')
+            dms_rprt_schd_full = self._metadata_table(cursor, db_type, 'DMS_RPRT_SCHD')
+            # Only due rows are read; naive NXT_RUN_DT values are in scheduler time
+            due_before = datetime.now(self.scheduler.timezone).replace(tzinfo=None)
 
             if db_type == "POSTGRESQL":
-                schema_lower = schema.lower() if schema else 'public'
-                dms_rprt_schd_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_RPRT_SCHD')
-                dms_rprt_schd_ref = f'"{dms_rprt_schd_table}"' if dms_rprt_schd_table != dms_rprt_schd_table.lower() else dms_rprt_schd_table
-                schema_prefix = f'{schema_lower}.' if schema else ''
-                dms_rprt_schd_full = f'{schema_prefix}{dms_rprt_schd_ref}'
                 cursor.execute(
                     f"""
                     SELECT schdid, rprtid, frqncy, tm_prm, otpt_fmt, dstn_typ, emal_to, fl_pth,
                            nxt_run_dt, lst_run_dt, stts
                     FROM {dms_rprt_schd_full}
                     WHERE UPPER(COALESCE(stts, '')) = 'ACTIVE'
-                    """
+                      AND (nxt_run_dt IS NULL OR nxt_run_dt <= %s)
+                    """,
+                    (due_before,),
                 )
             else:
-                schema_prefix = f'{schema}.' if schema else ''
                 cursor.execute(
                     f"""
                     SELECT schdid, rprtid, frqncy, tm_prm, otpt_fmt, dstn_typ, emal_to, fl_pth,
                            nxt_run_dt, lst_run_dt, stts
-                    FROM {schema_prefix}DMS_RPRT_SCHD
+                    FROM {dms_rprt_schd_full}
                     WHERE UPPER(COALESCE(stts, '')) = 'ACTIVE'
-                    """
+                      AND (nxt_run_dt IS NULL OR nxt_run_dt <= :due_before)
+                    """,
+                    {"due_before": due_before},
                 )
             rows = cursor.fetchall()
             columns = [col[0] for col in cursor.description]
@@ -591,7 +639,13 @@ class SchedulerService:
             if file_path:
                 payload["filePath"] = file_path
             try:
-                self._queue_report_request(report_id, payload)
+                # Keyed by the due time, so nodes that read the same due row queue it once
+                request_id = schedule_request_id(
+                    "RPRTSCHD", schedule_id, sched.get("NXT_RUN_DT") or sched.get("LST_RUN_DT")
+                )
+                if not self._queue_report_request(report_id, payload, request_id=request_id):
+                    info(f"Report schedule {schedule_id} was already queued by another node")
+                    continue
                 next_dt, status = self._calculate_next_report_run(sched.get("FRQNCY"), now)
                 self._update_report_schedule(schedule_id, last_run=now, next_run=next_dt, status=status)
                 info(f"Queued report schedule {schedule_id} for report {report_id}")
@@ -603,29 +657,29 @@ class SchedulerService:
         with self._db_cursor() as cursor:
             connection = cursor.connection
             db_type = _detect_db_type(connection)
-            schema = os.getenv('DMS_SCHEMA', 'TRG')
+            dms_flupld_schd_full = self._metadata_table(cursor, db_type, 'DMS_FLUPLD_SCHD')
+            # Only due rows are read; naive NXT_RUN_DT values are in scheduler time
+            due_before = datetime.now(self.scheduler.timezone).replace(tzinfo=None)
 
             if db_type == "POSTGRESQL":
-                schema_lower = schema.lower() if schema else 'public'
-                dms_flupld_schd_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_FLUPLD_SCHD')
-                dms_flupld_schd_ref = f'"{dms_flupld_schd_table}"' if dms_flupld_schd_table != dms_flupld_schd_table.lower() else dms_flupld_schd_table
-                schema_prefix = f'{schema_lower}.' if schema else ''
-                dms_flupld_schd_full = f'{schema_prefix}{dms_flupld_schd_ref}'
                 cursor.execute(
                     f"""
                     SELECT schdid, flupldref, frqncy, tm_prm, nxt_run_dt, lst_run_dt, stts
                     FROM {dms_flupld_schd_full}
                     WHERE UPPER(COALESCE(stts, '')) = 'ACTIVE'
-                    """
+                      AND (nxt_run_dt IS NULL OR nxt_run_dt <= %s)
+                    """,
+                    (due_before,),
                 )
             else:
-                schema_prefix = f'{schema}.' if schema else ''
                 cursor.execute(
                     f"""
                     SELECT schdid, flupldref, frqncy, tm_prm, nxt_run_dt, lst_run_dt, stts
-                    FROM {schema_prefix}DMS_FLUPLD_SCHD
+                    FROM {dms_flupld_schd_full}
                     WHERE UPPER(COALESCE(stts, '')) = 'ACTIVE'
-                    """
+                      AND (nxt_run_dt IS NULL OR nxt_run_dt <= :due_before)
+                    """,
+                    {"due_before": due_before},
                 )
             rows = cursor.fetchall()
             columns = [col[0] for col in cursor.description]
@@ -690,7 +744,13 @@ class SchedulerService:
             enddt = None
             
             try:
-                self._queue_file_upload_request(flupldref, payload={"load_mode": "INSERT"})
+                # Keyed by the due time, so nodes that read the same due row queue it once
+                request_id = schedule_request_id(
+                    "FLUPLDSCHD", schedule_id, sched.get("NXT_RUN_DT") or sched.get("LST_RUN_DT")
+                )
+                if not self._queue_file_upload_request(flupldref, payload={"load_mode": "INSERT"}, request_id=request_id):
+                    info(f"[_sync_flupld_schedules] Schedule {schedule_id} ({flupldref}) was already queued by another node")
+                    continue
                 info(f"[_sync_flupld_schedules] Queued file upload request for {flupldref} (schedule {schedule_id})")
                 
                 # Calculate next run time
@@ -736,138 +796,50 @@ class SchedulerService:
     def _poll_queue(self) -> None:
         """
         Poll DMS_PRCREQ for pending requests.
+
+        Expired leases are reclaimed first; NEW requests are then claimed
+        atomically for this node, so several scheduler nodes can share the queue.
         """
         debug("[_poll_queue] Starting queue poll...")
         try:
             with self._db_cursor() as cursor:
-                connection = cursor.connection
-                db_type = _detect_db_type(connection)
-                schema = os.getenv('DMS_SCHEMA', 'TRG')
-                
-                debug(f"[_poll_queue] Database type: {db_type}, Schema: {schema}")
-                
-                # Get table reference for PostgreSQL (handles case sensitivity)
-                if db_type == "POSTGRESQL":
-                    schema_lower = schema.lower() if schema else 'public'
-                    dms_prcreq_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_PRCREQ')
-                    # Quote table name if it contains uppercase letters (was created with quotes)
-                    dms_prcreq_ref = f'"{dms_prcreq_table}"' if dms_prcreq_table != dms_prcreq_table.lower() else dms_prcreq_table
-                    schema_prefix = f'{schema_lower}.' if schema else ''
-                    dms_prcreq_full = f'{schema_prefix}{dms_prcreq_ref}'
-                    
-                    # PostgreSQL: Use LIMIT instead of FETCH FIRST
-                    # Try uppercase column names first, fallback to lowercase
-                    try:
-                        cursor.execute(
-                            f"""
-                            SELECT "REQUEST_ID", "MAPREF", "REQUEST_TYPE", "PAYLOAD"
-                            FROM {dms_prcreq_full}
-                            WHERE "STATUS" = 'NEW'
-                            ORDER BY "REQUESTED_AT"
-                            LIMIT 25
-                            """
-                        )
-                    except Exception as e:
-                        # Fallback to lowercase column names if uppercase fails
-                        cursor.execute(
-                            f"""
-                            SELECT request_id, mapref, request_type, payload
-                            FROM {dms_prcreq_full}
-                            WHERE status = 'NEW'
-                            ORDER BY requested_at
-                            LIMIT 25
-                            """
-                        )
-                else:  # Oracle
-                    schema_prefix = f'{schema}.' if schema else ''
-                    cursor.execute(
-                        f"""
-                        SELECT request_id, mapref, request_type, payload
-                        FROM {schema_prefix}DMS_PRCREQ
-                        WHERE status = 'NEW'
-                        ORDER BY requested_at
-                        FETCH FIRST 25 ROWS ONLY
-                        """
-                    )
-                
-                rows = cursor.fetchall()
+                self.lease_store.reclaim_expired(cursor)
+                cursor.connection.commit()
+
+                # Claimed rows go to PROCESSING with this node's lease, which
+                # also allows users to cancel jobs that are being processed
+                rows = self.lease_store.claim(cursor, limit=25)
+                cursor.connection.commit()
                 if not rows:
                     debug("[_poll_queue] No pending scheduler requests")
                     return
-                
-                info(f"[_poll_queue] Found {len(rows)} pending requests")
 
-                claimed_ids: List[str] = []
-                requests: List[QueueRequest] = []
-                for row in rows:
-                    req_id, mapref, req_type, payload = row
-                    debug(f"[_poll_queue] Processing request: request_id={req_id}, mapref={mapref}, type={req_type}")
-                    # Read LOB object if it's a LOB
-                    payload_str = _read_lob(payload)
-                    payload_dict = json.loads(payload_str) if payload_str else {}
+                info(f"[_poll_queue] Claimed {len(rows)} pending requests for node {self.lease_store.node_id}")
+
+            requests: List[QueueRequest] = []
+            for req_id, mapref, req_type, payload_str in rows:
+                debug(f"[_poll_queue] Processing request: request_id={req_id}, mapref={mapref}, type={req_type}")
+                try:
                     requests.append(
                         QueueRequest(
                             request_id=req_id,
                             mapref=mapref,
                             request_type=JobRequestType(req_type),
-                            payload=payload_dict,
+                            payload=json.loads(payload_str) if payload_str else {},
                         )
                     )
-                    claimed_ids.append(req_id)
-
-                # Update with database-specific syntax
-                # Mark as PROCESSING immediately when picked up (instead of CLAIMED)
-                # This allows users to cancel jobs that are being processed
-                if db_type == "POSTGRESQL":
-                    # Try uppercase column names first
-                    try:
-                        cursor.executemany(
-                            f"""
-                            UPDATE {dms_prcreq_full}
-                            SET "STATUS" = 'PROCESSING',
-                                "CLAIMED_AT" = CURRENT_TIMESTAMP,
-                                "CLAIMED_BY" = %s
-                            WHERE "REQUEST_ID" = %s
-                            """,
-                            [
-                                ("PY_SCHED", request_id)
-                                for request_id in claimed_ids
-                            ],
-                        )
-                    except Exception:
-                        # Fallback to lowercase
-                        cursor.executemany(
-                            f"""
-                            UPDATE {dms_prcreq_full}
-                            SET status = 'PROCESSING',
-                                claimed_at = CURRENT_TIMESTAMP,
-                                claimed_by = %s
-                            WHERE request_id = %s
-                            """,
-                            [
-                                ("PY_SCHED", request_id)
-                                for request_id in claimed_ids
-                            ],
-                        )
-                else:  # Oracle
-                    cursor.executemany(
-                        f"""
-                        UPDATE {schema_prefix}DMS_PRCREQ
-                        SET status = 'PROCESSING',
-                            claimed_at = SYSTIMESTAMP,
-                            claimed_by = :claimed_by
-                        WHERE request_id = :request_id
-                        """,
-                        [
-                            {"claimed_by": "PY_SCHED", "request_id": request_id}
-                            for request_id in claimed_ids
-                        ],
+                except Exception as exc:
+                    # Already claimed: fail it instead of leaving it to expire and retry
+                    error(f"[_poll_queue] Invalid request {req_id}: {exc}")
+                    self._mark_request_complete(
+                        QueueRequest(req_id, mapref, JobRequestType.IMMEDIATE, {}),
+                        "FAILED",
+                        {"message": f"Invalid request: {exc}"},
                     )
-                cursor.connection.commit()
-                debug(f"[_poll_queue] Marked {len(claimed_ids)} requests as PROCESSING")
 
             for request in requests:
                 debug(f"[_poll_queue] Submitting request {request.request_id} ({request.mapref}) to executor")
+                self.heartbeat.track(request.request_id)
                 self.executor.submit(self._execute_request, request)
         except Exception as e:
             import traceback
@@ -880,17 +852,7 @@ class SchedulerService:
             # Only update if status is not already PROCESSING (safety check)
             # self._mark_request_processing(request)  # No longer needed - already PROCESSING
             
-            # Handle REPORT type requests separately
-            if request.request_type.value == "REPORT":
-                info(f"[_execute_request] Executing REPORT request for {request.mapref}")
-                result = self._execute_report_request(request)
-            elif request.request_type.value == "FILE_UPLOAD":
-                info(f"[_execute_request] Executing FILE_UPLOAD request for {request.mapref}")
-                result = self._execute_file_upload_request(request)
-            else:
-                info(f"[_execute_request] Executing job flow for {request.mapref} using execution engine")
-                result = self.engine.execute(request)
-                info(f"[_execute_request] Execution completed for {request.mapref}, result: {result}")
+            result = self._run_request(request)
             info(f"[_execute_request] Marking request {request.request_id} as DONE")
             self._mark_request_complete(request, "DONE", result)
             info(f"[_execute_request] Successfully completed request {request.request_id}")
@@ -911,72 +873,25 @@ class SchedulerService:
                 )
             except Exception as mark_exc:
                 error(f"[_execute_request] Failed to mark request as failed: {mark_exc}")
+        finally:
+            self.heartbeat.release(request.request_id)
 
-    def _execute_report_request(self, request: QueueRequest) -> Dict[str, Any]:
-        """Execute a REPORT type request using the ReportExecutor."""
-        # Support both FastAPI (package import) and legacy Flask (relative import) contexts
-        try:
-            from backend.modules.reports.report_executor import get_report_executor
-        except ImportError:  # When running Flask app.py directly inside backend
-            from modules.reports.report_executor import get_report_executor  # type: ignore
-
-        payload = request.payload or {}
-        # Ensure the downstream executor knows the originating queue request ID
-        # so it can be stored in DMS_RPRT_RUN.RQST_ID (NOT NULL column).
-        if "requestId" not in payload:
-            payload["requestId"] = request.request_id
-        report_id = payload.get("reportId")
-        
-        if not report_id:
-            # Try to extract from mapref (format: "REPORT:123")
-            if request.mapref and request.mapref.startswith("REPORT:"):
-                report_id = int(request.mapref.split(":")[1])
-        
-        if not report_id:
-            raise ValueError("Report ID not found in request payload or mapref")
-        
-        executor = get_report_executor()
-        result = executor.execute_report(report_id=report_id, payload=payload)
-        
-        info(f"[SchedulerService] Report {report_id} executed successfully: {result}")
-        return result
-
-    def _execute_file_upload_request(self, request: QueueRequest) -> Dict[str, Any]:
-        """
-        Execute file upload request using streaming executor for better memory efficiency.
-        Uses chunked processing to handle large files without loading entire file into memory.
-        """
-        # Support both FastAPI (package import) and legacy Flask (relative import) contexts
-        try:
-            from backend.modules.file_upload.streaming_file_executor import StreamingFileExecutor
-        except ImportError:  # When running Flask app.py directly inside backend
-            from modules.file_upload.streaming_file_executor import StreamingFileExecutor  # type: ignore
+    def _run_request(self, request: QueueRequest) -> Dict[str, Any]:
+        with log_context(request_id=request.request_id, mapref=request.mapref,
+                         request_type=request.request_type.value):
+            return self._dispatch_request(request)
 
-        payload = request.payload or {}
-        flupldref = payload.get("flupldref")
-        
-        if not flupldref:
-            # Try to extract from mapref (format: "FLUPLD:ReportData")
-            if request.mapref and request.mapref.startswith("FLUPLD:"):
-                flupldref = request.mapref.split(":", 1)[1]
-        
-        if not flupldref:
-            raise ValueError("File upload reference not found in request payload or mapref")
-        
-        load_mode = payload.get("load_mode", "INSERT")
-        username = payload.get("username", "system")  # Use username from payload if provided
-        
-        # Use streaming executor for better memory efficiency
-        executor = StreamingFileExecutor(chunk_size=10000)  # Process 10K rows per chunk
-        result = executor.execute(
-            flupldref=flupldref,
-            file_path=None,  # Use file path from configuration
-            load_mode=load_mode,
-            username=username
-        )
-        
-        info(f"[SchedulerService] File upload {flupldref} executed successfully: {result.get('rows_successful', 0)} rows loaded")
-        return result
+    def _dispatch_request(self, request: QueueRequest) -> Dict[str, Any]:
+        if request.request_type == JobRequestType.REFRESH_SCHEDULE:
+            # Pushed by schedule writes (JobSchedulerService.queue_schedule_refresh)
+            self.sync_state.request_refresh()
+            self._sync_schedules()
+            return {"status": "SUCCESS", "message": "Schedules refreshed"}
+        if self.worker_pool and request.request_type.value in ISOLATED_REQUEST_TYPES:
+            # A crash or limit breach in the worker fails this request only
+            info(f"[_execute_request] Executing {request.request_type.value} request for {request.mapref} in a worker process")
+            return self.worker_pool.run(request)
+        return execute_queue_request(request, self.engine)
 
     def _mark_request_processing(self, request: QueueRequest) -> None:
         """Mark request as PROCESSING when execution starts."""
@@ -1057,11 +972,13 @@ class SchedulerService:
                                 "RESULT_PAYLOAD" = %s,
                                 "COMPLETED_AT" = CURRENT_TIMESTAMP
                             WHERE "REQUEST_ID" = %s
+                              AND {self.lease_store.owner_condition(db_type, quoted=True)}
                             """,
                             (
                                 status,
                                 json.dumps(payload, default=str),
                                 request.request_id,
+                                self.lease_store.node_id,
                             ),
                         )
                     except Exception:
@@ -1073,11 +990,13 @@ class SchedulerService:
                                 result_payload = %s,
                                 completed_at = CURRENT_TIMESTAMP
                             WHERE request_id = %s
+                              AND {self.lease_store.owner_condition(db_type)}
                             """,
                             (
                                 status,
                                 json.dumps(payload, default=str),
                                 request.request_id,
+                                self.lease_store.node_id,
                             ),
                         )
                 else:  # Oracle
@@ -1090,13 +1009,21 @@ class SchedulerService:
                             result_payload = :result_payload,
                             completed_at = SYSTIMESTAMP
                         WHERE request_id = :request_id
+                          AND {self.lease_store.owner_condition(db_type)}
                         """,
                         {
                             "status": status,
                             "result_payload": json.dumps(payload, default=str),
                             "request_id": request.request_id,
+                            "claimed_by": self.lease_store.node_id,
                         },
                     )
+                if cursor.rowcount == 0:
+                    # The lease expired and the request was reclaimed by another attempt
+                    warning(f"[_mark_request_complete] Request {request.request_id} is no longer leased by "
+                            f"{self.lease_store.node_id}; its {status} result was not recorded")
+                    connection.rollback()
+                    return
                 cursor.connection.commit()
                 info(f"[_mark_request_complete] Successfully updated request {request.request_id} to status {status}")
         except Exception as e:
@@ -1109,11 +1036,31 @@ class SchedulerService:
             and payload.get("status") == "SUCCESS"
             and request.request_type in {JobRequestType.IMMEDIATE, JobRequestType.HISTORY}
         ):
-            self._enqueue_child_jobs(request.mapref)
+            # The parent is already DONE; a failure to queue its children must not change that
+            try:
+                self._enqueue_child_jobs(request.mapref)
+            except Exception as e:
+                import traceback
+                error(f"[_mark_request_complete] Failed to queue dependents of {request.mapref}: {e}\nTraceback: {traceback.format_exc()}")
 
     # ------------------------------------------------------------------ #
     # DB helpers
     # ------------------------------------------------------------------ #
+    def _metadata_table(self, cursor, db_type: str, table_name: str) -> str:
+        """Schema-qualified reference to a metadata table, resolved once per service."""
+        key = (db_type, table_name)
+        if key not in self._table_refs:
+            schema = os.getenv('DMS_SCHEMA', 'TRG')
+            if db_type == "POSTGRESQL":
+                schema_lower = schema.lower() if schema else 'public'
+                actual = get_postgresql_table_name(cursor, schema_lower, table_name)
+                # Quote table name if it contains uppercase letters (was created with quotes)
+                table_ref = f'"{actual}"' if actual != actual.lower() else actual
+                self._table_refs[key] = f'{schema_lower}.{table_ref}' if schema else table_ref
+            else:
+                self._table_refs[key] = f'{schema}.{table_name}' if schema else table_name
+        return self._table_refs[key]
+
     @contextmanager
     def _db_cursor(self):
         connection = create_metadata_connection()
@@ -1130,15 +1077,25 @@ class SchedulerService:
         info(f"[_enqueue_scheduled_job] Trigger fired! Enqueuing scheduled job for {mapref} (jobschid={jobschid})")
         try:
             payload = {"source": "schedule", "jobschid": jobschid}
+            # Every scheduler node fires the same trigger; the request id names the
+            # firing, so only the first node's insert is queued
+            now = datetime.now(self.scheduler.timezone)
+            job = self.scheduler.get_job(f"schedule:{jobschid}") if jobschid is not None else None
+            fire_time = (last_fire_time(job.trigger, now) if job else None) or now.replace(second=0, microsecond=0)
+            request_id = schedule_request_id("JOBSCH", jobschid if jobschid is not None else mapref, fire_time)
             info(f"[_enqueue_scheduled_job] Calling _queue_immediate_job with mapref={mapref}, payload={payload}")
-            self._queue_immediate_job(mapref, payload)
-            info(f"[_enqueue_scheduled_job] Successfully enqueued job for {mapref}")
+            if self._queue_immediate_job(mapref, payload, request_id=request_id):
+                info(f"[_enqueue_scheduled_job] Successfully enqueued job for {mapref}")
+            else:
+                info(f"[_enqueue_scheduled_job] {mapref} firing at {fire_time} was already queued by another node")
         except Exception as e:
             import traceback
             error(f"[_enqueue_scheduled_job] Failed to enqueue scheduled job {mapref}: {e}\nTraceback: {traceback.format_exc()}")
             raise
 
-    def _queue_immediate_job(self, mapref: str, payload: Optional[Dict[str, Any]] = None) -> None:
+    def _queue_immediate_job(
+        self, mapref: str, payload: Optional[Dict[str, Any]] = None, request_id: Optional[str] = None
+    ) -> Optional[str]:
         info(f"[_queue_immediate_job] Starting to queue immediate job for {mapref} with payload: {payload}")
         connection = None
         try:
@@ -1150,8 +1107,9 @@ class SchedulerService:
                 params=payload or {},
             )
             info(f"[_queue_immediate_job] Calling service.queue_immediate_job with mapref={mapref}, params={payload}")
-            request_id = service.queue_immediate_job(request)
+            request_id = service.queue_immediate_job(request, request_id=request_id)
             info(f"[_queue_immediate_job] Successfully queued job {mapref} with request_id={request_id}")
+            return request_id
         except Exception as exc:
             import traceback
             error(f"[_queue_immediate_job] Failed to enqueue job {mapref}: {exc}\nTraceback: {traceback.format_exc()}")
@@ -1161,12 +1119,14 @@ class SchedulerService:
                 connection.close()
                 debug(f"[_queue_immediate_job] Connection closed for {mapref}")
 
-    def _queue_report_request(self, report_id: int, payload: Optional[Dict[str, Any]] = None) -> None:
+    def _queue_report_request(
+        self, report_id: int, payload: Optional[Dict[str, Any]] = None, request_id: Optional[str] = None
+    ) -> Optional[str]:
         connection = None
         try:
             connection = create_metadata_connection()
             service = JobSchedulerService(connection)
-            service.queue_report_request(report_id=report_id, payload=payload)
+            return service.queue_report_request(report_id=report_id, payload=payload, request_id=request_id)
         except Exception as exc:
             error(f"Failed to enqueue report {report_id}: {exc}")
             raise
@@ -1232,12 +1192,14 @@ class SchedulerService:
             return reference + timedelta(days=365), "ACTIVE"
         return reference + timedelta(days=1), "ACTIVE"
 
-    def _queue_file_upload_request(self, flupldref: str, payload: Optional[Dict[str, Any]] = None) -> None:
+    def _queue_file_upload_request(
+        self, flupldref: str, payload: Optional[Dict[str, Any]] = None, request_id: Optional[str] = None
+    ) -> Optional[str]:
         connection = None
         try:
             connection = create_metadata_connection()
             service = JobSchedulerService(connection)
-            service.queue_file_upload_request(flupldref=flupldref, payload=payload)
+            return service.queue_file_upload_request(flupldref=flupldref, payload=payload, request_id=request_id)
         except Exception as exc:
             error(f"Failed to enqueue file upload {flupldref}: {exc}")
             raise
@@ -1299,71 +1261,39 @@ class SchedulerService:
             raise
 
     def _enqueue_child_jobs(self, parent_mapref: str) -> None:
+        """
+        Queue the children of ``parent_mapref`` whose parents have all
+        succeeded since the child last ran (see JobDag.ready_cycle). The
+        request id is derived from that cycle, so a fan-in child is queued
+        once even when its parents finish on different scheduler nodes.
+        """
         with self._db_cursor() as cursor:
-            connection = cursor.connection
-            db_type = _detect_db_type(connection)
-            schema = os.getenv('DMS_SCHEMA', 'TRG')
-            
-            # Get table reference for PostgreSQL (handles case sensitivity)
-            if db_type == "POSTGRESQL":
-                schema_lower = schema.lower() if schema else 'public'
-                dms_jobsch_table = get_postgresql_table_name(cursor, schema_lower, 'DMS_JOBSCH')
-                # Quote table name if it contains uppercase letters (was created with quotes)
-                dms_jobsch_ref = f'"{dms_jobsch_table}"' if dms_jobsch_table != dms_jobsch_table.lower() else dms_jobsch_table
-                schema_prefix = f'{schema_lower}.' if schema else ''
-                dms_jobsch_full = f'{schema_prefix}{dms_jobsch_ref}'
-                
-                # PostgreSQL: Use %s for bind variables, handle case-sensitive column names
-                try:
-                    cursor.execute(
-                        f"""
-                        SELECT child."MAPREF", child."JOBSCHID"
-                        FROM {dms_jobsch_full} child
-                        JOIN {dms_jobsch_full} parent
-                          ON child."DPND_JOBSCHID" = parent."JOBSCHID"
-                        WHERE parent."MAPREF" = %s
-                          AND parent."CURFLG" = 'Y'
-                          AND child."CURFLG" = 'Y'
-                          AND child."SCHFLG" = 'Y'
-                        """,
-                        (parent_mapref,),
-                    )
-                except Exception:
-                    # If uppercase fails, try lowercase (columns created without quotes)
-                    cursor.execute(
-                        f"""
-                        SELECT child.mapref, child.jobschid
-                        FROM {dms_jobsch_full} child
-                        JOIN {dms_jobsch_full} parent
-                          ON child.dpnd_jobschid = parent.jobschid
-                        WHERE parent.mapref = %s
-                          AND parent.curflg = 'Y'
-                          AND child.curflg = 'Y'
-                          AND child.schflg = 'Y'
-                        """,
-                        (parent_mapref,),
-                    )
-            else:  # Oracle
-                schema_prefix = f'{schema}.' if schema else ''
-                # Oracle: Use :param for bind variables
-                cursor.execute(
-                    f"""
-                    SELECT child.mapref, child.jobschid
-                    FROM {schema_prefix}DMS_JOBSCH child
-                    JOIN {schema_prefix}DMS_JOBSCH parent
-                      ON child.dpnd_jobschid = parent.jobschid
-                    WHERE parent.mapref = :parent_mapref
-                      AND parent.curflg = 'Y'
-                      AND child.curflg = 'Y'
-                      AND child.schflg = 'Y'
-                    """,
-                    {"parent_mapref": parent_mapref},
-                )
-            rows = cursor.fetchall()
+            dag = load_job_dag(cursor)
+            children = sorted(dag.children.get(parent_mapref, ()))
+            if not children:
+                return
+            relatives = set(children).union(*(dag.parents[child] for child in children))
+            latest_runs = load_latest_runs(cursor, relatives)
+            downstream = dag.subgraph(dag.descendants(parent_mapref))
+            durations = load_expected_durations(cursor, downstream.nodes)
 
-        for child_mapref, child_jobschid in rows:
-            info(f"Parent {parent_mapref} completed; enqueueing child {child_mapref}")
-            self._enqueue_scheduled_job(child_mapref, child_jobschid)
+        path, seconds = downstream.critical_path(durations)
+        info(
+            f"Parent {parent_mapref} completed; {len(children)} dependent jobs "
+            f"(critical path {' -> '.join(path)}, expected {seconds:.0f}s)"
+        )
+        for child in children:
+            cycle = dag.ready_cycle(child, latest_runs)
+            if cycle is None:
+                info(f"Dependent job {child} waits for its other parents ({', '.join(sorted(dag.parents[child]))})")
+                continue
+            request_id = self._queue_immediate_job(
+                child,
+                {"source": "dependency", "parent": parent_mapref, "cycle": cycle.isoformat()},
+                request_id=schedule_request_id("DPND", child, cycle),
+            )
+            if request_id is None:
+                info(f"Dependent job {child} is already queued for the cycle ending {cycle}")
 
 
 def main() -> None:
@@ -0,0 +1,108 @@
+"""
+Change detection for the scheduler's DMS_JOBSCH sync.
+
+Every refresh the scheduler first reads a cheap watermark of DMS_JOBSCH (row
+count and latest RECUPDT; all schedule writes stamp RECUPDT). The schedules
+themselves are only re-read when the watermark moved, a refresh was requested
+(REFRESH_SCHEDULE queue request) or SCHEDULER_FULL_SYNC_SECONDS passed since
+the last full read. After a read, a fingerprint of each schedule's trigger
+columns decides which APScheduler jobs are replaced; unchanged ones are left
+alone.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.logger import debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.logger import debug  # type: ignore
+
+
+# Columns that change as schedules run, not when they are edited
+RUNTIME_COLUMNS = ("NXT_RUN_DT", "LST_RUN_DT")
+
+
+def schedule_full_sync_seconds() -> int:
+    """Longest time between full DMS_JOBSCH reads (SCHEDULER_FULL_SYNC_SECONDS, 0 = every refresh)."""
+    try:
+        return max(0, int(os.getenv("SCHEDULER_FULL_SYNC_SECONDS", "900")))
+    except ValueError:
+        return 900
+
+
+def schedule_fingerprint(record: Dict[str, Any]) -> str:
+    """Checksum of the columns that define a schedule's trigger."""
+    values = {key: value for key, value in record.items() if key not in RUNTIME_COLUMNS}
+    return hashlib.sha1(json.dumps(values, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def read_schedule_watermark(cursor, db_type: str, table: str) -> Tuple[Any, Any]:
+    """(row count, latest RECUPDT) of DMS_JOBSCH ``table``."""
+    if db_type == "POSTGRESQL":
+        try:
+            cursor.execute(f'SELECT COUNT(*), MAX("RECUPDT") FROM {table}')
+        except Exception:
+            # Columns created without quotes
+            cursor.connection.rollback()
+            cursor.execute(f"SELECT COUNT(*), MAX(recupdt) FROM {table}")
+    else:
+        cursor.execute(f"SELECT COUNT(*), MAX(recupdt) FROM {table}")
+    row = cursor.fetchone()
+    return (row[0], row[1]) if row else (0, None)
+
+
+class ScheduleSyncState:
+    """Watermark, refresh requests and per-job fingerprints of the DMS_JOBSCH sync."""
+
+    def __init__(self, full_sync_seconds: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        self.full_sync_seconds = schedule_full_sync_seconds() if full_sync_seconds is None else full_sync_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._watermark: Optional[Tuple[Any, Any]] = None
+        self._last_full_sync: Optional[float] = None
+        self._refresh_requested = False
+        self._fingerprints: Dict[str, str] = {}
+
+    def request_refresh(self) -> None:
+        """Make the next sync re-read the schedules whatever the watermark says."""
+        with self._lock:
+            self._refresh_requested = True
+
+    def needs_full_sync(self, watermark: Tuple[Any, Any], force: bool = False) -> bool:
+        with self._lock:
+            if self._refresh_requested:
+                # Consumed here so requests arriving during the sync trigger another one
+                self._refresh_requested = False
+                return True
+            if force or self._last_full_sync is None:
+                return True
+            if watermark != self._watermark:
+                debug(f"[ScheduleSync] DMS_JOBSCH watermark moved: {self._watermark} -> {watermark}")
+                return True
+            return bool(self.full_sync_seconds) and self._clock() - self._last_full_sync >= self.full_sync_seconds
+
+    def mark_synced(self, watermark: Tuple[Any, Any]) -> None:
+        with self._lock:
+            self._watermark = watermark
+            self._last_full_sync = self._clock()
+
+    def changed(self, job_id: str, fingerprint: str) -> bool:
+        """True when ``job_id`` was scheduled from a different version of its row."""
+        with self._lock:
+            previous = self._fingerprints.get(job_id)
+        return previous is not None and previous != fingerprint
+
+    def remember(self, job_id: str, fingerprint: str) -> None:
+        with self._lock:
+            self._fingerprints[job_id] = fingerprint
+
+    def forget(self, job_id: str) -> None:
+        with self._lock:
+            self._fingerprints.pop(job_id, None)
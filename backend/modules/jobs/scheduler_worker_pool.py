@@ -0,0 +1,415 @@
+"""
+Worker processes for scheduled request execution.
+
+By default the scheduler runs mapper jobs, reports and file uploads on threads
+of its own process. With SCHEDULER_PROCESS_ISOLATION enabled, each of those
+requests runs in a worker process instead:
+
+- workers are forked from a forkserver that has already imported the job,
+  report and file upload modules, and are started with the scheduler, so a
+  request never waits for interpreter start-up or imports;
+- every request runs under soft per-request limits on address space
+  (SCHEDULER_REQUEST_MEMORY_MB) and CPU time (SCHEDULER_REQUEST_CPU_SECONDS);
+- a worker is replaced after SCHEDULER_WORKER_MAX_REQUESTS requests or once
+  its RSS exceeds SCHEDULER_WORKER_MAX_RSS_MB;
+- a worker that dies (killed, CPU limit, segfault) fails only its own request:
+  the scheduler marks the DMS_PRCREQ row FAILED and starts a new worker.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import traceback
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.logger import info, warning, error, debug
+    from backend.modules.jobs.scheduler_models import QueueRequest
+    from backend.modules.common.adaptive_batch import current_rss_bytes
+    from backend.modules.common.env_config import env_int
+    _PACKAGE = "backend.modules"
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.logger import info, warning, error, debug  # type: ignore
+    from modules.jobs.scheduler_models import QueueRequest  # type: ignore
+    from modules.common.adaptive_batch import current_rss_bytes  # type: ignore
+    from modules.common.env_config import env_int  # type: ignore
+    _PACKAGE = "modules"
+
+try:
+    import resource
+except ImportError:  # Windows: no per-request limits
+    resource = None  # type: ignore
+
+
+# Request types that run in worker processes; STOP / REFRESH_SCHEDULE stay inline
+ISOLATED_REQUEST_TYPES = {"IMMEDIATE", "HISTORY", "REPORT", "FILE_UPLOAD"}
+
+# Imported once in the forkserver, inherited by every worker
+PRELOAD_MODULES = [
+    f"{_PACKAGE}.jobs.execution_engine",
+    f"{_PACKAGE}.mapper.mapper_job_executor",
+    f"{_PACKAGE}.reports.report_executor",
+    f"{_PACKAGE}.file_upload.streaming_file_executor",
+]
+
+
+class WorkerCrashedError(RuntimeError):
+    """The worker process running a request exited before returning a result."""
+
+
+class WorkerRequestError(RuntimeError):
+    """A request raised inside its worker process."""
+
+
+# ---------------------------------------------------------------------- #
+# Request execution (shared by the scheduler threads and worker processes)
+# ---------------------------------------------------------------------- #
+def execute_report_request(request: QueueRequest) -> Dict[str, Any]:
+    """Execute a REPORT type request using the ReportExecutor."""
+    try:
+        from backend.modules.reports.report_executor import get_report_executor
+    except ImportError:  # When running Flask app.py directly inside backend
+        from modules.reports.report_executor import get_report_executor  # type: ignore
+
+    payload = request.payload or {}
+    # Ensure the downstream executor knows the originating queue request ID
+    # so it can be stored in DMS_RPRT_RUN.RQST_ID (NOT NULL column).
+    if "requestId" not in payload:
+        payload["requestId"] = request.request_id
+    report_id = payload.get("reportId")
+
+    if not report_id:
+        # Try to extract from mapref (format: "REPORT:123")
+        if request.mapref and request.mapref.startswith("REPORT:"):
+            report_id = int(request.mapref.split(":")[1])
+
+    if not report_id:
+        raise ValueError("Report ID not found in request payload or mapref")
+
+    executor = get_report_executor()
+    result = executor.execute_report(report_id=report_id, payload=payload)
+
+    info(f"[SchedulerService] Report {report_id} executed successfully: {result}")
+    return result
+
+
+def execute_file_upload_request(request: QueueRequest) -> Dict[str, Any]:
+    """
+    Execute file upload request using streaming executor for better memory efficiency.
+    Uses chunked processing to handle large files without loading entire file into memory.
+    """
+    try:
+        from backend.modules.file_upload.streaming_file_executor import StreamingFileExecutor
+    except ImportError:  # When running Flask app.py directly inside backend
+        from modules.file_upload.streaming_file_executor import StreamingFileExecutor  # type: ignore
+
+    payload = request.payload or {}
+    flupldref = payload.get("flupldref")
+
+    if not flupldref:
+        # Try to extract from mapref (format: "FLUPLD:ReportData")
+        if request.mapref and request.mapref.startswith("FLUPLD:"):
+            flupldref = request.mapref.split(":", 1)[1]
+
+    if not flupldref:
+        raise ValueError("File upload reference not found in request payload or mapref")
+
+    load_mode = payload.get("load_mode", "INSERT")
+    username = payload.get("username", "system")  # Use username from payload if provided
+
+    # Use streaming executor for better memory efficiency
+    executor = StreamingFileExecutor(chunk_size=10000)  # Process 10K rows per chunk
+    result = executor.execute(
+        flupldref=flupldref,
+        file_path=payload.get("file_path"),  # Stored upload if given, else path from configuration
+        load_mode=load_mode,
+        username=username
+    )
+
+    info(f"[SchedulerService] File upload {flupldref} executed successfully: {result.get('rows_successful', 0)} rows loaded")
+    return result
+
+
+def execute_queue_request(request: QueueRequest, engine=None) -> Dict[str, Any]:
+    """Run one queued request in the current process."""
+    if request.request_type.value == "REPORT":
+        info(f"[_execute_request] Executing REPORT request for {request.mapref}")
+        return execute_report_request(request)
+    if request.request_type.value == "FILE_UPLOAD":
+        info(f"[_execute_request] Executing FILE_UPLOAD request for {request.mapref}")
+        return execute_file_upload_request(request)
+    if engine is None:
+        try:
+            from backend.modules.jobs.execution_engine import JobExecutionEngine
+        except ImportError:  # When running Flask app.py directly inside backend
+            from modules.jobs.execution_engine import JobExecutionEngine  # type: ignore
+        engine = JobExecutionEngine()
+    info(f"[_execute_request] Executing job flow for {request.mapref} using execution engine")
+    result = engine.execute(request)
+    info(f"[_execute_request] Execution completed for {request.mapref}, result: {result}")
+    return result
+
+
+# ---------------------------------------------------------------------- #
+# Settings
+# ---------------------------------------------------------------------- #
+@dataclass
+class WorkerPoolSettings:
+    processes: int
+    max_requests_per_worker: int = 50
+    max_worker_rss_mb: int = 2048
+    request_memory_mb: int = 0
+    request_cpu_seconds: int = 0
+
+    @classmethod
+    def from_env(cls, default_processes: int) -> Optional['WorkerPoolSettings']:
+        """None unless SCHEDULER_PROCESS_ISOLATION is enabled."""
+        if os.getenv("SCHEDULER_PROCESS_ISOLATION", "false").strip().lower() not in ("true", "1", "yes", "y"):
+            return None
+        return cls(
+            processes=max(0, env_int("SCHEDULER_WORKER_PROCESSES", 0)) or default_processes,
+            max_requests_per_worker=max(0, env_int("SCHEDULER_WORKER_MAX_REQUESTS", 50)),
+            max_worker_rss_mb=max(0, env_int("SCHEDULER_WORKER_MAX_RSS_MB", 2048)),
+            request_memory_mb=max(0, env_int("SCHEDULER_REQUEST_MEMORY_MB", 0)),
+            request_cpu_seconds=max(0, env_int("SCHEDULER_REQUEST_CPU_SECONDS", 0)),
+        )
+
+
+# ---------------------------------------------------------------------- #
+# Worker process side
+# ---------------------------------------------------------------------- #
+def _address_space_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _apply_request_limits(settings: WorkerPoolSettings) -> List:
+    """
+    Lower the soft limits for the next request, relative to what the worker
+    already uses; returns the previous limits for _restore_limits().
+    """
+    saved = []
+    if resource is None:
+        return saved
+    if settings.request_memory_mb:
+        in_use = _address_space_bytes()
+        if in_use is not None:
+            soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+            limit = in_use + settings.request_memory_mb * 1024 * 1024
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+            saved.append((resource.RLIMIT_AS, soft, hard))
+    if settings.request_cpu_seconds:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        limit = int(usage.ru_utime + usage.ru_stime) + settings.request_cpu_seconds
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        # Past the soft limit the kernel sends SIGXCPU, which ends the worker
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+        saved.append((resource.RLIMIT_CPU, soft, hard))
+    return saved
+
+
+def _restore_limits(saved: List) -> None:
+    for limit, soft, hard in saved:
+        try:
+            resource.setrlimit(limit, (soft, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def _worker_main(connection, settings: WorkerPoolSettings, runner=None) -> None:
+    """
+    Worker loop: run requests from the pipe until told to stop (None).
+    ``runner(request)`` replaces execute_queue_request when given.
+    """
+    for module in PRELOAD_MODULES:  # already imported when forked from the forkserver
+        try:
+            __import__(module)
+        except Exception:
+            pass
+    engine = None
+    handled = 0
+    while True:
+        try:
+            request = connection.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        saved = _apply_request_limits(settings)
+        try:
+            if runner is not None:
+                result = runner(request)
+            else:
+                if engine is None and request.request_type.value not in ("REPORT", "FILE_UPLOAD"):
+                    from importlib import import_module
+                    engine = import_module(f"{_PACKAGE}.jobs.execution_engine").JobExecutionEngine()
+                result = execute_queue_request(request, engine)
+            # Results end up as JSON in DMS_PRCREQ anyway; this keeps them picklable
+            reply = ("ok", json.loads(json.dumps(result or {}, default=str)), "")
+        except MemoryError:
+            reply = ("memory", f"Request exceeded the worker memory limit "
+                               f"({settings.request_memory_mb} MB)", traceback.format_exc())
+        except BaseException as exc:  # report everything, including SystemExit from job code
+            reply = ("error", f"{type(exc).__name__}: {exc}", traceback.format_exc())
+        finally:
+            _restore_limits(saved)
+        handled += 1
+        try:
+            connection.send(reply + (handled, current_rss_bytes() or 0))
+        except (OSError, ValueError):
+            return
+
+
+# ---------------------------------------------------------------------- #
+# Scheduler side
+# ---------------------------------------------------------------------- #
+class _Worker:
+    def __init__(self, context, settings: WorkerPoolSettings, number: int, runner=None):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, settings, runner),
+            name=f"scheduler-worker-{number}", daemon=True,
+        )
+        self.process.start()
+        child_connection.close()
+        self.handled = 0
+
+    def describe_exit(self) -> str:
+        self.process.join(timeout=5)
+        code = self.process.exitcode
+        if code is None:
+            return "did not respond"
+        if code < 0:
+            try:
+                return f"was killed by {signal.Signals(-code).name}"
+            except ValueError:
+                return f"was killed by signal {-code}"
+        return f"exited with code {code}"
+
+    def stop(self) -> None:
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class SchedulerWorkerPool:
+    """A fixed number of worker processes, leased to one request at a time."""
+
+    def __init__(self, settings: WorkerPoolSettings, context=None, runner=None):
+        self.settings = settings
+        self._context = context or _context()
+        self._runner = runner
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self._spawned = 0
+
+    def _spawn(self) -> _Worker:
+        with self._lock:
+            self._spawned += 1
+            number = self._spawned
+        worker = _Worker(self._context, self.settings, number, self._runner)
+        debug(f"[WorkerPool] Started worker {number} (pid {worker.process.pid})")
+        return worker
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.settings.processes):
+            self._idle.put(self._spawn())
+        info(
+            f"[WorkerPool] {self.settings.processes} worker processes "
+            f"(recycled after {self.settings.max_requests_per_worker} requests or "
+            f"{self.settings.max_worker_rss_mb} MB; per request: "
+            f"{self.settings.request_memory_mb or 'no'} MB, {self.settings.request_cpu_seconds or 'no'} CPU seconds limit)"
+        )
+
+    def run(self, request: QueueRequest) -> Dict[str, Any]:
+        """Run the request in a worker process; raises on failure or crash."""
+        self.start()
+        worker = self._idle.get()
+        try:
+            worker.connection.send(request)
+            reply = worker.connection.recv()
+        except (EOFError, OSError) as exc:
+            reason = worker.describe_exit()
+            error(f"[WorkerPool] Worker pid {worker.process.pid} {reason} while running request "
+                  f"{request.request_id} ({request.mapref}): {exc}")
+            worker.connection.close()
+            self._replace(None)
+            raise WorkerCrashedError(
+                f"Worker process {reason} while running {request.request_type.value} request {request.mapref}"
+            ) from exc
+
+        status, payload, details, worker.handled, rss_bytes = reply
+        rss_mb = rss_bytes / (1024 * 1024)
+        if (
+            status == "memory"
+            or 0 < self.settings.max_requests_per_worker <= worker.handled
+            or 0 < self.settings.max_worker_rss_mb <= rss_mb
+        ):
+            info(f"[WorkerPool] Recycling worker pid {worker.process.pid} after {worker.handled} requests "
+                 f"(RSS {rss_mb:.0f} MB)")
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+        if status != "ok":
+            debug(f"[WorkerPool] Request {request.request_id} failed in worker:\n{details}")
+            raise WorkerRequestError(payload)
+        return payload
+
+    def _replace(self, worker: Optional[_Worker]) -> None:
+        if worker is not None:
+            threading.Thread(target=worker.stop, daemon=True).start()
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def shutdown(self) -> None:
+        """Stop the idle workers (call once no request is running any more)."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()
+
+
+def create_worker_pool(default_processes: int) -> Optional[SchedulerWorkerPool]:
+    settings = WorkerPoolSettings.from_env(default_processes)
+    if settings is None:
+        return None
+    if resource is None and (settings.request_memory_mb or settings.request_cpu_seconds):
+        warning("[WorkerPool] Per-request memory/CPU limits are not supported on this platform")
+    return SchedulerWorkerPool(settings)
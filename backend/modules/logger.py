@@ -1,13 +1,92 @@
+import atexit
+import contextlib
+import contextvars
+import json
 import logging
 import os
 import datetime
 import importlib
+import queue
 import re
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    from backend.modules.common.env_config import env_int
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.env_config import env_int  # type: ignore
+
+# Fields added to JSON log lines by log_context() (job/run ids of the current task)
+_LOG_CONTEXT = contextvars.ContextVar('dwtool_log_context', default={})
+
+
+def _env_flag(name, default):
+    value = os.getenv(name)
+    if value is None or value.strip() == '':
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'y', 'on')
+
+
+class TextFormatter(logging.Formatter):
+    """datetime : user_name : level : log details"""
+
+    def format(self, record):
+        timestamp = datetime.datetime.fromtimestamp(record.created).strftime('%Y-%m-%d %H:%M:%S')
+        username = getattr(record, 'username', 'system')
+        return f"{timestamp} : {username} : {record.levelname.lower()} : {record.getMessage()}"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the log_context() fields of the caller."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'user': getattr(record, 'username', 'system'),
+            'level': record.levelname.lower(),
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        entry.update(getattr(record, 'context', None) or {})
+        return json.dumps(entry, default=str)
+
+
+class RateLimiter:
+    """At most ``per_minute`` messages per key per minute; counts the ones dropped."""
+
+    def __init__(self, per_minute, clock=time.monotonic):
+        self.per_minute = per_minute
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def allow(self, key):
+        """(allowed, messages suppressed for ``key`` since the last allowed one)."""
+        if self.per_minute <= 0:
+            return True, 0
+        now = self._clock()
+        with self._lock:
+            started, sent, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - started >= 60:
+                started, sent = now, 0
+            if sent >= self.per_minute:
+                self._windows[key] = (started, sent, suppressed + 1)
+                return False, 0
+            self._windows[key] = (started, sent + 1, 0)
+            return True, suppressed
+
 
 class DWToolLogger:
     """
     Custom logger for DW Tool application
     Logs format: datetime : user_name : error/warning/info : log details
+
+    Records are handed to a QueueListener thread that formats and writes them
+    (LOG_ASYNC, default on), so callers never wait for file I/O. Messages of a
+    disabled level are dropped before any formatting: pass %-style arguments
+    or a callable instead of an f-string on hot paths. LOG_FORMAT=json writes
+    JSON lines including the log_context() fields (mapref, jobid, ...).
     """
     _instance = None
     
@@ -17,7 +96,7 @@ class DWToolLogger:
             cls._instance._setup_logger()
         return cls._instance
     
-    def _setup_logger(self):
+    def _setup_logger(self, async_writes=None):
         """Set up the logger with the required format"""
         self.logger = logging.getLogger('dwtool')
         
@@ -51,12 +130,22 @@ class DWToolLogger:
         # Set file handler level to match logger level
         file_handler.setLevel(log_level)
         
-        # Create formatter - we'll handle the custom format in our methods
-        formatter = logging.Formatter('%(message)s')
-        file_handler.setFormatter(formatter)
+        # Timestamps and the line layout are rendered by the handler (on the listener thread when async)
+        use_json = os.getenv('LOG_FORMAT', 'text').strip().lower() == 'json'
+        file_handler.setFormatter(JsonFormatter() if use_json else TextFormatter())
+        
+        # Add handler to logger, behind a queue unless LOG_ASYNC is off
+        self.listener = None
+        if _env_flag('LOG_ASYNC', True) if async_writes is None else async_writes:
+            log_queue = queue.SimpleQueue()
+            self.logger.addHandler(QueueHandler(log_queue))
+            self.listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+            self.listener.start()
+        else:
+            self.logger.addHandler(file_handler)
         
-        # Add handler to logger
-        self.logger.addHandler(file_handler)
+        # Repeated messages logged with a rate_key are limited per key
+        self.rate_limiter = RateLimiter(env_int('LOG_RATE_LIMIT_PER_MINUTE', 60))
         
         # Initialize filter patterns
         self.filter_patterns = [
@@ -64,6 +153,45 @@ class DWToolLogger:
             r'Response: \d+',     # Filter out API response logs
         ]
     
+    def shutdown(self):
+        """Write out queued records and stop the listener thread."""
+        if self.listener is not None:
+            try:
+                self.listener.stop()
+            except Exception:
+                pass
+            self.listener = None
+    
+    def _after_fork_in_child(self):
+        # The listener thread does not survive fork(), and forked pool workers
+        # leave through os._exit() without draining a queue: write directly
+        self.listener = None
+        self._setup_logger(async_writes=False)
+    
+    def is_enabled(self, level):
+        """True when messages of ``level`` ('debug', 'info', ...) are written."""
+        return self.logger.isEnabledFor(getattr(logging, str(level).upper(), logging.INFO))
+    
+    def _log(self, level, message, args, rate_key=None):
+        if not self.logger.isEnabledFor(level):
+            return
+        if callable(message):
+            message = message()
+        if args:
+            message = message % args if '%' in message else message.format(*args)
+        if not self._should_log(message):
+            return
+        if rate_key is not None:
+            allowed, suppressed = self.rate_limiter.allow(rate_key)
+            if not allowed:
+                return
+            if suppressed:
+                message = f"{message} [{suppressed} similar messages suppressed]"
+        self.logger.log(
+            level, message,
+            extra={'username': self._get_username(), 'context': _LOG_CONTEXT.get()}
+        )
+    
     def _should_log(self, message):
         """Check if the message should be logged based on filter patterns"""
         for pattern in self.filter_patterns:
@@ -73,64 +201,39 @@ class DWToolLogger:
     
     def _get_username(self):
         """Get the current user's username from Flask's g object or default to 'system'"""
-        try:
-            # Import Flask's g object lazily to avoid circular imports
-            from flask import g
-            if hasattr(g, 'user') and g.user:
-                return g.user.get('username', 'system')
-        except (ImportError, RuntimeError):
-            # Flask app context might not be available or Flask might not be imported
-            pass
+        g = _flask_g()
+        if g is not None:
+            try:
+                if hasattr(g, 'user') and g.user:
+                    return g.user.get('username', 'system')
+            except RuntimeError:
+                # Flask app context might not be available
+                pass
         return 'system'
     
-    def _format_message(self, level, message):
-        """Format the log message according to requirements"""
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        username = self._get_username()
-        return f"{timestamp} : {username} : {level} : {message}"
-    
-    def debug(self, message, *args):
+    def debug(self, message, *args, rate_key=None):
         """Log a debug message. Supports format strings: debug("format %s", arg)"""
-        if args:
-            message = message % args if '%' in message else message.format(*args)
-        formatted_message = self._format_message('debug', message)
-        if self._should_log(message):
-            self.logger.debug(formatted_message)
+        self._log(logging.DEBUG, message, args, rate_key)
     
-    def info(self, message, *args):
+    def info(self, message, *args, rate_key=None):
         """Log an info message. Supports format strings: info("format %s", arg)"""
-        if args:
-            message = message % args if '%' in message else message.format(*args)
-        formatted_message = self._format_message('info', message)
-        if self._should_log(message):
-            self.logger.info(formatted_message)
+        self._log(logging.INFO, message, args, rate_key)
     
-    def warning(self, message, *args):
+    def warning(self, message, *args, rate_key=None):
         """Log a warning message. Supports format strings: warning("format %s", arg)"""
-        if args:
-            message = message % args if '%' in message else message.format(*args)
-        formatted_message = self._format_message('warning', message)
-        if self._should_log(message):
-            self.logger.warning(formatted_message)
+        self._log(logging.WARNING, message, args, rate_key)
     
-    def error(self, message, *args, **kwargs):
+    def error(self, message, *args, rate_key=None, **kwargs):
         """
         Log an error message. Supports format strings: error("format %s", arg)
         exc_info parameter is ignored - no tracebacks are included by default
         """
-        if args:
-            message = message % args if '%' in message else message.format(*args)
-        formatted_message = self._format_message('error', message)
-        # Always set exc_info to False to avoid tracebacks
-        if self._should_log(message):
-            self.logger.error(formatted_message, exc_info=False)
+        self._log(logging.ERROR, message, args, rate_key)
     
     def exception(self, message):
         """Log an exception message without traceback"""
-        formatted_message = self._format_message('error', message)
         # Use error instead of exception to avoid traceback
-        if self._should_log(message):
-            self.logger.error(formatted_message)
+        self._log(logging.ERROR, message, ())
     
     def add_filter_pattern(self, pattern):
         """Add a regex pattern to filter out log messages"""
@@ -141,34 +244,77 @@ class DWToolLogger:
         if pattern in self.filter_patterns:
             self.filter_patterns.remove(pattern)
 
+_FLASK_G = None
+_FLASK_CHECKED = False
+
+
+def _flask_g():
+    """Flask's g object, imported once; None when Flask is not installed."""
+    global _FLASK_G, _FLASK_CHECKED
+    if not _FLASK_CHECKED:
+        try:
+            # Import Flask's g object lazily to avoid circular imports
+            from flask import g
+            _FLASK_G = g
+        except ImportError:
+            _FLASK_G = None
+        _FLASK_CHECKED = True
+    return _FLASK_G
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """Add ``fields`` (mapref, jobid, sessionid, ...) to JSON log lines written inside the block."""
+    token = _LOG_CONTEXT.set({**_LOG_CONTEXT.get(), **fields})
+    try:
+        yield
+    finally:
+        _LOG_CONTEXT.reset(token)
+
+
 # Create a singleton instance
 logger = DWToolLogger()
+atexit.register(logger.shutdown)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=logger._after_fork_in_child)
 
-# Export the logger functions for easy import
-def debug(message, *args):
+# Export the logger functions for easy import. ``message`` may be a callable
+# returning the text; it is only called when the level is enabled. Messages
+# with a ``rate_key`` are limited to LOG_RATE_LIMIT_PER_MINUTE per key.
+def debug(message, *args, rate_key=None):
     """Log a debug message. Supports format strings: debug("format %s", arg)"""
-    logger.debug(message, *args)
+    logger.debug(message, *args, rate_key=rate_key)
 
-def info(message, *args):
+def info(message, *args, rate_key=None):
     """Log an info message. Supports format strings: info("format %s", arg)"""
-    logger.info(message, *args)
+    logger.info(message, *args, rate_key=rate_key)
 
-def warning(message, *args):
+def warning(message, *args, rate_key=None):
     """Log a warning message. Supports format strings: warning("format %s", arg)"""
-    logger.warning(message, *args)
+    logger.warning(message, *args, rate_key=rate_key)
 
-def error(message, *args, exc_info=False):
+def error(message, *args, exc_info=False, rate_key=None):
     """Log an error message. Supports format strings: error("format %s", arg)"""
     # exc_info parameter is ignored - no tracebacks are included by default
-    logger.error(message, *args)
+    logger.error(message, *args, rate_key=rate_key)
 
 def exception(message):
     # Use error instead of exception to avoid traceback
     logger.error(message)
 
+def is_enabled(level):
+    """True when messages of ``level`` ('debug', 'info', ...) are written."""
+    return logger.is_enabled(level)
+
+def flush_logs():
+    """Write out queued records (restarts the listener when logging is async)."""
+    if logger.listener is not None:
+        logger.listener.stop()
+        logger.listener.start()
+
 # Add or remove filter patterns
 def add_filter_pattern(pattern):
     logger.add_filter_pattern(pattern)
 
 def remove_filter_pattern(pattern):
-    logger.remove_filter_pattern(pattern) 
\ No newline at end of file
+    logger.remove_filter_pattern(pattern)
@@ -15,6 +15,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
 
 from backend.database.dbconnect import sqlite_engine
+from backend.modules.security import auth_cache
 
 
 load_dotenv()
@@ -89,16 +90,29 @@ def send_reset_email_fastapi(email: str, reset_token: str, base_url: str) -> boo
         return False
 
 
+def _load_user(user_id):
+    session = Session()
+    try:
+        return session.execute(
+            text("SELECT * FROM users WHERE user_id = :user_id"),
+            {"user_id": user_id},
+        ).fetchone()
+    finally:
+        session.close()
+
+
 def get_user_from_token(request: Request):
     """
     Decode JWT token from Authorization header or cookie and return user record.
     Mirrors the behavior of the Flask `token_required` decorator.
+    The user row is served from ``auth_cache`` so a warm request only pays
+    for the signature check.
     """
     # Support both FastAPI/package context and legacy Flask context
     try:
-        from backend.modules.logger import info, error
+        from backend.modules.logger import debug, error
     except ImportError:
-        from modules.logger import info, error  # type: ignore
+        from modules.logger import debug, error  # type: ignore
 
     token = None
 
@@ -119,20 +133,13 @@ def get_user_from_token(request: Request):
         data = jwt.decode(token, os.getenv("JWT_SECRET_KEY"), algorithms=["HS256"])
         user_id = data["user_id"]
 
-        session = Session()
-        try:
-            user = session.execute(
-                text("SELECT * FROM users WHERE user_id = :user_id"),
-                {"user_id": user_id},
-            ).fetchone()
-        finally:
-            session.close()
+        user = auth_cache.get_user(user_id, lambda: _load_user(user_id))
 
         if not user:
             error(f"Authentication failed: User ID {user_id} not found")
             raise HTTPException(status_code=401, detail="User not found")
 
-        info(f"User {user.username} authenticated successfully")
+        debug(f"User {user.username} authenticated successfully")
         return user
 
     except jwt.ExpiredSignatureError:
@@ -279,6 +286,7 @@ async def login(payload: LoginRequest, response: Response):
         )
 
         session.commit()
+        auth_cache.invalidate_user(user.user_id)
 
         user_profile = session.execute(
             text(
@@ -390,6 +398,7 @@ async def forgot_password(payload: ForgotPasswordRequest, request: Request):
             },
         )
         session.commit()
+        auth_cache.invalidate_user(user.user_id)
 
         base_url = str(request.base_url)
         if not send_reset_email_fastapi(email, reset_token, base_url):
@@ -500,6 +509,7 @@ async def reset_password(payload: ResetPasswordRequest):
         )
 
         session.commit()
+        auth_cache.invalidate_user(user.user_id)
         return SimpleMessageResponse(
             message="Password has been reset successfully"
         )
@@ -620,6 +630,7 @@ async def change_password_after_login(
         )
 
         session.commit()
+        auth_cache.invalidate_user(current_user_id)
         return SimpleMessageResponse(
             message="Password has been changed successfully"
         )
@@ -29,12 +29,15 @@ from .mapper_transformation_utils import (
     map_row_to_target_columns,
     generate_hash,
     build_primary_key_values,
-    build_primary_key_where_clause
+    build_primary_key_where_clause,
+    RowProjector,
+    StandardTransformation
 )
 from .mapper_progress_tracker import (
     check_stop_request,
     log_batch_progress,
-    update_process_log_progress
+    update_process_log_progress,
+    BufferedProgressWriter
 )
 from .mapper_checkpoint_handler import (
     parse_checkpoint_value,
@@ -76,9 +79,12 @@ __all__ = [
     'generate_hash',
     'build_primary_key_values',
     'build_primary_key_where_clause',
+    'RowProjector',
+    'StandardTransformation',
     'check_stop_request',
     'log_batch_progress',
     'update_process_log_progress',
+    'BufferedProgressWriter',
     'parse_checkpoint_value',
     'apply_checkpoint_to_query',
     'update_checkpoint',
@@ -0,0 +1,634 @@
+"""
+End-to-end ETL benchmark.
+Generates a synthetic source table, runs execute_mapper_job over it (initial
+load, then an incremental run after changing a fraction of the rows, both
+sequentially and in parallel) and reports rows/sec, peak RSS, database round
+trips and the stage breakdown of every run as JSON, so results can be compared
+across commits.
+
+Usage:
+    python -m backend.modules.mapper.benchmark_etl [--rows N] [--width N]
+        [--change-rate F] [--key-distribution sequential|random|skewed]
+        [--scd-type 1|2] [--workers N] [--pg-dsn DSN] [--output FILE]
+        [--flupldref REF] [--report-id ID]
+
+Databases:
+    By default everything runs on a SQLite stand-in for PostgreSQL: the DMS
+    metadata tables come from doc/database_install_postgresql_full.sql and the
+    connection speaks PostgreSQL's dialect (%s binds, nextval, information_schema
+    sequences) to the mapper code. Timings are only comparable between runs on
+    the same stand-in; round trips and rows are comparable everywhere.
+    With --pg-dsn the mapper runs against a local PostgreSQL database that has
+    the DMS schema installed; source and target tables go to the "bench" schema.
+
+File uploads and reports need the configured application database
+(backend/database/dbconnect.py): --flupldref runs StreamingFileExecutor for an
+existing upload definition over a generated CSV file, --report-id runs
+ReportMetadataService.execute_report for an existing report. They are reported
+as skipped when not requested or when their dependencies are missing.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from backend.modules.common.adaptive_batch import current_rss_bytes
+from backend.modules.mapper.mapper_job_executor import execute_mapper_job
+from backend.modules.mapper.mapper_transformation_utils import StandardTransformation
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
+INSTALL_SQL = os.path.join(PROJECT_ROOT, 'doc', 'database_install_postgresql_full.sql')
+
+SOURCE_TABLE = 'bench_src'
+TARGET_TABLE = 'bench_dim'
+SCHEMA = 'bench'
+MAPREF = 'BENCH_ETL'
+SCD_COLUMNS = ['RWHKEY', 'CURFLG', 'FROMDT', 'TODT']
+
+
+# ---------------------------------------------------------------------------
+# Round-trip counting
+# ---------------------------------------------------------------------------
+
+class RoundTripCounter:
+    """Thread-safe count of statements and fetch calls per connection role."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def add(self, role: str, calls: int = 1) -> None:
+        with self._lock:
+            self.counts[role] = self.counts.get(role, 0) + calls
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+class _CountingCursor:
+    """Cursor proxy counting execute/executemany/fetch calls as round trips."""
+
+    def __init__(self, cursor, connection, translate: Optional[Callable[[str], Optional[str]]] = None):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, 'connection', connection)
+        object.__setattr__(self, '_translate', translate)
+
+    def _call(self, method, *args):
+        self.connection._counter.add(self.connection._role)
+        with self.connection._lock:
+            return method(*args)
+
+    def execute(self, query, params=None):
+        if self._translate is not None:
+            query = self._translate(query)
+            if query is None:
+                self.connection._counter.add(self.connection._role)
+                return self
+        if params is None:
+            return self._call(self._cursor.execute, query)
+        return self._call(self._cursor.execute, query, params)
+
+    def executemany(self, query, params):
+        if self._translate is not None:
+            query = self._translate(query)
+            if query is None:
+                self.connection._counter.add(self.connection._role)
+                return self
+        return self._call(self._cursor.executemany, query, params)
+
+    def fetchone(self):
+        return self._call(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            return self._call(self._cursor.fetchmany)
+        return self._call(self._cursor.fetchmany, size)
+
+    def fetchall(self):
+        return self._call(self._cursor.fetchall)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+
+class _NoLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _CountingConnection:
+    """Connection proxy handing out counting cursors; commits count as round trips."""
+
+    _translate = None
+    _lock = _NoLock()
+
+    def __init__(self, connection, counter: RoundTripCounter, role: str):
+        self._connection = connection
+        self._counter = counter
+        self._role = role
+
+    def cursor(self, *args, **kwargs):
+        return _CountingCursor(self._connection.cursor(*args, **kwargs), self, self._translate)
+
+    def commit(self):
+        self._counter.add(self._role)
+        with self._lock:
+            return self._connection.commit()
+
+    def rollback(self):
+        with self._lock:
+            return self._connection.rollback()
+
+    def close(self):
+        pass  # shared by the benchmark runs; closed by the harness
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def counting_connection(connection, counter: RoundTripCounter, role: str):
+    """
+    Wrap a DB-API connection so its round trips are counted under ``role``.
+    The proxy class reports the driver's module name, so database type
+    detection sees the same driver as for the unwrapped connection.
+    """
+    proxy_class = type('CountingConnection', (_CountingConnection,), {'__module__': type(connection).__module__})
+    return proxy_class(connection, counter, role)
+
+
+# ---------------------------------------------------------------------------
+# SQLite stand-in for PostgreSQL
+# ---------------------------------------------------------------------------
+
+_CREATE_SEQUENCE = re.compile(
+    r'^\s*CREATE\s+SEQUENCE\s+(?:IF\s+NOT\s+EXISTS\s+)?("?[\w$]+"?(?:\."?[\w$]+"?)?)', re.IGNORECASE
+)
+_UNSUPPORTED = re.compile(
+    r'^\s*(CREATE\s+(OR\s+REPLACE\s+)?(FUNCTION|TRIGGER|EXTENSION|SCHEMA|TYPE)|COMMENT\s+ON|ALTER\s+|GRANT\s+|DO\s+)',
+    re.IGNORECASE
+)
+
+
+class SQLiteStandIn:
+    """
+    One SQLite database standing in for a PostgreSQL metadata, source and target
+    database: schemas are attached databases, sequences are Python counters
+    exposed through nextval() and information_schema.sequences.
+    """
+
+    def __init__(self, directory: str, schemas: List[str]):
+        self.connection = sqlite3.connect(
+            os.path.join(directory, 'metadata.db'), check_same_thread=False
+        )
+        for schema in schemas + ['information_schema']:
+            self.connection.execute(
+                f"ATTACH DATABASE '{os.path.join(directory, schema + '.db')}' AS {schema}"
+            )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS information_schema.sequences (sequence_schema TEXT, sequence_name TEXT)"
+        )
+        self._sequences: Dict[str, int] = {}
+        self._sequence_lock = threading.Lock()
+        # Chunk threads share the one SQLite connection. Calls are serialised
+        # here: SQLite runs one writer at a time anyway, and a thread holding
+        # the GIL while waiting for the connection mutex would otherwise
+        # deadlock with a statement calling back into nextval().
+        self.lock = threading.RLock()
+        self.connection.create_function('nextval', 1, self._nextval)
+        self.connection.create_function('version', 0, lambda: f'SQLite {sqlite3.sqlite_version} (PostgreSQL stand-in)')
+
+    def _nextval(self, name: str) -> int:
+        key = name.replace('"', '').lower()
+        with self._sequence_lock:
+            self._sequences[key] = self._sequences.get(key, 0) + 1
+            return self._sequences[key]
+
+    def create_sequence(self, name: str) -> None:
+        parts = name.replace('"', '').lower().split('.')
+        schema, sequence = (parts[0], parts[1]) if len(parts) == 2 else ('public', parts[0])
+        self.connection.execute(
+            "INSERT INTO information_schema.sequences VALUES (?, ?)", (schema, sequence)
+        )
+
+    def translate(self, query: str) -> Optional[str]:
+        """PostgreSQL statement -> SQLite statement (None when handled here)."""
+        match = _CREATE_SEQUENCE.match(query)
+        if match:
+            self.create_sequence(match.group(1))
+            return None
+        query = query.replace('%s', '?')
+        return re.sub(r'\s+FOR\s+UPDATE\b', '', query, flags=re.IGNORECASE)
+
+    def connect(self, counter: RoundTripCounter, role: str):
+        # detect_database_type() and the ID provider recognise PostgreSQL by
+        # the driver module name
+        proxy_class = type(
+            'SQLiteStandInConnection', (_CountingConnection,),
+            {'__module__': 'psycopg_sqlite_standin', '_translate': staticmethod(self.translate), '_lock': self.lock}
+        )
+        return proxy_class(self.connection, counter, role)
+
+    def install_metadata(self, script_path: str = INSTALL_SQL) -> Dict[str, int]:
+        """Run the PostgreSQL install script, skipping statements SQLite cannot run."""
+        with open(script_path, encoding='utf-8') as script:
+            text = re.sub(r'--[^\n]*', '', script.read())
+        created, skipped = 0, 0
+        for statement in (part.strip() for part in text.split(';')):
+            if not statement or _UNSUPPORTED.match(statement):
+                skipped += bool(statement)
+                continue
+            try:
+                translated = self.translate(statement)
+                if translated is not None:
+                    self.connection.execute(translated)
+                created += 1
+            except sqlite3.Error:
+                skipped += 1
+        self.connection.commit()
+        return {'statements': created, 'skipped': skipped}
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+# ---------------------------------------------------------------------------
+# Synthetic data
+# ---------------------------------------------------------------------------
+
+def generate_keys(rows: int, distribution: str, rng: random.Random) -> List[int]:
+    """
+    Primary keys for the source table: ``sequential`` 1..rows, ``random``
+    sparse keys in random order, ``skewed`` 90% packed into a dense low range
+    and the rest spread thinly over a wide one (uneven key-range chunks).
+    """
+    if distribution == 'sequential':
+        return list(range(1, rows + 1))
+    if distribution == 'random':
+        return rng.sample(range(1, rows * 10 + 1), rows)
+    if distribution == 'skewed':
+        dense = int(rows * 0.9)
+        sparse = rng.sample(range(dense + 1, dense + rows * 1000 + 1), rows - dense)
+        return list(range(1, dense + 1)) + sorted(sparse)
+    raise ValueError(f"Unknown key distribution: {distribution}")
+
+
+def column_value(key: int, column: int, version: int = 0) -> Any:
+    if column % 3 == 0:
+        return key * column + version
+    if column % 3 == 1:
+        return f"value_{key}_{column}_{version}"
+    return round(key / (column + 1) + version, 4)
+
+
+class Workload:
+    """DDL and data for the benchmark source and target tables."""
+
+    def __init__(self, rows: int, width: int, key_distribution: str, seed: int):
+        self.rows = rows
+        self.width = width
+        self.rng = random.Random(seed)
+        self.keys = generate_keys(rows, key_distribution, self.rng)
+        self.columns = [f'C{i}' for i in range(1, width + 1)]
+
+    def _column_type(self, index: int) -> str:
+        return ('BIGINT', 'VARCHAR(200)', 'NUMERIC(20,4)')[index % 3]
+
+    def create_tables(self, cursor, postgresql: bool) -> None:
+        source = f'{SCHEMA}.{SOURCE_TABLE}'
+        target = f'{SCHEMA}.{TARGET_TABLE}'
+        column_ddl = ', '.join(f'{col} {self._column_type(i)}' for i, col in enumerate(self.columns, start=1))
+        if postgresql:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {SCHEMA}')
+        for table in (source, target):
+            cursor.execute(f'DROP TABLE IF EXISTS {table}')
+        if postgresql:
+            cursor.execute(f'DROP SEQUENCE IF EXISTS {target}_seq')
+        cursor.execute(f'CREATE TABLE {source} (ID BIGINT PRIMARY KEY, {column_ddl})')
+        cursor.execute(
+            f'CREATE TABLE {target} (SKEY BIGINT PRIMARY KEY, ID BIGINT, {column_ddl}, '
+            'RWHKEY VARCHAR(64), CURFLG CHAR(1), FROMDT TIMESTAMP, TODT TIMESTAMP, '
+            'RECCRDT TIMESTAMP, RECUPDT TIMESTAMP)'
+        )
+        cursor.execute(f'CREATE INDEX {TARGET_TABLE}_id_idx ON {target} (ID, CURFLG)' if postgresql
+                       else f'CREATE INDEX {SCHEMA}.{TARGET_TABLE}_id_idx ON {TARGET_TABLE} (ID, CURFLG)')
+
+    def load_source(self, cursor, placeholder: str) -> None:
+        placeholders = ', '.join([placeholder] * (self.width + 1))
+        query = f'INSERT INTO {SCHEMA}.{SOURCE_TABLE} (ID, {", ".join(self.columns)}) VALUES ({placeholders})'
+        batch = []
+        for key in self.keys:
+            batch.append((key, *(column_value(key, i) for i in range(1, self.width + 1))))
+            if len(batch) == 10000:
+                cursor.executemany(query, batch)
+                batch = []
+        if batch:
+            cursor.executemany(query, batch)
+
+    def apply_changes(self, cursor, placeholder: str, change_rate: float) -> int:
+        """Change one column of ``change_rate`` of the source rows; returns the count."""
+        changed = self.rng.sample(self.keys, int(len(self.keys) * change_rate))
+        cursor.executemany(
+            f'UPDATE {SCHEMA}.{SOURCE_TABLE} SET C1 = {placeholder} WHERE ID = {placeholder}',
+            [(column_value(key, 1, version=1), key) for key in changed]
+        )
+        return len(changed)
+
+    def job_config(self, scd_type: int, bulk_limit: int, parallel_config: Dict[str, Any]) -> Dict[str, Any]:
+        mapping = {'ID': 'ID', **{col: col for col in self.columns}}
+        all_columns = ['ID'] + self.columns + SCD_COLUMNS
+        return {
+            'mapref': MAPREF,
+            'jobid': 1,
+            'target_schema': SCHEMA,
+            'target_table': TARGET_TABLE,
+            'target_type': 'DIM',
+            'full_table_name': f'{SCHEMA}.{TARGET_TABLE}',
+            'pk_columns': {'ID'},
+            'pk_source_mapping': {'ID': 'ID'},
+            'all_columns': all_columns,
+            'column_source_mapping': mapping,
+            'hash_exclude_columns': {'SKEY', 'RWHKEY', 'RECCRDT', 'RECUPDT', 'CURFLG', 'FROMDT', 'TODT'},
+            'bulk_limit': bulk_limit,
+            'scd_type': scd_type,
+            'parallel_config': parallel_config,
+        }
+
+    def transformation(self) -> StandardTransformation:
+        mapping = {'ID': 'ID', **{col: col for col in self.columns}}
+        return StandardTransformation(mapping, ['ID'] + self.columns + SCD_COLUMNS)
+
+    def source_sql(self) -> str:
+        return f'SELECT ID, {", ".join(self.columns)} FROM {SCHEMA}.{SOURCE_TABLE} ORDER BY ID'
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+class RssSampler:
+    """Samples resident memory in a background thread; reports the peak."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = current_rss_bytes() or 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes() or 0)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes() or 0)
+
+
+def measure(counter: RoundTripCounter, rows: int, run: Callable[[], Any]) -> Dict[str, Any]:
+    """Time ``run`` and report rows/sec, peak RSS and round trips per connection role."""
+    before = counter.snapshot()
+    started = time.perf_counter()
+    with RssSampler() as rss:
+        outcome = run()
+    seconds = time.perf_counter() - started
+    after = counter.snapshot()
+    result = {
+        'rows': rows,
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(rows / seconds, 1) if seconds else None,
+        'peak_rss_mb': round(rss.peak / 1048576, 1) if rss.peak else None,
+        'round_trips': {role: after.get(role, 0) - before.get(role, 0) for role in after},
+    }
+    if isinstance(outcome, dict):
+        result.update(outcome)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+def run_mapper_scenarios(args, connections: Dict[str, Any], counter: RoundTripCounter,
+                         placeholder: str, postgresql: bool) -> Dict[str, Any]:
+    workload = Workload(args.rows, args.width, args.key_distribution, args.seed)
+    metadata_conn, source_conn, target_conn = connections['metadata'], connections['source'], connections['target']
+    results = {}
+    modes = [('sequential', {'enable_parallel': False})]
+    if args.workers > 1:
+        modes.append(('parallel', {
+            'enable_parallel': True,
+            'max_workers': args.workers,
+            'chunk_size': max(1, args.rows // (args.workers * 2)),
+            'min_rows_for_parallel': 0,
+        }))
+
+    for mode, parallel_config in modes:
+        cursor = target_conn.cursor()
+        workload.create_tables(cursor, postgresql)
+        workload.load_source(cursor, placeholder)
+        cursor.close()
+        target_conn.commit()
+        job_config = workload.job_config(args.scd_type, args.bulk_limit, parallel_config)
+
+        def run_job(sessionid: int):
+            session_params = {'prcid': sessionid, 'sessionid': sessionid, 'param1': None}
+            result = execute_mapper_job(
+                metadata_conn, source_conn, target_conn, job_config, workload.source_sql(),
+                workload.transformation(), {'enabled': False}, session_params
+            )
+            return {
+                'status': result.get('status'),
+                'target_rows': result.get('target_rows'),
+                'error_rows': result.get('error_rows'),
+                'message': result.get('message'),
+                'stage_profile': result.get('stage_profile'),
+            }
+
+        results[f'mapper_{mode}_initial'] = measure(counter, args.rows, lambda: run_job(1))
+        cursor = source_conn.cursor()
+        changed = workload.apply_changes(cursor, placeholder, args.change_rate)
+        cursor.close()
+        source_conn.commit()
+        incremental = measure(counter, args.rows, lambda: run_job(2))
+        incremental['changed_rows'] = changed
+        results[f'mapper_{mode}_incremental'] = incremental
+    return results
+
+
+@contextmanager
+def _counting_factories(module, names: List[str], counter: RoundTripCounter):
+    """Have ``module`` hand out counting connections from its connection factories."""
+    originals = {name: getattr(module, name) for name in names if hasattr(module, name)}
+
+    def wrap(name, factory):
+        def create(*args, **kwargs):
+            return counting_connection(factory(*args, **kwargs), counter, name.replace('create_', '').replace('_connection', ''))
+        return create
+
+    for name, factory in originals.items():
+        setattr(module, name, wrap(name, factory))
+    try:
+        yield
+    finally:
+        for name, factory in originals.items():
+            setattr(module, name, factory)
+
+
+def run_file_upload(args, counter: RoundTripCounter, directory: str) -> Dict[str, Any]:
+    if not args.flupldref:
+        return {'skipped': 'no --flupldref given'}
+    try:
+        from backend.modules.file_upload import streaming_file_executor
+    except ImportError as e:
+        return {'skipped': f'file upload modules not importable: {e}'}
+
+    workload = Workload(args.rows, args.width, args.key_distribution, args.seed)
+    file_path = os.path.join(directory, f'{args.flupldref}.csv')
+    with open(file_path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['ID'] + workload.columns)
+        for key in workload.keys:
+            writer.writerow([key] + [column_value(key, i) for i in range(1, args.width + 1)])
+
+    def run():
+        with _counting_factories(streaming_file_executor,
+                                 ['create_metadata_connection', 'create_target_connection'], counter):
+            result = streaming_file_executor.StreamingFileExecutor().execute(args.flupldref, file_path=file_path)
+        return {'status': result.get('status'), 'result': {
+            key: value for key, value in result.items() if isinstance(value, (int, float, str, type(None)))
+        }}
+    return _guarded(lambda: measure(counter, args.rows, run))
+
+
+def run_report(args, counter: RoundTripCounter) -> Dict[str, Any]:
+    if args.report_id is None:
+        return {'skipped': 'no --report-id given'}
+    try:
+        from backend.modules.reports import report_service
+    except ImportError as e:
+        return {'skipped': f'report modules not importable: {e}'}
+
+    def run():
+        with _counting_factories(report_service,
+                                 ['create_metadata_connection', 'create_target_connection'], counter):
+            result = report_service.ReportMetadataService().execute_report(
+                args.report_id, {'outputFormats': ['CSV']}, username='benchmark'
+            )
+        return {'report_rows': result.get('rowCount'), 'run_id': result.get('runId')}
+
+    outcome = _guarded(lambda: measure(counter, 0, run))
+    if 'report_rows' in outcome and outcome.get('seconds'):
+        outcome['rows'] = outcome['report_rows']
+        outcome['rows_per_sec'] = round(outcome['report_rows'] / outcome['seconds'], 1)
+    return outcome
+
+
+def _guarded(run: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        return run()
+    except Exception as e:
+        return {'status': 'ERROR', 'message': f'{type(e).__name__}: {e}'}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    counter = RoundTripCounter()
+    report: Dict[str, Any] = {
+        'benchmark': 'etl',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            key: getattr(args, key) for key in (
+                'rows', 'width', 'change_rate', 'key_distribution', 'scd_type', 'workers', 'bulk_limit', 'seed'
+            )
+        },
+    }
+
+    with tempfile.TemporaryDirectory(prefix='dms_bench_') as directory:
+        if args.pg_dsn:
+            import psycopg2
+            raw = {role: psycopg2.connect(args.pg_dsn) for role in ('metadata', 'source', 'target')}
+            connections = {role: counting_connection(conn, counter, role) for role, conn in raw.items()}
+            report['database'] = 'postgresql'
+            close = lambda: [conn.close() for conn in raw.values()]
+        else:
+            standin = SQLiteStandIn(directory, [SCHEMA])
+            report['database'] = 'sqlite-standin'
+            report['metadata_install'] = standin.install_metadata()
+            connections = {role: standin.connect(counter, role) for role in ('metadata', 'source', 'target')}
+            close = standin.close
+        try:
+            report['results'] = run_mapper_scenarios(args, connections, counter, '%s', bool(args.pg_dsn))
+        finally:
+            close()
+        report['results']['file_upload'] = run_file_upload(args, counter, directory)
+        report['results']['report'] = run_report(args, counter)
+    return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='End-to-end ETL benchmark (JSON output)')
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--width', type=int, default=20, help='non-key source columns')
+    parser.add_argument('--change-rate', type=float, default=0.1, help='fraction of rows changed before the incremental run')
+    parser.add_argument('--key-distribution', choices=('sequential', 'random', 'skewed'), default='sequential')
+    parser.add_argument('--scd-type', type=int, choices=(1, 2), default=1)
+    parser.add_argument('--workers', type=int, default=4, help='parallel mapper workers (1 skips the parallel runs)')
+    parser.add_argument('--bulk-limit', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--pg-dsn', help='run the mapper on this PostgreSQL database instead of the SQLite stand-in')
+    parser.add_argument('--flupldref', help='existing file upload definition to run over a generated CSV')
+    parser.add_argument('--report-id', type=int, help='existing report definition to execute')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    # The executors print progress to stdout; keep stdout for the JSON report
+    with redirect_stdout(sys.stderr):
+        results = run_benchmark(arguments)
+    text = json.dumps(results, indent=2, default=str)
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='utf-8') as output:
+            output.write(text + '\n')
+    print(text)
@@ -0,0 +1,82 @@
+"""
+Benchmark for the mapper process pool.
+Classifies synthetic rows inline and with 1/2/4/8 worker processes and
+prints rows/sec and speedup, so the process mode can be sized per host.
+
+Usage:
+    python -m backend.modules.mapper.benchmark_process_pool [rows] [columns]
+
+No database connection is needed: target lookups are simulated by a fixed
+mix of new, unchanged and changed rows.
+"""
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
+
+from backend.modules.mapper.mapper_process_pool import (
+    MapperProcessPool,
+    RowBlockSpec,
+    classify_row_block
+)
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def build_workload(row_count: int, column_count: int):
+    """Build a row block spec, source rows and simulated target states."""
+    source_columns = tuple(f'col_{i}' for i in range(column_count))
+    all_columns = tuple(col.upper() for col in source_columns) + ('RWHKEY',)
+    spec = RowBlockSpec(
+        source_columns=source_columns,
+        column_source_mapping={col.upper(): col for col in source_columns},
+        all_columns=all_columns,
+        hash_exclude_columns=frozenset({'RWHKEY'}),
+        scd_type=2,
+        target_type='DIM',
+        checkpoint_columns=(source_columns[0],),
+    )
+    rows = [
+        tuple(row_id if i == 0 else f'value_{row_id}_{i}' for i in range(column_count))
+        for row_id in range(row_count)
+    ]
+    # One third new rows, the rest changed (stale hash) so every row is hashed and classified
+    target_states = [
+        None if row_id % 3 == 0 else {'RWHKEY': 'stale', 'SKEY': row_id}
+        for row_id in range(row_count)
+    ]
+    return spec, rows, target_states
+
+
+def run_benchmark(row_count: int = 200000, column_count: int = 20):
+    spec, rows, target_states = build_workload(row_count, column_count)
+
+    print("\n" + "=" * 80)
+    print(f"MAPPER PROCESS POOL BENCHMARK ({row_count:,} rows x {column_count} columns, "
+          f"{os.cpu_count()} CPUs)")
+    print("=" * 80)
+
+    start = time.perf_counter()
+    baseline = classify_row_block(spec, rows, target_states)
+    inline_seconds = time.perf_counter() - start
+    print(f"{'inline':>10}: {row_count / inline_seconds:>12,.0f} rows/sec  (1.00x)")
+
+    for workers in WORKER_COUNTS:
+        with MapperProcessPool(max_workers=workers) as pool:
+            # Warm up so process start-up is not counted
+            pool.classify(spec, rows[:workers], target_states[:workers])
+            start = time.perf_counter()
+            result = pool.classify(spec, rows, target_states)
+            seconds = time.perf_counter() - start
+        if len(result.rows_to_insert) != len(baseline.rows_to_insert):
+            print(f"WARNING: {workers} workers classified {len(result.rows_to_insert)} inserts, "
+                  f"expected {len(baseline.rows_to_insert)}")
+        print(f"{workers:>3} procs : {row_count / seconds:>12,.0f} rows/sec  "
+              f"({inline_seconds / seconds:.2f}x)")
+
+
+if __name__ == '__main__':
+    args = [int(arg) for arg in sys.argv[1:3]]
+    run_benchmark(*args)
@@ -2,18 +2,91 @@
 Chunk Manager for parallel processing.
 Handles chunking strategies for different database types and data sources.
 """
-from typing import Optional, Tuple
+from decimal import Decimal
+from typing import Optional, Tuple, Dict, Any, List
+import json
+import os
 import re
+import time
+import uuid
 
 # Support both FastAPI (package import) and legacy Flask (relative import) contexts
 try:
     from backend.modules.common.db_table_utils import _detect_db_type
+    from backend.modules.common.ttl_cache import TTLCache
     from backend.modules.logger import info, warning, error, debug
 except ImportError:  # When running Flask app.py directly inside backend
     from modules.common.db_table_utils import _detect_db_type  # type: ignore
+    from modules.common.ttl_cache import TTLCache  # type: ignore
     from modules.logger import info, warning, error, debug  # type: ignore
 
-from .parallel_models import ChunkingStrategy, ChunkConfig
+from .parallel_models import ChunkingStrategy, ChunkConfig, ChunkRange
+
+
+# SELECT <plain columns> FROM [schema.]table with nothing after it but an ORDER BY
+# (no function calls, so aggregates and expressions fall through to the planner)
+_SIMPLE_TABLE_SQL = re.compile(
+    r'^\s*SELECT\s+(?!DISTINCT\b)(?:(?!\bFROM\b)[^()])+?\s+FROM\s+(?:"?(?P<schema>\w+)"?\.)?"?(?P<table>\w+)"?'
+    r'(?:\s+(?:AS\s+)?(?!ORDER\b)\w+)?(?:\s+ORDER\s+BY\s+[\w\s,."]+)?\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+
+# mapref -> source rows of its latest logged run
+_history_cache = TTLCache(
+    ttl_seconds=float(os.getenv('MAPPER_ROW_ESTIMATE_HISTORY_TTL_SECONDS', '3600') or 0)
+)
+
+
+def _historic_row_count(metadata_conn, mapref: Optional[str]) -> Optional[int]:
+    """Source row count of the mapping's latest run with rows in DMS_JOBLOG (cached per mapref)."""
+    if metadata_conn is None or not mapref:
+        return None
+    
+    def load() -> Optional[int]:
+        db_type = _detect_db_type(metadata_conn)
+        cursor = metadata_conn.cursor()
+        try:
+            if db_type == "POSTGRESQL":
+                cursor.execute("""
+                    SELECT srcrows FROM DMS_JOBLOG
+                    WHERE joblogid = (SELECT MAX(joblogid) FROM DMS_JOBLOG WHERE mapref = %s AND srcrows > 0)
+                """, (mapref,))
+            else:
+                cursor.execute("""
+                    SELECT srcrows FROM DMS_JOBLOG
+                    WHERE joblogid = (SELECT MAX(joblogid) FROM DMS_JOBLOG WHERE mapref = :mapref AND srcrows > 0)
+                """, {'mapref': mapref})
+            result = cursor.fetchone()
+            return int(result[0]) if result and result[0] is not None else None
+        finally:
+            cursor.close()
+    
+    rows = _history_cache.get(mapref)
+    if rows is None:
+        rows = load()
+        if rows is not None:
+            _history_cache.set(mapref, rows)
+    return rows
+
+
+def record_actual_row_count(mapref: Optional[str], estimated_rows: int, actual_rows: int) -> None:
+    """Log how far the pre-run estimate was off and refresh the cached history count."""
+    if not mapref:
+        return
+    if actual_rows > 0:
+        _history_cache.set(mapref, actual_rows)
+    if estimated_rows or actual_rows:
+        error_pct = abs(estimated_rows - actual_rows) * 100.0 / max(actual_rows, 1)
+        info(f"Row count estimate error for {mapref}: estimated {estimated_rows}, actual {actual_rows} "
+             f"({error_pct:.1f}%)")
+
+
+def _rollback_quietly(connection) -> None:
+    # A failed statement aborts the current transaction on PostgreSQL
+    try:
+        connection.rollback()
+    except Exception:
+        pass
 
 
 class ChunkManager:
@@ -27,39 +100,174 @@ class ChunkManager:
             db_type: Database type ('POSTGRESQL' or 'ORACLE')
         """
         self.db_type = db_type.upper()
+        self.last_estimate_source: Optional[str] = None
     
     def estimate_total_rows(
         self,
         connection,
         source_sql: str,
-        source_schema: Optional[str] = None
+        source_schema: Optional[str] = None,
+        bind_params: Optional[Dict[str, Any]] = None,
+        mapref: Optional[str] = None,
+        metadata_conn=None,
+        exact: bool = False
     ) -> int:
         """
         Estimate total number of rows in source query.
         
+        Cheap estimators are tried in order and the first usable one wins:
+        table statistics (simple single-table sources), optimizer plan
+        cardinality (EXPLAIN / EXPLAIN PLAN), the last row count recorded
+        for ``mapref`` in DMS_JOBLOG, and finally an exact COUNT(*).
+        
         Args:
             connection: Database connection
             source_sql: Source SQL query
             source_schema: Optional source schema
+            bind_params: Bind values for placeholders in source_sql
+            mapref: Mapping reference for the DMS_JOBLOG history estimate
+            metadata_conn: Metadata connection for the history estimate
+            exact: Skip the estimators and run COUNT(*) (needed for chunk boundaries)
             
         Returns:
             Estimated row count
         """
+        estimators = [] if exact else [
+            ('table statistics', lambda: self._estimate_from_table_stats(connection, source_sql, source_schema)),
+            ('optimizer plan', lambda: self._estimate_from_plan(connection, source_sql, bind_params)),
+            ('job history', lambda: _historic_row_count(metadata_conn, mapref)),
+        ]
+        estimators.append(('exact count', lambda: self._count_rows(connection, source_sql, bind_params)))
+        
+        for source, estimator in estimators:
+            started = time.perf_counter()
+            try:
+                rows = estimator()
+            except Exception as e:
+                debug(f"Row count estimation via {source} failed: {e}")
+                _rollback_quietly(connection)
+                continue
+            if rows is None or rows < 0:
+                continue
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.last_estimate_source = source
+            info(f"Row count estimate: {rows} rows via {source} ({elapsed_ms:.0f} ms)")
+            return int(rows)
+        
+        warning("Failed to estimate total rows, assuming 0")
+        self.last_estimate_source = None
+        return 0
+    
+    def _count_rows(self, connection, source_sql: str, bind_params: Optional[Dict[str, Any]] = None) -> int:
+        """Exact COUNT(*) over the source query."""
         cursor = connection.cursor()
         try:
             # Wrap source SQL in COUNT query
             count_sql = f"SELECT COUNT(*) FROM ({source_sql}) subq"
-            
-            if self.db_type == "POSTGRESQL":
-                cursor.execute(count_sql)
-            else:  # Oracle
+            if bind_params:
+                cursor.execute(count_sql, bind_params)
+            else:
                 cursor.execute(count_sql)
             
             result = cursor.fetchone()
             return int(result[0]) if result else 0
-        except Exception as e:
-            warning(f"Failed to estimate total rows: {e}, assuming 0")
-            return 0
+        finally:
+            cursor.close()
+    
+    def _estimate_from_table_stats(
+        self,
+        connection,
+        source_sql: str,
+        source_schema: Optional[str] = None
+    ) -> Optional[int]:
+        """
+        Row count from the catalog statistics of a source that is a plain
+        ``SELECT ... FROM [schema.]table`` (no WHERE, JOIN, GROUP BY, ...).
+        Returns None for other sources or tables without statistics.
+        """
+        match = _SIMPLE_TABLE_SQL.match(source_sql)
+        if not match:
+            return None
+        schema = match.group('schema') or source_schema
+        table = match.group('table')
+        
+        cursor = connection.cursor()
+        try:
+            if self.db_type == "POSTGRESQL":
+                qualified = f"{schema}.{table}" if schema else table
+                # reltuples is -1 (or 0 on older versions) until the table is analyzed
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                    (qualified,)
+                )
+            elif self.db_type == "ORACLE":
+                cursor.execute(
+                    "SELECT num_rows FROM all_tables "
+                    "WHERE table_name = :table_name AND owner = NVL(:owner, USER)",
+                    {'table_name': table.upper(), 'owner': schema.upper() if schema else None}
+                )
+            elif self.db_type == "MYSQL":
+                cursor.execute(
+                    "SELECT table_rows FROM information_schema.tables "
+                    "WHERE table_name = %s AND table_schema = COALESCE(%s, DATABASE())",
+                    (table, schema)
+                )
+            else:
+                return None
+            result = cursor.fetchone()
+            if not result or result[0] is None or int(result[0]) <= 0:
+                return None
+            return int(result[0])
+        finally:
+            cursor.close()
+    
+    def _estimate_from_plan(
+        self,
+        connection,
+        source_sql: str,
+        bind_params: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        """Row count from the optimizer's cardinality estimate for the top plan node."""
+        cursor = connection.cursor()
+        try:
+            if self.db_type == "POSTGRESQL":
+                # EXPLAIN without ANALYZE only plans the query
+                if bind_params:
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {source_sql}", bind_params)
+                else:
+                    cursor.execute(f"EXPLAIN (FORMAT JSON) {source_sql}")
+                result = cursor.fetchone()
+                plan = result[0] if result else None
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]['Plan']['Plan Rows'])
+            if self.db_type == "ORACLE":
+                # Bind placeholders are allowed unbound in EXPLAIN PLAN
+                statement_id = f"DMS_EST_{uuid.uuid4().hex[:20]}"
+                cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {source_sql}")
+                try:
+                    cursor.execute(
+                        "SELECT cardinality FROM plan_table WHERE statement_id = :statement_id AND id = 0",
+                        {'statement_id': statement_id}
+                    )
+                    result = cursor.fetchone()
+                finally:
+                    cursor.execute(
+                        "DELETE FROM plan_table WHERE statement_id = :statement_id",
+                        {'statement_id': statement_id}
+                    )
+                return int(result[0]) if result and result[0] is not None else None
+            if self.db_type == "MYSQL":
+                if bind_params:
+                    cursor.execute(f"EXPLAIN {source_sql}", bind_params)
+                else:
+                    cursor.execute(f"EXPLAIN {source_sql}")
+                columns = [desc[0].lower() for desc in cursor.description]
+                rows_index = columns.index('rows')
+                # The first row of a plan drives the query; joins multiply from there
+                first = cursor.fetchone()
+                return int(first[rows_index]) if first and first[rows_index] is not None else None
+            return None
         finally:
             cursor.close()
     
@@ -172,6 +380,55 @@ class ChunkManager:
             # Fallback to OFFSET/LIMIT for other databases
             return self._create_offset_limit_chunk_query(sql, chunk_id, chunk_size)
     
+    def create_chunk_range_query(
+        self,
+        original_sql: str,
+        chunk: ChunkRange,
+        chunk_size: int
+    ) -> str:
+        """
+        Create the query for a planned chunk: a key range predicate when the
+        chunk has key bounds, otherwise the OFFSET/LIMIT window for its id.
+        """
+        if not chunk.key_column:
+            return self.create_chunked_query(original_sql, chunk.chunk_id, chunk_size)
+        
+        column = f"rng_src.{chunk.key_column}"
+        predicates = []
+        if chunk.key_from is not None:
+            predicates.append(f"{column} > {_key_literal(chunk.key_from, chunk.key_type)}")
+        if chunk.key_to is not None:
+            upper = f"{column} <= {_key_literal(chunk.key_to, chunk.key_type)}"
+            # The first chunk also takes rows whose key is NULL
+            predicates.append(f"({upper} OR {column} IS NULL)" if chunk.key_from is None else upper)
+        where_clause = f"WHERE {' AND '.join(predicates)}" if predicates else ""
+        return f"""
+                SELECT * FROM (
+                    {original_sql}
+                ) rng_src
+                {where_clause}
+                ORDER BY {column}
+            """
+    
+    def create_skip_query(self, sql: str, rows_to_skip: int) -> Optional[str]:
+        """
+        Push a row skip into the query as an OFFSET so skipped rows are not
+        fetched. Returns None for databases without a usable OFFSET form.
+        
+        PYTHON checkpoints only store a row count, so there is no key to turn
+        into a range predicate; KEY checkpoints already resume with one.
+        """
+        if rows_to_skip <= 0:
+            return sql
+        if self.db_type == "POSTGRESQL":
+            return f"SELECT * FROM ({sql}) skp_src OFFSET {int(rows_to_skip)}"
+        if self.db_type == "ORACLE":
+            return f"SELECT * FROM ({sql}) skp_src OFFSET {int(rows_to_skip)} ROWS"
+        if self.db_type == "MYSQL":
+            # MySQL has no OFFSET without LIMIT; this is its documented "all rows" limit
+            return f"SELECT * FROM ({sql}) skp_src LIMIT 18446744073709551615 OFFSET {int(rows_to_skip)}"
+        return None
+    
     def detect_key_column(
         self,
         connection,
@@ -206,7 +463,8 @@ class ChunkManager:
         connection,
         source_sql: str,
         chunk_size: int,
-        source_schema: Optional[str] = None
+        source_schema: Optional[str] = None,
+        bind_params: Optional[Dict[str, Any]] = None
     ) -> ChunkConfig:
         """
         Calculate chunking configuration for a source query.
@@ -216,12 +474,15 @@ class ChunkManager:
             source_sql: Source SQL query
             chunk_size: Desired chunk size
             source_schema: Optional source schema
+            bind_params: Bind values for placeholders in source_sql
             
         Returns:
             ChunkConfig with strategy and chunk count
         """
-        # Estimate total rows
-        total_rows = self.estimate_total_rows(connection, source_sql, source_schema)
+        # Chunk boundaries are OFFSET based, so they need the exact row count
+        total_rows = self.estimate_total_rows(
+            connection, source_sql, source_schema, bind_params=bind_params, exact=True
+        )
         
         # Try to detect key column for key-based chunking
         key_column = self.detect_key_column(connection, source_sql)
@@ -242,4 +503,106 @@ class ChunkManager:
             total_rows=total_rows,
             num_chunks=num_chunks
         )
+    
+    def plan_chunk_ranges(
+        self,
+        connection,
+        source_sql: str,
+        chunk_config: ChunkConfig,
+        bind_params: Optional[Dict[str, Any]] = None
+    ) -> List[ChunkRange]:
+        """
+        Split a source query into chunks for the chunk ledger.
+        
+        With a key column the boundaries are read from the source once, so each
+        chunk is a key range that can be re-run on its own after a failure.
+        Otherwise (or if the boundaries cannot be read) chunks are OFFSET ranges,
+        which the ledger does not keep.
+        """
+        chunk_size = chunk_config.chunk_size
+        if chunk_config.key_column:
+            boundaries = self._key_boundaries(
+                connection, source_sql, chunk_config.key_column, chunk_size, bind_params
+            )
+            if boundaries is not None:
+                key_type, values = boundaries
+                edges = [None] + values + [None]
+                return [
+                    ChunkRange(
+                        chunk_id=chunk_id,
+                        key_column=chunk_config.key_column,
+                        key_type=key_type,
+                        key_from=edges[chunk_id],
+                        key_to=edges[chunk_id + 1],
+                    )
+                    for chunk_id in range(len(edges) - 1)
+                ]
+        
+        num_chunks = chunk_config.num_chunks or 1
+        return [
+            ChunkRange(
+                chunk_id=chunk_id,
+                row_from=chunk_id * chunk_size,
+                row_to=(chunk_id + 1) * chunk_size,
+            )
+            for chunk_id in range(num_chunks)
+        ]
+    
+    def _key_boundaries(
+        self,
+        connection,
+        source_sql: str,
+        key_column: str,
+        chunk_size: int,
+        bind_params: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[str, List[str]]]:
+        """
+        Return (key_type, upper bounds) splitting the non-NULL keys into runs of
+        chunk_size rows, or None if the keys cannot be used as range bounds.
+        """
+        modulo = f"bnd.bnd_rn % {int(chunk_size)}" if self.db_type == "MSSQL" else f"MOD(bnd.bnd_rn, {int(chunk_size)})"
+        query = f"""
+            SELECT bnd.bnd_key FROM (
+                SELECT bnd_src.{key_column} AS bnd_key,
+                       ROW_NUMBER() OVER (ORDER BY bnd_src.{key_column}) AS bnd_rn
+                FROM ({source_sql}) bnd_src
+                WHERE bnd_src.{key_column} IS NOT NULL
+            ) bnd
+            WHERE {modulo} = 0
+            ORDER BY bnd.bnd_rn
+        """
+        cursor = connection.cursor()
+        try:
+            if bind_params:
+                cursor.execute(query, bind_params)
+            else:
+                cursor.execute(query)
+            keys = [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            warning(f"Could not read chunk boundaries on {key_column}, using OFFSET chunks: {e}")
+            _rollback_quietly(connection)
+            return None
+        finally:
+            cursor.close()
+        
+        if all(isinstance(key, (int, Decimal)) and not isinstance(key, bool) for key in keys):
+            key_type = 'N'
+        elif all(isinstance(key, str) for key in keys):
+            key_type = 'S'
+        else:
+            debug(f"Chunk key {key_column} is not numeric or text, using OFFSET chunks")
+            return None
+        
+        values = []
+        for key in keys:
+            text = str(key)
+            if not values or values[-1] != text:
+                values.append(text)
+        return key_type, values
+
 
+def _key_literal(value: str, key_type: Optional[str]) -> str:
+    """Render a ledger key bound as a SQL literal."""
+    if key_type == 'N':
+        return str(Decimal(value))  # rejects anything that is not a number
+    return "'" + value.replace("'", "''") + "'"
@@ -3,7 +3,6 @@ import datetime
 import io
 import traceback
 import re
-import difflib
 
 import pandas as pd
 from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form
@@ -34,6 +33,8 @@ from backend.modules.helper_functions import (
 )
 # Import validate_logic2 directly from pkgdwmapr_python to support target_connection parameter
 from backend.modules.mapper.pkgdwmapr_python import validate_logic2
+from backend.modules.mapper.sql_similarity_index import normalize_sql, sql_similarity_index
+from backend.modules.common.describe_cache import cached_description, store_description
 
 # Support both FastAPI (package import) and legacy Flask (relative import) contexts
 try:
@@ -84,35 +85,6 @@ def _detect_db_type_from_connection(conn) -> str:
     return "ORACLE"
 
 
-def _normalize_sql(sql: str) -> str:
-    """
-    Normalize SQL for comparison:
-    - Remove comments
-    - Collapse whitespace
-    - Uppercase
-    """
-    if not sql:
-        return ""
-
-    # Remove single-line comments --
-    sql_no_single = re.sub(r"--.*?$", "", sql, flags=re.MULTILINE)
-    # Remove /* */ comments
-    sql_no_comments = re.sub(r"/\*.*?\*/", "", sql_no_single, flags=re.DOTALL)
-    # Collapse whitespace
-    sql_spaced = re.sub(r"\s+", " ", sql_no_comments).strip()
-    return sql_spaced.upper()
-
-
-def _calculate_sql_similarity(a: str, b: str) -> float:
-    """
-    Calculate similarity between two SQL strings using difflib.
-    Returns a float between 0 and 1.
-    """
-    if not a or not b:
-        return 0.0
-    return difflib.SequenceMatcher(None, a, b).ratio()
-
-
 def _build_wrapped_sql(original_sql: str, db_type: str) -> str:
     """
     Wrap the user SQL so we can safely fetch column metadata without
@@ -649,45 +621,53 @@ async def extract_sql_columns(payload: ExtractSqlColumnsRequest):
                 status_code=400, detail="Resolved SQL content is empty"
             )
 
-        # Step 2: Create source connection (target or metadata)
-        if connection_id is not None:
-            try:
-                source_conn = create_target_connection(connection_id)
-            except Exception as e:
-                error(
-                    f"extract_sql_columns: failed to create target connection "
-                    f"(connection_id={connection_id}): {str(e)}"
-                )
-                raise HTTPException(
-                    status_code=500,
-                    detail=(
-                        f"Failed to connect to selected database for SQL analysis "
-                        f"(connection_id={connection_id})"
-                    ),
-                )
+        # Columns of this SQL on this connection described recently: skip the source entirely
+        cached = cached_description(connection_id, sql_content)
+        if cached is not None:
+            db_type_source, description = cached
         else:
-            source_conn = metadata_conn
+            # Step 2: Create source connection (target or metadata)
+            if connection_id is not None:
+                try:
+                    source_conn = create_target_connection(connection_id)
+                except Exception as e:
+                    error(
+                        f"extract_sql_columns: failed to create target connection "
+                        f"(connection_id={connection_id}): {str(e)}"
+                    )
+                    raise HTTPException(
+                        status_code=500,
+                        detail=(
+                            f"Failed to connect to selected database for SQL analysis "
+                            f"(connection_id={connection_id})"
+                        ),
+                    )
+            else:
+                source_conn = metadata_conn
 
-        if not source_conn:
-            raise HTTPException(
-                status_code=500, detail="Failed to create source connection"
-            )
+            if not source_conn:
+                raise HTTPException(
+                    status_code=500, detail="Failed to create source connection"
+                )
 
-        db_type_source = _detect_db_type_from_connection(source_conn)
+            db_type_source = _detect_db_type_from_connection(source_conn)
 
-        # Step 3: Build wrapped SQL and execute to obtain column metadata
-        wrapped_sql = _build_wrapped_sql(sql_content, db_type_source)
-        info(
-            f"extract_sql_columns: executing wrapped SQL for metadata only "
-            f"(db_type={db_type_source})"
-        )
+            # Step 3: Build wrapped SQL and execute to obtain column metadata
+            wrapped_sql = _build_wrapped_sql(sql_content, db_type_source)
+            info(
+                f"extract_sql_columns: executing wrapped SQL for metadata only "
+                f"(db_type={db_type_source})"
+            )
 
-        src_cursor = source_conn.cursor()
-        try:
-            src_cursor.execute(wrapped_sql)
-            description = src_cursor.description or []
-        finally:
-            src_cursor.close()
+            src_cursor = source_conn.cursor()
+            try:
+                src_cursor.execute(wrapped_sql)
+                description = src_cursor.description or []
+            finally:
+                src_cursor.close()
+            description = store_description(
+                connection_id, sql_content, db_type_source, description
+            )
 
         if not description:
             return ExtractSqlColumnsResponse(
@@ -1034,7 +1014,8 @@ async def check_sql_duplicate(payload: CheckSqlDuplicateRequest):
     Check if a given SQL already exists (exactly or similarly) in DMS_MAPRSQL.
 
     Uses simplified normalization + string similarity (difflib) and returns
-    any matches above the provided similarity threshold (default: 0.7).
+    any matches above the provided similarity threshold (default: 0.7). Only
+    the shortlist returned by the in-memory similarity index is scored.
     """
     data = payload.model_dump()
     sql_content = (data.get("sql_content") or "").strip()
@@ -1045,7 +1026,7 @@ async def check_sql_duplicate(payload: CheckSqlDuplicateRequest):
             status_code=400, detail="sql_content must not be empty"
         )
 
-    normalized_new = _normalize_sql(sql_content)
+    normalized_new = normalize_sql(sql_content)
     if not normalized_new:
         raise HTTPException(
             status_code=400,
@@ -1060,59 +1041,21 @@ async def check_sql_duplicate(payload: CheckSqlDuplicateRequest):
                 status_code=500, detail="Failed to create metadata connection"
             )
 
-        db_type = _detect_db_type_from_connection(conn)
+        index = sql_similarity_index()
         cursor = conn.cursor()
         try:
-            if db_type == "POSTGRESQL":
-                query = (
-                    "SELECT MAPRSQLCD, MAPRSQL "
-                    "FROM DMS_MAPRSQL WHERE CURFLG = 'Y'"
-                )
-                cursor.execute(query)
-            else:
-                query = (
-                    "SELECT MAPRSQLCD, MAPRSQL "
-                    "FROM DMS_MAPRSQL WHERE CURFLG = 'Y'"
-                )
-                cursor.execute(query)
-
-            rows = cursor.fetchall() or []
+            index.refresh(cursor)
         finally:
             cursor.close()
 
-        has_exact_match = False
-        exact_match_code: Optional[str] = None
-        similar: List[SimilarQuery] = []
-
-        for row in rows:
-            code = str(row[0])
-            sql_value = row[1]
-            existing_sql = (
-                sql_value.read() if hasattr(sql_value, "read") else str(sql_value)
-            )
-            normalized_existing = _normalize_sql(existing_sql)
-            if not normalized_existing:
-                continue
-
-            if normalized_existing == normalized_new:
-                has_exact_match = True
-                exact_match_code = code
-                # Even if exact match is found, continue to collect other similar queries
-
-            score = _calculate_sql_similarity(normalized_new, normalized_existing)
-            if score >= similarity_threshold:
-                similar.append(
-                    SimilarQuery(
-                        sql_code=code,
-                        similarity_score=round(score, 4),
-                        sql_content=existing_sql,
-                    )
-                )
-
-        # Sort similar queries by descending similarity
-        similar_sorted = sorted(
-            similar, key=lambda x: x.similarity_score, reverse=True
+        exact_match_code, matches = index.search(
+            sql_content, similarity_threshold, limit=5
         )
+        has_exact_match = exact_match_code is not None
+        similar_sorted = [
+            SimilarQuery(sql_code=code, similarity_score=score, sql_content=sql)
+            for code, score, sql in matches
+        ]
 
         return CheckSqlDuplicateResponse(
             has_exact_match=has_exact_match,
@@ -0,0 +1,252 @@
+"""
+Batch validation of mapping-detail logic (used by validate_logic_for_mapref).
+
+A mapping with hundreds of columns used to validate every detail's SQL one
+statement at a time over one connection, although most details share a
+handful of SQL codes. Callers now hand over the distinct statements grouped
+by the connection they validate on:
+
+- statements are keyed by a hash of the normalized SQL plus key/value
+  columns, so identical logic is validated once per run
+- results are cached per (connection id, statement hash, schema version);
+  the schema version is a cheap fingerprint of the database's catalog, so
+  any DDL on the validation database invalidates the cached results
+  (MAPPER_VALIDATE_CACHE_TTL_SECONDS bounds their age, 0 disables the cache).
+  Only passes and missing table/column errors are cached: other errors may
+  be transient (lost connection, timeout, lock) and are checked again
+- the remaining statements run on MAPPER_VALIDATE_WORKERS threads; each
+  thread checks out its own connection of the group (the caller's connection
+  first, further ones opened on demand and closed at the end)
+"""
+from __future__ import annotations
+
+import hashlib
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.common.env_config import env_int
+    from backend.modules.common.ttl_cache import TTLCache
+    from backend.modules.mapper.sql_similarity_index import normalize_sql
+    from backend.modules.logger import info, warning, debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.env_config import env_int  # type: ignore
+    from modules.common.ttl_cache import TTLCache  # type: ignore
+    from modules.mapper.sql_similarity_index import normalize_sql  # type: ignore
+    from modules.logger import info, warning, debug  # type: ignore
+
+
+# Statements validated at once (and connections open) per validation group
+VALIDATE_WORKERS = max(1, env_int("MAPPER_VALIDATE_WORKERS", 4))
+
+_MISSING = object()
+
+# (conid, statement hash, schema version) -> error message or None
+_result_cache = TTLCache(ttl_seconds=env_int("MAPPER_VALIDATE_CACHE_TTL_SECONDS", 900))
+
+# Errors that only change with the catalog (and so with the schema version)
+_SCHEMA_ERRORS = re.compile(r"does not exist|ORA-00942|ORA-00904|ORA-04043", re.IGNORECASE)
+
+
+def _cacheable(result: Any) -> bool:
+    """Passes and missing table/column errors; anything else may be transient."""
+    return result is None or (isinstance(result, str) and bool(_SCHEMA_ERRORS.search(result)))
+
+
+def validation_key(logic: Any, keyclnm: Any = None, valclnm: Any = None) -> str:
+    """Hash identifying one validation statement (normalized SQL + key/value columns)."""
+    text = "\x1f".join([normalize_sql(str(logic or "")), str(keyclnm or "").upper(), str(valclnm or "").upper()])
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def schema_version(connection, db_type: str) -> Optional[str]:
+    """
+    Fingerprint of the tables/views/columns visible on ``connection``.
+
+    PostgreSQL: row counts and newest row versions (xmin) of pg_class and
+    pg_attribute, which change with any create/alter/drop. Oracle: count and
+    latest LAST_DDL_TIME of ALL_OBJECTS. None when it cannot be read, in which
+    case results on that connection are not cached.
+    """
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        if db_type == "POSTGRESQL":
+            cursor.execute("""
+                SELECT (SELECT COUNT(*) || ':' || MAX(xmin::text::bigint) FROM pg_catalog.pg_class),
+                       (SELECT COUNT(*) || ':' || MAX(xmin::text::bigint) FROM pg_catalog.pg_attribute)
+            """)
+        else:  # Oracle
+            cursor.execute("""
+                SELECT COUNT(*), TO_CHAR(MAX(last_ddl_time), 'YYYYMMDDHH24MISS')
+                FROM all_objects
+                WHERE object_type IN ('TABLE', 'VIEW', 'SYNONYM', 'MATERIALIZED VIEW')
+            """)
+        row = cursor.fetchone()
+        return "/".join(str(value) for value in row) if row else None
+    except Exception as e:
+        warning(f"[logic_validation] Could not read schema version, results will not be cached: {e}")
+        _rollback_quietly(connection, db_type)
+        return None
+    finally:
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+
+def _rollback_quietly(connection, db_type: str) -> None:
+    # A failed statement leaves a PostgreSQL transaction aborted; clear it for the next one
+    if db_type == "POSTGRESQL" and not getattr(connection, "autocommit", False):
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+
+
+class ValidationGroup:
+    """
+    Distinct statements validated on one database.
+
+    ``conid`` names the database in the result cache (None = do not cache);
+    ``connect`` opens another connection to it for parallel workers (None =
+    only ``connection`` is used, so the group runs serially).
+    """
+
+    def __init__(
+        self,
+        conid: Optional[Hashable],
+        connection,
+        db_type: str,
+        connect: Optional[Callable[[], Any]] = None,
+    ):
+        self.conid = conid
+        self.connection = connection
+        self.db_type = db_type
+        self.connect = connect
+        self.statements: Dict[str, Any] = {}
+
+    def add(self, key: str, statement: Any) -> None:
+        self.statements.setdefault(key, statement)
+
+
+class _ConnectionPool:
+    """The group's connection plus up to ``size - 1`` extra ones opened on demand."""
+
+    def __init__(self, group: ValidationGroup, size: int):
+        self.group = group
+        self.size = size if group.connect else 1
+        self._idle: "queue.Queue" = queue.Queue()
+        self._idle.put(group.connection)
+        self._opened: List[Any] = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = len(self._opened) + 1 < self.size
+            if grow:
+                self._opened.append(None)  # reserve the slot while connecting
+        if grow:
+            try:
+                connection = self.group.connect()
+                if connection is not None:
+                    with self._lock:
+                        self._opened[self._opened.index(None)] = connection
+                    return connection
+            except Exception as e:
+                warning(f"[logic_validation] Could not open an extra connection for {self.group.conid}: {e}")
+            with self._lock:
+                self._opened.remove(None)
+                self.size = len(self._opened) + 1  # stop trying for this run
+        return self._idle.get()
+
+    def release(self, connection) -> None:
+        self._idle.put(connection)
+
+    def close(self) -> None:
+        for connection in self._opened:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self._opened = []
+
+
+def validate_groups(
+    groups: List[ValidationGroup],
+    validate: Callable[[Any, Any, str], Optional[str]],
+    max_workers: Optional[int] = None,
+) -> Dict[Tuple[int, str], Any]:
+    """
+    Validate every group's statements; returns {(group index, key): result}.
+
+    ``validate(connection, statement, db_type)`` returns the error message or
+    None. A raised exception is returned as the result of its statement so
+    the caller can report it against the detail rows using it. Only results
+    accepted by ``_cacheable`` are cached.
+    """
+    workers = max_workers or VALIDATE_WORKERS
+    results: Dict[Tuple[int, str], Any] = {}
+    pending: List[Tuple[int, str, Any, Optional[Tuple]]] = []
+
+    for index, group in enumerate(groups):
+        version = schema_version(group.connection, group.db_type) if group.conid is not None and group.statements else None
+        for key, statement in group.statements.items():
+            cache_key = (group.conid, key, version) if version is not None else None
+            if cache_key is not None:
+                cached = _result_cache.get(cache_key, _MISSING)
+                if cached is not _MISSING:
+                    results[(index, key)] = cached
+                    continue
+            pending.append((index, key, statement, cache_key))
+
+    total = sum(len(group.statements) for group in groups)
+    if not pending:
+        debug(f"[logic_validation] {total} statements, all served from cache")
+        return results
+
+    pools = [_ConnectionPool(group, workers) for group in groups]
+
+    def run(index: int, statement: Any):
+        pool = pools[index]
+        connection = pool.acquire()
+        try:
+            result = validate(connection, statement, groups[index].db_type)
+        except Exception as e:
+            result = e
+        if result is not None:
+            _rollback_quietly(connection, groups[index].db_type)
+        pool.release(connection)
+        return result
+
+    try:
+        thread_count = min(workers * len(groups), len(pending))
+        with ThreadPoolExecutor(max_workers=thread_count, thread_name_prefix="map-validate") as executor:
+            futures = [(index, key, cache_key, executor.submit(run, index, statement))
+                       for index, key, statement, cache_key in pending]
+            for index, key, cache_key, future in futures:
+                result = future.result()
+                results[(index, key)] = result
+                if cache_key is not None and _cacheable(result):
+                    _result_cache.set(cache_key, result)
+    finally:
+        for pool in pools:
+            pool.close()
+
+    info(f"[logic_validation] Validated {len(pending)} of {total} distinct statements "
+         f"({total - len(pending)} cached) on {len(groups)} connections")
+    return results
+
+
+def clear_validation_cache() -> None:
+    """Drop all cached validation results."""
+    _result_cache.clear()
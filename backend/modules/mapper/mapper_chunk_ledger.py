@@ -0,0 +1,210 @@
+"""
+Chunk ledger for resumable parallel mapper runs.
+
+Each chunk of a parallel run (its key range, status and row counts) is
+recorded in DMS_MAPRCHNK. When a run fails or is stopped, the next run of the
+same mapping over the same source query re-executes only the chunks that did
+not finish; a run that completes removes its ledger rows. Only key-range plans
+are kept: OFFSET windows of a query without a key column need not return the
+same rows twice, so such runs restart from scratch.
+
+The ledger is written from the coordinating thread only, on the metadata
+connection. A chunk is marked DONE after its target commit, so a crash in
+between re-runs that chunk; SCD classification makes the re-run a no-op for
+rows that were already written.
+"""
+import hashlib
+import os
+from typing import Any, Dict, List, Optional
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.mapper.database_sql_adapter import create_adapter
+    from backend.modules.mapper.parallel_models import ChunkRange
+    from backend.modules.logger import info, warning, debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.mapper.database_sql_adapter import create_adapter  # type: ignore
+    from modules.mapper.parallel_models import ChunkRange  # type: ignore
+    from modules.logger import info, warning, debug  # type: ignore
+
+
+CHUNK_PENDING = 'PENDING'
+CHUNK_DONE = 'DONE'
+CHUNK_FAILED = 'FAILED'
+
+_LEDGER_COLUMNS = (
+    'CHUNKID', 'ROWFROM', 'ROWTO', 'KEYCOL', 'KEYTYP', 'KEYFROM', 'KEYTO',
+    'STATUS', 'SRCROWS', 'TRGROWS', 'ERRROWS'
+)
+
+
+def chunk_ledger_enabled(checkpoint_config: Dict[str, Any]) -> bool:
+    """The ledger is kept for parallel runs of jobs with checkpoints enabled."""
+    if not checkpoint_config.get('enabled', False):
+        return False
+    return os.getenv('MAPPER_CHUNK_LEDGER_ENABLED', 'true').strip().lower() in ('true', '1', 'yes', 'y')
+
+
+def chunk_run_key(source_query: str, bind_params: Any, chunk_size: int) -> str:
+    """Identify a run's chunk plan: a restart only resumes the same query, binds and chunk size."""
+    digest = hashlib.sha1()
+    digest.update(' '.join(source_query.split()).encode('utf-8'))
+    digest.update(repr(bind_params or None).encode('utf-8'))
+    digest.update(str(chunk_size).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ChunkLedger:
+    """
+    DMS_MAPRCHNK access for one mapping's parallel run.
+
+    Any database error disables the ledger for the rest of the run (with a
+    warning) so a missing table never fails the job; the run then behaves as
+    it would without a ledger.
+    """
+
+    def __init__(self, metadata_conn, mapref: str, run_key: str, sessionid: Optional[Any] = None):
+        self.metadata_conn = metadata_conn
+        self.mapref = mapref
+        self.run_key = run_key
+        self.sessionid = sessionid
+        self.enabled = True
+        self._adapter = create_adapter(metadata_conn)
+
+    def load(self) -> List[ChunkRange]:
+        """Return the chunks of an unfinished earlier run, or [] if there is none."""
+        params = {'mapref': self.mapref, 'runkey': self.run_key}
+        rows = self._execute(
+            f"SELECT {', '.join(_LEDGER_COLUMNS)} FROM DMS_MAPRCHNK "
+            f"WHERE MAPREF = {self._ph('mapref')} AND RUNKEY = {self._ph('runkey')} "
+            "ORDER BY CHUNKID",
+            params,
+            fetch=True
+        )
+        if not rows:
+            return []
+        chunks = [
+            ChunkRange(
+                chunk_id=int(chunk_id),
+                row_from=int(row_from or 0),
+                row_to=int(row_to or 0),
+                key_column=key_column,
+                key_type=key_type,
+                key_from=key_from,
+                key_to=key_to,
+                status=status or CHUNK_PENDING,
+                source_rows=int(source_rows or 0),
+                target_rows=int(target_rows or 0),
+                error_rows=int(error_rows or 0),
+            )
+            for (chunk_id, row_from, row_to, key_column, key_type, key_from, key_to,
+                 status, source_rows, target_rows, error_rows) in rows
+        ]
+        if all(chunk.status == CHUNK_DONE for chunk in chunks):
+            return []
+        return chunks
+
+    def start(self, chunks: List[ChunkRange]) -> None:
+        """Record a new chunk plan, replacing any earlier run of the mapping."""
+        self._execute(
+            f"DELETE FROM DMS_MAPRCHNK WHERE MAPREF = {self._ph('mapref')}",
+            {'mapref': self.mapref}
+        )
+        timestamp = self._adapter.get_current_timestamp()
+        names = ['mapref', 'runkey', 'sessionid', 'chunkid', 'rowfrom', 'rowto',
+                 'keycol', 'keytyp', 'keyfrom', 'keyto', 'status']
+        self._execute(
+            "INSERT INTO DMS_MAPRCHNK (MAPREF, RUNKEY, SESSIONID, CHUNKID, ROWFROM, ROWTO, "
+            "KEYCOL, KEYTYP, KEYFROM, KEYTO, STATUS, SRCROWS, TRGROWS, ERRROWS, RECCRDT, RECUPDT) "
+            f"VALUES ({', '.join(self._ph(name) for name in names)}, 0, 0, 0, {timestamp}, {timestamp})",
+            [
+                {
+                    'mapref': self.mapref,
+                    'runkey': self.run_key,
+                    'sessionid': self.sessionid,
+                    'chunkid': chunk.chunk_id,
+                    'rowfrom': chunk.row_from,
+                    'rowto': chunk.row_to,
+                    'keycol': chunk.key_column,
+                    'keytyp': chunk.key_type,
+                    'keyfrom': chunk.key_from,
+                    'keyto': chunk.key_to,
+                    'status': chunk.status,
+                }
+                for chunk in chunks
+            ],
+            many=True
+        )
+        self._commit()
+        if self.enabled:
+            info(f"Chunk ledger started for {self.mapref}: {len(chunks)} chunks")
+
+    def record(self, chunk: ChunkRange) -> None:
+        """Persist a chunk's status and row counts."""
+        timestamp = self._adapter.get_current_timestamp()
+        self._execute(
+            f"UPDATE DMS_MAPRCHNK SET STATUS = {self._ph('status')}, SRCROWS = {self._ph('srcrows')}, "
+            f"TRGROWS = {self._ph('trgrows')}, ERRROWS = {self._ph('errrows')}, "
+            f"SESSIONID = {self._ph('sessionid')}, RECUPDT = {timestamp} "
+            f"WHERE MAPREF = {self._ph('mapref')} AND RUNKEY = {self._ph('runkey')} "
+            f"AND CHUNKID = {self._ph('chunkid')}",
+            {
+                'status': chunk.status,
+                'srcrows': chunk.source_rows,
+                'trgrows': chunk.target_rows,
+                'errrows': chunk.error_rows,
+                'sessionid': self.sessionid,
+                'mapref': self.mapref,
+                'runkey': self.run_key,
+                'chunkid': chunk.chunk_id,
+            }
+        )
+        self._commit()
+
+    def clear(self) -> None:
+        """Remove the ledger rows of a completed run."""
+        self._execute(
+            f"DELETE FROM DMS_MAPRCHNK WHERE MAPREF = {self._ph('mapref')} AND RUNKEY = {self._ph('runkey')}",
+            {'mapref': self.mapref, 'runkey': self.run_key}
+        )
+        self._commit()
+        debug(f"Chunk ledger cleared for {self.mapref}")
+
+    def _ph(self, name: str) -> str:
+        return self._adapter.get_parameter_placeholder(name)
+
+    def _execute(self, query: str, params, fetch: bool = False, many: bool = False):
+        if not self.enabled:
+            return None
+        cursor = None
+        try:
+            cursor = self.metadata_conn.cursor()
+            if many:
+                rows = [self._adapter.format_parameters(row, use_named=True) for row in params]
+                if rows:
+                    cursor.executemany(query, rows)
+                return None
+            cursor.execute(query, self._adapter.format_parameters(params, use_named=True))
+            return cursor.fetchall() if fetch else None
+        except Exception as e:
+            warning(f"Chunk ledger disabled for {self.mapref} (DMS_MAPRCHNK not usable): {e}")
+            self.enabled = False
+            try:
+                self.metadata_conn.rollback()
+            except Exception:
+                pass
+            return None
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    def _commit(self) -> None:
+        if not self.enabled:
+            return
+        try:
+            self.metadata_conn.commit()
+        except Exception as e:
+            warning(f"Could not commit chunk ledger for {self.mapref}: {e}")
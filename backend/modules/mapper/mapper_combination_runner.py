@@ -0,0 +1,351 @@
+"""
+Runs the mapping combinations of a generated job flow.
+
+A job flow executes execute_mapper_job once per (MAPCMBCD, SCD type)
+combination of its mapping. By default the combinations run one after the
+other, in the order the job flow generator emitted them. With combination
+concurrency enabled, a dependency plan groups them into waves: combinations
+in the same wave run at the same time, each on its own pooled metadata,
+source and target connections; waves run in order.
+
+A combination has to wait for an earlier one when
+  - the earlier one is the leading combination (it establishes the target rows),
+  - either of them is SCD type 2 (row versions depend on the load order),
+  - their mapped non-key columns overlap, or either has no known columns, or
+  - their source queries produce a common primary key value.
+
+Each combination upserts whole target rows, so two combinations loading the
+same key at once could both insert it. Before a wave runs, the distinct key
+values of every member's source query are read (up to
+MAPPER_COMBINATION_KEY_PROBE_LIMIT keys each) and members whose keys overlap,
+or could not be read, are moved to later waves. Concurrency is off unless
+enabled per job (session param 'parallel_combinations') or through
+MAPPER_COMBINATION_PARALLEL.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.common.env_config import env_int
+    from backend.modules.mapper.mapper_job_executor import execute_mapper_job
+    from backend.modules.mapper.parallel_connection_pool import ConnectionPoolManager
+    from backend.modules.logger import info, warning, error, debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.env_config import env_int  # type: ignore
+    from modules.mapper.mapper_job_executor import execute_mapper_job  # type: ignore
+    from modules.mapper.parallel_connection_pool import ConnectionPoolManager  # type: ignore
+    from modules.logger import info, warning, error, debug  # type: ignore
+
+
+# Target columns maintained by the mapper itself; they never make two
+# combinations depend on each other.
+AUDIT_COLUMNS = frozenset({'SKEY', 'RWHKEY', 'RECCRDT', 'RECUPDT', 'CURFLG', 'FROMDT', 'TODT', 'VALDFRM', 'VALDTO'})
+
+# Distinct source keys read per combination before it may run concurrently;
+# a combination with more keys runs on its own.
+KEY_PROBE_LIMIT = max(0, env_int('MAPPER_COMBINATION_KEY_PROBE_LIMIT', 1000000))
+KEY_PROBE_FETCH_SIZE = 10000
+
+
+@dataclass
+class MappingCombination:
+    """One (MAPCMBCD, SCD type) combination of a generated job flow."""
+    index: int
+    code: Optional[str]
+    scd_type: int
+    source_sql: str
+    columns: FrozenSet[str] = field(default_factory=frozenset)
+    source_conn_id: Optional[int] = None
+    target_conn_id: Optional[int] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.code if self.code else 'DEFAULT'} (SCD Type {self.scd_type})"
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> 'MappingCombination':
+        return cls(
+            index=values['index'],
+            code=values.get('code'),
+            scd_type=int(values.get('scd_type') or 1),
+            source_sql=values['source_sql'],
+            columns=frozenset(str(column).upper() for column in values.get('columns') or ()),
+            source_conn_id=values.get('source_conn_id'),
+            target_conn_id=values.get('target_conn_id'),
+        )
+
+
+def combination_concurrency_settings(session_params: Optional[Dict[str, Any]]) -> Tuple[bool, int]:
+    """
+    Return (enabled, max concurrent combinations) from the session params,
+    falling back to MAPPER_COMBINATION_PARALLEL / MAPPER_COMBINATION_MAX_WORKERS.
+    """
+    session_params = session_params or {}
+    enabled = session_params.get('parallel_combinations')
+    if enabled is None:
+        enabled = os.getenv('MAPPER_COMBINATION_PARALLEL', 'false')
+    if isinstance(enabled, str):
+        enabled = enabled.strip().upper() in ('Y', 'YES', 'TRUE', '1')
+
+    workers = session_params.get('combination_workers') or os.getenv('MAPPER_COMBINATION_MAX_WORKERS')
+    try:
+        workers = int(workers) if workers else 4
+    except (TypeError, ValueError):
+        workers = 4
+    return bool(enabled), max(1, workers)
+
+
+def _must_follow(earlier: MappingCombination, later: MappingCombination, pk_columns: FrozenSet[str], leading_index: int) -> bool:
+    if earlier.index == leading_index:
+        return True
+    if earlier.scd_type == 2 or later.scd_type == 2:
+        return True
+    earlier_columns = earlier.columns - pk_columns - AUDIT_COLUMNS
+    later_columns = later.columns - pk_columns - AUDIT_COLUMNS
+    if not earlier_columns or not later_columns:
+        return True
+    return bool(earlier_columns & later_columns)
+
+
+def plan_combination_waves(
+    combinations: List[MappingCombination],
+    pk_columns: Optional[FrozenSet[str]] = None
+) -> List[List[MappingCombination]]:
+    """
+    Group combinations (in generated order) into waves: each combination goes
+    into the wave after the last earlier combination it has to follow.
+    """
+    if not combinations:
+        return []
+    pk_columns = frozenset(str(column).upper() for column in (pk_columns or ()))
+    leading_index = combinations[0].index
+    levels: List[int] = []
+    for position, combination in enumerate(combinations):
+        level = 0
+        for earlier_position in range(position):
+            if _must_follow(combinations[earlier_position], combination, pk_columns, leading_index):
+                level = max(level, levels[earlier_position] + 1)
+        levels.append(level)
+
+    waves: List[List[MappingCombination]] = [[] for _ in range(max(levels) + 1)]
+    for combination, level in zip(combinations, levels):
+        waves[level].append(combination)
+    return waves
+
+
+def split_by_source_keys(
+    wave: List[MappingCombination],
+    source_keys: Dict[int, Optional[FrozenSet[Tuple[Any, ...]]]]
+) -> List[List[MappingCombination]]:
+    """
+    Split a wave so that combinations whose source keys overlap (or are
+    unknown, None) run one after the other, keeping their generated order.
+    """
+    levels: List[int] = []
+    for position, combination in enumerate(wave):
+        keys = source_keys.get(combination.index)
+        level = 0
+        for earlier_position in range(position):
+            earlier_keys = source_keys.get(wave[earlier_position].index)
+            if keys is None or earlier_keys is None or not keys.isdisjoint(earlier_keys):
+                level = max(level, levels[earlier_position] + 1)
+        levels.append(level)
+
+    groups: List[List[MappingCombination]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for combination, level in zip(wave, levels):
+        groups[level].append(combination)
+    return groups
+
+
+def _read_source_keys(
+    connection,
+    combination: MappingCombination,
+    key_columns: List[str],
+    limit: int
+) -> Optional[FrozenSet[Tuple[Any, ...]]]:
+    """
+    Distinct key values of a combination's source query, or None when they
+    cannot be read or there are more than ``limit`` of them.
+    """
+    if not key_columns or limit <= 0:
+        return None
+    columns = ', '.join(f'key_src.{column}' for column in key_columns)
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT DISTINCT {columns} FROM ({combination.source_sql}) key_src")
+        keys = set()
+        while True:
+            rows = cursor.fetchmany(KEY_PROBE_FETCH_SIZE)
+            if not rows:
+                return frozenset(keys)
+            keys.update(tuple(row) for row in rows)
+            if len(keys) > limit:
+                debug(f"[Combinations] {combination.label} has more than {limit} keys, running it on its own")
+                return None
+    except Exception as e:
+        warning(f"[Combinations] Could not read the source keys of {combination.label}, running it on its own: {e}")
+        with suppress(Exception):
+            connection.rollback()
+        return None
+    finally:
+        with suppress(Exception):
+            cursor.close()
+
+
+def _connection_factories(combination: MappingCombination):
+    try:
+        from backend.database.dbconnect import create_metadata_connection, create_target_connection
+    except ImportError:  # When running Flask app.py directly inside backend
+        from database.dbconnect import create_metadata_connection, create_target_connection  # type: ignore
+    return (
+        create_metadata_connection,
+        lambda: create_target_connection(combination.source_conn_id),
+        lambda: create_target_connection(combination.target_conn_id),
+    )
+
+
+def execute_combinations(
+    metadata_connection,
+    source_connection,
+    target_connection,
+    job_config: Dict[str, Any],
+    combinations: List[Dict[str, Any]],
+    transformation_func,
+    checkpoint_config: Optional[Dict[str, Any]],
+    session_params: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Run every combination of a job flow and aggregate the results.
+
+    Returns the job flow result: status (SUCCESS, or the last ERROR/STOPPED),
+    summed source/target/error rows of the successful combinations, and message.
+    A STOPPED combination ends the flow after its wave; an ERROR does not.
+    """
+    specs = [MappingCombination.from_dict(values) for values in combinations]
+    mapref = job_config.get('mapref')
+
+    # Connection IDs come from the first combination (as for parallel chunks)
+    if specs:
+        job_config['source_conn_id'] = specs[0].source_conn_id
+        job_config['target_conn_id'] = specs[0].target_conn_id
+
+    enabled, max_workers = combination_concurrency_settings(session_params)
+    if enabled and len(specs) > 1:
+        waves = plan_combination_waves(specs, job_config.get('pk_columns'))
+        if any(len(wave) > 1 for wave in waves):
+            info(f"[Combinations] {mapref}: {len(specs)} combinations in {len(waves)} waves: "
+                 + ' | '.join(', '.join(c.label for c in wave) for wave in waves))
+    else:
+        waves = [[spec] for spec in specs]
+
+    totals = {'source_rows': 0, 'target_rows': 0, 'error_rows': 0}
+    last_status = 'SUCCESS'
+    pools: Dict[Tuple[Any, Any], ConnectionPoolManager] = {}
+
+    def run(combination: MappingCombination, pooled: bool) -> Dict[str, Any]:
+        config = dict(job_config, scd_type=combination.scd_type)
+        if not pooled:
+            debug(f"Processing combination: {combination.label}")
+            return execute_mapper_job(
+                metadata_connection, source_connection, target_connection,
+                config, combination.source_sql, transformation_func, checkpoint_config, session_params
+            )
+        # Checkpoints live on the shared DMS_PRCLOG session row, so combinations
+        # running side by side always do full runs.
+        concurrent_checkpoint = dict(checkpoint_config or {}, enabled=False)
+        pool = pools[(combination.source_conn_id, combination.target_conn_id)]
+        debug(f"Processing combination concurrently: {combination.label}")
+        with pool.get_metadata_connection() as metadata_conn, \
+                pool.get_source_connection() as source_conn, \
+                pool.get_target_connection() as target_conn:
+            return execute_mapper_job(
+                metadata_conn, source_conn, target_conn,
+                config, combination.source_sql, transformation_func, concurrent_checkpoint, session_params
+            )
+
+    pk_source_mapping = job_config.get('pk_source_mapping') or {}
+    key_columns = [pk_source_mapping.get(column, column) for column in sorted(job_config.get('pk_columns') or ())]
+    source_keys: Dict[int, Optional[FrozenSet[Tuple[Any, ...]]]] = {}
+
+    def ensure_pool(combination: MappingCombination) -> ConnectionPoolManager:
+        key = (combination.source_conn_id, combination.target_conn_id)
+        if key not in pools:
+            metadata_factory, source_factory, target_factory = _connection_factories(combination)
+            pools[key] = ConnectionPoolManager(source_factory, target_factory, metadata_factory)
+        return pools[key]
+
+    pending = list(waves)
+    try:
+        while pending:
+            wave = pending.pop(0)
+            pooled = len(wave) > 1 and all(c.source_conn_id and c.target_conn_id for c in wave)
+            if len(wave) > 1 and not pooled:
+                warning(f"[Combinations] {mapref}: connection IDs missing, running "
+                        f"{', '.join(c.label for c in wave)} one after the other")
+            if pooled:
+                for combination in wave:
+                    if combination.index not in source_keys:
+                        with ensure_pool(combination).get_source_connection() as source_conn:
+                            source_keys[combination.index] = _read_source_keys(
+                                source_conn, combination, key_columns, KEY_PROBE_LIMIT
+                            )
+                groups = split_by_source_keys(wave, source_keys)
+                if len(groups) > 1:
+                    info(f"[Combinations] {mapref}: overlapping source keys, running "
+                         + ' | '.join(', '.join(c.label for c in group) for group in groups) + " in turn")
+                    wave = groups[0]
+                    pending[:0] = groups[1:]
+                    pooled = len(wave) > 1
+            if pooled:
+                with ThreadPoolExecutor(max_workers=min(len(wave), max_workers),
+                                        thread_name_prefix='combination') as executor:
+                    futures = [executor.submit(run, combination, True) for combination in wave]
+                    results = []
+                    for combination, future in zip(wave, futures):
+                        try:
+                            results.append(future.result())
+                        except Exception as e:
+                            results.append({'status': 'ERROR', 'error_message': str(e)})
+            else:
+                results = []
+                for combination in wave:
+                    results.append(run(combination, False))
+                    if results[-1].get('status') == 'STOPPED':
+                        break
+
+            stop = False
+            for combination, result in zip(wave, results):
+                if result.get('status') == 'STOPPED':
+                    last_status = 'STOPPED'
+                    stop = True
+                elif result.get('status') == 'ERROR':
+                    last_status = 'ERROR'
+                    error(f"[Combinations] ERROR in combination {combination.index}: "
+                          f"{result.get('error_message', 'Unknown error')}")
+                    # Continue to next combination (don't stop, allow next combination to run)
+                else:
+                    for key in totals:
+                        totals[key] += result.get(key, 0)
+                    info(f"[Combinations] Combination {combination.index} completed: "
+                         f"{result.get('source_rows', 0)} source, {result.get('target_rows', 0)} target rows")
+                source_keys.pop(combination.index, None)
+            if stop:
+                break
+    finally:
+        for pool in pools.values():
+            pool.close_all_connections()
+
+    info(f"[Combinations] All combinations completed for {mapref}: {totals['source_rows']} source, "
+         f"{totals['target_rows']} target, {totals['error_rows']} error rows")
+
+    return {
+        'status': last_status,
+        'source_rows': totals['source_rows'],
+        'target_rows': totals['target_rows'],
+        'error_rows': totals['error_rows'],
+        'message': 'Job completed successfully' if last_status == 'SUCCESS' else f'Job ended with status: {last_status}'
+    }
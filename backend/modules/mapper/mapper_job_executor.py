@@ -4,6 +4,7 @@ Generic execution framework for mapper jobs.
 No job-specific code - all job data passed as parameters.
 """
 import sys
+from itertools import chain
 from typing import Dict, Any, List, Callable, Optional, Tuple
 from datetime import datetime
 
@@ -14,12 +15,14 @@ try:
         map_row_to_target_columns,
         generate_hash,
         build_primary_key_values,
-        build_primary_key_where_clause
+        build_primary_key_where_clause,
+        RowProjector
     )
     from backend.modules.mapper.mapper_progress_tracker import (
         check_stop_request,
         log_batch_progress,
-        update_process_log_progress
+        update_process_log_progress,
+        BufferedProgressWriter
     )
     from backend.modules.mapper.mapper_checkpoint_handler import (
         parse_checkpoint_value,
@@ -28,31 +31,71 @@ try:
         complete_checkpoint
     )
     from backend.modules.mapper.mapper_scd_handler import (
+        joberr_sink,
         process_scd_batch,
         prepare_row_for_scd
     )
-    from backend.modules.logger import info, warning, error, debug
-    from backend.modules.mapper.chunk_manager import ChunkManager
+    from backend.modules.logger import info, warning, error, debug, log_context
+    from backend.modules.common.adaptive_batch import BatchTimer, batch_size_controller
+    from backend.modules.mapper.mapper_stage_profiler import (
+        STAGE_COMMIT,
+        STAGE_HASH,
+        STAGE_METADATA_LOG,
+        STAGE_SOURCE_FETCH,
+        STAGE_TARGET_LOOKUP,
+        STAGE_TRANSFORM,
+        StageProfiler,
+        new_stage_profiler,
+        sampling_profile
+    )
+    from backend.modules.mapper.chunk_manager import ChunkManager, record_actual_row_count
     from backend.modules.mapper.parallel_integration_helper import (
         get_parallel_config_from_params,
         should_use_parallel_processing
     )
     from backend.modules.mapper.parallel_processor import ParallelProcessor
-    from backend.modules.mapper.parallel_models import ParallelProcessingResult, ChunkResult
+    from backend.modules.mapper.parallel_models import ParallelProcessingResult, ChunkResult, ChunkRange
+    from backend.modules.mapper.mapper_chunk_ledger import (
+        CHUNK_DONE,
+        CHUNK_FAILED,
+        ChunkLedger,
+        chunk_ledger_enabled,
+        chunk_run_key
+    )
     from backend.modules.mapper.parallel_retry_handler import create_retry_handler
     from backend.modules.mapper.parallel_progress import ProgressTracker, create_progress_callback
+    from backend.modules.mapper.mapper_process_pool import (
+        MapperProcessPool,
+        RowBlockSpec,
+        is_picklable,
+        process_pool_settings,
+        target_state
+    )
+    from backend.modules.mapper.mapper_merge_cdc import (
+        CDC_MODE_MERGE,
+        build_ordered_source_query,
+        build_target_state_query,
+        cdc_mode_settings,
+        iter_cursor_rows,
+        merge_join,
+        open_stream_cursor,
+        target_state_stream,
+        text_key_columns
+    )
 except ImportError:  # When running Flask app.py directly inside backend
     from modules.mapper.database_sql_adapter import create_adapter, detect_database_type  # type: ignore
     from modules.mapper.mapper_transformation_utils import (  # type: ignore
         map_row_to_target_columns,
         generate_hash,
         build_primary_key_values,
-        build_primary_key_where_clause
+        build_primary_key_where_clause,
+        RowProjector
     )
     from modules.mapper.mapper_progress_tracker import (  # type: ignore
         check_stop_request,
         log_batch_progress,
-        update_process_log_progress
+        update_process_log_progress,
+        BufferedProgressWriter
     )
     from modules.mapper.mapper_checkpoint_handler import (  # type: ignore
         parse_checkpoint_value,
@@ -61,19 +104,57 @@ except ImportError:  # When running Flask app.py directly inside backend
         complete_checkpoint
     )
     from modules.mapper.mapper_scd_handler import (  # type: ignore
+        joberr_sink,
         process_scd_batch,
         prepare_row_for_scd
     )
-    from modules.logger import info, warning, error, debug  # type: ignore
-    from modules.mapper.chunk_manager import ChunkManager  # type: ignore
+    from modules.logger import info, warning, error, debug, log_context  # type: ignore
+    from modules.common.adaptive_batch import BatchTimer, batch_size_controller  # type: ignore
+    from modules.mapper.mapper_stage_profiler import (  # type: ignore
+        STAGE_COMMIT,
+        STAGE_HASH,
+        STAGE_METADATA_LOG,
+        STAGE_SOURCE_FETCH,
+        STAGE_TARGET_LOOKUP,
+        STAGE_TRANSFORM,
+        StageProfiler,
+        new_stage_profiler,
+        sampling_profile
+    )
+    from modules.mapper.chunk_manager import ChunkManager, record_actual_row_count  # type: ignore
     from modules.mapper.parallel_integration_helper import (  # type: ignore
         get_parallel_config_from_params,
         should_use_parallel_processing
     )
     from modules.mapper.parallel_processor import ParallelProcessor  # type: ignore
-    from modules.mapper.parallel_models import ParallelProcessingResult, ChunkResult  # type: ignore
+    from modules.mapper.parallel_models import ParallelProcessingResult, ChunkResult, ChunkRange  # type: ignore
+    from modules.mapper.mapper_chunk_ledger import (  # type: ignore
+        CHUNK_DONE,
+        CHUNK_FAILED,
+        ChunkLedger,
+        chunk_ledger_enabled,
+        chunk_run_key
+    )
     from modules.mapper.parallel_retry_handler import create_retry_handler  # type: ignore
     from modules.mapper.parallel_progress import ProgressTracker, create_progress_callback  # type: ignore
+    from modules.mapper.mapper_process_pool import (  # type: ignore
+        MapperProcessPool,
+        RowBlockSpec,
+        is_picklable,
+        process_pool_settings,
+        target_state
+    )
+    from modules.mapper.mapper_merge_cdc import (  # type: ignore
+        CDC_MODE_MERGE,
+        build_ordered_source_query,
+        build_target_state_query,
+        cdc_mode_settings,
+        iter_cursor_rows,
+        merge_join,
+        open_stream_cursor,
+        target_state_stream,
+        text_key_columns
+    )
 
 
 def execute_mapper_job(
@@ -123,6 +204,10 @@ def execute_mapper_job(
                 - 'max_workers': Optional[int] - Number of worker threads
                 - 'chunk_size': int - Rows per chunk
                 - 'min_rows_for_parallel': int - Minimum rows to enable parallel
+            - 'cdc_mode': Optional[str] - 'LOOKUP' (per-row target lookup, default) or
+              'MERGE' (sorted merge join of source and target, full snapshots only)
+            - 'merge_detect_deletes': Optional[bool] - In MERGE mode, expire current
+              target rows whose key is missing from the source
         source_sql: Source SQL query (job-specific)
         transformation_func: Function to transform source rows (job-specific)
                             Signature: (Dict[str, Any]) -> Dict[str, Any]
@@ -143,9 +228,38 @@ def execute_mapper_job(
             'source_rows': int,
             'target_rows': int,
             'error_rows': int,
-            'message': Optional[str]
+            'message': Optional[str],
+            'stage_profile': Dict[str, Dict[str, Any]] - wall/CPU seconds, calls,
+                round trips and rows per stage (also stored in DMS_JOBSTGPRF)
         }
     """
+    mapref = job_config['mapref']
+    profiler = new_stage_profiler(mapref)
+    with log_context(mapref=mapref, jobid=job_config.get('jobid'),
+                     sessionid=session_params.get('sessionid'), prcid=session_params.get('prcid')), \
+            sampling_profile(mapref):
+        result = _run_mapper_job(
+            metadata_conn, source_conn, target_conn, job_config, source_sql,
+            transformation_func, checkpoint_config, session_params, profiler
+        )
+    profiler.log_summary()
+    profiler.save(metadata_conn, session_params.get('sessionid'))
+    result['stage_profile'] = profiler.as_dict()
+    return result
+
+
+def _run_mapper_job(
+    metadata_conn,
+    source_conn,
+    target_conn,
+    job_config: Dict[str, Any],
+    source_sql: str,
+    transformation_func: Callable,
+    checkpoint_config: Dict[str, Any],
+    session_params: Dict[str, Any],
+    profiler: StageProfiler
+) -> Dict[str, Any]:
+    """Run a mapper job for execute_mapper_job, charging stage timings to ``profiler``."""
     # Extract job configuration
     mapref = job_config['mapref']
     jobid = job_config['jobid']
@@ -184,6 +298,7 @@ def execute_mapper_job(
     metadata_cursor = None
     source_cursor = None
     target_cursor = None
+    error_sink = None
     
     try:
         # Validate connections
@@ -218,19 +333,23 @@ def execute_mapper_job(
 
         # Create one run-level JOBLOG row early so row-level DMS_JOBERR writes have a stable JOBLOGID.
         run_session_params = dict(session_params)
-        run_joblogid = log_batch_progress(
-            metadata_conn,
-            mapref,
-            jobid,
-            0,
-            0,
-            0,
-            0,
-            session_params,
-        )
-        if run_joblogid is not None:
-            run_session_params['joblogid'] = run_joblogid
-            metadata_conn.commit()
+        with profiler.stage(STAGE_METADATA_LOG, round_trips=2):
+            run_joblogid = log_batch_progress(
+                metadata_conn,
+                mapref,
+                jobid,
+                0,
+                0,
+                0,
+                0,
+                session_params,
+            )
+            if run_joblogid is not None:
+                run_session_params['joblogid'] = run_joblogid
+                metadata_conn.commit()
+        profiler.joblogid = run_joblogid
+        # Rows rejected by the SCD fallbacks are capped and written to DMS_JOBERR in bulk
+        error_sink = joberr_sink(metadata_conn, mapref, jobid, run_session_params)
         
         # Apply checkpoint to query
         source_query, query_bind_params = apply_checkpoint_to_query(
@@ -241,6 +360,37 @@ def execute_mapper_job(
             source_db_type
         )
         
+        # PYTHON checkpoints resume by skipping rows; push the skip into the query
+        # as an OFFSET where the database supports it instead of fetching them
+        skip_in_query = False
+        if checkpoint_config.get('enabled', False) and \
+           checkpoint_config.get('strategy') == 'PYTHON' and \
+           rows_to_skip > 0:
+            skip_query = ChunkManager(source_db_type).create_skip_query(source_query, rows_to_skip)
+            if skip_query is not None:
+                source_query = skip_query
+                skip_in_query = True
+                info(f"Resuming after {rows_to_skip} rows (PYTHON strategy, OFFSET in source query)")
+        
+        # Full-snapshot loads can detect changes with a sorted merge join instead of
+        # per-row target lookups
+        cdc_mode, detect_deletes = cdc_mode_settings(job_config)
+        if cdc_mode == CDC_MODE_MERGE:
+            if checkpoint_config.get('enabled', False):
+                info("MERGE CDC mode needs a full snapshot; checkpoints are enabled, using per-row lookups")
+            elif not pk_columns:
+                info("MERGE CDC mode needs primary key columns, using per-row lookups")
+            else:
+                source_cursor.close()
+                source_cursor = None
+                return _execute_mapper_job_merge(
+                    metadata_conn, source_conn, target_conn,
+                    job_config, source_query, transformation_func,
+                    session_params, run_session_params, run_joblogid,
+                    source_db_type, target_db_type, detect_deletes,
+                    profiler=profiler, error_sink=error_sink
+                )
+        
         # Check if parallel processing should be used (Phase 4)
         use_parallel = False
         estimated_rows = 0
@@ -264,12 +414,12 @@ def execute_mapper_job(
         info(f"Checkpoint config: enabled={checkpoint_enabled}, strategy={checkpoint_strategy}")
         
         if parallel_config and parallel_config.get('enable_parallel', False):
-            # PYTHON checkpoint strategy is not supported in parallel processing
-            # (requires row skipping after fetch, which doesn't work with chunking)
-            if checkpoint_enabled and checkpoint_strategy == 'PYTHON':
+            # A PYTHON checkpoint skip that could not be pushed into the query needs
+            # row-by-row skipping after fetch, which doesn't work with chunking
+            if checkpoint_enabled and checkpoint_strategy == 'PYTHON' and rows_to_skip > 0 and not skip_in_query:
                 info("=" * 80)
-                info("PARALLEL PROCESSING DISABLED: PYTHON checkpoint strategy not supported in parallel mode")
-                info("  Reason: PYTHON checkpoint requires row-by-row skipping which is incompatible with chunking")
+                info("PARALLEL PROCESSING DISABLED: PYTHON checkpoint skip cannot be applied to chunked queries")
+                info(f"  Reason: {source_db_type} has no OFFSET form for skipping {rows_to_skip} rows in SQL")
                 info("  Solution: Use KEY checkpoint strategy or disable checkpoints to enable parallel processing")
                 info("=" * 80)
                 use_parallel = False
@@ -277,8 +427,14 @@ def execute_mapper_job(
                 # Estimate row count to decide if parallel processing should be used
                 try:
                     chunk_manager = ChunkManager(source_db_type)
-                    # Use the checkpoint-modified query for estimation
-                    estimated_rows = chunk_manager.estimate_total_rows(source_conn, source_query)
+                    # Use the checkpoint-modified query for estimation. Job history is only
+                    # comparable when no checkpoint filter narrowed the query.
+                    estimated_rows = chunk_manager.estimate_total_rows(
+                        source_conn, source_query,
+                        bind_params=query_bind_params,
+                        mapref=mapref if source_query == source_sql else None,
+                        metadata_conn=metadata_conn
+                    )
                     min_rows = parallel_config.get('min_rows_for_parallel', 100000)
                     
                     info(f"Row count estimation: {estimated_rows} rows (parallel threshold: {min_rows})")
@@ -312,19 +468,39 @@ def execute_mapper_job(
         if use_parallel:
             # Close the cursor since parallel processing will create its own connections/cursors
             source_cursor.close()
-            return _execute_mapper_job_parallel(
+            source_cursor = None
+            parallel_result = _execute_mapper_job_parallel(
                 metadata_conn, source_conn, target_conn,
                 job_config, source_query, query_bind_params, transformation_func,
                 checkpoint_config, run_session_params,
                 source_columns, source_db_type, target_db_type,
-                parallel_config, estimated_rows
+                parallel_config, estimated_rows,
+                profiler=profiler
             )
+            if parallel_result is not None:
+                return parallel_result
+            # Single chunk after all (the estimate was too high): run the query again sequentially
+            source_cursor = source_conn.cursor()
+            if query_bind_params:
+                source_cursor.execute(source_query, query_bind_params)
+            else:
+                source_cursor.execute(source_query)
         source_cursor.arraysize = bulk_limit
         
-        # Skip rows for PYTHON checkpoint strategy
+        # Standard column mappings are compiled to a tuple projector once per job
+        projector = RowProjector.for_transformation(
+            transformation_func, source_columns, all_columns, pk_columns, pk_source_mapping, hash_exclude_columns
+        )
+        
+        # Progress rows are coalesced instead of being written and committed per batch
+        progress_writer = BufferedProgressWriter(
+            metadata_conn, mapref, jobid, session_params, joblogid=run_joblogid, profiler=profiler
+        )
+        
+        # Skip rows for PYTHON checkpoint strategy (databases without an OFFSET form)
         if checkpoint_config.get('enabled', False) and \
            checkpoint_config.get('strategy') == 'PYTHON' and \
-           rows_to_skip > 0:
+           rows_to_skip > 0 and not skip_in_query:
             print(f"Skipping {rows_to_skip} rows (PYTHON strategy)...")
             for _ in range(rows_to_skip):
                 row = source_cursor.fetchone()
@@ -335,7 +511,19 @@ def execute_mapper_job(
         source_count = 0
         target_count = 0
         error_count = 0
-        batch_num = rows_to_skip // bulk_limit if checkpoint_config.get('strategy') == 'PYTHON' else 0
+        
+        # Optional adaptive sizing: bulk_limit is the starting size, later batches
+        # are sized from the measured fetch/transform/write time and memory
+        batch_sizer = batch_size_controller(f"mapper {mapref}", bulk_limit)
+        
+        # A PYTHON checkpoint holds the rows already loaded. Batch numbers continue
+        # from it only with fixed batches; adaptive batches of the earlier run had
+        # other sizes, so numbering restarts with this run (as the row counts do).
+        batch_num = 0
+        if checkpoint_config.get('strategy') == 'PYTHON' and batch_sizer is None:
+            batch_num = rows_to_skip // bulk_limit
+        elif rows_to_skip > 0:
+            info(f"Resumed after {rows_to_skip} rows; batch numbers count this run's batches")
         
         # Process batches
         print(f"Starting batch processing (bulk_limit={bulk_limit})...")
@@ -347,12 +535,16 @@ def execute_mapper_job(
                 break
             
             # Fetch batch
+            batch_timer = BatchTimer()
             try:
                 if source_cursor.description is None:
                     print("Source cursor exhausted.")
                     break
                 
-                source_rows = source_cursor.fetchmany(bulk_limit)
+                started = profiler.clock()
+                source_rows = source_cursor.fetchmany(batch_sizer.size if batch_sizer else bulk_limit)
+                profiler.add(STAGE_SOURCE_FETCH, started, rows=len(source_rows), round_trips=1)
+                batch_timer.fetch = batch_timer.lap()
                 if not source_rows:
                     print("No more rows to process.")
                     break
@@ -389,18 +581,25 @@ def execute_mapper_job(
                         break
                 
                 try:
-                    # Convert row to dictionary
-                    raw_src_dict = dict(zip(source_columns, src_row))
-                    
-                    # Apply transformation (job-specific)
-                    src_dict = transformation_func(raw_src_dict)
-                    
-                    # Build primary key for lookup
-                    pk_values = build_primary_key_values(
-                        raw_src_dict,
-                        pk_columns,
-                        pk_source_mapping
-                    )
+                    started = profiler.clock()
+                    if projector is not None:
+                        # Compiled projection: target-ordered tuple view, no per-row dicts
+                        src_dict = projector.project(src_row)
+                        pk_values = projector.pk_values(src_row)
+                    else:
+                        # Convert row to dictionary
+                        raw_src_dict = dict(zip(source_columns, src_row))
+                        
+                        # Apply transformation (job-specific)
+                        src_dict = transformation_func(raw_src_dict)
+                        
+                        # Build primary key for lookup
+                        pk_values = build_primary_key_values(
+                            raw_src_dict,
+                            pk_columns,
+                            pk_source_mapping
+                        )
+                    started = profiler.add(STAGE_TRANSFORM, started, rows=1)
                     
                     # Check for NULL PK values
                     if any(v is None for v in pk_values.values()):
@@ -417,9 +616,14 @@ def execute_mapper_job(
                         target_schema,
                         target_table
                     )
+                    started = profiler.add(STAGE_TARGET_LOOKUP, started, rows=1, round_trips=1)
                     
                     # Generate hash
-                    src_hash = generate_hash(src_dict, all_columns, hash_exclude_columns)
+                    if projector is not None:
+                        src_hash = projector.row_hash(src_dict)
+                    else:
+                        src_hash = generate_hash(src_dict, all_columns, hash_exclude_columns)
+                    started = profiler.add(STAGE_HASH, started, rows=1)
                     
                     # Prepare for SCD processing
                     row_to_insert, row_to_update_scd1, skey_to_expire_scd2 = prepare_row_for_scd(
@@ -429,6 +633,7 @@ def execute_mapper_job(
                         scd_type,
                         target_type
                     )
+                    profiler.add(STAGE_TRANSFORM, started, calls=0)
                     
                     if row_to_insert:
                         rows_to_insert.append(row_to_insert)
@@ -441,6 +646,7 @@ def execute_mapper_job(
                     error(f"Error processing row: {row_err}")
                     error_count += 1
                     continue
+            batch_timer.transform = batch_timer.lap()
             
             # Process SCD batch
             try:
@@ -460,6 +666,8 @@ def execute_mapper_job(
                     mapref=mapref,
                     jobid=jobid,
                     session_params=run_session_params,
+                    profiler=profiler,
+                    error_sink=error_sink,
                 )
                 
                 target_count += inserted + updated
@@ -471,41 +679,21 @@ def execute_mapper_job(
             
             # Commit target connection periodically
             if batch_num % 5 == 0:
-                target_conn.commit()
+                with profiler.stage(STAGE_COMMIT):
+                    target_conn.commit()
                 print(f"Committed target connection (batch {batch_num})")
             
-            # Update progress
-            update_process_log_progress(metadata_conn, session_params, source_count, target_count)
+            if batch_sizer is not None:
+                batch_timer.write = batch_timer.lap()
+                batch_sizer.record(batch_size, batch_timer.fetch, batch_timer.transform, batch_timer.write)
             
-            batch_error_rows = error_count - batch_error_start
-
-            # Update the single run-level JOBLOG row (or create once lazily if initial create failed).
-            if run_joblogid is None:
-                run_joblogid = log_batch_progress(
-                    metadata_conn,
-                    mapref,
-                    jobid,
-                    batch_num,
-                    source_count,
-                    target_count,
-                    error_count,
-                    session_params,
-                )
-                if run_joblogid is not None:
-                    run_session_params['joblogid'] = run_joblogid
-            else:
-                log_batch_progress(
-                    metadata_conn,
-                    mapref,
-                    jobid,
-                    batch_num,
-                    source_count,
-                    target_count,
-                    error_count,
-                    session_params,
-                    joblogid=run_joblogid,
-                )
-            metadata_conn.commit()
+            # Update progress: the single run-level JOBLOG row and the PRCLOG activity
+            # timestamp (the JOBLOG row is created on the first flush if the initial create failed).
+            progress_writer.record(batch_num, source_count, target_count, error_count)
+            if run_joblogid is None and progress_writer.joblogid is not None:
+                run_joblogid = progress_writer.joblogid
+                run_session_params['joblogid'] = run_joblogid
+                profiler.joblogid = run_joblogid
             
             # Update checkpoint (KEY strategy)
             if checkpoint_config.get('enabled', False) and \
@@ -526,19 +714,30 @@ def execute_mapper_job(
                     new_checkpoint_value = str(last_row_dict.get(checkpoint_columns[0], ''))
                 
                 if new_checkpoint_value:
-                    update_checkpoint(metadata_conn, session_params, new_checkpoint_value)
-                    metadata_conn.commit()
+                    # Progress is written in the same commit as the checkpoint that covers it
+                    progress_writer.flush(commit=False)
+                    with profiler.stage(STAGE_METADATA_LOG, round_trips=2):
+                        update_checkpoint(metadata_conn, session_params, new_checkpoint_value)
+                        metadata_conn.commit()
+        
+        progress_writer.flush()
+        if batch_sizer is not None:
+            batch_sizer.log_summary()
         
         # Mark checkpoint as completed
         if checkpoint_config.get('enabled', False):
-            complete_checkpoint(metadata_conn, session_params)
-            metadata_conn.commit()
+            with profiler.stage(STAGE_METADATA_LOG, round_trips=2):
+                complete_checkpoint(metadata_conn, session_params)
+                metadata_conn.commit()
         
         # Final commit
-        target_conn.commit()
-        metadata_conn.commit()
+        with profiler.stage(STAGE_COMMIT, round_trips=2):
+            target_conn.commit()
+            metadata_conn.commit()
         
         print(f"Job completed: {source_count} source rows, {target_count} target rows, {error_count} errors")
+        if estimated_rows:
+            record_actual_row_count(mapref, estimated_rows, source_count)
         
         return {
             'status': 'SUCCESS',
@@ -557,6 +756,13 @@ def execute_mapper_job(
         except Exception:
             pass
         
+        # Keep the progress of completed batches that had not been flushed yet
+        if 'progress_writer' in locals():
+            try:
+                progress_writer.flush()
+            except Exception:
+                pass
+        
         return {
             'status': 'FAILED',
             'source_rows': source_count if 'source_count' in locals() else 0,
@@ -566,6 +772,8 @@ def execute_mapper_job(
         }
         
     finally:
+        if error_sink is not None:
+            error_sink.close()
         # Close cursors
         try:
             if metadata_cursor:
@@ -578,6 +786,252 @@ def execute_mapper_job(
             pass
 
 
+def _execute_mapper_job_merge(
+    metadata_conn,
+    source_conn,
+    target_conn,
+    job_config: Dict[str, Any],
+    source_query: str,
+    transformation_func: Callable,
+    session_params: Dict[str, Any],
+    run_session_params: Dict[str, Any],
+    run_joblogid: Optional[int],
+    source_db_type: str,
+    target_db_type: str,
+    detect_deletes: bool,
+    profiler: Optional[StageProfiler] = None,
+    error_sink=None
+) -> Dict[str, Any]:
+    """
+    Execute a full-snapshot mapper job with sorted merge-join change detection.
+    
+    The source (ordered by the target PK) and the current target rows (PK, SKEY,
+    RWHKEY only, ordered by PK) are streamed side by side; each matched, new or
+    (optionally) deleted key is classified with prepare_row_for_scd and written
+    in bulk_limit batches through process_scd_batch, as in the lookup path.
+    Keys missing from the source are expired (CURFLG = 'N') when detect_deletes is set.
+    Reading the target state stream is charged to the target_lookup stage.
+    """
+    if profiler is None:
+        profiler = StageProfiler(enabled=False)
+    mapref = job_config['mapref']
+    jobid = job_config['jobid']
+    target_schema = job_config['target_schema']
+    target_table = job_config['target_table']
+    target_type = job_config['target_type']
+    full_table_name = job_config['full_table_name']
+    pk_order = sorted(job_config['pk_columns'])
+    pk_source_mapping = job_config['pk_source_mapping']
+    all_columns = job_config['all_columns']
+    hash_exclude_columns = job_config.get('hash_exclude_columns', set())
+    bulk_limit = job_config.get('bulk_limit', 50000)
+    scd_type = job_config.get('scd_type', 1)
+    
+    source_cursor = None
+    target_stream_cursor = None
+    source_count = 0
+    target_count = 0
+    error_count = 0
+    deleted_count = 0
+    
+    try:
+        adapter = create_adapter(target_conn)
+        formatted_table = adapter.format_table_name(target_schema, target_table)
+        
+        catalog_cursor = target_conn.cursor()
+        try:
+            text_columns = text_key_columns(catalog_cursor, target_db_type, target_schema, target_table, pk_order)
+        finally:
+            catalog_cursor.close()
+        
+        info(f"*** MERGE CDC MODE ***: merge-joining source and {full_table_name} on "
+             f"{', '.join(pk_order)} (detect_deletes={detect_deletes})")
+        
+        # Both sides stream; the source only needs a buffered MySQL cursor when the
+        # batches are written on the same connection
+        source_cursor = open_stream_cursor(source_conn, bulk_limit, buffered=source_conn is target_conn)
+        source_cursor.execute(build_ordered_source_query(
+            source_query, pk_order, pk_source_mapping, text_columns, source_db_type
+        ))
+        first_rows = []
+        if source_cursor.description is None:
+            started = profiler.clock()
+            first_rows = source_cursor.fetchmany(bulk_limit)
+            profiler.add(STAGE_SOURCE_FETCH, started, rows=len(first_rows), round_trips=1)
+        source_columns = [desc[0] for desc in source_cursor.description]
+        
+        target_stream_cursor = open_stream_cursor(target_conn, bulk_limit)
+        target_stream_cursor.execute(build_target_state_query(
+            formatted_table, pk_order, text_columns, target_db_type
+        ))
+        
+        progress_writer = BufferedProgressWriter(
+            metadata_conn, mapref, jobid, session_params, joblogid=run_joblogid, profiler=profiler
+        )
+        
+        projector = RowProjector.for_transformation(
+            transformation_func, source_columns, all_columns, pk_order, pk_source_mapping, hash_exclude_columns
+        )
+        
+        def keyed_source_rows():
+            nonlocal error_count
+            for src_row in chain(first_rows, iter_cursor_rows(source_cursor, bulk_limit, profiler, STAGE_SOURCE_FETCH)):
+                if projector is not None:
+                    pk_values = projector.pk_values(src_row)
+                else:
+                    pk_values = build_primary_key_values(
+                        dict(zip(source_columns, src_row)), pk_order, pk_source_mapping
+                    )
+                key = tuple(pk_values.get(col) for col in pk_order)
+                if any(v is None for v in key):
+                    warning(f"NULL primary key values found. Skipping row.")
+                    error_count += 1
+                    continue
+                yield key, src_row
+        
+        rows_to_insert = []
+        rows_to_update_scd1 = []
+        rows_to_update_scd2 = []
+        batch_num = 0
+        batch_source_rows = 0
+        stopped = False
+        
+        def write_batch():
+            nonlocal target_count, error_count, batch_num, batch_source_rows
+            nonlocal rows_to_insert, rows_to_update_scd1, rows_to_update_scd2
+            batch_num += 1
+            try:
+                inserted, updated, expired = process_scd_batch(
+                    target_conn,
+                    target_schema,
+                    target_table,
+                    full_table_name,
+                    rows_to_insert,
+                    rows_to_update_scd1,
+                    rows_to_update_scd2,
+                    all_columns,
+                    scd_type,
+                    target_type,
+                    target_db_type,
+                    metadata_conn=metadata_conn,
+                    mapref=mapref,
+                    jobid=jobid,
+                    session_params=run_session_params,
+                    profiler=profiler,
+                    error_sink=error_sink,
+                )
+                target_count += inserted + updated
+            except Exception as scd_err:
+                error(f"Error processing SCD batch: {scd_err}")
+                error_count += len(rows_to_insert) + len(rows_to_update_scd1) + len(rows_to_update_scd2)
+            
+            rows_to_insert, rows_to_update_scd1, rows_to_update_scd2 = [], [], []
+            batch_source_rows = 0
+            
+            if batch_num % 5 == 0:
+                with profiler.stage(STAGE_COMMIT):
+                    target_conn.commit()
+            progress_writer.record(batch_num, source_count, target_count, error_count)
+            if progress_writer.joblogid is not None:
+                run_session_params['joblogid'] = progress_writer.joblogid
+                profiler.joblogid = progress_writer.joblogid
+        
+        target_states = target_state_stream(
+            iter_cursor_rows(target_stream_cursor, bulk_limit, profiler, STAGE_TARGET_LOOKUP), len(pk_order)
+        )
+        for src_row, target_row in merge_join(keyed_source_rows(), target_states):
+            if src_row is None:
+                # Current target row whose key is no longer in the source
+                if detect_deletes and target_row.get('SKEY') is not None:
+                    rows_to_update_scd2.append(target_row['SKEY'])
+                    deleted_count += 1
+            else:
+                source_count += 1
+                batch_source_rows += 1
+                try:
+                    started = profiler.clock()
+                    if projector is not None:
+                        src_dict = projector.project(src_row)
+                        started = profiler.add(STAGE_TRANSFORM, started, rows=1)
+                        src_hash = projector.row_hash(src_dict)
+                    else:
+                        src_dict = transformation_func(dict(zip(source_columns, src_row)))
+                        started = profiler.add(STAGE_TRANSFORM, started, rows=1)
+                        src_hash = generate_hash(src_dict, all_columns, hash_exclude_columns)
+                    started = profiler.add(STAGE_HASH, started, rows=1)
+                    row_to_insert, row_to_update_scd1, skey_to_expire_scd2 = prepare_row_for_scd(
+                        src_dict,
+                        target_row,
+                        src_hash,
+                        scd_type,
+                        target_type
+                    )
+                    profiler.add(STAGE_TRANSFORM, started, calls=0)
+                    if row_to_insert:
+                        rows_to_insert.append(row_to_insert)
+                    if row_to_update_scd1:
+                        rows_to_update_scd1.append(row_to_update_scd1)
+                    if skey_to_expire_scd2:
+                        rows_to_update_scd2.append(skey_to_expire_scd2)
+                except Exception as row_err:
+                    error(f"Error processing row: {row_err}")
+                    error_count += 1
+            
+            if batch_source_rows >= bulk_limit or len(rows_to_update_scd2) >= bulk_limit:
+                write_batch()
+                if check_stop_request(metadata_conn, mapref):
+                    print(f"STOP request detected for {mapref}. Stopping job gracefully...")
+                    stopped = True
+                    break
+        
+        if not stopped and (rows_to_insert or rows_to_update_scd1 or rows_to_update_scd2 or batch_num == 0):
+            write_batch()
+        
+        progress_writer.flush()
+        with profiler.stage(STAGE_COMMIT, round_trips=2):
+            target_conn.commit()
+            metadata_conn.commit()
+        
+        info(f"Merge CDC completed: {source_count} source rows, {target_count} target rows, "
+             f"{error_count} errors, {deleted_count} keys missing from source"
+             f"{' expired' if detect_deletes else ''}")
+        
+        return {
+            'status': 'STOPPED' if stopped else 'SUCCESS',
+            'source_rows': source_count,
+            'target_rows': target_count,
+            'error_rows': error_count
+        }
+    
+    except Exception as e:
+        error(f"Merge CDC job execution failed: {e}", exc_info=True)
+        try:
+            target_conn.rollback()
+            metadata_conn.rollback()
+        except Exception:
+            pass
+        if 'progress_writer' in locals():
+            try:
+                progress_writer.flush()
+            except Exception:
+                pass
+        return {
+            'status': 'FAILED',
+            'source_rows': source_count,
+            'target_rows': target_count,
+            'error_rows': error_count,
+            'message': str(e)
+        }
+    
+    finally:
+        for cursor in (source_cursor, target_stream_cursor):
+            try:
+                if cursor:
+                    cursor.close()
+            except Exception:
+                pass
+
+
 def _execute_mapper_job_parallel(
     metadata_conn,
     source_conn,
@@ -592,7 +1046,8 @@ def _execute_mapper_job_parallel(
     source_db_type: str,
     target_db_type: str,
     parallel_config: Dict[str, Any],
-    estimated_rows: int
+    estimated_rows: int,
+    profiler: Optional[StageProfiler] = None
 ) -> Dict[str, Any]:
     """
     Execute mapper job using parallel processing (Phase 4).
@@ -619,12 +1074,17 @@ def _execute_mapper_job_parallel(
         target_db_type: Target database type
         parallel_config: Parallel processing configuration
         estimated_rows: Estimated total rows
+        profiler: Optional StageProfiler; each chunk is timed on its own thread
+            and merged in, so stage times are summed across chunk threads
         
     Returns:
-        Execution result dictionary
+        Execution result dictionary, or None when the plan has a single chunk
+        and the job should run sequentially instead
     """
     from concurrent.futures import ThreadPoolExecutor, as_completed
     
+    if profiler is None:
+        profiler = StageProfiler(enabled=False)
     mapref = job_config['mapref']
     jobid = job_config['jobid']
     target_schema = job_config['target_schema']
@@ -648,33 +1108,78 @@ def _execute_mapper_job_parallel(
     total_target_rows = 0
     total_error_rows = 0
     last_status = 'SUCCESS'
+    process_pool = None
+    block_spec = None
     
     try:
-        # Calculate chunk configuration
         chunk_manager = ChunkManager(source_db_type)
-        chunk_config = chunk_manager.calculate_chunk_config(
-            source_conn, source_query, chunk_size
-        )
         
-        num_chunks = chunk_config.num_chunks or 1
-        total_rows = chunk_config.total_rows or estimated_rows
+        # Jobs with checkpoints keep a chunk ledger: a failed or stopped run leaves
+        # its chunk plan behind and the next run re-executes only unfinished chunks
+        ledger = None
+        chunk_ranges = []
+        key_column = None
+        if chunk_ledger_enabled(checkpoint_config):
+            ledger = ChunkLedger(
+                metadata_conn, mapref,
+                chunk_run_key(source_query, query_bind_params, chunk_size),
+                sessionid=session_params.get('sessionid')
+            )
+            chunk_ranges = ledger.load()
+            if chunk_ranges and not chunk_ranges[0].key_column:
+                # OFFSET windows of an unordered query need not return the same rows
+                # on the next run; such a plan is dropped and the run starts over
+                info(f"Discarding OFFSET chunk ledger of {mapref}, starting from scratch")
+                ledger.clear()
+                chunk_ranges = []
+        resumed = bool(chunk_ranges)
+        
+        if resumed:
+            num_chunks = len(chunk_ranges)
+            total_rows = estimated_rows
+            key_column = chunk_ranges[0].key_column
+            info(f"Resuming {mapref} from chunk ledger: "
+                 f"{sum(1 for chunk in chunk_ranges if chunk.status == CHUNK_DONE)}/{num_chunks} chunks already done")
+        else:
+            # Calculate chunk configuration
+            chunk_config = chunk_manager.calculate_chunk_config(
+                source_conn, source_query, chunk_size, bind_params=query_bind_params
+            )
+            
+            num_chunks = chunk_config.num_chunks or 1
+            total_rows = chunk_config.total_rows or estimated_rows
+            key_column = chunk_config.key_column
+            if chunk_config.total_rows:
+                record_actual_row_count(mapref, estimated_rows, chunk_config.total_rows)
+            
+            if ledger is not None:
+                # Key ranges (when the source is ordered by a key) re-run exactly on restart
+                chunk_ranges = chunk_manager.plan_chunk_ranges(
+                    source_conn, source_query, chunk_config, bind_params=query_bind_params
+                )
+                num_chunks = len(chunk_ranges)
+                if not chunk_ranges[0].key_column:
+                    # Only key ranges re-run exactly; OFFSET windows keep the checkpoint
+                    # behaviour without a ledger
+                    info(f"No key ranges for {mapref}, running without a chunk ledger")
+                    ledger = None
+                elif num_chunks <= 1:
+                    # Few distinct keys: nothing is written to the ledger, the sequential
+                    # path and its own checkpoint take over
+                    info(f"Key boundaries of {mapref} give {num_chunks} range(s), no chunk ledger needed")
+            else:
+                chunk_ranges = [ChunkRange(chunk_id=chunk_id) for chunk_id in range(num_chunks)]
         
         info(f"*** ENTERING PARALLEL PROCESSING MODE ***")
         info(f"Parallel processing configuration: {num_chunks} chunks, ~{total_rows} total rows, "
              f"chunk_size={chunk_size}, max_workers={max_workers}")
         
-        # Edge case: If only 1 chunk, use sequential processing (parallel overhead not worth it)
+        # Edge case: the estimate (statistics, plan or history) chose parallel mode but
+        # the exact count or the key-range plan gives a single chunk - let the caller
+        # load sequentially instead
         if num_chunks <= 1:
             info(f"Parallel processing disabled: Only {num_chunks} chunk(s), using sequential processing")
-            # Fall back to sequential processing
-            # This should not happen if row estimation is correct, but handle gracefully
-            return {
-                'status': 'SUCCESS',
-                'source_rows': 0,
-                'target_rows': 0,
-                'error_rows': 0,
-                'message': 'Parallel processing not needed (single chunk), use sequential processing'
-            }
+            return None
         
         # Check for stop request before starting
         if check_stop_request(metadata_conn, mapref):
@@ -686,9 +1191,34 @@ def _execute_mapper_job_parallel(
                 'message': 'Job stopped before parallel processing started'
             }
         
+        if ledger is not None and not resumed:
+            ledger.start(chunk_ranges)
+        
+        # Rows of chunks finished by an earlier attempt count toward this run's totals
+        chunks_by_id = {chunk.chunk_id: chunk for chunk in chunk_ranges}
+        pending_chunks = [chunk for chunk in chunk_ranges if chunk.status != CHUNK_DONE]
+        for chunk in chunk_ranges:
+            if chunk.status == CHUNK_DONE:
+                total_source_rows += chunk.source_rows
+                total_target_rows += chunk.target_rows
+                total_error_rows += chunk.error_rows
+        planned_chunks = num_chunks
+        num_chunks = len(pending_chunks)
+        
         # Create retry handler
         retry_handler = create_retry_handler(max_retries=3)
         
+        # Optional process mode: chunk threads keep all DB I/O and ship row blocks
+        # to worker processes for transformation, hashing and SCD classification.
+        use_process_pool, process_workers = process_pool_settings(parallel_config)
+        if use_process_pool:
+            block_spec = _build_row_block_spec(job_config, source_columns, transformation_func, checkpoint_config)
+            if block_spec is not None:
+                process_pool = MapperProcessPool(max_workers=process_workers)
+            else:
+                info("Process pool mode requested but transformation is not picklable and job_config has "
+                     "no column_source_mapping - classifying rows in chunk threads")
+        
         # Create progress tracker
         progress_tracker = ProgressTracker(
             total_chunks=num_chunks,
@@ -722,11 +1252,12 @@ def _execute_mapper_job_parallel(
             
             # Submit all chunks in batch
             info(f"Starting chunk submission loop for {num_chunks} chunks...")
-            info(f"About to iterate through range({num_chunks})...")
-            for chunk_id in range(num_chunks):
+            info(f"About to iterate through {num_chunks} pending chunks...")
+            for chunk in pending_chunks:
+                chunk_id = chunk.chunk_id
                 try:
                     # Submit chunk processing (non-blocking)
-                    if chunk_id == 0 or chunk_id % 10 == 0 or chunk_id == num_chunks - 1:
+                    if submitted_count % 10 == 0 or submitted_count == num_chunks - 1:
                         debug(f"Submitting chunk {chunk_id}...")
                     
                     # Create the future - this should be non-blocking
@@ -737,7 +1268,7 @@ def _execute_mapper_job_parallel(
                         source_query=source_query,
                         query_bind_params=query_bind_params,
                         chunk_size=chunk_size,
-                        key_column=chunk_config.key_column,
+                        key_column=key_column,
                         source_columns=source_columns,
                         transformation_func=transformation_func,
                         target_conn=target_conn,
@@ -759,7 +1290,11 @@ def _execute_mapper_job_parallel(
                         checkpoint_columns=checkpoint_config.get('columns', []) if checkpoint_config.get('enabled') and checkpoint_config.get('strategy') == 'KEY' else None,
                         retry_handler=retry_handler,
                         source_conn_id=source_conn_id,
-                        target_conn_id=target_conn_id
+                        target_conn_id=target_conn_id,
+                        process_pool=process_pool,
+                        block_spec=block_spec,
+                        chunk_range=chunk,
+                        profile=profiler.enabled
                     )
                     # Store the future immediately after submission
                     futures[future] = chunk_id
@@ -776,7 +1311,7 @@ def _execute_mapper_job_parallel(
                     
                     # Increment counter and log progress
                     submitted_count += 1
-                    if submitted_count % 10 == 0 or chunk_id == num_chunks - 1:
+                    if submitted_count % 10 == 0 or submitted_count == num_chunks:
                         debug(f"Submitted {submitted_count}/{num_chunks} chunks so far...")
                         
                 except Exception as submit_err:
@@ -826,6 +1361,15 @@ def _execute_mapper_job_parallel(
                     chunk_result = future.result(timeout=timeout_seconds)
                     info(f"Got result for chunk {chunk_id}: status={chunk_result.get('status')}, source_rows={chunk_result.get('source_rows', 0)}, target_rows={chunk_result.get('target_rows', 0)}")
                     chunk_results.append(chunk_result)
+                    profiler.merge(chunk_result.get('stage_profile'))
+                    
+                    chunk = chunks_by_id[chunk_id]
+                    chunk.status = CHUNK_FAILED if chunk_result.get('status') == 'ERROR' else CHUNK_DONE
+                    chunk.source_rows = chunk_result.get('source_rows', 0)
+                    chunk.target_rows = chunk_result.get('target_rows', 0)
+                    chunk.error_rows = chunk_result.get('error_rows', 0)
+                    if ledger is not None:
+                        ledger.record(chunk)
                     
                     # Aggregate results
                     total_source_rows += chunk_result.get('source_rows', 0)
@@ -851,8 +1395,9 @@ def _execute_mapper_job_parallel(
                     # Update progress log periodically (less frequently to reduce lock contention)
                     if len(chunk_results) % 10 == 0 or len(chunk_results) == num_chunks:
                         try:
-                            update_process_log_progress(metadata_conn, session_params, total_source_rows, total_target_rows)
-                            metadata_conn.commit()
+                            with profiler.stage(STAGE_METADATA_LOG, round_trips=2):
+                                update_process_log_progress(metadata_conn, session_params, total_source_rows, total_target_rows)
+                                metadata_conn.commit()
                             info(f"Parallel processing progress: {len(chunk_results)}/{num_chunks} chunks completed, "
                                  f"{total_source_rows} source rows, {total_target_rows} target rows processed so far")
                         except Exception as progress_err:
@@ -863,6 +1408,7 @@ def _execute_mapper_job_parallel(
                     total_error_rows += chunk_size
                     progress_tracker.update_chunk_failed(chunk_id, f"Timeout after {timeout_seconds} seconds")
                     last_status = 'FAILED'
+                    _record_failed_chunk(ledger, chunks_by_id[chunk_id])
                     # Cancel the future if possible
                     try:
                         future.cancel()
@@ -873,14 +1419,27 @@ def _execute_mapper_job_parallel(
                     total_error_rows += chunk_size  # Estimate error rows
                     progress_tracker.update_chunk_failed(chunk_id, str(e))
                     last_status = 'FAILED'
+                    _record_failed_chunk(ledger, chunks_by_id[chunk_id])
         
         # Final progress update
-        update_process_log_progress(metadata_conn, session_params, total_source_rows, total_target_rows)
+        with profiler.stage(STAGE_METADATA_LOG):
+            update_process_log_progress(metadata_conn, session_params, total_source_rows, total_target_rows)
+        
+        # The ledger records exactly which chunks finished; it is removed once all have
+        run_complete = all(chunk.status == CHUNK_DONE for chunk in chunk_ranges)
+        ledger_active = ledger is not None and ledger.enabled
+        if ledger_active:
+            if run_complete:
+                ledger.clear()
+            else:
+                incomplete = sum(1 for chunk in chunk_ranges if chunk.status != CHUNK_DONE)
+                info(f"Chunk ledger kept for restart: {incomplete}/{planned_chunks} chunks incomplete")
         
-        # Handle checkpoint updates (KEY strategy)
+        # Handle checkpoint updates (KEY strategy). Without a ledger the best resume
+        # point is the highest key of any finished chunk.
         if checkpoint_config.get('enabled', False) and \
            checkpoint_config.get('strategy') == 'KEY' and \
-           chunk_results:
+           chunk_results and not ledger_active:
             # Get maximum checkpoint value from all successful chunks
             # (not just the last one, as chunks may complete out of order)
             max_checkpoint_value = None
@@ -926,13 +1485,16 @@ def _execute_mapper_job_parallel(
                 debug(f"Checkpoint updated to maximum value: {max_checkpoint_value}")
         
         # Mark checkpoint as completed
-        if checkpoint_config.get('enabled', False) and last_status != 'STOPPED':
-            complete_checkpoint(metadata_conn, session_params)
-            metadata_conn.commit()
+        if checkpoint_config.get('enabled', False) and last_status != 'STOPPED' and \
+           (run_complete or not ledger_active):
+            with profiler.stage(STAGE_METADATA_LOG, round_trips=2):
+                complete_checkpoint(metadata_conn, session_params)
+                metadata_conn.commit()
         
         # Final commit
-        target_conn.commit()
-        metadata_conn.commit()
+        with profiler.stage(STAGE_COMMIT, round_trips=2):
+            target_conn.commit()
+            metadata_conn.commit()
         
         info(f"*** PARALLEL PROCESSING COMPLETED ***: {num_chunks} chunks processed, "
              f"{total_source_rows} source rows, {total_target_rows} target rows, {total_error_rows} errors")
@@ -960,6 +1522,50 @@ def _execute_mapper_job_parallel(
             'error_rows': total_error_rows,
             'message': f'Parallel processing failed: {str(e)}'
         }
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown()
+
+
+def _record_failed_chunk(ledger: Optional[ChunkLedger], chunk: ChunkRange) -> None:
+    """Mark a chunk whose future raised or timed out as FAILED in the ledger."""
+    chunk.status = CHUNK_FAILED
+    if ledger is not None:
+        ledger.record(chunk)
+
+
+def _build_row_block_spec(
+    job_config: Dict[str, Any],
+    source_columns: List[str],
+    transformation_func: Callable,
+    checkpoint_config: Dict[str, Any]
+) -> Optional[RowBlockSpec]:
+    """
+    Describe the job's row classification for worker processes.
+
+    Generated jobs define transformation_func inside execute_job (not picklable);
+    it only applies COLUMN_SOURCE_MAPPING, so workers rebuild that projection from
+    job_config instead. Returns None when neither is available.
+    """
+    column_source_mapping = job_config.get('column_source_mapping')
+    picklable_func = transformation_func if is_picklable(transformation_func) else None
+    if picklable_func is None and column_source_mapping is None:
+        return None
+
+    hash_exclude_columns = job_config.get('hash_exclude_columns', set())
+    checkpoint_columns = ()
+    if checkpoint_config.get('enabled') and checkpoint_config.get('strategy') == 'KEY':
+        checkpoint_columns = tuple(checkpoint_config.get('columns') or ())
+    return RowBlockSpec(
+        source_columns=tuple(source_columns),
+        column_source_mapping=dict(column_source_mapping or {}),
+        all_columns=tuple(job_config['all_columns']),
+        hash_exclude_columns=frozenset(hash_exclude_columns) if hash_exclude_columns is not None else None,
+        scd_type=job_config.get('scd_type', 1),
+        target_type=job_config['target_type'],
+        checkpoint_columns=checkpoint_columns,
+        transformation_func=picklable_func,
+    )
 
 
 def _process_mapper_chunk(
@@ -990,18 +1596,29 @@ def _process_mapper_chunk(
     checkpoint_columns: Optional[List[str]] = None,
     retry_handler = None,
     source_conn_id: Optional[int] = None,
-    target_conn_id: Optional[int] = None
+    target_conn_id: Optional[int] = None,
+    process_pool: Optional[MapperProcessPool] = None,
+    block_spec: Optional[RowBlockSpec] = None,
+    chunk_range: Optional[ChunkRange] = None,
+    profile: bool = False
 ) -> Dict[str, Any]:
     """
     Process a single chunk with full mapper logic (SCD, checkpoints, etc.).
     
     This is called by parallel workers to process individual chunks.
     Each worker creates its own database connections to avoid thread-safety issues.
+    With a process_pool, the thread only looks up target rows and writes; the
+    transformation, hashing and SCD classification run in worker processes.
+    A chunk_range with key bounds from the chunk ledger is read with a key range
+    predicate; otherwise the chunk is the OFFSET/LIMIT window for chunk_id.
+    With profile set, the chunk's StageProfiler is returned as 'stage_profile'
+    for the coordinator to merge.
     """
     from backend.modules.mapper.chunk_manager import ChunkManager
     
-    debug(f"[PARALLEL] Starting chunk {chunk_id} processing (chunk_size={chunk_size})")
+    debug("[PARALLEL] Starting chunk %s processing (chunk_size=%s)", chunk_id, chunk_size)
     
+    profiler = StageProfiler(mapref, enabled=profile)
     chunk_result = {
         'chunk_id': chunk_id,
         'source_rows': 0,
@@ -1010,6 +1627,8 @@ def _process_mapper_chunk(
         'status': 'SUCCESS',
         'checkpoint_value': None
     }
+    if profile:
+        chunk_result['stage_profile'] = profiler
     
     # Create separate connections for this thread to avoid thread-safety issues
     chunk_source_conn = None
@@ -1027,7 +1646,7 @@ def _process_mapper_chunk(
             if source_conn_id:
                 from backend.database.dbconnect import create_target_connection
                 chunk_source_conn = create_target_connection(source_conn_id)
-                debug(f"[PARALLEL] Chunk {chunk_id}: Created source connection (ID: {source_conn_id})")
+                debug("[PARALLEL] Chunk %s: Created source connection (ID: %s)", chunk_id, source_conn_id)
             else:
                 # Fallback to using the provided connection (not ideal but works)
                 chunk_source_conn = source_conn
@@ -1036,7 +1655,7 @@ def _process_mapper_chunk(
             if target_conn_id:
                 from backend.database.dbconnect import create_target_connection
                 chunk_target_conn = create_target_connection(target_conn_id)
-                debug(f"[PARALLEL] Chunk {chunk_id}: Created target connection (ID: {target_conn_id})")
+                debug("[PARALLEL] Chunk %s: Created target connection (ID: %s)", chunk_id, target_conn_id)
             else:
                 # Fallback to using the provided connection (not ideal but works)
                 chunk_target_conn = target_conn
@@ -1049,12 +1668,16 @@ def _process_mapper_chunk(
         
         # Create chunked query
         chunk_manager = ChunkManager(source_db_type)
-        chunk_sql = chunk_manager.create_chunked_query(
-            source_query, chunk_id, chunk_size, key_column
-        )
+        if chunk_range is not None and chunk_range.key_column:
+            chunk_sql = chunk_manager.create_chunk_range_query(source_query, chunk_range, chunk_size)
+        else:
+            chunk_sql = chunk_manager.create_chunked_query(
+                source_query, chunk_id, chunk_size, key_column
+            )
         
         # Execute chunk query
         source_cursor = chunk_source_conn.cursor()
+        started = profiler.clock()
         if query_bind_params:
             source_cursor.execute(chunk_sql, query_bind_params)
         else:
@@ -1062,6 +1685,7 @@ def _process_mapper_chunk(
         
         # Fetch all rows for this chunk
         source_rows = source_cursor.fetchall()
+        profiler.add(STAGE_SOURCE_FETCH, started, rows=len(source_rows), round_trips=1)
         
         if not source_rows:
             return chunk_result
@@ -1077,73 +1701,134 @@ def _process_mapper_chunk(
         rows_to_update_scd2 = []
         last_checkpoint_value = None
         
-        # Process each row in chunk
-        for src_row in source_rows:
-            try:
-                # Convert row to dictionary
-                raw_src_dict = dict(zip(source_columns, src_row))
-                
-                # Apply transformation
-                src_dict = transformation_func(raw_src_dict)
-                
-                # Build primary key
-                pk_values = build_primary_key_values(
-                    raw_src_dict,
-                    pk_columns,
-                    pk_source_mapping
-                )
-                
-                # Check for NULL PK
-                if any(v is None for v in pk_values.values()):
+        if process_pool is not None and block_spec is not None:
+            # Target lookups stay on this thread; classification runs in worker processes
+            lookup_rows, target_states = [], []
+            for src_row in source_rows:
+                try:
+                    raw_src_dict = dict(zip(source_columns, src_row))
+                    pk_values = build_primary_key_values(
+                        raw_src_dict,
+                        pk_columns,
+                        pk_source_mapping
+                    )
+                    if any(v is None for v in pk_values.values()):
+                        chunk_result['error_rows'] += 1
+                        continue
+                    started = profiler.clock()
+                    target_row = _lookup_target_record(
+                        target_cursor,
+                        full_table_name,
+                        pk_values,
+                        target_db_type,
+                        target_schema,
+                        target_table
+                    )
+                    profiler.add(STAGE_TARGET_LOOKUP, started, rows=1, round_trips=1)
+                    lookup_rows.append(src_row)
+                    target_states.append(target_state(target_row))
+                except Exception as row_err:
+                    error(f"[Chunk {chunk_id}] Error processing row: {row_err}")
                     chunk_result['error_rows'] += 1
-                    continue
+
+            # Transform, hash and classification run in the workers: timed as one transform stage
+            started = profiler.clock()
+            classified = process_pool.classify(block_spec, lookup_rows, target_states)
+            profiler.add(STAGE_TRANSFORM, started, rows=len(lookup_rows))
+            rows_to_insert = classified.rows_to_insert
+            rows_to_update_scd1 = classified.rows_to_update_scd1
+            rows_to_update_scd2 = classified.rows_to_update_scd2
+            last_checkpoint_value = classified.checkpoint_value
+            chunk_result['error_rows'] += classified.error_rows
+            for message in classified.error_messages:
+                error(f"[Chunk {chunk_id}] Error processing row: {message}")
+        else:
+            projector = RowProjector.for_transformation(
+                transformation_func, source_columns, all_columns, pk_columns, pk_source_mapping, hash_exclude_columns
+            )
+            last_processed_row = None
+            
+            # Process each row in chunk
+            for src_row in source_rows:
+                try:
+                    started = profiler.clock()
+                    if projector is not None:
+                        src_dict = projector.project(src_row)
+                        pk_values = projector.pk_values(src_row)
+                    else:
+                        # Convert row to dictionary
+                        raw_src_dict = dict(zip(source_columns, src_row))
+                    
+                        # Apply transformation
+                        src_dict = transformation_func(raw_src_dict)
+                    
+                        # Build primary key
+                        pk_values = build_primary_key_values(
+                            raw_src_dict,
+                            pk_columns,
+                            pk_source_mapping
+                        )
+                    started = profiler.add(STAGE_TRANSFORM, started, rows=1)
                 
-                # Lookup existing record
-                target_row = _lookup_target_record(
-                    target_cursor,
-                    full_table_name,
-                    pk_values,
-                    target_db_type,
-                    target_schema,
-                    target_table
-                )
+                    # Check for NULL PK
+                    if any(v is None for v in pk_values.values()):
+                        chunk_result['error_rows'] += 1
+                        continue
                 
-                # Generate hash
-                src_hash = generate_hash(src_dict, all_columns, hash_exclude_columns)
+                    # Lookup existing record
+                    target_row = _lookup_target_record(
+                        target_cursor,
+                        full_table_name,
+                        pk_values,
+                        target_db_type,
+                        target_schema,
+                        target_table
+                    )
+                    started = profiler.add(STAGE_TARGET_LOOKUP, started, rows=1, round_trips=1)
                 
-                # Prepare for SCD processing
-                row_to_insert, row_to_update_scd1, skey_to_expire_scd2 = prepare_row_for_scd(
-                    src_dict,
-                    target_row,
-                    src_hash,
-                    scd_type,
-                    target_type
-                )
+                    # Generate hash
+                    if projector is not None:
+                        src_hash = projector.row_hash(src_dict)
+                    else:
+                        src_hash = generate_hash(src_dict, all_columns, hash_exclude_columns)
+                    started = profiler.add(STAGE_HASH, started, rows=1)
                 
-                if row_to_insert:
-                    rows_to_insert.append(row_to_insert)
-                if row_to_update_scd1:
-                    rows_to_update_scd1.append(row_to_update_scd1)
-                if skey_to_expire_scd2:
-                    rows_to_update_scd2.append(skey_to_expire_scd2)
+                    # Prepare for SCD processing
+                    row_to_insert, row_to_update_scd1, skey_to_expire_scd2 = prepare_row_for_scd(
+                        src_dict,
+                        target_row,
+                        src_hash,
+                        scd_type,
+                        target_type
+                    )
+                    profiler.add(STAGE_TRANSFORM, started, calls=0)
                 
-                # Track checkpoint value (for KEY strategy)
-                # Extract checkpoint value from checkpoint columns
-                if checkpoint_columns:
-                    if len(checkpoint_columns) > 1:
-                        # Composite key
-                        checkpoint_values_list = [
-                            str(raw_src_dict.get(col, '')) for col in checkpoint_columns
-                        ]
-                        last_checkpoint_value = '|'.join(checkpoint_values_list)
-                    else:
-                        # Single column
-                        last_checkpoint_value = str(raw_src_dict.get(checkpoint_columns[0], ''))
+                    if row_to_insert:
+                        rows_to_insert.append(row_to_insert)
+                    if row_to_update_scd1:
+                        rows_to_update_scd1.append(row_to_update_scd1)
+                    if skey_to_expire_scd2:
+                        rows_to_update_scd2.append(skey_to_expire_scd2)
                 
-            except Exception as row_err:
-                error(f"[Chunk {chunk_id}] Error processing row: {row_err}")
-                chunk_result['error_rows'] += 1
-                continue
+                    last_processed_row = src_row
+                
+                except Exception as row_err:
+                    error(f"[Chunk {chunk_id}] Error processing row: {row_err}")
+                    chunk_result['error_rows'] += 1
+                    continue
+            
+            # Track checkpoint value (for KEY strategy) from the last processed row
+            if checkpoint_columns and last_processed_row is not None:
+                raw_src_dict = dict(zip(source_columns, last_processed_row))
+                if len(checkpoint_columns) > 1:
+                    # Composite key
+                    checkpoint_values_list = [
+                        str(raw_src_dict.get(col, '')) for col in checkpoint_columns
+                    ]
+                    last_checkpoint_value = '|'.join(checkpoint_values_list)
+                else:
+                    # Single column
+                    last_checkpoint_value = str(raw_src_dict.get(checkpoint_columns[0], ''))
         
         # Process SCD batch with retry logic
         def process_scd_batch_with_retry():
@@ -1163,6 +1848,7 @@ def _process_mapper_chunk(
                 mapref=mapref,
                 jobid=jobid,
                 session_params=session_params,
+                profiler=profiler,
             )
         
         try:
@@ -1184,7 +1870,8 @@ def _process_mapper_chunk(
             chunk_result['error_message'] = str(scd_err)
         
         # Commit target connection for this chunk
-        chunk_target_conn.commit()
+        with profiler.stage(STAGE_COMMIT):
+            chunk_target_conn.commit()
         
         # Store checkpoint value if available
         if last_checkpoint_value:
@@ -1214,14 +1901,14 @@ def _process_mapper_chunk(
         try:
             if chunk_source_conn and chunk_source_conn is not source_conn:
                 chunk_source_conn.close()
-                debug(f"[PARALLEL] Chunk {chunk_id}: Closed source connection")
+                debug("[PARALLEL] Chunk %s: Closed source connection", chunk_id)
         except Exception:
             pass
         
         try:
             if chunk_target_conn and chunk_target_conn is not target_conn:
                 chunk_target_conn.close()
-                debug(f"[PARALLEL] Chunk {chunk_id}: Closed target connection")
+                debug("[PARALLEL] Chunk %s: Closed target connection", chunk_id)
         except Exception:
             pass
     
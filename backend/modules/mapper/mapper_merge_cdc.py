@@ -0,0 +1,251 @@
+"""
+Sorted merge-join change detection for full-snapshot mapper loads.
+
+Instead of probing the target by primary key for every source row, the
+source query and the target's current rows (CURFLG = 'Y', PK + SKEY + RWHKEY
+only) are both streamed ordered by primary key and merge-joined in a single
+pass. Memory use is bounded by one fetch batch of each stream.
+
+Both streams are ordered with a binary collation on text key columns so the
+database order matches Python's comparison order; an out-of-order key still
+fails the job with MergeOrderError rather than silently misclassifying rows.
+"""
+import os
+import uuid
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.logger import warning
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.logger import warning  # type: ignore
+
+
+CDC_MODE_LOOKUP = 'LOOKUP'
+CDC_MODE_MERGE = 'MERGE'
+
+# Data types whose ORDER BY needs a binary collation to match Python ordering
+_TEXT_TYPES = {
+    'POSTGRESQL': {'character varying', 'varchar', 'character', 'char', 'text', 'bpchar'},
+    'ORACLE': {'VARCHAR2', 'VARCHAR', 'CHAR', 'NVARCHAR2', 'NCHAR'},
+    'MYSQL': {'varchar', 'char', 'text', 'tinytext', 'mediumtext', 'longtext'},
+    'MSSQL': {'varchar', 'char', 'nvarchar', 'nchar', 'text', 'ntext'},
+}
+
+_NO_KEY = object()
+
+
+class MergeOrderError(RuntimeError):
+    """Raised when a stream is not in the key order the merge join relies on."""
+
+
+def cdc_mode_settings(job_config: Dict[str, Any]) -> Tuple[str, bool]:
+    """
+    Return (cdc_mode, detect_deletes) for a job.
+
+    ``job_config['cdc_mode']`` ('LOOKUP' or 'MERGE') and
+    ``job_config['merge_detect_deletes']`` override MAPPER_CDC_MODE and
+    MAPPER_MERGE_DETECT_DELETES.
+    """
+    mode = (job_config.get('cdc_mode') or os.getenv('MAPPER_CDC_MODE', CDC_MODE_LOOKUP)).strip().upper()
+    if mode not in (CDC_MODE_LOOKUP, CDC_MODE_MERGE):
+        warning(f"Unknown CDC mode '{mode}', using {CDC_MODE_LOOKUP}")
+        mode = CDC_MODE_LOOKUP
+
+    detect_deletes = job_config.get('merge_detect_deletes')
+    if detect_deletes is None:
+        detect_deletes = os.getenv('MAPPER_MERGE_DETECT_DELETES', 'false')
+    if isinstance(detect_deletes, str):
+        detect_deletes = detect_deletes.strip().upper() in ('Y', 'YES', 'TRUE', '1')
+    return mode, bool(detect_deletes)
+
+
+def text_key_columns(cursor, db_type: str, schema: str, table: str, pk_columns: Iterable[str]) -> Set[str]:
+    """
+    Return the primary key columns of the target table that hold text.
+    An empty set is returned if the catalog cannot be read.
+    """
+    db_type = (db_type or '').upper()
+    pk_upper = {col.upper(): col for col in pk_columns}
+    try:
+        if db_type == 'ORACLE':
+            cursor.execute(
+                "SELECT column_name, data_type FROM all_tab_columns "
+                "WHERE owner = :owner AND table_name = :table_name",
+                {'owner': (schema or '').upper(), 'table_name': table.upper()}
+            )
+        elif db_type in ('POSTGRESQL', 'MYSQL', 'MSSQL'):
+            placeholder = '?' if db_type == 'MSSQL' else '%s'
+            cursor.execute(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                f"WHERE LOWER(table_schema) = LOWER({placeholder}) AND LOWER(table_name) = LOWER({placeholder})",
+                (schema, table)
+            )
+        else:
+            return set()
+        text_types = _TEXT_TYPES.get(db_type, set())
+        return {
+            pk_upper[str(name).upper()]
+            for name, data_type in cursor.fetchall()
+            if str(name).upper() in pk_upper and str(data_type) in text_types
+        }
+    except Exception as e:
+        warning(f"Could not read key column types for {schema}.{table}: {e}")
+        return set()
+
+
+def binary_order_expression(expression: str, db_type: str) -> str:
+    """Wrap an ORDER BY expression so text sorts by code point, as in Python."""
+    db_type = (db_type or '').upper()
+    if db_type == 'POSTGRESQL':
+        return f'{expression} COLLATE "C"'
+    if db_type == 'ORACLE':
+        return f"NLSSORT({expression}, 'NLS_SORT=BINARY')"
+    if db_type == 'MYSQL':
+        return f"BINARY {expression}"
+    if db_type == 'MSSQL':
+        return f"{expression} COLLATE Latin1_General_BIN2"
+    return expression
+
+
+def build_ordered_source_query(
+    source_sql: str,
+    pk_order: Sequence[str],
+    pk_source_mapping: Dict[str, str],
+    text_columns: Set[str],
+    db_type: str
+) -> str:
+    """Wrap the source SQL so rows arrive ordered by the target primary key."""
+    order_by = []
+    for pk_col in pk_order:
+        expression = f"mrg_src.{pk_source_mapping.get(pk_col, pk_col)}"
+        order_by.append(binary_order_expression(expression, db_type) if pk_col in text_columns else expression)
+    return f"SELECT * FROM ({source_sql}) mrg_src ORDER BY {', '.join(order_by)}"
+
+
+def build_target_state_query(
+    formatted_table: str,
+    pk_order: Sequence[str],
+    text_columns: Set[str],
+    db_type: str
+) -> str:
+    """Query for the current target rows (key columns, SKEY, RWHKEY) ordered by key."""
+    order_by = [
+        binary_order_expression(col, db_type) if col in text_columns else col
+        for col in pk_order
+    ]
+    return (
+        f"SELECT {', '.join(pk_order)}, SKEY, RWHKEY FROM {formatted_table} "
+        f"WHERE CURFLG = 'Y' ORDER BY {', '.join(order_by)}"
+    )
+
+
+def open_stream_cursor(connection, arraysize: int, buffered: bool = True):
+    """
+    Open a cursor that streams its result. On psycopg2 this is a named
+    (server-side) cursor held across commits, so batches written on the same
+    connection do not close it. MySQL cursors are buffered because the
+    connection cannot run the batch writes while a result is unread; pass
+    buffered=False for a connection that is only read. Oracle cursors stream
+    as they are. A named cursor has no description until its first fetch.
+    """
+    try:
+        cursor = connection.cursor(name=f"dms_merge_{uuid.uuid4().hex[:12]}", withhold=True)
+        cursor.itersize = arraysize
+    except TypeError:
+        try:
+            cursor = connection.cursor(buffered=True) if buffered else connection.cursor()
+        except TypeError:
+            cursor = connection.cursor()
+    cursor.arraysize = arraysize
+    return cursor
+
+
+def iter_cursor_rows(cursor, batch_size: int, profiler=None, stage: str = 'source_fetch') -> Iterator[tuple]:
+    """
+    Yield rows from an executed cursor one fetchmany() batch at a time.
+    With a StageProfiler, each fetch is charged to ``stage``.
+    """
+    while True:
+        started = profiler.clock() if profiler is not None else None
+        rows = cursor.fetchmany(batch_size)
+        if started is not None:
+            profiler.add(stage, started, rows=len(rows), round_trips=1)
+        if not rows:
+            return
+        for row in rows:
+            yield row
+
+
+def target_state_stream(rows: Iterable[tuple], key_width: int) -> Iterator[Tuple[tuple, Dict[str, Any]]]:
+    """Turn (pk..., SKEY, RWHKEY) rows into (key, target state) pairs."""
+    for row in rows:
+        key = tuple(row[:key_width])
+        if any(value is None for value in key):
+            continue
+        yield key, {'SKEY': row[key_width], 'RWHKEY': row[key_width + 1]}
+
+
+def merge_join(
+    source: Iterable[Tuple[tuple, Any]],
+    target: Iterable[Tuple[tuple, Dict[str, Any]]]
+) -> Iterator[Tuple[Optional[Any], Optional[Dict[str, Any]]]]:
+    """
+    Merge-join two key-ordered streams of (key, payload) pairs.
+
+    Yields (source_payload, target_state) for every source row, with
+    target_state None for keys missing from the target, and
+    (None, target_state) for target keys that no source row matched.
+    Repeated source keys all match the same target row.
+    """
+    target_iter = iter(target)
+    previous_target_key = _NO_KEY
+
+    def next_target():
+        nonlocal previous_target_key
+        item = next(target_iter, None)
+        if item is not None:
+            _check_order('target', previous_target_key, item[0])
+            previous_target_key = item[0]
+        return item
+
+    current = next_target()
+    current_matched = False
+    previous_source_key = _NO_KEY
+
+    for source_key, payload in source:
+        _check_order('source', previous_source_key, source_key)
+        previous_source_key = source_key
+
+        while current is not None and _less(current[0], source_key):
+            if not current_matched:
+                yield None, current[1]
+            current = next_target()
+            current_matched = False
+
+        if current is not None and current[0] == source_key:
+            current_matched = True
+            yield payload, current[1]
+        else:
+            yield payload, None
+
+    while current is not None:
+        if not current_matched:
+            yield None, current[1]
+        current = next_target()
+        current_matched = False
+
+
+def _less(left: tuple, right: tuple) -> bool:
+    try:
+        return left < right
+    except TypeError as e:
+        raise MergeOrderError(f"Cannot compare keys {left!r} and {right!r}: {e}") from e
+
+
+def _check_order(stream: str, previous: Any, key: tuple) -> None:
+    if previous is not _NO_KEY and _less(key, previous):
+        raise MergeOrderError(
+            f"{stream} rows are not ordered by primary key ({key!r} after {previous!r}); "
+            "check the key column collation or use the LOOKUP CDC mode"
+        )
@@ -0,0 +1,217 @@
+"""
+Process-pool execution of the CPU-bound part of mapper jobs.
+
+Row blocks (source tuples plus the RWHKEY/SKEY of their current target rows)
+are pickled to worker processes, which transform, hash and classify them into
+insert / SCD1 update / SCD2 expire lists. Source fetches, target lookups and
+writes stay on the calling threads, so connections never cross processes.
+"""
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable, Tuple, Sequence
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.mapper.mapper_transformation_utils import RowProjector, StandardTransformation, generate_hash
+    from backend.modules.mapper.mapper_scd_handler import prepare_row_for_scd
+    from backend.modules.logger import info, warning
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.mapper.mapper_transformation_utils import RowProjector, StandardTransformation, generate_hash  # type: ignore
+    from modules.mapper.mapper_scd_handler import prepare_row_for_scd  # type: ignore
+    from modules.logger import info, warning  # type: ignore
+
+
+# Target row columns prepare_row_for_scd() looks at
+TARGET_STATE_COLUMNS = ('RWHKEY', 'SKEY')
+
+
+@dataclass(frozen=True)
+class RowBlockSpec:
+    """Everything a worker process needs to classify rows of one job (pickled once per block)."""
+    source_columns: Tuple[str, ...]
+    column_source_mapping: Dict[str, str]
+    all_columns: Tuple[str, ...]
+    hash_exclude_columns: Optional[frozenset]
+    scd_type: int
+    target_type: str
+    checkpoint_columns: Tuple[str, ...] = ()
+    # Picklable transformation; None applies the standard COLUMN_SOURCE_MAPPING
+    # projection used by generated jobs (compiled to a RowProjector).
+    transformation_func: Optional[Callable] = None
+
+
+@dataclass
+class BlockResult:
+    """Classified rows of one block, in source order."""
+    rows_to_insert: List[Dict[str, Any]]
+    rows_to_update_scd1: List[Dict[str, Any]]
+    rows_to_update_scd2: List[Any]
+    error_rows: int = 0
+    checkpoint_value: Optional[str] = None
+    error_messages: Tuple[str, ...] = ()
+
+
+def target_state(target_row: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Reduce a looked-up target row to the columns needed for classification."""
+    if not target_row:
+        return None
+    return {col: target_row[col] for col in TARGET_STATE_COLUMNS if col in target_row}
+
+
+def classify_row_block(
+    spec: RowBlockSpec,
+    rows: Sequence[tuple],
+    target_states: Sequence[Optional[Dict[str, Any]]]
+) -> BlockResult:
+    """
+    Transform, hash and SCD-classify a block of source rows.
+
+    Runs in worker processes (and inline as the fallback), so it must only
+    depend on picklable arguments and never touch a database connection.
+    """
+    result = BlockResult([], [], [])
+    error_messages = []
+    hash_exclude = set(spec.hash_exclude_columns) if spec.hash_exclude_columns is not None else None
+    all_columns = list(spec.all_columns)
+    transformation_func = spec.transformation_func
+    if transformation_func is None:
+        transformation_func = StandardTransformation(spec.column_source_mapping, all_columns)
+    projector = RowProjector.for_transformation(
+        transformation_func, spec.source_columns, all_columns, hash_exclude_columns=hash_exclude
+    )
+    last_processed_row = None
+
+    for src_row, state in zip(rows, target_states):
+        try:
+            if projector is not None:
+                src_dict = projector.project(src_row)
+                src_hash = projector.row_hash(src_dict)
+            else:
+                src_dict = transformation_func(dict(zip(spec.source_columns, src_row)))
+                src_hash = generate_hash(src_dict, all_columns, hash_exclude)
+            row_to_insert, row_to_update_scd1, skey_to_expire_scd2 = prepare_row_for_scd(
+                src_dict,
+                state,
+                src_hash,
+                spec.scd_type,
+                spec.target_type
+            )
+
+            if row_to_insert:
+                result.rows_to_insert.append(row_to_insert)
+            if row_to_update_scd1:
+                result.rows_to_update_scd1.append(row_to_update_scd1)
+            if skey_to_expire_scd2:
+                result.rows_to_update_scd2.append(skey_to_expire_scd2)
+
+            last_processed_row = src_row
+        except Exception as row_err:
+            result.error_rows += 1
+            if len(error_messages) < 5:
+                error_messages.append(str(row_err))
+
+    if spec.checkpoint_columns and last_processed_row is not None:
+        raw_src_dict = dict(zip(spec.source_columns, last_processed_row))
+        result.checkpoint_value = '|'.join(
+            str(raw_src_dict.get(col, '')) for col in spec.checkpoint_columns
+        )
+
+    result.error_messages = tuple(error_messages)
+    return result
+
+
+def process_pool_settings(parallel_config: Optional[Dict[str, Any]]) -> Tuple[bool, Optional[int]]:
+    """
+    Return (enabled, worker count) for process mode from the job's parallel config,
+    falling back to MAPPER_PROCESS_POOL_ENABLED / MAPPER_PROCESS_POOL_WORKERS.
+    """
+    parallel_config = parallel_config or {}
+    enabled = parallel_config.get('use_process_pool')
+    if enabled is None:
+        enabled = os.getenv('MAPPER_PROCESS_POOL_ENABLED', 'false')
+    if isinstance(enabled, str):
+        enabled = enabled.strip().upper() in ('Y', 'YES', 'TRUE', '1')
+
+    workers = parallel_config.get('process_workers') or os.getenv('MAPPER_PROCESS_POOL_WORKERS')
+    try:
+        workers = int(workers) if workers else None
+    except (TypeError, ValueError):
+        workers = None
+    return bool(enabled), workers
+
+
+def is_picklable(value: Any) -> bool:
+    try:
+        pickle.dumps(value)
+        return True
+    except Exception:
+        return False
+
+
+class MapperProcessPool:
+    """
+    Shared process pool that classifies row blocks for all chunk threads of a job.
+
+    Workers are started with the ``spawn`` method: the parent is multi-threaded
+    (chunk workers, DB drivers) and forking it could copy held locks.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, block_rows: Optional[int] = None):
+        self.max_workers = max(1, max_workers or (os.cpu_count() or 1))
+        self.block_rows = max(1, block_rows or int(os.getenv('MAPPER_PROCESS_BLOCK_ROWS', '5000')))
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        info(f"Mapper process pool started: {self.max_workers} processes, {self.block_rows} rows per block")
+
+    def classify(
+        self,
+        spec: RowBlockSpec,
+        rows: Sequence[tuple],
+        target_states: Sequence[Optional[Dict[str, Any]]]
+    ) -> BlockResult:
+        """
+        Classify rows in blocks across the pool and merge the results in source order.
+        A block that cannot be shipped (e.g. unpicklable LOB values) or whose worker
+        died is classified inline instead.
+        """
+        futures = []
+        for start in range(0, len(rows), self.block_rows):
+            block = (list(rows[start:start + self.block_rows]), list(target_states[start:start + self.block_rows]))
+            try:
+                futures.append((self._executor.submit(classify_row_block, spec, *block), block))
+            except Exception as submit_err:
+                warning(f"Could not submit row block to process pool, classifying inline: {submit_err}")
+                futures.append((None, block))
+
+        merged = BlockResult([], [], [])
+        error_messages: List[str] = []
+        for future, block in futures:
+            try:
+                block_result = future.result() if future is not None else classify_row_block(spec, *block)
+            except Exception as block_err:
+                warning(f"Process pool block failed, classifying inline: {block_err}")
+                block_result = classify_row_block(spec, *block)
+            merged.rows_to_insert.extend(block_result.rows_to_insert)
+            merged.rows_to_update_scd1.extend(block_result.rows_to_update_scd1)
+            merged.rows_to_update_scd2.extend(block_result.rows_to_update_scd2)
+            merged.error_rows += block_result.error_rows
+            if block_result.checkpoint_value is not None:
+                merged.checkpoint_value = block_result.checkpoint_value
+            error_messages.extend(block_result.error_messages)
+        merged.error_messages = tuple(error_messages[:5])
+        return merged
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
@@ -3,15 +3,18 @@ Mapper progress tracking and stop request checking.
 Generic functions for logging progress and checking stop requests.
 No job-specific code - all job data passed as parameters.
 """
+import time
 from typing import Dict, Any, Optional
 
 # Support both FastAPI (package import) and legacy Flask (relative import) contexts
 try:
     from backend.modules.mapper.database_sql_adapter import create_adapter
+    from backend.modules.common.env_config import env_float, env_int
     from backend.modules.common.id_provider import next_id as get_next_id
     from backend.modules.logger import warning, debug
 except ImportError:  # When running Flask app.py directly inside backend
     from modules.mapper.database_sql_adapter import create_adapter  # type: ignore
+    from modules.common.env_config import env_float, env_int  # type: ignore
     from modules.common.id_provider import next_id as get_next_id  # type: ignore
     from modules.logger import warning, debug  # type: ignore
 
@@ -267,3 +270,100 @@ def update_process_log_progress(
     except Exception as e:
         warning(f"Could not update process log progress: {e}")
 
+
+
+class BufferedProgressWriter:
+    """
+    Coalesces per-batch progress writes (DMS_JOBLOG counters and the DMS_PRCLOG
+    activity timestamp) for one job run.
+
+    Batches only record their cumulative totals; the metadata rows are written
+    and committed once ``flush_seconds`` have passed or ``flush_rows`` source
+    rows have accumulated since the last flush, and always on ``flush()``.
+    Callers must flush (``commit=False`` is enough when they commit right after)
+    before writing a checkpoint, so a committed checkpoint never covers rows
+    whose progress is not committed. Both thresholds at 0 flush every batch.
+    Flushes are charged to the 'metadata_log' stage of an optional StageProfiler.
+    """
+
+    def __init__(
+        self,
+        metadata_conn,
+        mapref: str,
+        jobid: int,
+        session_params: Dict[str, Any],
+        joblogid: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        flush_rows: Optional[int] = None,
+        clock=time.monotonic,
+        profiler=None,
+    ):
+        self.metadata_conn = metadata_conn
+        self.mapref = mapref
+        self.jobid = jobid
+        self.session_params = session_params
+        self.joblogid = joblogid
+        self.flush_seconds = (
+            env_float('MAPPER_PROGRESS_FLUSH_SECONDS', 5.0) if flush_seconds is None else flush_seconds
+        )
+        self.flush_rows = (
+            env_int('MAPPER_PROGRESS_FLUSH_ROWS', 50000) if flush_rows is None else flush_rows
+        )
+        self._clock = clock
+        self.profiler = profiler
+        self._last_flush_at = clock()
+        self._flushed_source_rows = 0
+        self._pending = None
+        self.flush_count = 0
+
+    def record(
+        self,
+        batch_number: int,
+        source_rows: int,
+        target_rows: int,
+        error_rows: int
+    ) -> None:
+        """
+        Record cumulative totals after a batch; writes them if a threshold is reached.
+        A run whose DMS_JOBLOG row does not exist yet is flushed immediately so
+        error rows logged by later batches have a JOBLOGID to reference.
+        """
+        self._pending = (batch_number, source_rows, target_rows, error_rows)
+        if (
+            self.joblogid is None
+            or self._clock() - self._last_flush_at >= self.flush_seconds
+            or source_rows - self._flushed_source_rows >= self.flush_rows
+        ):
+            self.flush()
+
+    def flush(self, commit: bool = True) -> Optional[int]:
+        """Write pending totals (if any) and optionally commit; returns the joblogid."""
+        if self._pending is None:
+            return self.joblogid
+        batch_number, source_rows, target_rows, error_rows = self._pending
+        started = self.profiler.clock() if self.profiler is not None else None
+
+        update_process_log_progress(self.metadata_conn, self.session_params, source_rows, target_rows)
+        joblog_id = log_batch_progress(
+            self.metadata_conn,
+            self.mapref,
+            self.jobid,
+            batch_number,
+            source_rows,
+            target_rows,
+            error_rows,
+            self.session_params,
+            joblogid=self.joblogid,
+        )
+        if joblog_id is not None:
+            self.joblogid = joblog_id
+        if commit:
+            self.metadata_conn.commit()
+        if started is not None:
+            self.profiler.add('metadata_log', started, round_trips=3 if commit else 2)
+
+        self._pending = None
+        self._flushed_source_rows = source_rows
+        self._last_flush_at = self._clock()
+        self.flush_count += 1
+        return self.joblogid
@@ -11,27 +11,54 @@ import os
 try:
     from backend.modules.mapper.database_sql_adapter import create_adapter_from_type, detect_database_type
     from backend.modules.mapper.mapper_transformation_utils import generate_hash
-    from backend.modules.common.id_provider import next_id as get_next_id
+    from backend.modules.common.error_sink import ErrorSink, error_code
+    from backend.modules.common.id_provider import next_ids
     from backend.modules.logger import warning, error, debug
 except ImportError:  # When running Flask app.py directly inside backend
     from modules.mapper.database_sql_adapter import create_adapter_from_type, detect_database_type  # type: ignore
     from modules.mapper.mapper_transformation_utils import generate_hash  # type: ignore
-    from modules.common.id_provider import next_id as get_next_id  # type: ignore
+    from modules.common.error_sink import ErrorSink, error_code  # type: ignore
+    from modules.common.id_provider import next_ids  # type: ignore
     from modules.logger import warning, error, debug  # type: ignore
 
+def joberr_sink(
+    metadata_conn,
+    mapref: Optional[str],
+    jobid: Optional[int],
+    session_params: Optional[Dict[str, Any]],
+) -> Optional[ErrorSink]:
+    """
+    Per-run ErrorSink writing row-level errors to DMS_JOBERR in bulk.
+    ``session_params`` is read at each write, so a JOBLOGID set later is used.
+    """
+    if metadata_conn is None:
+        return None
+
+    def _write(rows: List[Dict[str, Any]]) -> None:
+        _write_joberr_rows(metadata_conn, mapref, jobid, session_params, rows)
+
+    return ErrorSink(_write, name=f"DMS_JOBERR {mapref or ''}".strip())
+
+
+def _add_row_error(error_sink: Optional[ErrorSink], errmsg: str, row_err: Exception, keyvalue: Any) -> None:
+    if error_sink is None:
+        return
+    dberrmsg = str(row_err)
+    error_sink.add(
+        error_code(dberrmsg, "TARGET_LOAD"),
+        {"errtyp": "TARGET_LOAD", "errmsg": errmsg, "dberrmsg": dberrmsg, "keyvalue": str(keyvalue)},
+    )
+
 
-def _log_row_error_to_joberr(
+def _write_joberr_rows(
     metadata_conn,
     mapref: Optional[str],
     jobid: Optional[int],
     session_params: Optional[Dict[str, Any]],
-    errtyp: str,
-    errmsg: str,
-    dberrmsg: str,
-    keyvalue: Optional[str],
+    rows: List[Dict[str, Any]],
 ) -> None:
-    """Best-effort row-level error logging to DMS_JOBERR."""
-    if metadata_conn is None:
+    """Insert row-level errors (errtyp, errmsg, dberrmsg, keyvalue) into DMS_JOBERR with one executemany."""
+    if metadata_conn is None or not rows:
         return
 
     cursor = None
@@ -102,65 +129,55 @@ def _log_row_error_to_joberr(
 
         if joblogid is None:
             warning(
-                "Skipping DMS_JOBERR row insert because JOBLOGID could not be resolved "
+                f"Skipping {len(rows)} DMS_JOBERR row inserts because JOBLOGID could not be resolved "
                 f"(mapref={mapref}, jobid={jobid}, sessionid={sessionid}, prcid={prcid})"
             )
             return
 
-        # Try to generate ERRID from ID provider; allow NULL if not available.
-        errid = None
+        # Generate ERRIDs from ID provider in one round trip; allow NULL if not available.
+        errids: List[Optional[int]] = [None] * len(rows)
         try:
             seq_name = f"{schema}.DMS_JOBERRSEQ" if schema else "DMS_JOBERRSEQ"
-            errid = int(get_next_id(cursor, seq_name))
+            errids = list(next_ids(cursor, seq_name, len(rows)))
         except Exception:
             pass
 
         def _insert_with_lengths(errtyp_len: int, errmsg_len: int, dberrmsg_len: int, keyvalue_len: int, mapref_len: int):
-            errtyp_trim = (errtyp or "TGT_LOAD")[:errtyp_len]
-            errmsg_trim = (errmsg or "")[:errmsg_len]
-            dberrmsg_trim = (dberrmsg or "")[:dberrmsg_len]
-            keyvalue_trim = (keyvalue or "")[:keyvalue_len] if keyvalue is not None else None
             mapref_trim = (mapref or "")[:mapref_len] if mapref is not None else None
+            params = []
+            for errid, row in zip(errids, rows):
+                keyvalue = row.get("keyvalue")
+                params.append({
+                    "joblogid": joblogid,
+                    "errid": errid,
+                    "errtyp": (row.get("errtyp") or "TGT_LOAD")[:errtyp_len],
+                    "dberrmsg": (row.get("dberrmsg") or "")[:dberrmsg_len],
+                    "errmsg": (row.get("errmsg") or "")[:errmsg_len],
+                    "keyvalue": (keyvalue or "")[:keyvalue_len] if keyvalue is not None else None,
+                    "jobid": jobid,
+                    "sessionid": sessionid,
+                    "prcid": prcid,
+                    "mapref": mapref_trim,
+                })
 
             if db_type == "POSTGRESQL":
-                cursor.execute(
+                cursor.executemany(
                     f"""
                     INSERT INTO {schema_prefix_pg}DMS_JOBERR
                     (JOBLOGID, ERRID, PRCDT, ERRTYP, DBERRMSG, ERRMSG, KEYVALUE, JOBID, SESSIONID, PRCID, MAPREF)
-                    VALUES (%s, %s, CURRENT_TIMESTAMP, %s, %s, %s, %s, %s, %s, %s, %s)
+                    VALUES (%(joblogid)s, %(errid)s, CURRENT_TIMESTAMP, %(errtyp)s, %(dberrmsg)s, %(errmsg)s,
+                            %(keyvalue)s, %(jobid)s, %(sessionid)s, %(prcid)s, %(mapref)s)
                     """,
-                    (
-                        joblogid,
-                        errid,
-                        errtyp_trim,
-                        dberrmsg_trim,
-                        errmsg_trim,
-                        keyvalue_trim,
-                        jobid,
-                        sessionid,
-                        prcid,
-                        mapref_trim,
-                    ),
+                    params,
                 )
             else:
-                cursor.execute(
+                cursor.executemany(
                     f"""
                     INSERT INTO {schema_prefix_oracle}DMS_JOBERR
                     (JOBLOGID, ERRID, PRCDT, ERRTYP, DBERRMSG, ERRMSG, KEYVALUE, JOBID, SESSIONID, PRCID, MAPREF)
                     VALUES (:joblogid, :errid, SYSTIMESTAMP, :errtyp, :dberrmsg, :errmsg, :keyvalue, :jobid, :sessionid, :prcid, :mapref)
                     """,
-                    {
-                        "joblogid": joblogid,
-                        "errid": errid,
-                        "errtyp": errtyp_trim,
-                        "dberrmsg": dberrmsg_trim,
-                        "errmsg": errmsg_trim,
-                        "keyvalue": keyvalue_trim,
-                        "jobid": jobid,
-                        "sessionid": sessionid,
-                        "prcid": prcid,
-                        "mapref": mapref_trim,
-                    },
+                    params,
                 )
 
         try:
@@ -176,7 +193,7 @@ def _log_row_error_to_joberr(
 
         metadata_conn.commit()
     except Exception as log_err:
-        warning(f"Could not write row error to DMS_JOBERR: {log_err}")
+        warning(f"Could not write {len(rows)} row errors to DMS_JOBERR: {log_err}")
     finally:
         if cursor:
             try:
@@ -201,6 +218,8 @@ def process_scd_batch(
     mapref: Optional[str] = None,
     jobid: Optional[int] = None,
     session_params: Optional[Dict[str, Any]] = None,
+    profiler=None,
+    error_sink: Optional[ErrorSink] = None,
 ) -> Tuple[int, int, int]:
     """
     Process SCD batch operations (insert, update SCD Type 1, expire SCD Type 2).
@@ -217,6 +236,11 @@ def process_scd_batch(
         scd_type: SCD type (1 or 2)
         target_type: Target table type ('DIM', 'FCT', 'MRT')
         db_type: Database type ("ORACLE" or "POSTGRESQL")
+        profiler: Optional StageProfiler charged with the insert, SCD1 update
+            and SCD2 expire times
+        error_sink: Run-level ErrorSink (see joberr_sink) collecting rows rejected
+            by the row-by-row fallbacks; flushed before returning. Without one a
+            sink for this batch is used.
         
     Returns:
         Tuple of (inserted_count, updated_count, expired_count)
@@ -229,41 +253,45 @@ def process_scd_batch(
     # Format table name correctly for this database type
     adapter = create_adapter_from_type(db_type)
     formatted_table_name = adapter.format_table_name(target_schema, target_table)
+    batch_sink = error_sink if error_sink is not None else joberr_sink(metadata_conn, mapref, jobid, session_params)
     
     try:
         # Process SCD Type 2 expiration first (before inserts)
         if rows_to_update_scd2:
+            started = profiler.clock() if profiler is not None else None
             expired_count = _expire_scd2_records(
                 cursor, formatted_table_name, rows_to_update_scd2, db_type
             )
+            if started is not None:
+                profiler.add('scd2_expire', started, rows=len(rows_to_update_scd2), round_trips=1)
         
         # Process SCD Type 1 updates
         if rows_to_update_scd1:
+            started = profiler.clock() if profiler is not None else None
             updated_count = _update_scd1_records(
                 cursor,
                 formatted_table_name,
                 rows_to_update_scd1,
                 all_columns,
                 db_type,
-                metadata_conn=metadata_conn,
-                mapref=mapref,
-                jobid=jobid,
-                session_params=session_params,
+                error_sink=batch_sink,
             )
+            if started is not None:
+                profiler.add('scd1_update', started, rows=len(rows_to_update_scd1), round_trips=1)
         
         # Process inserts
         if rows_to_insert:
+            started = profiler.clock() if profiler is not None else None
             inserted_count = _insert_records(
                 cursor, formatted_table_name, rows_to_insert, all_columns, 
                 target_type,
                 db_type,
                 target_schema,
                 target_table,
-                metadata_conn=metadata_conn,
-                mapref=mapref,
-                jobid=jobid,
-                session_params=session_params,
+                error_sink=batch_sink,
             )
+            if started is not None:
+                profiler.add('insert', started, rows=len(rows_to_insert), round_trips=1)
         
         cursor.close()
         return inserted_count, updated_count, expired_count
@@ -272,6 +300,13 @@ def process_scd_batch(
         error(f"Error processing SCD batch: {e}")
         cursor.close()
         raise
+    finally:
+        # Rejected rows are written at the batch boundary
+        if batch_sink is not None:
+            if error_sink is None:
+                batch_sink.close()
+            else:
+                batch_sink.flush()
 
 
 def _expire_scd2_records(
@@ -324,10 +359,7 @@ def _update_scd1_records(
     rows_to_update: List[Dict[str, Any]],
     all_columns: List[str],
     db_type: str,
-    metadata_conn=None,
-    mapref: Optional[str] = None,
-    jobid: Optional[int] = None,
-    session_params: Optional[Dict[str, Any]] = None,
+    error_sink: Optional[ErrorSink] = None,
 ) -> int:
     """Update SCD Type 1 records."""
     if not rows_to_update:
@@ -392,16 +424,7 @@ def _update_scd1_records(
                 except Exception as row_err:
                     if "ORA-01438" in str(row_err):
                         skipped_rows += 1
-                        _log_row_error_to_joberr(
-                            metadata_conn,
-                            mapref,
-                            jobid,
-                            session_params,
-                            errtyp="TARGET_LOAD",
-                            errmsg="SCD Type 1 row skipped due to precision overflow",
-                            dberrmsg=str(row_err),
-                            keyvalue=str(param_row),
-                        )
+                        _add_row_error(error_sink, "SCD Type 1 row skipped due to precision overflow", row_err, param_row)
                         if skipped_rows <= 5:
                             warning(
                                 f"Skipped SCD1 update row {index + 1} due to ORA-01438: {row_err}"
@@ -427,10 +450,7 @@ def _insert_records(
     db_type: str,
     target_schema: str = None,
     target_table: str = None,
-    metadata_conn=None,
-    mapref: Optional[str] = None,
-    jobid: Optional[int] = None,
-    session_params: Optional[Dict[str, Any]] = None,
+    error_sink: Optional[ErrorSink] = None,
 ) -> int:
     """Insert new records."""
     if not rows_to_insert:
@@ -517,16 +537,7 @@ def _insert_records(
                 except Exception as row_err:
                     if "ORA-01438" in str(row_err):
                         skipped_rows += 1
-                        _log_row_error_to_joberr(
-                            metadata_conn,
-                            mapref,
-                            jobid,
-                            session_params,
-                            errtyp="TARGET_LOAD",
-                            errmsg="Insert row skipped due to precision overflow",
-                            dberrmsg=str(row_err),
-                            keyvalue=str(param_row),
-                        )
+                        _add_row_error(error_sink, "Insert row skipped due to precision overflow", row_err, param_row)
                         if skipped_rows <= 5:
                             warning(
                                 f"Skipped insert row {index + 1} due to ORA-01438: {row_err}"
@@ -574,7 +585,7 @@ def prepare_row_for_scd(
             # Data changed
             if scd_type == 2:
                 # SCD Type 2 - Insert new version, expire old
-                new_version = dict(source_row)
+                new_version = source_row.copy()
                 new_version['SKEY'] = None  # Will be generated
                 new_version['RWHKEY'] = source_hash
                 new_version['CURFLG'] = 'Y'
@@ -583,7 +594,7 @@ def prepare_row_for_scd(
                 return new_version, None, target_row['SKEY']
             else:
                 # SCD Type 1 - Update existing
-                updated_row = dict(source_row)
+                updated_row = source_row.copy()
                 updated_row['SKEY'] = target_row['SKEY']
                 updated_row['RWHKEY'] = source_hash
                 return None, updated_row, None
@@ -592,7 +603,7 @@ def prepare_row_for_scd(
             return None, None, None
     else:
         # New record
-        new_row = dict(source_row)
+        new_row = source_row.copy()
         new_row['RWHKEY'] = source_hash
         if target_type == 'DIM':
             new_row['CURFLG'] = 'Y'
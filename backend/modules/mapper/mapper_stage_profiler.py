@@ -0,0 +1,242 @@
+"""
+Stage-level timing for mapper job runs.
+
+A StageProfiler accumulates wall time, CPU time (of the thread doing the work),
+calls, database round trips and rows for each stage of a run: source fetch,
+transform, target lookup, hashing, insert, SCD1 update, SCD2 expire, commit and
+metadata logging. Parallel chunks each keep their own profiler (CPU time is
+per thread) and the coordinator merges them.
+
+The breakdown is logged at the end of the run, returned in the job result as
+'stage_profile' and stored per run in DMS_JOBSTGPRF (keyed by JOBLOGID).
+Mappings listed in MAPPER_PROFILE_MAPREFS are additionally run under cProfile
+and the stats are dumped to MAPPER_PROFILE_DIR.
+"""
+import cProfile
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.mapper.database_sql_adapter import create_adapter
+    from backend.modules.logger import info, warning, debug
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.mapper.database_sql_adapter import create_adapter  # type: ignore
+    from modules.logger import info, warning, debug  # type: ignore
+
+
+STAGE_SOURCE_FETCH = 'source_fetch'
+STAGE_TRANSFORM = 'transform'
+STAGE_TARGET_LOOKUP = 'target_lookup'
+STAGE_HASH = 'hash'
+STAGE_INSERT = 'insert'
+STAGE_SCD1_UPDATE = 'scd1_update'
+STAGE_SCD2_EXPIRE = 'scd2_expire'
+STAGE_COMMIT = 'commit'
+STAGE_METADATA_LOG = 'metadata_log'
+
+STAGES = (
+    STAGE_SOURCE_FETCH, STAGE_TRANSFORM, STAGE_TARGET_LOOKUP, STAGE_HASH,
+    STAGE_INSERT, STAGE_SCD1_UPDATE, STAGE_SCD2_EXPIRE, STAGE_COMMIT, STAGE_METADATA_LOG,
+)
+
+Clock = Optional[Tuple[float, float]]
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in ('true', '1', 'yes', 'y')
+
+
+def stage_profiling_enabled() -> bool:
+    """Stage timing is on by default; MAPPER_STAGE_PROFILE=false turns it off."""
+    return _env_flag('MAPPER_STAGE_PROFILE', 'true')
+
+
+class StageProfiler:
+    """
+    Per-run stage totals. A disabled profiler keeps the same interface and
+    records nothing, so call sites never need to check for it.
+
+    Hot loops use clock()/add(), which chain: add() returns the clock it read,
+    to be passed as the start of the next stage. Everything else can use the
+    stage() context manager.
+    """
+
+    def __init__(self, mapref: Optional[str] = None, enabled: bool = True):
+        self.mapref = mapref
+        self.enabled = enabled
+        self.joblogid: Optional[int] = None
+        self._totals: Dict[str, List[float]] = {}
+
+    def clock(self) -> Clock:
+        if not self.enabled:
+            return None
+        return time.perf_counter(), time.thread_time()
+
+    def add(self, stage: str, started: Clock, rows: int = 0, round_trips: int = 0, calls: int = 1) -> Clock:
+        """
+        Charge the time since ``started`` to ``stage``; returns the current clock.
+        ``calls=0`` adds time to a stage already counted for the same row.
+        """
+        if started is None:
+            return None
+        now = time.perf_counter(), time.thread_time()
+        totals = self._totals.get(stage)
+        if totals is None:
+            totals = self._totals[stage] = [0.0, 0.0, 0, 0, 0]
+        totals[0] += now[0] - started[0]
+        totals[1] += now[1] - started[1]
+        totals[2] += calls
+        totals[3] += round_trips
+        totals[4] += rows
+        return now
+
+    @contextmanager
+    def stage(self, stage: str, rows: int = 0, round_trips: int = 1) -> Iterator[None]:
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.add(stage, started, rows=rows, round_trips=round_trips)
+
+    def merge(self, other: Optional['StageProfiler']) -> None:
+        """Add another profiler's totals (e.g. a parallel chunk's) to this one."""
+        if other is None or not self.enabled:
+            return
+        for stage, values in other._totals.items():
+            totals = self._totals.setdefault(stage, [0.0, 0.0, 0, 0, 0])
+            for index, value in enumerate(values):
+                totals[index] += value
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Stage totals in pipeline order, then any other stages by name."""
+        ordered = [stage for stage in STAGES if stage in self._totals]
+        ordered += sorted(stage for stage in self._totals if stage not in STAGES)
+        return {
+            stage: {
+                'wall_seconds': round(self._totals[stage][0], 6),
+                'cpu_seconds': round(self._totals[stage][1], 6),
+                'calls': int(self._totals[stage][2]),
+                'round_trips': int(self._totals[stage][3]),
+                'rows': int(self._totals[stage][4]),
+            }
+            for stage in ordered
+        }
+
+    def summary(self) -> str:
+        """One line per run: wall seconds and share of the profiled time per stage."""
+        stages = self.as_dict()
+        total = sum(values['wall_seconds'] for values in stages.values())
+        if not total:
+            return 'no stages recorded'
+        return ', '.join(
+            f"{stage} {values['wall_seconds']:.2f}s ({100 * values['wall_seconds'] / total:.0f}%)"
+            for stage, values in stages.items()
+        )
+
+    def log_summary(self) -> None:
+        if self._totals:
+            info(f"[StageProfile] {self.mapref}: {self.summary()}")
+
+    def save(self, metadata_conn, sessionid: Optional[Any] = None) -> bool:
+        """
+        Store the breakdown in DMS_JOBSTGPRF under this run's JOBLOGID. Errors
+        (e.g. the table not being installed) are logged and never fail the job.
+        """
+        if not self._totals or self.joblogid is None or metadata_conn is None:
+            return False
+        cursor = None
+        try:
+            adapter = create_adapter(metadata_conn)
+            names = ['joblogid', 'mapref', 'sessionid', 'stage', 'wallsec', 'cpusec',
+                     'calls', 'rndtrps', 'rowscnt']
+            query = (
+                "INSERT INTO DMS_JOBSTGPRF (JOBLOGID, MAPREF, SESSIONID, STAGE, WALLSEC, CPUSEC, "
+                "CALLS, RNDTRPS, ROWSCNT, RECCRDT) "
+                f"VALUES ({', '.join(adapter.get_parameter_placeholder(name) for name in names)}, "
+                f"{adapter.get_current_timestamp()})"
+            )
+            rows = [
+                adapter.format_parameters({
+                    'joblogid': self.joblogid,
+                    'mapref': self.mapref,
+                    'sessionid': sessionid,
+                    'stage': stage,
+                    'wallsec': values['wall_seconds'],
+                    'cpusec': values['cpu_seconds'],
+                    'calls': values['calls'],
+                    'rndtrps': values['round_trips'],
+                    'rowscnt': values['rows'],
+                }, use_named=True)
+                for stage, values in self.as_dict().items()
+            ]
+            cursor = metadata_conn.cursor()
+            cursor.executemany(query, rows)
+            metadata_conn.commit()
+            return True
+        except Exception as e:
+            warning(f"Could not store stage profile for {self.mapref} (DMS_JOBSTGPRF): {e}")
+            try:
+                metadata_conn.rollback()
+            except Exception:
+                pass
+            return False
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+
+def sampling_profile_requested(mapref: Optional[str]) -> bool:
+    """True when the mapping is listed in MAPPER_PROFILE_MAPREFS ('*' profiles every mapping)."""
+    listed = {
+        name.strip().upper()
+        for name in os.getenv('MAPPER_PROFILE_MAPREFS', '').split(',')
+        if name.strip()
+    }
+    return bool(mapref) and ('*' in listed or mapref.upper() in listed)
+
+
+@contextmanager
+def sampling_profile(mapref: Optional[str]) -> Iterator[Optional[str]]:
+    """
+    Run the block under cProfile when the mapping is listed in
+    MAPPER_PROFILE_MAPREFS and dump the stats (readable with pstats or
+    snakeviz) to MAPPER_PROFILE_DIR. Yields the dump path, or None.
+    Only the calling thread is profiled: parallel chunk threads show up in
+    the stage breakdown, not in the dump.
+    """
+    if not sampling_profile_requested(mapref):
+        yield None
+        return
+    directory = os.getenv('MAPPER_PROFILE_DIR') or os.path.join('logs', 'profiles')
+    path = os.path.join(directory, f"{mapref}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:  # another profiler is already active in this thread
+        warning(f"cProfile not started for {mapref}: {e}")
+        yield None
+        return
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(path)
+            info(f"[StageProfile] cProfile stats for {mapref} written to {path}")
+        except OSError as e:
+            warning(f"Could not write cProfile stats for {mapref} to {path}: {e}")
+
+
+def new_stage_profiler(mapref: Optional[str]) -> StageProfiler:
+    profiler = StageProfiler(mapref, enabled=stage_profiling_enabled())
+    if not profiler.enabled:
+        debug(f"[StageProfile] stage timing disabled for {mapref}")
+    return profiler
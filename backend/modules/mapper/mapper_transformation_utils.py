@@ -4,8 +4,10 @@ Generic functions for row transformation and hash generation.
 No job-specific code - all job data passed as parameters.
 """
 import hashlib
+from collections.abc import Mapping
 from datetime import datetime
-from typing import Dict, Any, List, Set, Optional
+from operator import itemgetter
+from typing import Dict, Any, List, Set, Optional, Sequence, Tuple
 
 # Support both FastAPI (package import) and legacy Flask (relative import) contexts
 try:
@@ -14,6 +16,13 @@ except ImportError:  # When running Flask app.py directly inside backend
     from modules.logger import debug, warning  # type: ignore
 
 
+# Audit columns left out of the row hash when no exclude set is given
+_DEFAULT_HASH_EXCLUDE_COLUMNS = {
+    'SKEY', 'RWHKEY', 'RECCRDT', 'RECUPDT', 'CURFLG',
+    'FROMDT', 'TODT', 'VALDFRM', 'VALDTO'
+}
+
+
 def map_row_to_target_columns(
     row_dict: Dict[str, Any],
     column_mapping: Dict[str, str],
@@ -59,6 +68,213 @@ def map_row_to_target_columns(
     return normalized
 
 
+class StandardTransformation:
+    """
+    The standard mapper transformation: map_row_to_target_columns with a fixed
+    COLUMN_SOURCE_MAPPING / ALL_COLUMNS. Unlike a closure it is picklable, and
+    the executor recognises it and replaces it with a compiled RowProjector.
+    """
+    __slots__ = ('column_mapping', 'all_columns')
+
+    def __init__(self, column_mapping: Dict[str, str], all_columns: List[str]):
+        self.column_mapping = column_mapping
+        self.all_columns = all_columns
+
+    def __call__(self, source_row: Dict[str, Any]) -> Dict[str, Any]:
+        return map_row_to_target_columns(source_row, self.column_mapping, self.all_columns)
+
+
+class ProjectedRow(Mapping):
+    """
+    Read-only row in target column order: a tuple of values plus the shared
+    column -> position index of its projector, so no dict is built per row.
+    """
+    __slots__ = ('values', '_index')
+
+    def __init__(self, values: tuple, index: Dict[str, int]):
+        self.values = values
+        self._index = index
+
+    def __getitem__(self, column: str) -> Any:
+        return self.values[self._index[column]]
+
+    def get(self, column: str, default: Any = None) -> Any:
+        position = self._index.get(column)
+        return default if position is None else self.values[position]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def copy(self) -> Dict[str, Any]:
+        """Plain dict of the row (allocated at full size, unlike dict(row))."""
+        row = dict.fromkeys(self._index)
+        row.update(zip(self._index, self.values))
+        return row
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return f"ProjectedRow({dict(self)!r})"
+
+
+def _source_index_chain(
+    exact: Dict[str, int],
+    upper: Dict[str, int],
+    source_col: Any,
+    target_col: Any
+) -> Tuple[int, ...]:
+    """
+    Positions map_row_to_target_columns/build_primary_key_values would probe for
+    a column, in order (mapped source name, its upper case, target name, its
+    upper case), without duplicates.
+    """
+    chain = []
+    for name in (source_col, target_col):
+        for position in (
+            exact.get(name),
+            upper.get(name.upper()) if isinstance(name, str) else None
+        ):
+            if position is not None and position not in chain:
+                chain.append(position)
+    return tuple(chain)
+
+
+class RowProjector:
+    """
+    Compiled once per job from the source cursor description and the column
+    mappings; turns source row tuples into target-ordered ProjectedRows, primary
+    key values and RWHKEY hashes with the same results as
+    map_row_to_target_columns / build_primary_key_values / generate_hash.
+    """
+
+    def __init__(
+        self,
+        source_columns: Sequence[str],
+        column_mapping: Dict[str, str],
+        all_columns: Sequence[str],
+        pk_columns: Optional[Sequence[str]] = None,
+        pk_source_mapping: Optional[Dict[str, str]] = None,
+        hash_exclude_columns: Optional[Set[str]] = None
+    ):
+        self.all_columns = list(all_columns)
+        self.index = {col: position for position, col in enumerate(self.all_columns)}
+
+        exact = {col: position for position, col in enumerate(source_columns)}
+        upper = {col.upper(): position for position, col in enumerate(source_columns) if isinstance(col, str)}
+        # Unmapped columns read a None appended past the end of the source row
+        self._missing = len(source_columns)
+
+        chains = [
+            _source_index_chain(exact, upper, column_mapping.get(col, col), col)
+            for col in self.all_columns
+        ]
+        self._pad = any(not chain for chain in chains)
+        self._getter = self._compile_getter([chain[0] if chain else self._missing for chain in chains])
+        # (target position, remaining source positions) probed when the first one is None
+        self._fallbacks = [
+            (position, chain[1:]) for position, chain in enumerate(chains) if len(chain) > 1
+        ]
+
+        pk_source_mapping = pk_source_mapping or {}
+        self.pk_columns = list(pk_columns or [])
+        self._pk_chains = [
+            (col, _source_index_chain(exact, upper, pk_source_mapping.get(col, col), col))
+            for col in self.pk_columns
+        ]
+
+        if hash_exclude_columns is None:
+            hash_exclude_columns = _DEFAULT_HASH_EXCLUDE_COLUMNS
+        self._hash_positions = [
+            position for position, col in enumerate(self.all_columns)
+            if col.upper() not in hash_exclude_columns
+        ]
+
+    @staticmethod
+    def _compile_getter(positions: List[int]):
+        if not positions:
+            return lambda row: ()
+        if len(positions) == 1:
+            position = positions[0]
+            return lambda row: (row[position],)
+        return itemgetter(*positions)
+
+    @classmethod
+    def for_transformation(
+        cls,
+        transformation_func: Any,
+        source_columns: Sequence[str],
+        all_columns: Sequence[str],
+        pk_columns: Optional[Sequence[str]] = None,
+        pk_source_mapping: Optional[Dict[str, str]] = None,
+        hash_exclude_columns: Optional[Set[str]] = None
+    ) -> Optional['RowProjector']:
+        """
+        Projector equivalent to transformation_func plus hashing over all_columns,
+        or None if it is a custom function or maps to a different column list.
+        """
+        if not isinstance(transformation_func, StandardTransformation):
+            return None
+        if list(transformation_func.all_columns) != list(all_columns):
+            return None
+        return cls(
+            source_columns,
+            transformation_func.column_mapping,
+            transformation_func.all_columns,
+            pk_columns=pk_columns,
+            pk_source_mapping=pk_source_mapping,
+            hash_exclude_columns=hash_exclude_columns
+        )
+
+    def project(self, row: Sequence[Any]) -> ProjectedRow:
+        """Target-ordered view of a source row tuple."""
+        if self._pad:
+            row = tuple(row) + (None,)
+        values = self._getter(row)
+        if self._fallbacks:
+            patched = None
+            for position, chain in self._fallbacks:
+                if values[position] is None:
+                    for source_position in chain:
+                        if row[source_position] is not None:
+                            if patched is None:
+                                patched = list(values)
+                            patched[position] = row[source_position]
+                            break
+            if patched is not None:
+                values = tuple(patched)
+        return ProjectedRow(values, self.index)
+
+    def pk_values(self, row: Sequence[Any]) -> Dict[str, Any]:
+        """Primary key values of a source row tuple (as build_primary_key_values)."""
+        pk_values = {}
+        for col, chain in self._pk_chains:
+            value = None
+            for source_position in chain:
+                value = row[source_position]
+                if value is not None:
+                    break
+            pk_values[col] = value
+        return pk_values
+
+    def row_hash(self, projected: ProjectedRow) -> str:
+        """RWHKEY of a projected row (identical to generate_hash over all_columns)."""
+        values = projected.values
+        return _hash_parts(values[position] for position in self._hash_positions)
+
+
+def _hash_parts(values) -> str:
+    parts = []
+    for val in values:
+        if val is None:
+            parts.append('<NULL>')
+        elif isinstance(val, datetime):
+            parts.append(val.strftime('%Y-%m-%d %H:%M:%S'))
+        else:
+            parts.append(str(val))
+    return hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+
+
 def generate_hash(
     row_dict: Dict[str, Any],
     column_order: List[str],
@@ -78,25 +294,12 @@ def generate_hash(
     """
     if exclude_columns is None:
         # Default exclude columns (audit columns)
-        exclude_columns = {
-            'SKEY', 'RWHKEY', 'RECCRDT', 'RECUPDT', 'CURFLG',
-            'FROMDT', 'TODT', 'VALDFRM', 'VALDTO'
-        }
+        exclude_columns = _DEFAULT_HASH_EXCLUDE_COLUMNS
     
     # Filter out audit columns and build concatenated string
-    parts = []
-    for col in column_order:
-        if col.upper() not in exclude_columns:
-            val = row_dict.get(col)
-            if val is None:
-                parts.append('<NULL>')
-            elif isinstance(val, datetime):
-                parts.append(val.strftime('%Y-%m-%d %H:%M:%S'))
-            else:
-                parts.append(str(val))
-    
-    concat_str = '|'.join(parts)
-    return hashlib.md5(concat_str.encode('utf-8')).hexdigest()
+    return _hash_parts(
+        row_dict.get(col) for col in column_order if col.upper() not in exclude_columns
+    )
 
 
 def build_primary_key_values(
@@ -19,18 +19,21 @@ class ConnectionPoolManager:
     Each worker thread gets its own database connection from the pool.
     """
     
-    def __init__(self, source_conn_factory=None, target_conn_factory=None):
+    def __init__(self, source_conn_factory=None, target_conn_factory=None, metadata_conn_factory=None):
         """
         Initialize connection pool manager.
         
         Args:
             source_conn_factory: Factory function to create source connections
             target_conn_factory: Factory function to create target connections
+            metadata_conn_factory: Factory function to create metadata connections (optional)
         """
         self.source_conn_factory = source_conn_factory
         self.target_conn_factory = target_conn_factory
+        self.metadata_conn_factory = metadata_conn_factory
         self._source_connections = {}  # Thread ID -> connection
         self._target_connections = {}  # Thread ID -> connection
+        self._metadata_connections = {}  # Thread ID -> connection
         self._lock = threading.Lock()
     
     @contextmanager
@@ -108,6 +111,38 @@ class ConnectionPoolManager:
                 self._target_connections.pop(thread_id, None)
             raise
     
+    @contextmanager
+    def get_metadata_connection(self):
+        """
+        Get a metadata connection for the current thread.
+        Creates a new connection if one doesn't exist for this thread.
+        """
+        thread_id = threading.get_ident()
+        
+        # Get or create connection for this thread
+        with self._lock:
+            if thread_id not in self._metadata_connections:
+                if self.metadata_conn_factory:
+                    self._metadata_connections[thread_id] = self.metadata_conn_factory()
+                    debug(f"Created metadata connection for thread {thread_id}")
+                else:
+                    raise ValueError("Metadata connection factory not provided")
+        
+        conn = self._metadata_connections[thread_id]
+        
+        try:
+            yield conn
+        except Exception as e:
+            error(f"Error with metadata connection in thread {thread_id}: {e}")
+            # Close and remove connection on error
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self._lock:
+                self._metadata_connections.pop(thread_id, None)
+            raise
+    
     def close_all_connections(self):
         """Close all connections in the pool"""
         with self._lock:
@@ -128,6 +163,15 @@ class ConnectionPoolManager:
                 except Exception:
                     pass
             self._target_connections.clear()
+            
+            # Close metadata connections
+            for thread_id, conn in list(self._metadata_connections.items()):
+                try:
+                    conn.close()
+                    debug(f"Closed metadata connection for thread {thread_id}")
+                except Exception:
+                    pass
+            self._metadata_connections.clear()
     
     def __enter__(self):
         """Context manager entry"""
@@ -58,3 +58,25 @@ class ChunkConfig:
     total_rows: Optional[int] = None  # Estimated or actual total rows
     num_chunks: Optional[int] = None  # Calculated number of chunks
 
+
+
+@dataclass
+class ChunkRange:
+    """
+    One chunk of a parallel mapper run, as recorded in the chunk ledger.
+    
+    Key ranges are (key_from, key_to]: key_from None means no lower bound
+    (that chunk also takes rows with a NULL key), key_to None no upper bound.
+    Chunks without a key column are OFFSET ranges [row_from, row_to).
+    """
+    chunk_id: int
+    row_from: int = 0
+    row_to: int = 0
+    key_column: Optional[str] = None
+    key_type: Optional[str] = None  # 'N' numeric, 'S' text
+    key_from: Optional[str] = None
+    key_to: Optional[str] = None
+    status: str = "PENDING"  # PENDING, DONE, FAILED
+    source_rows: int = 0
+    target_rows: int = 0
+    error_rows: int = 0
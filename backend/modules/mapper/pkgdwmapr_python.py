@@ -20,10 +20,16 @@ try:
     from backend.modules.logger import logger, info, warning, error
     from backend.modules.common.id_provider import next_id as get_next_id
     from backend.modules.common.db_table_utils import get_postgresql_table_name
+    from backend.modules.common.describe_cache import invalidate_sql as invalidate_described_sql
+    from backend.modules.mapper.sql_similarity_index import sql_similarity_index
+    from backend.modules.mapper.logic_validation import ValidationGroup, validate_groups, validation_key
 except ImportError:  # When running Flask app.py directly inside backend
     from modules.logger import logger, info, warning, error
     from modules.common.id_provider import next_id as get_next_id
     from modules.common.db_table_utils import get_postgresql_table_name
+    from modules.common.describe_cache import invalidate_sql as invalidate_described_sql
+    from modules.mapper.sql_similarity_index import sql_similarity_index
+    from modules.mapper.logic_validation import ValidationGroup, validate_groups, validation_key
 
 # Package constants
 G_NAME = 'PKGDMS_MAPR_PY'
@@ -222,11 +228,15 @@ def create_update_sql(connection, p_dwmaprsqlcd, p_dwmaprsql, p_sqlconid=None):
         info(f"Processing row data. Row is: {row}")
         w_return = None
         w_res = 1  # Assume different
+        old_sql = None
         
         if row:
             info(f"Found existing SQL code. Unpacking row data...")
             try:
                 w_rec_maprsqlid, w_rec_maprsqlcd, w_rec_maprsql, w_rec_sqlconid = row
+                # Oracle returns MAPRSQL as a LOB; read it before the cursor moves on
+                w_rec_maprsql = w_rec_maprsql.read() if hasattr(w_rec_maprsql, 'read') else w_rec_maprsql
+                old_sql = w_rec_maprsql
                 info(f"Unpacked: maprsqlid={w_rec_maprsqlid}, maprsqlcd={w_rec_maprsqlcd}, sqlconid={w_rec_sqlconid}")
                 # Compare the SQL text and connection ID
                 sql_matches = w_rec_maprsql == p_dwmaprsql
@@ -335,6 +345,16 @@ def create_update_sql(connection, p_dwmaprsqlcd, p_dwmaprsql, p_sqlconid=None):
             # PostgreSQL with autocommit=True - no commit needed, but log it
             info(f"SQL saved with autocommit for code: {p_dwmaprsqlcd}, ID: {w_return}")
         
+        if w_res != 0:
+            # Keep this worker's duplicate-check index current; other workers catch up on refresh
+            try:
+                sql_similarity_index().upsert(p_dwmaprsqlcd, clean_sql, w_return)
+            except Exception as index_error:
+                warning(f"Could not update SQL similarity index for {p_dwmaprsqlcd}: {index_error}")
+        
+        # Column pickers describe the saved SQL again (also after an unchanged re-save)
+        invalidate_described_sql(old_sql, p_dwmaprsql)
+        
         info(f"create_update_sql completed successfully. Returning SQL ID: {w_return}")
         return w_return
         
@@ -1395,6 +1415,110 @@ def validate_logic2(metadata_connection, p_logic, p_keyclnm, p_valclnm, target_c
                 except Exception as close_e:
                     warning(f"Error closing source connection: {str(close_e)}")
 
+def _lookup_sql_code(cursor, db_type, p_logic):
+    """
+    Resolve mapping logic that names a DMS_MAPRSQL code.
+    Returns: (sql, sqlconid); the logic itself and None when it is not a SQL code
+    """
+    if not p_logic or len(p_logic) > 100:
+        return p_logic, None
+    dms_maprsql_ref = _get_table_ref(cursor, db_type, 'DMS_MAPRSQL')
+    if db_type == "POSTGRESQL":
+        cursor.execute(f"""
+            SELECT maprsql, sqlconid
+            FROM {dms_maprsql_ref}
+            WHERE maprsqlcd = %s
+            AND curflg = 'Y'
+        """, (p_logic[:100],))
+    else:  # Oracle
+        cursor.execute("""
+            SELECT maprsql, sqlconid
+            FROM DMS_MAPRSQL
+            WHERE maprsqlcd = :1
+            AND curflg = 'Y'
+        """, [p_logic[:100]])
+    row = cursor.fetchone()
+    if not row:
+        return p_logic, None
+    sql = row[0].read() if hasattr(row[0], 'read') else row[0]
+    return sql, row[1]
+
+def _validate_detail_logic(metadata_connection, cursor, db_type, rows, sql_validation_connection):
+    """
+    Validate the logic of DMS_MAPRDTL rows as validate_logic2 would, row by row.
+    Identical statements are validated once, results are cached per connection
+    and schema version, and the rest run concurrently (see logic_validation).
+    Returns: one outcome per row - error message, None when valid, or the
+             exception raised while validating it
+    """
+    try:
+        from backend.database.dbconnect import create_metadata_connection, create_target_connection
+    except ImportError:
+        from database.dbconnect import create_metadata_connection, create_target_connection
+    
+    # Logic without its own source connection is validated where validate_logic2 would:
+    # on the target connection if one was given, else on the metadata connection
+    trgconid = next((row[7] for row in rows if row[7]), None)
+    if sql_validation_connection is not metadata_connection:
+        default_group = ValidationGroup(
+            trgconid, sql_validation_connection, _detect_db_type(sql_validation_connection),
+            (lambda: create_target_connection(trgconid)) if trgconid else None,
+        )
+    else:
+        default_group = ValidationGroup('METADATA', metadata_connection, db_type, create_metadata_connection)
+    groups = [default_group]
+    group_by_conid = {default_group.conid: 0} if trgconid and default_group.conid == trgconid else {}
+    source_connections = []
+    resolved = {}
+    plan = []
+    
+    try:
+        for row in rows:
+            keyclnm, valclnm, maplogic = row[4], row[5], row[6]
+            try:
+                if maplogic not in resolved:
+                    resolved[maplogic] = _lookup_sql_code(cursor, db_type, maplogic)
+                w_logic, sqlconid = resolved[maplogic]
+                
+                index = 0
+                if sqlconid:
+                    if sqlconid not in group_by_conid:
+                        # SQL codes are validated on their own source connection when it can be opened
+                        group_by_conid[sqlconid] = 0
+                        try:
+                            source_connection = create_target_connection(sqlconid)
+                            if source_connection:
+                                source_connections.append(source_connection)
+                                groups.append(ValidationGroup(
+                                    sqlconid, source_connection, _detect_db_type(source_connection),
+                                    lambda conid=sqlconid: create_target_connection(conid),
+                                ))
+                                group_by_conid[sqlconid] = len(groups) - 1
+                            else:
+                                warning(f"Failed to create source connection (ID: {sqlconid}), will fall back to other options")
+                        except Exception as src_conn_e:
+                            error(f"Error creating source connection (ID: {sqlconid}) from SQL code: {str(src_conn_e)}")
+                    index = group_by_conid[sqlconid]
+                
+                key = validation_key(w_logic, keyclnm, valclnm)
+                groups[index].add(key, (w_logic, keyclnm, valclnm))
+                plan.append((index, key))
+            except Exception as e:
+                plan.append(e)
+        
+        results = validate_groups(
+            groups,
+            lambda connection, statement, _db_type: _validate_sql(connection, *statement, 'Y'),
+        )
+    finally:
+        for source_connection in source_connections:
+            try:
+                source_connection.close()
+            except Exception as close_e:
+                warning(f"Error closing source connection: {str(close_e)}")
+    
+    return [item if isinstance(item, Exception) else results[item] for item in plan]
+
 def validate_logic_for_mapref(metadata_connection, p_mapref, p_user=None, target_connection=None):
     """
     Function to validate all mapping logic for a mapping reference
@@ -1431,7 +1555,7 @@ def validate_logic_for_mapref(metadata_connection, p_mapref, p_user=None, target
             if db_type == "POSTGRESQL":
                 cursor.execute(f"""
                     SELECT m.mapref, md.mapdtlid, m.trgtbnm, md.trgclnm,
-                           md.keyclnm, md.valclnm, md.maplogic
+                           md.keyclnm, md.valclnm, md.maplogic, m.trgconid
                     FROM {dms_mapr_ref} m, {dms_maprdtl_ref} md
                     WHERE m.mapref = %s
                     AND m.curflg = 'Y'
@@ -1441,7 +1565,7 @@ def validate_logic_for_mapref(metadata_connection, p_mapref, p_user=None, target
             else:
                 cursor.execute("""
                     SELECT m.mapref, md.mapdtlid, m.trgtbnm, md.trgclnm,
-                           md.keyclnm, md.valclnm, md.maplogic
+                           md.keyclnm, md.valclnm, md.maplogic, m.trgconid
                     FROM DMS_MAPR m, DMS_MAPRDTL md
                     WHERE m.mapref = :1
                     AND m.curflg = 'Y'
@@ -1451,7 +1575,7 @@ def validate_logic_for_mapref(metadata_connection, p_mapref, p_user=None, target
         else:  # Oracle
             cursor.execute("""
                 SELECT m.mapref, md.mapdtlid, m.trgtbnm, md.trgclnm,
-                       md.keyclnm, md.valclnm, md.maplogic
+                       md.keyclnm, md.valclnm, md.maplogic, m.trgconid
                 FROM DMS_MAPR m, DMS_MAPRDTL md
                 WHERE m.mapref = :1
                 AND m.curflg = 'Y'
@@ -1462,14 +1586,18 @@ def validate_logic_for_mapref(metadata_connection, p_mapref, p_user=None, target
         rows = cursor.fetchall()
         w_return = 'Y'
         
-        for row in rows:
-            mapref, mapdtlid, trgtbnm, trgclnm, keyclnm, valclnm, maplogic = row
+        # Distinct logic is validated once, concurrently; results are recorded row by row below
+        outcomes = _validate_detail_logic(metadata_connection, cursor, db_type, rows, sql_validation_connection)
+        
+        for row, outcome in zip(rows, outcomes):
+            mapref, mapdtlid, trgtbnm, trgclnm, keyclnm, valclnm, maplogic, _trgconid = row
             
             w_pm = f'TB:{trgtbnm}-TC:{trgclnm}:Key:{keyclnm}-Val:{valclnm}-{maplogic}'[:400]
             
             try:
-                # Use target_connection for SQL validation, metadata_connection for metadata queries
-                w_res, w_err = validate_logic2(metadata_connection, maplogic, keyclnm, valclnm, sql_validation_connection)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                w_res, w_err = ('N', outcome) if outcome else ('Y', None)
                 
                 if w_res == 'N' and w_err:
                     # Insert error record
@@ -0,0 +1,239 @@
+"""
+Similarity index over the current DMS_MAPRSQL queries, used by the duplicate
+SQL check of the mapper screens.
+
+Each query is normalized (comments removed, whitespace collapsed, upper case),
+split into tokens and 3-token shingles, and summarised by a MinHash signature.
+The signature is cut into bands; queries sharing any band bucket are the
+candidates for a new query (locality-sensitive hashing). Only candidates are
+scored with difflib, so the similarity scores and threshold are the ones the
+check has always used. Edited copies of a stored query share most shingles and
+are practically always shortlisted; queries that only share boilerplate with it
+can score above the threshold yet fall outside the shortlist. Small indexes, and
+thresholds below 0.5, are therefore scored exhaustively.
+
+The index lives per process. create_update_sql adds saved queries directly;
+other workers pick up new DMS_MAPRSQL versions on their next check by reading
+rows above the highest MAPRSQLID they know, and rebuild when the number of
+current rows says something was removed.
+"""
+from __future__ import annotations
+
+import difflib
+import hashlib
+import random
+import re
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+# Support both FastAPI (package import) and legacy Flask (relative import) contexts
+try:
+    from backend.modules.logger import debug, info
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.logger import debug, info  # type: ignore
+
+
+SHINGLE_TOKENS = 3
+NUM_PERM = 64
+BANDS = 32
+# Up to this many queries every one is scored, as is any threshold below LSH_MIN_THRESHOLD
+LINEAR_SCAN_MAX = 500
+LSH_MIN_THRESHOLD = 0.5
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+_MASK32 = 0xFFFFFFFF
+_rng = random.Random(20240601)
+# Universal hash family (a*x + b mod 2^32) standing in for random permutations
+_PERMUTATIONS = tuple((_rng.randrange(1, _MASK32) | 1, _rng.randrange(0, _MASK32)) for _ in range(NUM_PERM))
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Normalize SQL for comparison:
+    - Remove comments
+    - Collapse whitespace
+    - Uppercase
+    """
+    if not sql:
+        return ""
+
+    # Remove single-line comments --
+    sql_no_single = re.sub(r"--.*?$", "", sql, flags=re.MULTILINE)
+    # Remove /* */ comments
+    sql_no_comments = re.sub(r"/\*.*?\*/", "", sql_no_single, flags=re.DOTALL)
+    # Collapse whitespace
+    sql_spaced = re.sub(r"\s+", " ", sql_no_comments).strip()
+    return sql_spaced.upper()
+
+
+def _shingles(normalized: str) -> Set[int]:
+    tokens = _TOKEN_PATTERN.findall(normalized)
+    if len(tokens) < SHINGLE_TOKENS:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+    return {
+        zlib.crc32(" ".join(tokens[i:i + SHINGLE_TOKENS]).encode("utf-8"))
+        for i in range(len(tokens) - SHINGLE_TOKENS + 1)
+    }
+
+
+def minhash_signature(normalized: str) -> Tuple[int, ...]:
+    """MinHash signature of the token shingles of ``normalized``."""
+    shingles = _shingles(normalized)
+    if not shingles:
+        return ()
+    return tuple(min(((a * h + b) & _MASK32) for h in shingles) for a, b in _PERMUTATIONS)
+
+
+def _band_keys(signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+    if not signature:
+        return []
+    rows = NUM_PERM // BANDS
+    return [(band, signature[band * rows:(band + 1) * rows]) for band in range(BANDS)]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    code: str
+    sql: str
+    normalized: str
+    digest: str
+    bands: FrozenSet[Tuple[int, Tuple[int, ...]]]
+
+
+class SqlSimilarityIndex:
+    """MinHash/LSH index of SQL code -> current query text."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: Dict[str, _Entry] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self._digests: Dict[str, Set[str]] = {}
+        self.max_sqlid: Optional[int] = None
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def upsert(self, code: str, sql: str, sqlid: Optional[int] = None) -> None:
+        """Add or replace the query stored under ``code``."""
+        normalized = normalize_sql(sql)
+        entry = _Entry(
+            code=code,
+            sql=sql,
+            normalized=normalized,
+            digest=hashlib.sha1(normalized.encode("utf-8")).hexdigest(),
+            bands=frozenset(_band_keys(minhash_signature(normalized))),
+        )
+        with self._lock:
+            self._remove(code)
+            if not normalized:
+                return
+            self._entries[code] = entry
+            self._digests.setdefault(entry.digest, set()).add(code)
+            for key in entry.bands:
+                self._buckets.setdefault(key, set()).add(code)
+            if sqlid is not None:
+                self.max_sqlid = max(self.max_sqlid or 0, int(sqlid))
+
+    def remove(self, code: str) -> None:
+        with self._lock:
+            self._remove(code)
+
+    def _remove(self, code: str) -> None:
+        entry = self._entries.pop(code, None)
+        if entry is None:
+            return
+        codes = self._digests.get(entry.digest)
+        if codes is not None:
+            codes.discard(code)
+            if not codes:
+                del self._digests[entry.digest]
+        for key in entry.bands:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(code)
+                if not bucket:
+                    del self._buckets[key]
+
+    def candidates(self, normalized: str) -> Set[str]:
+        """Codes sharing at least one LSH band with ``normalized``, plus exact matches."""
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        with self._lock:
+            found = set(self._digests.get(digest, ()))
+            for key in _band_keys(minhash_signature(normalized)):
+                found.update(self._buckets.get(key, ()))
+        return found
+
+    def search(
+        self, sql: str, threshold: float, limit: int = 5
+    ) -> Tuple[Optional[str], List[Tuple[str, float, str]]]:
+        """
+        (exact match code, [(code, score, sql)]) for the stored queries scoring at
+        least ``threshold`` against ``sql``, best first, at most ``limit``.
+        """
+        normalized = normalize_sql(sql)
+        with self._lock:
+            exhaustive = len(self._entries) <= LINEAR_SCAN_MAX or threshold < LSH_MIN_THRESHOLD
+            codes = list(self._entries) if exhaustive else sorted(self.candidates(normalized))
+            entries = [self._entries[code] for code in codes if code in self._entries]
+        debug(f"[SqlSimilarityIndex] scoring {len(entries)} of {len(self)} queries"
+              f"{' (exhaustive)' if exhaustive else ''}")
+
+        exact_code = None
+        scored: List[Tuple[str, float, str]] = []
+        for entry in entries:
+            if entry.normalized == normalized and exact_code is None:
+                exact_code = entry.code
+            matcher = difflib.SequenceMatcher(None, normalized, entry.normalized)
+            # Cheap upper bounds first; ratio() only for queries that can still pass
+            if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+                continue
+            score = matcher.ratio()
+            if score >= threshold:
+                scored.append((entry.code, round(score, 4), entry.sql))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return exact_code, scored[:limit]
+
+    def refresh(self, cursor) -> None:
+        """Bring the index up to date with the current (CURFLG = 'Y') DMS_MAPRSQL rows."""
+        cursor.execute("SELECT COUNT(*), MAX(MAPRSQLID) FROM DMS_MAPRSQL WHERE CURFLG = 'Y'")
+        row = cursor.fetchone() or (0, None)
+        count, max_sqlid = int(row[0] or 0), (int(row[1]) if row[1] is not None else None)
+
+        with self._lock:
+            if self.loaded and count == len(self._entries) and max_sqlid == self.max_sqlid:
+                return
+            if self.loaded and self.max_sqlid is not None and max_sqlid is not None and max_sqlid >= self.max_sqlid:
+                cursor.execute(
+                    f"SELECT MAPRSQLID, MAPRSQLCD, MAPRSQL FROM DMS_MAPRSQL "
+                    f"WHERE CURFLG = 'Y' AND MAPRSQLID > {int(self.max_sqlid)}"
+                )
+                for sqlid, code, sql in cursor.fetchall() or []:
+                    self.upsert(str(code), _read_text(sql), sqlid)
+                if count == len(self._entries):
+                    return
+
+            # First load, or queries were deactivated without a new version: rebuild
+            cursor.execute("SELECT MAPRSQLID, MAPRSQLCD, MAPRSQL FROM DMS_MAPRSQL WHERE CURFLG = 'Y'")
+            rows = cursor.fetchall() or []
+            self._entries, self._buckets, self._digests = {}, {}, {}
+            self.max_sqlid = None
+            for sqlid, code, sql in rows:
+                self.upsert(str(code), _read_text(sql), sqlid)
+            self.max_sqlid = max_sqlid if max_sqlid is not None else self.max_sqlid
+            self.loaded = True
+            info(f"[SqlSimilarityIndex] indexed {len(self._entries)} DMS_MAPRSQL queries")
+
+
+def _read_text(value) -> str:
+    return value.read() if hasattr(value, "read") else str(value or "")
+
+
+_index = SqlSimilarityIndex()
+
+
+def sql_similarity_index() -> SqlSimilarityIndex:
+    """The process-wide index of DMS_MAPRSQL queries."""
+    return _index
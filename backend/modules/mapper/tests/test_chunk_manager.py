@@ -4,7 +4,7 @@ Unit tests for ChunkManager.
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 from backend.modules.mapper.chunk_manager import ChunkManager
-from backend.modules.mapper.parallel_models import ChunkingStrategy
+from backend.modules.mapper.parallel_models import ChunkingStrategy, ChunkConfig
 
 
 class TestChunkManager(unittest.TestCase):
@@ -111,7 +111,86 @@ class TestChunkManager(unittest.TestCase):
         total = self.postgresql_manager.estimate_total_rows(mock_conn, sql)
         
         self.assertEqual(total, 0)  # Should return 0 on error
+    
+    def test_estimate_total_rows_uses_plan_for_filtered_query(self):
+        """Filtered sources are estimated from EXPLAIN, not COUNT(*)"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = ([{'Plan': {'Plan Rows': 420000}}],)
+        
+        sql = "SELECT * FROM test_table WHERE region = 'EU'"
+        
+        total = self.postgresql_manager.estimate_total_rows(mock_conn, sql)
+        
+        self.assertEqual(total, 420000)
+        self.assertEqual(self.postgresql_manager.last_estimate_source, 'optimizer plan')
+        executed_sql = mock_cursor.execute.call_args[0][0]
+        self.assertTrue(executed_sql.startswith("EXPLAIN (FORMAT JSON)"))
+        self.assertNotIn("COUNT(*)", executed_sql)
+    
+    def test_estimate_total_rows_falls_back_to_job_history(self):
+        """Job history is used when the source cannot be planned"""
+        source_conn = Mock()
+        source_conn.cursor.return_value.execute.side_effect = Exception("syntax error")
+        metadata_conn = Mock()
+        metadata_conn.cursor.return_value.fetchone.return_value = (1234567,)
+        
+        with patch('backend.modules.mapper.chunk_manager._detect_db_type', return_value='POSTGRESQL'):
+            total = self.postgresql_manager.estimate_total_rows(
+                source_conn, "SELECT * FROM a JOIN b ON a.id = b.id",
+                mapref='MAP_HISTORY_TEST', metadata_conn=metadata_conn
+            )
+        
+        self.assertEqual(total, 1234567)
+        self.assertEqual(self.postgresql_manager.last_estimate_source, 'job history')
+    
+    def test_estimate_total_rows_exact_runs_count(self):
+        """exact=True skips the estimators"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchone.return_value = (77,)
+        
+        total = self.postgresql_manager.estimate_total_rows(mock_conn, "SELECT * FROM test_table", exact=True)
+        
+        self.assertEqual(total, 77)
+        self.assertIn("COUNT(*)", mock_cursor.execute.call_args[0][0])
 
+    
+    def test_plan_chunk_ranges_uses_key_boundaries(self):
+        """Key boundaries become (from, to] ranges; the first chunk also takes NULL keys"""
+        mock_conn = Mock()
+        mock_cursor = Mock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_cursor.fetchall.return_value = [(100,), (200,), (200,)]
+        config = ChunkConfig(strategy=ChunkingStrategy.KEY_BASED, chunk_size=100, key_column='id', num_chunks=3)
+        
+        chunks = self.postgresql_manager.plan_chunk_ranges(mock_conn, "SELECT * FROM t ORDER BY id", config)
+        
+        self.assertEqual([(c.key_from, c.key_to) for c in chunks], [(None, '100'), ('100', '200'), ('200', None)])
+        self.assertIn("MOD(bnd.bnd_rn, 100) = 0", mock_cursor.execute.call_args[0][0])
+        first_sql = self.postgresql_manager.create_chunk_range_query("SELECT * FROM t", chunks[0], 100)
+        self.assertIn("WHERE (rng_src.id <= 100 OR rng_src.id IS NULL)", first_sql)
+        middle_sql = self.postgresql_manager.create_chunk_range_query("SELECT * FROM t", chunks[1], 100)
+        self.assertIn("WHERE rng_src.id > 100 AND rng_src.id <= 200", middle_sql)
+    
+    def test_plan_chunk_ranges_falls_back_to_offsets(self):
+        """Unreadable boundaries (e.g. ORDER BY an expression) give OFFSET ranges"""
+        mock_conn = Mock()
+        mock_conn.cursor.return_value.execute.side_effect = Exception("invalid column")
+        config = ChunkConfig(strategy=ChunkingStrategy.KEY_BASED, chunk_size=10, key_column='1', num_chunks=2)
+        
+        chunks = self.postgresql_manager.plan_chunk_ranges(mock_conn, "SELECT * FROM t ORDER BY 1", config)
+        
+        self.assertEqual([(c.row_from, c.row_to, c.key_column) for c in chunks], [(0, 10, None), (10, 20, None)])
+        mock_conn.rollback.assert_called_once()
+    
+    def test_create_skip_query(self):
+        """Row skips are pushed into SQL where an OFFSET form exists"""
+        self.assertTrue(self.postgresql_manager.create_skip_query("SELECT 1", 5).endswith("OFFSET 5"))
+        self.assertTrue(self.oracle_manager.create_skip_query("SELECT 1", 5).endswith("OFFSET 5 ROWS"))
+        self.assertIsNone(ChunkManager("MSSQL").create_skip_query("SELECT 1", 5))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,183 @@
+"""
+Unit tests for the parallel run chunk ledger.
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+try:
+    from backend.modules.mapper.database_sql_adapter import create_adapter_from_type
+    from backend.modules.mapper.mapper_chunk_ledger import (
+        CHUNK_DONE,
+        CHUNK_FAILED,
+        ChunkLedger,
+        chunk_run_key
+    )
+    from backend.modules.mapper.mapper_job_executor import _execute_mapper_job_parallel
+    from backend.modules.mapper.parallel_models import ChunkRange
+    LEDGER_BASE = 'backend.modules.mapper.mapper_chunk_ledger'
+    PATCH_BASE = 'backend.modules.mapper.mapper_job_executor'
+except ImportError:
+    from modules.mapper.database_sql_adapter import create_adapter_from_type  # type: ignore
+    from modules.mapper.mapper_chunk_ledger import (  # type: ignore
+        CHUNK_DONE,
+        CHUNK_FAILED,
+        ChunkLedger,
+        chunk_run_key
+    )
+    from modules.mapper.mapper_job_executor import _execute_mapper_job_parallel  # type: ignore
+    from modules.mapper.parallel_models import ChunkRange  # type: ignore
+    LEDGER_BASE = 'modules.mapper.mapper_chunk_ledger'
+    PATCH_BASE = 'modules.mapper.mapper_job_executor'
+
+
+def _ledger(metadata_conn):
+    with patch(f'{LEDGER_BASE}.create_adapter', return_value=create_adapter_from_type('POSTGRESQL')):
+        return ChunkLedger(metadata_conn, 'MAP_LEDGER', 'run-key', sessionid=7)
+
+
+class TestChunkLedger(unittest.TestCase):
+    """Test cases for ChunkLedger"""
+
+    def test_load_returns_only_unfinished_runs(self):
+        metadata_conn = Mock()
+        cursor = metadata_conn.cursor.return_value
+        cursor.fetchall.side_effect = [
+            [(0, 0, 0, 'ID', 'N', None, '100', 'DONE', 100, 90, 0),
+             (1, 0, 0, 'ID', 'N', '100', None, 'FAILED', 0, 0, 0)],
+            [(0, 0, 0, None, None, None, None, 'DONE', 5, 5, 0)],
+        ]
+        ledger = _ledger(metadata_conn)
+
+        chunks = ledger.load()
+        self.assertEqual([(c.chunk_id, c.status, c.key_from, c.key_to) for c in chunks],
+                         [(0, CHUNK_DONE, None, '100'), (1, CHUNK_FAILED, '100', None)])
+        self.assertEqual(chunks[0].source_rows, 100)
+        self.assertEqual(cursor.execute.call_args[0][1], ('MAP_LEDGER', 'run-key'))
+
+        self.assertEqual(ledger.load(), [])
+
+    def test_database_errors_disable_the_ledger(self):
+        metadata_conn = Mock()
+        metadata_conn.cursor.return_value.execute.side_effect = Exception('relation "dms_maprchnk" does not exist')
+        ledger = _ledger(metadata_conn)
+
+        self.assertEqual(ledger.load(), [])
+        self.assertFalse(ledger.enabled)
+        metadata_conn.rollback.assert_called_once()
+
+        ledger.record(ChunkRange(chunk_id=0, status=CHUNK_DONE))
+        self.assertEqual(metadata_conn.cursor.call_count, 1)
+
+    def test_run_key_ignores_whitespace_only(self):
+        self.assertEqual(chunk_run_key("SELECT *\n  FROM t", None, 10), chunk_run_key("SELECT * FROM t", None, 10))
+        self.assertNotEqual(chunk_run_key("SELECT * FROM t", None, 10), chunk_run_key("SELECT * FROM t", None, 20))
+
+
+JOB_CONFIG = {
+    'mapref': 'MAP_LEDGER', 'jobid': 1, 'target_schema': 'DW', 'target_table': 'DIM_X',
+    'target_type': 'DIM', 'full_table_name': 'DW.DIM_X', 'pk_columns': {'ID'},
+    'pk_source_mapping': {'ID': 'ID'}, 'all_columns': ['ID', 'RWHKEY'],
+    'hash_exclude_columns': {'RWHKEY'}, 'scd_type': 1,
+}
+
+
+class TestParallelResume(unittest.TestCase):
+    """A parallel run resumes only the chunks its ledger has not finished"""
+
+    def test_single_key_range_hands_back_to_sequential(self):
+        checkpoint_config = {'enabled': True, 'strategy': 'KEY', 'columns': ['ID']}
+        parallel_config = {'enable_parallel': True, 'max_workers': 2, 'chunk_size': 100}
+
+        with patch(f'{PATCH_BASE}.ChunkLedger') as ledger_cls, \
+             patch(f'{PATCH_BASE}.ChunkManager') as chunk_manager_cls, \
+             patch(f'{PATCH_BASE}._process_mapper_chunk') as process_chunk, \
+             patch(f'{PATCH_BASE}.record_actual_row_count'):
+            ledger = ledger_cls.return_value
+            ledger.load.return_value = []
+            chunk_manager = chunk_manager_cls.return_value
+            chunk_manager.calculate_chunk_config.return_value = Mock(num_chunks=3, total_rows=250, key_column='ID')
+            chunk_manager.plan_chunk_ranges.return_value = [ChunkRange(chunk_id=0, key_column='ID', key_type='N')]
+
+            result = _execute_mapper_job_parallel(
+                Mock(), Mock(), Mock(), dict(JOB_CONFIG), "SELECT ID FROM SRC ORDER BY ID", None,
+                lambda row: row, checkpoint_config, {'prcid': 1, 'sessionid': 7},
+                ['ID'], 'POSTGRESQL', 'POSTGRESQL', parallel_config, 250000
+            )
+
+        self.assertIsNone(result)
+        ledger.start.assert_not_called()
+        process_chunk.assert_not_called()
+
+    def test_offset_plans_are_not_kept_in_the_ledger(self):
+        checkpoint_config = {'enabled': True, 'strategy': 'KEY', 'columns': ['ID']}
+        parallel_config = {'enable_parallel': True, 'max_workers': 2, 'chunk_size': 100}
+        stale = [ChunkRange(chunk_id=0, row_from=0, row_to=100, status=CHUNK_DONE),
+                 ChunkRange(chunk_id=1, row_from=100, row_to=200, status=CHUNK_FAILED)]
+
+        with patch(f'{PATCH_BASE}.ChunkLedger') as ledger_cls, \
+             patch(f'{PATCH_BASE}.ChunkManager') as chunk_manager_cls, \
+             patch(f'{PATCH_BASE}._process_mapper_chunk') as process_chunk, \
+             patch(f'{PATCH_BASE}.record_actual_row_count'):
+            ledger = ledger_cls.return_value
+            ledger.load.return_value = stale
+            chunk_manager = chunk_manager_cls.return_value
+            chunk_manager.calculate_chunk_config.return_value = Mock(num_chunks=1, total_rows=90, key_column=None)
+            chunk_manager.plan_chunk_ranges.return_value = [ChunkRange(chunk_id=0, row_from=0, row_to=100)]
+
+            result = _execute_mapper_job_parallel(
+                Mock(), Mock(), Mock(), dict(JOB_CONFIG), "SELECT ID FROM SRC", None,
+                lambda row: row, checkpoint_config, {'prcid': 1, 'sessionid': 7},
+                ['ID'], 'POSTGRESQL', 'POSTGRESQL', parallel_config, 250000
+            )
+
+        # The OFFSET windows of the earlier run are dropped and the run starts over
+        self.assertIsNone(result)
+        ledger.clear.assert_called_once()
+        chunk_manager.calculate_chunk_config.assert_called_once()
+        ledger.start.assert_not_called()
+        process_chunk.assert_not_called()
+
+    def test_only_incomplete_chunks_are_re_executed(self):
+        job_config = dict(JOB_CONFIG)
+        checkpoint_config = {'enabled': True, 'strategy': 'KEY', 'columns': ['ID']}
+        parallel_config = {'enable_parallel': True, 'max_workers': 2, 'chunk_size': 100}
+        done = ChunkRange(chunk_id=0, key_column='ID', key_type='N', key_to='100',
+                          status=CHUNK_DONE, source_rows=100, target_rows=100)
+        failed = ChunkRange(chunk_id=1, key_column='ID', key_type='N', key_from='100', status=CHUNK_FAILED)
+
+        with patch(f'{PATCH_BASE}.ChunkLedger') as ledger_cls, \
+             patch(f'{PATCH_BASE}.ChunkManager') as chunk_manager_cls, \
+             patch(f'{PATCH_BASE}._process_mapper_chunk') as process_chunk, \
+             patch(f'{PATCH_BASE}.check_stop_request', return_value=False), \
+             patch(f'{PATCH_BASE}.update_process_log_progress'), \
+             patch(f'{PATCH_BASE}.update_checkpoint') as update_checkpoint, \
+             patch(f'{PATCH_BASE}.complete_checkpoint') as complete_checkpoint:
+            ledger = ledger_cls.return_value
+            ledger.load.return_value = [done, failed]
+            ledger.enabled = True
+            process_chunk.return_value = {
+                'chunk_id': 1, 'source_rows': 40, 'target_rows': 40, 'error_rows': 0,
+                'status': 'SUCCESS', 'checkpoint_value': '140'
+            }
+
+            result = _execute_mapper_job_parallel(
+                Mock(), Mock(), Mock(), job_config, "SELECT ID FROM SRC ORDER BY ID", None,
+                lambda row: row, checkpoint_config, {'prcid': 1, 'sessionid': 7},
+                ['ID'], 'POSTGRESQL', 'POSTGRESQL', parallel_config, 140
+            )
+
+        self.assertEqual(result['status'], 'SUCCESS')
+        self.assertEqual(result['source_rows'], 140)
+        process_chunk.assert_called_once()
+        self.assertIs(process_chunk.call_args.kwargs['chunk_range'], failed)
+        chunk_manager_cls.return_value.calculate_chunk_config.assert_not_called()
+        ledger.start.assert_not_called()
+        ledger.record.assert_called_once_with(failed)
+        self.assertEqual(failed.status, CHUNK_DONE)
+        ledger.clear.assert_called_once()
+        update_checkpoint.assert_not_called()
+        complete_checkpoint.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
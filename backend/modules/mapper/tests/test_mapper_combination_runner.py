@@ -0,0 +1,157 @@
+"""
+Unit tests for running job flow combinations.
+"""
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+try:
+    from backend.modules.mapper.mapper_combination_runner import (
+        MappingCombination,
+        execute_combinations,
+        plan_combination_waves,
+        split_by_source_keys
+    )
+    PATCH_BASE = 'backend.modules.mapper.mapper_combination_runner'
+except ImportError:
+    from modules.mapper.mapper_combination_runner import (  # type: ignore
+        MappingCombination,
+        execute_combinations,
+        plan_combination_waves,
+        split_by_source_keys
+    )
+    PATCH_BASE = 'modules.mapper.mapper_combination_runner'
+
+
+def _combination(index, scd_type=1, columns=('ID',), code=None):
+    return {
+        'index': index,
+        'code': code or f'C{index}',
+        'scd_type': scd_type,
+        'source_sql': f'SELECT {index}',
+        'columns': list(columns),
+        'source_conn_id': 7,
+        'target_conn_id': 5,
+    }
+
+
+class TestCombinationPlan(unittest.TestCase):
+    """Test cases for plan_combination_waves"""
+
+    def test_independent_combinations_share_a_wave_after_the_leading_one(self):
+        combinations = [MappingCombination.from_dict(values) for values in (
+            _combination(1, columns=('ID', 'NAME')),
+            _combination(2, columns=('ID', 'CITY', 'RECUPDT')),
+            _combination(3, columns=('ID', 'ZIP')),
+            _combination(4, columns=('ID', 'CITY')),    # overlaps 2
+            _combination(5, scd_type=2, columns=('ID', 'STATUS')),
+        )]
+
+        waves = plan_combination_waves(combinations, frozenset({'ID'}))
+
+        self.assertEqual([[c.index for c in wave] for wave in waves], [[1], [2, 3], [4], [5]])
+
+    def test_combinations_without_known_columns_stay_serial(self):
+        combinations = [MappingCombination.from_dict(_combination(i, columns=())) for i in (1, 2, 3)]
+        self.assertEqual(len(plan_combination_waves(combinations, frozenset({'ID'}))), 3)
+
+    def test_overlapping_or_unknown_source_keys_are_split_in_order(self):
+        wave = [MappingCombination.from_dict(_combination(i)) for i in (2, 3, 4, 5)]
+        source_keys = {2: frozenset({(1,), (2,)}), 3: frozenset({(3,)}), 4: frozenset({(2,), (4,)}), 5: None}
+
+        groups = split_by_source_keys(wave, source_keys)
+
+        self.assertEqual([[c.index for c in group] for group in groups], [[2, 3], [4], [5]])
+
+
+class TestExecuteCombinations(unittest.TestCase):
+    """Test cases for execute_combinations"""
+
+    def setUp(self):
+        self.job_config = {'mapref': 'MAP_CMB', 'pk_columns': {'ID'}}
+        self.combinations = [
+            _combination(1, columns=('ID', 'NAME')),
+            _combination(2, columns=('ID', 'CITY')),
+            _combination(3, columns=('ID', 'ZIP')),
+        ]
+
+    def test_runs_serially_on_the_job_connections_by_default(self):
+        calls = []
+
+        def fake_execute(metadata_conn, source_conn, target_conn, config, source_sql, *args):
+            calls.append((source_conn, config['scd_type'], source_sql))
+            return {'status': 'SUCCESS', 'source_rows': 10, 'target_rows': 4, 'error_rows': 1}
+
+        source_conn = Mock()
+        with patch(f'{PATCH_BASE}.execute_mapper_job', side_effect=fake_execute), \
+                patch.dict('os.environ', {'MAPPER_COMBINATION_PARALLEL': 'false'}):
+            result = execute_combinations(Mock(), source_conn, Mock(), self.job_config, self.combinations,
+                                          Mock(), {'enabled': True}, {})
+
+        self.assertEqual([call[2] for call in calls], ['SELECT 1', 'SELECT 2', 'SELECT 3'])
+        self.assertTrue(all(call[0] is source_conn for call in calls))
+        self.assertEqual((result['status'], result['source_rows'], result['target_rows'], result['error_rows']),
+                         ('SUCCESS', 30, 12, 3))
+        self.assertEqual(self.job_config['source_conn_id'], 7)
+
+    def test_concurrent_wave_uses_pooled_connections_without_checkpoints(self):
+        both_started = threading.Barrier(2, timeout=5)
+        seen = {}
+
+        def fake_execute(metadata_conn, source_conn, target_conn, config, source_sql, transformation, checkpoint, params):
+            if source_sql != 'SELECT 1':
+                both_started.wait()  # combinations 2 and 3 overlap
+            seen[source_sql] = (source_conn, checkpoint)
+            return {'status': 'ERROR' if source_sql == 'SELECT 3' else 'SUCCESS',
+                    'source_rows': 5, 'target_rows': 5, 'error_rows': 0, 'error_message': 'boom'}
+
+        connections = iter(range(100))
+        with patch(f'{PATCH_BASE}.execute_mapper_job', side_effect=fake_execute), \
+                patch(f'{PATCH_BASE}._read_source_keys',
+                      side_effect=lambda conn, combination, columns, limit: frozenset({(combination.index,)})), \
+                patch(f'{PATCH_BASE}._connection_factories',
+                      return_value=(lambda: Mock(name='meta'), lambda: next(connections), lambda: Mock(name='trg'))):
+            result = execute_combinations(Mock(), 'job-source', Mock(), self.job_config, self.combinations,
+                                          Mock(), {'enabled': True}, {'parallel_combinations': 'Y'})
+
+        self.assertEqual(seen['SELECT 1'], ('job-source', {'enabled': True}))
+        self.assertNotEqual(seen['SELECT 2'][0], seen['SELECT 3'][0])
+        self.assertFalse(seen['SELECT 2'][1]['enabled'])
+        self.assertEqual((result['status'], result['source_rows']), ('ERROR', 10))
+
+    def test_combinations_sharing_source_keys_run_one_after_the_other(self):
+        probes = []
+
+        def source_connection():
+            connection = Mock()
+            connection.cursor.return_value.execute.side_effect = probes.append
+            connection.cursor.return_value.fetchmany.side_effect = [[(1,), (2,)], []]
+            return connection
+
+        job_config = dict(self.job_config, pk_source_mapping={'ID': 'SRC_ID'})
+        result_row = {'status': 'SUCCESS', 'source_rows': 1, 'target_rows': 1, 'error_rows': 0}
+        with patch(f'{PATCH_BASE}.execute_mapper_job', return_value=result_row) as execute, \
+                patch(f'{PATCH_BASE}._connection_factories',
+                      return_value=(lambda: Mock(name='meta'), source_connection, lambda: Mock(name='trg'))):
+            result = execute_combinations(Mock(), 'job-source', Mock(), job_config, self.combinations,
+                                          Mock(), {'enabled': True}, {'parallel_combinations': 'Y'})
+
+        # 2 and 3 have disjoint columns but load the same keys, so they run in turn
+        self.assertEqual(probes, ['SELECT DISTINCT key_src.SRC_ID FROM (SELECT 2) key_src',
+                                  'SELECT DISTINCT key_src.SRC_ID FROM (SELECT 3) key_src'])
+        self.assertEqual([call.args[4] for call in execute.call_args_list], ['SELECT 1', 'SELECT 2', 'SELECT 3'])
+        self.assertTrue(all(call.args[1] == 'job-source' for call in execute.call_args_list))
+        self.assertEqual(result['source_rows'], 3)
+
+    def test_stop_request_skips_later_waves(self):
+        results = iter([{'status': 'STOPPED'}])
+        with patch(f'{PATCH_BASE}.execute_mapper_job', side_effect=lambda *args: next(results)) as execute:
+            result = execute_combinations(Mock(), Mock(), Mock(), self.job_config, self.combinations,
+                                          Mock(), None, {'parallel_combinations': True})
+
+        self.assertEqual(execute.call_count, 1)
+        self.assertEqual(result['status'], 'STOPPED')
+
+
+if __name__ == '__main__':
+    unittest.main()
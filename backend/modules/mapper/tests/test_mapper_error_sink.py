@@ -0,0 +1,81 @@
+"""
+Unit tests for bulk row-error logging to DMS_JOBERR.
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+try:
+    from backend.modules.common.error_sink import ErrorSink
+    from backend.modules.mapper.mapper_scd_handler import joberr_sink, process_scd_batch
+    SCD_BASE = 'backend.modules.mapper.mapper_scd_handler'
+except ImportError:
+    from modules.common.error_sink import ErrorSink  # type: ignore
+    from modules.mapper.mapper_scd_handler import joberr_sink, process_scd_batch  # type: ignore
+    SCD_BASE = 'modules.mapper.mapper_scd_handler'
+
+
+def _overflowing_target(bad_ids):
+    """Target connection whose bulk insert hits ORA-01438 and whose row inserts fail for bad_ids."""
+    cursor = Mock()
+    cursor.executemany.side_effect = Exception('ORA-01438: value larger than specified precision')
+
+    def execute(query, params):
+        if params[0] in bad_ids:
+            raise Exception('ORA-01438: value larger than specified precision')
+
+    cursor.execute.side_effect = execute
+    target_conn = Mock()
+    target_conn.cursor.return_value = cursor
+    return target_conn
+
+
+class TestJobErrorSink(unittest.TestCase):
+    """Test cases for the DMS_JOBERR error sink"""
+
+    def test_rejected_rows_are_written_with_one_insert_per_batch(self):
+        metadata_conn = Mock()
+        rows = [{'ID': i, 'RWHKEY': str(i)} for i in range(10)]
+
+        with patch(f'{SCD_BASE}.detect_database_type', return_value='POSTGRESQL'), \
+                patch(f'{SCD_BASE}.next_ids', return_value=list(range(500, 504))) as next_ids:
+            inserted, _, _ = process_scd_batch(
+                _overflowing_target({1, 3, 5, 7}), 'DW', 'FCT_X', 'DW.FCT_X',
+                rows, [], [], ['ID', 'RWHKEY'], 1, 'FCT', 'POSTGRESQL',
+                metadata_conn=metadata_conn, mapref='MAP_X', jobid=3,
+                session_params={'sessionid': 11, 'prcid': 12, 'joblogid': 99},
+            )
+
+        self.assertEqual(inserted, 6)
+        next_ids.assert_called_once()
+        metadata_cursor = metadata_conn.cursor.return_value
+        query, params = metadata_cursor.executemany.call_args[0]
+        self.assertIn('DMS_JOBERR', query)
+        self.assertEqual([p['errid'] for p in params], [500, 501, 502, 503])
+        self.assertEqual({p['joblogid'] for p in params}, {99})
+        self.assertEqual(metadata_cursor.executemany.call_count, 1)
+        metadata_conn.commit.assert_called_once()
+
+    def test_run_sink_caps_payloads_and_counts_codes(self):
+        written = []
+        sink = ErrorSink(written.extend, max_rows=3, flush_rows=2)
+        for i in range(5):
+            sink.add('ORA-01438' if i % 2 else 'ORA-12899', {'row': i})
+
+        self.assertEqual(written, [{'row': 0}, {'row': 1}])
+        summary = sink.close()
+        self.assertEqual(written, [{'row': 0}, {'row': 1}, {'row': 2}])
+        self.assertEqual(summary['dropped'], 2)
+        self.assertEqual(summary['by_code'], {'ORA-12899': 3, 'ORA-01438': 2})
+
+    def test_write_failures_do_not_fail_the_load(self):
+        def failing_writer(rows):
+            raise RuntimeError('metadata offline')
+
+        sink = ErrorSink(failing_writer, flush_rows=1)
+        sink.add('ORA-01438', {'row': 1})
+        self.assertEqual(sink.summary()['written'], 0)
+        self.assertIsNone(joberr_sink(None, 'MAP_X', 1, {}))
+
+
+if __name__ == '__main__':
+    unittest.main()
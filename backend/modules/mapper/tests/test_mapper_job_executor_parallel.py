@@ -150,6 +150,52 @@ class TestMapperJobExecutorParallel(unittest.TestCase):
         mock_manager.estimate_total_rows.assert_called_once()
         # Should use sequential processing
     
+    @patch('backend.modules.mapper.mapper_job_executor.detect_database_type')
+    @patch('backend.modules.mapper.mapper_job_executor.ChunkManager')
+    @patch('backend.modules.mapper.mapper_job_executor.check_stop_request')
+    @patch('backend.modules.mapper.mapper_job_executor._lookup_target_record')
+    @patch('backend.modules.mapper.mapper_job_executor.process_scd_batch')
+    def test_single_chunk_after_high_estimate_loads_sequentially(self, mock_process_scd, mock_lookup,
+                                                                 mock_check_stop, mock_chunk_manager,
+                                                                 mock_detect_db):
+        """Test that an estimate above the threshold with a single exact chunk still loads the rows"""
+        mock_detect_db.return_value = 'POSTGRESQL'
+        mock_check_stop.return_value = False
+        mock_lookup.return_value = None
+        mock_process_scd.return_value = (2, 0, 0)
+
+        mock_manager = Mock()
+        mock_manager.estimate_total_rows.return_value = 150000  # stale statistics
+        mock_manager.calculate_chunk_config.return_value = ChunkConfig(
+            strategy=ChunkingStrategy.OFFSET_LIMIT,
+            chunk_size=50000,
+            total_rows=2,
+            num_chunks=1
+        )
+        mock_chunk_manager.return_value = mock_manager
+
+        self.mock_source_cursor.description = [('ID',), ('NAME',)]
+        self.mock_source_cursor.fetchmany.side_effect = [[(1, 'Name1'), (2, 'Name2')], []]
+        self.mock_metadata_cursor.fetchone.return_value = None
+
+        result = execute_mapper_job(
+            self.mock_metadata_conn,
+            self.mock_source_conn,
+            self.mock_target_conn,
+            self.job_config,
+            self.source_sql,
+            self.transformation_func,
+            self.checkpoint_config,
+            self.session_params
+        )
+
+        mock_manager.calculate_chunk_config.assert_called_once()
+        self.assertEqual(result['status'], 'SUCCESS')
+        self.assertEqual(result['source_rows'], 2)
+        self.assertEqual(result['target_rows'], 2)
+        mock_process_scd.assert_called_once()
+        self.assertEqual(self.mock_source_cursor.execute.call_count, 2)
+
     @patch('backend.modules.mapper.mapper_job_executor.detect_database_type')
     @patch('backend.modules.mapper.mapper_job_executor.ChunkManager')
     @patch('backend.modules.mapper.mapper_job_executor.ThreadPoolExecutor')
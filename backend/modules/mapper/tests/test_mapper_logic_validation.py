@@ -0,0 +1,116 @@
+"""
+Unit tests for deduplicated, cached and concurrent mapping logic validation.
+"""
+import threading
+import unittest
+from unittest.mock import Mock
+
+try:
+    from backend.modules.mapper import logic_validation
+    from backend.modules.mapper.logic_validation import ValidationGroup, validate_groups, validation_key
+except ImportError:
+    from modules.mapper import logic_validation  # type: ignore
+    from modules.mapper.logic_validation import ValidationGroup, validate_groups, validation_key  # type: ignore
+
+
+def _connection(version='10:500/90:700'):
+    """Connection whose catalog fingerprint query returns ``version``."""
+    connection = Mock()
+    connection.autocommit = False
+    connection.cursor.return_value.fetchone.side_effect = lambda: tuple(connection.version.split('/'))
+    connection.version = version
+    return connection
+
+
+class TestLogicValidation(unittest.TestCase):
+    """Test cases for validate_groups"""
+
+    def setUp(self):
+        logic_validation.clear_validation_cache()
+
+    def test_identical_logic_is_validated_once(self):
+        group = ValidationGroup(None, _connection(), 'POSTGRESQL')
+        keys = [validation_key(sql, 'ID', 'VAL') for sql in (
+            'select id, val from src', 'SELECT  id, val\nFROM src -- same', 'select id, val from other')]
+        for key, sql in zip(keys, ('a', 'a', 'b')):
+            group.add(key, sql)
+        validate = Mock(side_effect=lambda connection, statement, db_type: None if statement == 'a' else 'bad')
+
+        results = validate_groups([group], validate)
+
+        self.assertEqual(keys[0], keys[1])
+        self.assertEqual(validate.call_count, 2)
+        self.assertEqual(results[(0, keys[0])], None)
+        self.assertEqual(results[(0, keys[2])], 'bad')
+        # The failed statement's aborted transaction is rolled back, the valid one is left alone
+        self.assertEqual(group.connection.rollback.call_count, 1)
+
+    def test_results_are_cached_until_the_schema_changes(self):
+        connection = _connection()
+        validate = Mock(return_value=None)
+
+        def run():
+            group = ValidationGroup(7, connection, 'POSTGRESQL')
+            group.add('k1', 'select 1')
+            return validate_groups([group], validate)
+
+        run()
+        run()
+        self.assertEqual(validate.call_count, 1)
+        connection.version = '11:501/92:702'
+        run()
+        self.assertEqual(validate.call_count, 2)
+
+    def test_only_passes_and_missing_object_errors_are_cached(self):
+        connection = _connection()
+        outcomes = {
+            'ok': None,
+            'missing': 'relation "src" does not exist',
+            'dropped': 'ORA-03113: end-of-file on communication channel',
+            'timeout': 'canceling statement due to statement timeout',
+        }
+        validate = Mock(side_effect=lambda connection, statement, db_type: outcomes[statement])
+
+        def run():
+            group = ValidationGroup(7, connection, 'POSTGRESQL')
+            for statement in outcomes:
+                group.add(statement, statement)
+            return validate_groups([group], validate)
+
+        run()
+        results = run()
+        self.assertEqual(results[(0, 'dropped')], outcomes['dropped'])
+        validated_again = [call.args[1] for call in validate.call_args_list[len(outcomes):]]
+        self.assertEqual(sorted(validated_again), ['dropped', 'timeout'])
+
+    def test_statements_run_concurrently_on_extra_connections(self):
+        opened = []
+        barrier = threading.Barrier(3, timeout=5)
+
+        def connect():
+            opened.append(_connection())
+            return opened[-1]
+
+        def validate(connection, statement, db_type):
+            if statement == 'boom':
+                raise RuntimeError('ORA-00942: table or view does not exist')
+            barrier.wait()  # only passes if three statements are in flight at once
+            return None
+
+        group = ValidationGroup(3, _connection(), 'ORACLE', connect)
+        for index in range(3):
+            group.add(f'k{index}', f'select {index} from dual')
+        group.add('k-err', 'boom')
+
+        results = validate_groups([group], validate, max_workers=3)
+
+        self.assertEqual([results[(0, f'k{index}')] for index in range(3)], [None, None, None])
+        self.assertIsInstance(results[(0, 'k-err')], RuntimeError)
+        self.assertEqual(len(opened), 2)
+        for connection in opened:
+            connection.close.assert_called_once()
+        group.connection.close.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
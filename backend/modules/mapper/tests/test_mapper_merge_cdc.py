@@ -0,0 +1,129 @@
+"""
+Unit tests for sorted merge-join change detection.
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+try:
+    from backend.modules.mapper.mapper_merge_cdc import (
+        MergeOrderError,
+        build_ordered_source_query,
+        build_target_state_query,
+        cdc_mode_settings,
+        merge_join
+    )
+    from backend.modules.mapper.mapper_job_executor import _execute_mapper_job_merge
+    from backend.modules.mapper.mapper_transformation_utils import generate_hash
+    PATCH_BASE = 'backend.modules.mapper.mapper_job_executor'
+except ImportError:
+    from modules.mapper.mapper_merge_cdc import (  # type: ignore
+        MergeOrderError,
+        build_ordered_source_query,
+        build_target_state_query,
+        cdc_mode_settings,
+        merge_join
+    )
+    from modules.mapper.mapper_job_executor import _execute_mapper_job_merge  # type: ignore
+    from modules.mapper.mapper_transformation_utils import generate_hash  # type: ignore
+    PATCH_BASE = 'modules.mapper.mapper_job_executor'
+
+
+class TestMergeJoin(unittest.TestCase):
+    """Test cases for merge_join"""
+
+    def test_new_matched_and_missing_keys(self):
+        source = [((1,), 'a'), ((3,), 'c'), ((3,), 'c2'), ((5,), 'e')]
+        target = [((2,), {'SKEY': 20}), ((3,), {'SKEY': 30}), ((6,), {'SKEY': 60})]
+
+        pairs = list(merge_join(source, target))
+
+        self.assertEqual(pairs, [
+            ('a', None),
+            (None, {'SKEY': 20}),
+            ('c', {'SKEY': 30}),
+            ('c2', {'SKEY': 30}),
+            ('e', None),
+            (None, {'SKEY': 60}),
+        ])
+
+    def test_out_of_order_stream_raises(self):
+        with self.assertRaises(MergeOrderError):
+            list(merge_join([((2,), 'b'), ((1,), 'a')], []))
+        with self.assertRaises(MergeOrderError):
+            list(merge_join([((9,), 'z')], [(('b',), {}), (('a',), {})]))
+
+
+class TestMergeQueries(unittest.TestCase):
+    """Test cases for the ordered stream queries"""
+
+    def test_text_keys_use_binary_collation(self):
+        source_sql = build_ordered_source_query(
+            "SELECT * FROM src", ['CODE', 'ID'], {'CODE': 'SRC_CODE', 'ID': 'SRC_ID'}, {'CODE'}, 'POSTGRESQL'
+        )
+        self.assertTrue(source_sql.endswith('ORDER BY mrg_src.SRC_CODE COLLATE "C", mrg_src.SRC_ID'))
+
+        target_sql = build_target_state_query('dw.dim_x', ['CODE', 'ID'], {'CODE'}, 'ORACLE')
+        self.assertIn("SELECT CODE, ID, SKEY, RWHKEY FROM dw.dim_x WHERE CURFLG = 'Y'", target_sql)
+        self.assertTrue(target_sql.endswith("ORDER BY NLSSORT(CODE, 'NLS_SORT=BINARY'), ID"))
+
+    def test_cdc_mode_settings(self):
+        self.assertEqual(cdc_mode_settings({'cdc_mode': 'merge', 'merge_detect_deletes': 'Y'}), ('MERGE', True))
+        self.assertEqual(cdc_mode_settings({'cdc_mode': 'bogus'})[0], 'LOOKUP')
+
+
+class TestExecuteMapperJobMerge(unittest.TestCase):
+    """Merge mode classifies through prepare_row_for_scd and writes via process_scd_batch"""
+
+    def test_merge_classifies_and_expires_missing_keys(self):
+        all_columns = ['ID', 'NAME', 'RWHKEY']
+        unchanged_hash = generate_hash({'ID': 2, 'NAME': 'same'}, all_columns, {'RWHKEY'})
+        job_config = {
+            'mapref': 'MERGE_TEST', 'jobid': 1, 'target_schema': 'DW', 'target_table': 'DIM_X',
+            'target_type': 'DIM', 'full_table_name': 'DW.DIM_X', 'pk_columns': {'ID'},
+            'pk_source_mapping': {'ID': 'ID'}, 'all_columns': all_columns,
+            'hash_exclude_columns': {'RWHKEY'}, 'bulk_limit': 100, 'scd_type': 1,
+        }
+
+        # Like a psycopg2 named cursor, the source is only described after its first fetch
+        source_cursor = Mock(description=None)
+        source_batches = iter([[(1, 'new'), (2, 'same'), (3, 'changed')], []])
+
+        def fetch_source(size):
+            source_cursor.description = [('ID',), ('NAME',)]
+            return next(source_batches)
+
+        source_cursor.fetchmany.side_effect = fetch_source
+        source_conn = Mock()
+        source_conn.cursor.return_value = source_cursor
+
+        target_cursor = Mock()
+        target_cursor.fetchall.return_value = []
+        target_cursor.fetchmany.side_effect = [[(2, 20, unchanged_hash), (3, 30, 'stale'), (4, 40, 'gone')], []]
+        target_conn = Mock()
+        target_conn.cursor.return_value = target_cursor
+
+        with patch(f'{PATCH_BASE}.process_scd_batch', return_value=(1, 1, 1)) as scd_batch, \
+             patch(f'{PATCH_BASE}.BufferedProgressWriter'), \
+             patch(f'{PATCH_BASE}.check_stop_request', return_value=False):
+            result = _execute_mapper_job_merge(
+                Mock(), source_conn, target_conn, job_config,
+                "SELECT ID, NAME FROM SRC", lambda row: dict(row),
+                {}, {}, None, 'POSTGRESQL', 'POSTGRESQL', True
+            )
+
+        self.assertEqual(result['status'], 'SUCCESS')
+        self.assertEqual(result['source_rows'], 3)
+        scd_batch.assert_called_once()
+        args = scd_batch.call_args[0]
+        rows_to_insert, rows_to_update_scd1, rows_to_update_scd2 = args[4], args[5], args[6]
+        self.assertEqual([row['ID'] for row in rows_to_insert], [1])
+        self.assertEqual([(row['ID'], row['SKEY']) for row in rows_to_update_scd1], [(3, 30)])
+        # Key 4 is missing from the source and is expired
+        self.assertEqual(rows_to_update_scd2, [40])
+        self.assertIn('ORDER BY mrg_src.ID', source_cursor.execute.call_args[0][0])
+        # The source streams through a server-side cursor as well
+        self.assertTrue(source_conn.cursor.call_args.kwargs['name'].startswith('dms_merge_'))
+
+
+if __name__ == '__main__':
+    unittest.main()
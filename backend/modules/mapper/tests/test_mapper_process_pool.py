@@ -0,0 +1,113 @@
+"""
+Unit tests for process-pool row classification.
+"""
+import unittest
+
+try:
+    from backend.modules.mapper.mapper_process_pool import (
+        MapperProcessPool,
+        RowBlockSpec,
+        classify_row_block,
+        process_pool_settings,
+        target_state
+    )
+    from backend.modules.mapper.mapper_transformation_utils import generate_hash, map_row_to_target_columns
+except ImportError:
+    from modules.mapper.mapper_process_pool import (  # type: ignore
+        MapperProcessPool,
+        RowBlockSpec,
+        classify_row_block,
+        process_pool_settings,
+        target_state
+    )
+    from modules.mapper.mapper_transformation_utils import generate_hash, map_row_to_target_columns  # type: ignore
+
+
+ALL_COLUMNS = ('ID', 'NAME', 'AMOUNT', 'RWHKEY')
+MAPPING = {'ID': 'id', 'NAME': 'name', 'AMOUNT': 'amount'}
+EXCLUDE = frozenset({'RWHKEY'})
+
+
+def _spec(scd_type=1, checkpoint_columns=()):
+    return RowBlockSpec(
+        source_columns=('id', 'name', 'amount'),
+        column_source_mapping=MAPPING,
+        all_columns=ALL_COLUMNS,
+        hash_exclude_columns=EXCLUDE,
+        scd_type=scd_type,
+        target_type='DIM',
+        checkpoint_columns=checkpoint_columns,
+    )
+
+
+def _hash(row):
+    mapped = map_row_to_target_columns(dict(zip(('id', 'name', 'amount'), row)), MAPPING, list(ALL_COLUMNS))
+    return generate_hash(mapped, list(ALL_COLUMNS), set(EXCLUDE))
+
+
+class TestClassifyRowBlock(unittest.TestCase):
+    """Test cases for classify_row_block"""
+
+    def test_rows_are_classified_like_prepare_row_for_scd(self):
+        rows = [(1, 'new', 10), (2, 'same', 20), (3, 'changed', 30)]
+        states = [
+            None,
+            {'RWHKEY': _hash(rows[1]), 'SKEY': 102},
+            {'RWHKEY': 'stale', 'SKEY': 103},
+        ]
+
+        scd1 = classify_row_block(_spec(scd_type=1, checkpoint_columns=('id',)), rows, states)
+        self.assertEqual([row['ID'] for row in scd1.rows_to_insert], [1])
+        self.assertEqual([(row['ID'], row['SKEY']) for row in scd1.rows_to_update_scd1], [(3, 103)])
+        self.assertEqual(scd1.rows_to_update_scd2, [])
+        self.assertEqual(scd1.checkpoint_value, '3')
+
+        scd2 = classify_row_block(_spec(scd_type=2), rows, states)
+        self.assertEqual([row['ID'] for row in scd2.rows_to_insert], [1, 3])
+        self.assertEqual(scd2.rows_to_update_scd2, [103])
+
+    def test_row_errors_are_counted_not_raised(self):
+        rows = [(1, 'a', 1), (2, 'b', 2)]
+        states = [{'RWHKEY': 'stale'}, None]  # no SKEY on a changed row
+
+        result = classify_row_block(_spec(), rows, states)
+
+        self.assertEqual(result.error_rows, 1)
+        self.assertEqual(len(result.rows_to_insert), 1)
+
+    def test_target_state_keeps_only_classification_columns(self):
+        self.assertIsNone(target_state(None))
+        self.assertEqual(
+            target_state({'SKEY': 5, 'RWHKEY': 'h', 'NAME': 'x'}),
+            {'SKEY': 5, 'RWHKEY': 'h'}
+        )
+
+    def test_settings_default_to_disabled(self):
+        self.assertEqual(process_pool_settings({'use_process_pool': 'N'}), (False, None))
+        self.assertEqual(
+            process_pool_settings({'use_process_pool': True, 'process_workers': '3'}),
+            (True, 3)
+        )
+
+
+class TestMapperProcessPool(unittest.TestCase):
+    """Process pool results must match inline classification"""
+
+    def test_pool_matches_inline_classification_in_order(self):
+        rows = [(i, f'name_{i}', i * 1.5) for i in range(1, 41)]
+        states = [None if i % 3 else {'RWHKEY': 'stale', 'SKEY': i} for i in range(1, 41)]
+        spec = _spec(scd_type=2, checkpoint_columns=('id',))
+
+        expected = classify_row_block(spec, rows, states)
+        with MapperProcessPool(max_workers=2, block_rows=7) as pool:
+            actual = pool.classify(spec, rows, states)
+
+        strip = lambda batch: [{k: v for k, v in row.items() if k != 'FROMDT'} for row in batch]
+        self.assertEqual(strip(actual.rows_to_insert), strip(expected.rows_to_insert))
+        self.assertEqual(actual.rows_to_update_scd2, expected.rows_to_update_scd2)
+        self.assertEqual(actual.checkpoint_value, '40')
+        self.assertEqual(actual.error_rows, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
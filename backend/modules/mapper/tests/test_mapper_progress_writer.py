@@ -0,0 +1,97 @@
+"""
+Unit tests for BufferedProgressWriter.
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+try:
+    from backend.modules.mapper.mapper_progress_tracker import BufferedProgressWriter
+    PATCH_BASE = 'backend.modules.mapper.mapper_progress_tracker'
+except ImportError:
+    from modules.mapper.mapper_progress_tracker import BufferedProgressWriter  # type: ignore
+    PATCH_BASE = 'modules.mapper.mapper_progress_tracker'
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBufferedProgressWriter(unittest.TestCase):
+    """Test cases for BufferedProgressWriter"""
+
+    def setUp(self):
+        self.metadata_conn = Mock()
+        self.clock = _Clock()
+        self.session_params = {'prcid': 1, 'sessionid': 1}
+        log_patch = patch(f'{PATCH_BASE}.log_batch_progress', return_value=77)
+        prclog_patch = patch(f'{PATCH_BASE}.update_process_log_progress')
+        self.log_batch_progress = log_patch.start()
+        self.update_process_log_progress = prclog_patch.start()
+        self.addCleanup(log_patch.stop)
+        self.addCleanup(prclog_patch.stop)
+
+    def _writer(self, joblogid=77, flush_seconds=5.0, flush_rows=1000):
+        return BufferedProgressWriter(
+            self.metadata_conn, 'MAP1', 9, self.session_params,
+            joblogid=joblogid, flush_seconds=flush_seconds, flush_rows=flush_rows,
+            clock=self.clock,
+        )
+
+    def test_batches_are_coalesced_until_row_threshold(self):
+        writer = self._writer()
+        for batch in range(1, 4):
+            writer.record(batch, batch * 300, batch * 300, 0)
+        self.log_batch_progress.assert_not_called()
+        self.metadata_conn.commit.assert_not_called()
+
+        writer.record(4, 1200, 1190, 10)
+
+        self.log_batch_progress.assert_called_once()
+        args = self.log_batch_progress.call_args
+        self.assertEqual(args.args[3:7], (4, 1200, 1190, 10))
+        self.assertEqual(args.kwargs['joblogid'], 77)
+        self.update_process_log_progress.assert_called_once()
+        self.metadata_conn.commit.assert_called_once()
+
+    def test_time_threshold_flushes_latest_totals(self):
+        writer = self._writer()
+        writer.record(1, 10, 10, 0)
+        self.clock.now = 6.0
+        writer.record(2, 20, 19, 1)
+
+        self.assertEqual(self.log_batch_progress.call_count, 1)
+        self.assertEqual(self.log_batch_progress.call_args.args[3:7], (2, 20, 19, 1))
+
+    def test_flush_without_commit_before_checkpoint(self):
+        writer = self._writer()
+        writer.record(1, 10, 10, 0)
+
+        writer.flush(commit=False)
+        writer.flush()
+
+        self.assertEqual(self.log_batch_progress.call_count, 1)
+        self.metadata_conn.commit.assert_not_called()
+
+    def test_missing_joblog_row_is_created_immediately(self):
+        writer = self._writer(joblogid=None)
+        writer.record(1, 10, 10, 0)
+
+        self.assertEqual(writer.joblogid, 77)
+        self.assertIsNone(self.log_batch_progress.call_args.kwargs['joblogid'])
+
+        writer.record(2, 20, 20, 0)
+        self.assertEqual(self.log_batch_progress.call_count, 1)
+
+    def test_zero_thresholds_flush_every_batch(self):
+        writer = self._writer(flush_seconds=0, flush_rows=0)
+        writer.record(1, 10, 10, 0)
+        writer.record(2, 20, 20, 0)
+        self.assertEqual(self.metadata_conn.commit.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Unit tests for the compiled row projector.
+"""
+import pickle
+import unittest
+from datetime import datetime
+
+try:
+    from backend.modules.mapper.mapper_transformation_utils import (
+        RowProjector,
+        StandardTransformation,
+        build_primary_key_values,
+        generate_hash,
+        map_row_to_target_columns
+    )
+    from backend.modules.mapper.mapper_scd_handler import prepare_row_for_scd
+except ImportError:
+    from modules.mapper.mapper_transformation_utils import (  # type: ignore
+        RowProjector,
+        StandardTransformation,
+        build_primary_key_values,
+        generate_hash,
+        map_row_to_target_columns
+    )
+    from modules.mapper.mapper_scd_handler import prepare_row_for_scd  # type: ignore
+
+
+SOURCE_COLUMNS = ['id', 'Name', 'AMT', 'loaded_at', 'NAME']
+MAPPING = {'ID': 'id', 'NAME': 'name', 'AMOUNT': 'amt'}
+ALL_COLUMNS = ['ID', 'NAME', 'AMOUNT', 'LOADED_AT', 'NOT_IN_SOURCE', 'RWHKEY']
+PK_SOURCE_MAPPING = {'ID': 'id'}
+
+
+class TestRowProjector(unittest.TestCase):
+    """RowProjector must match the dict-based helpers exactly"""
+
+    def setUp(self):
+        self.transform = StandardTransformation(MAPPING, ALL_COLUMNS)
+        self.projector = RowProjector.for_transformation(
+            self.transform, SOURCE_COLUMNS, ALL_COLUMNS, ['ID'], PK_SOURCE_MAPPING, {'RWHKEY'}
+        )
+
+    def test_matches_dict_helpers(self):
+        rows = [
+            (1, 'alpha', 10.5, datetime(2024, 1, 2, 3, 4, 5), None),
+            (2, None, None, None, 'fallback'),  # NAME falls back to the second match
+            (None, 'x', 1, None, None),
+        ]
+        for row in rows:
+            raw = dict(zip(SOURCE_COLUMNS, row))
+            expected = map_row_to_target_columns(raw, MAPPING, ALL_COLUMNS)
+
+            projected = self.projector.project(row)
+
+            self.assertEqual(dict(projected), expected)
+            self.assertEqual(projected.copy(), expected)
+            self.assertEqual(self.projector.row_hash(projected), generate_hash(expected, ALL_COLUMNS, {'RWHKEY'}))
+            self.assertEqual(self.projector.pk_values(row), build_primary_key_values(raw, {'ID'}, PK_SOURCE_MAPPING))
+
+    def test_projected_rows_flow_through_scd_classification(self):
+        projected = self.projector.project((7, 'n', 1, None, None))
+        src_hash = self.projector.row_hash(projected)
+
+        row_to_insert, _, _ = prepare_row_for_scd(projected, None, src_hash, 1, 'DIM')
+        self.assertIsInstance(row_to_insert, dict)
+        self.assertEqual(row_to_insert['ID'], 7)
+        self.assertEqual(row_to_insert['RWHKEY'], src_hash)
+
+        unchanged = prepare_row_for_scd(projected, {'RWHKEY': src_hash, 'SKEY': 1}, src_hash, 1, 'DIM')
+        self.assertEqual(unchanged, (None, None, None))
+
+    def test_only_standard_transformations_are_compiled(self):
+        self.assertIsNone(RowProjector.for_transformation(lambda row: row, SOURCE_COLUMNS, ALL_COLUMNS))
+        self.assertIsNone(RowProjector.for_transformation(self.transform, SOURCE_COLUMNS, ALL_COLUMNS[:-1]))
+        restored = pickle.loads(pickle.dumps(self.transform))
+        self.assertEqual(restored.column_mapping, MAPPING)
+
+
+if __name__ == '__main__':
+    unittest.main()
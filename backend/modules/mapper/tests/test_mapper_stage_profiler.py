@@ -0,0 +1,102 @@
+"""
+Unit tests for mapper stage profiling.
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+try:
+    from backend.modules.mapper.database_sql_adapter import create_adapter_from_type
+    from backend.modules.mapper.mapper_scd_handler import process_scd_batch
+    from backend.modules.mapper.mapper_stage_profiler import (
+        STAGES,
+        StageProfiler,
+        sampling_profile_requested
+    )
+    PROFILER_BASE = 'backend.modules.mapper.mapper_stage_profiler'
+except ImportError:
+    from modules.mapper.database_sql_adapter import create_adapter_from_type  # type: ignore
+    from modules.mapper.mapper_scd_handler import process_scd_batch  # type: ignore
+    from modules.mapper.mapper_stage_profiler import (  # type: ignore
+        STAGES,
+        StageProfiler,
+        sampling_profile_requested
+    )
+    PROFILER_BASE = 'modules.mapper.mapper_stage_profiler'
+
+
+class TestStageProfiler(unittest.TestCase):
+    """Test cases for StageProfiler"""
+
+    def test_chained_clocks_and_merged_chunks_accumulate_per_stage(self):
+        profiler = StageProfiler('MAP_PROF')
+        for _ in range(3):
+            started = profiler.clock()
+            started = profiler.add('transform', started, rows=1)
+            started = profiler.add('target_lookup', started, rows=1, round_trips=1)
+            profiler.add('transform', started, calls=0)
+
+        chunk = StageProfiler('MAP_PROF')
+        with chunk.stage('commit'):
+            pass
+        profiler.merge(chunk)
+
+        stages = profiler.as_dict()
+        self.assertEqual(list(stages), ['transform', 'target_lookup', 'commit'])
+        self.assertEqual((stages['transform']['calls'], stages['transform']['rows']), (3, 3))
+        self.assertEqual(stages['target_lookup']['round_trips'], 3)
+        self.assertEqual(stages['commit']['calls'], 1)
+        self.assertTrue(all(values['wall_seconds'] >= 0 for values in stages.values()))
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = StageProfiler('MAP_PROF', enabled=False)
+        profiler.add('hash', profiler.clock(), rows=1)
+        with profiler.stage('commit'):
+            pass
+        self.assertEqual(profiler.as_dict(), {})
+        self.assertFalse(profiler.save(Mock()))
+
+    def test_scd_batch_charges_each_write_stage(self):
+        profiler = StageProfiler('MAP_PROF')
+        target_conn = Mock()
+        target_conn.cursor.return_value.rowcount = 2
+
+        process_scd_batch(
+            target_conn, 'DW', 'DIM_X', 'DW.DIM_X',
+            [{'ID': 1, 'RWHKEY': 'a'}, {'ID': 2, 'RWHKEY': 'b'}],
+            [{'ID': 3, 'RWHKEY': 'c', 'SKEY': 30}],
+            [40, 41],
+            ['ID', 'RWHKEY'], 2, 'DIM', 'POSTGRESQL',
+            profiler=profiler,
+        )
+
+        stages = profiler.as_dict()
+        self.assertEqual([stage for stage in STAGES if stage in stages], ['insert', 'scd1_update', 'scd2_expire'])
+        self.assertEqual(stages['insert']['rows'], 2)
+        self.assertEqual(stages['scd2_expire']['rows'], 2)
+
+    def test_save_writes_one_row_per_stage(self):
+        profiler = StageProfiler('MAP_PROF')
+        profiler.joblogid = 99
+        profiler.add('source_fetch', profiler.clock(), rows=10, round_trips=1)
+        profiler.add('commit', profiler.clock(), round_trips=1)
+        metadata_conn = Mock()
+
+        with patch(f'{PROFILER_BASE}.create_adapter', return_value=create_adapter_from_type('POSTGRESQL')):
+            self.assertTrue(profiler.save(metadata_conn, sessionid=7))
+
+        query, rows = metadata_conn.cursor.return_value.executemany.call_args[0]
+        self.assertIn('DMS_JOBSTGPRF', query)
+        self.assertEqual([row[:4] for row in rows],
+                         [(99, 'MAP_PROF', 7, 'source_fetch'), (99, 'MAP_PROF', 7, 'commit')])
+        metadata_conn.commit.assert_called_once()
+
+    def test_sampling_profile_is_toggled_per_mapref(self):
+        with patch.dict('os.environ', {'MAPPER_PROFILE_MAPREFS': 'map_a, MAP_B'}):
+            self.assertTrue(sampling_profile_requested('MAP_A'))
+            self.assertFalse(sampling_profile_requested('MAP_C'))
+        with patch.dict('os.environ', {'MAPPER_PROFILE_MAPREFS': '*'}):
+            self.assertTrue(sampling_profile_requested('MAP_C'))
+
+
+if __name__ == '__main__':
+    unittest.main()
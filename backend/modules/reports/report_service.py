@@ -19,7 +19,8 @@ try:
         detect_db_type,
         get_metadata_table_refs,
     )
-    from backend.modules.common.id_provider import IdProviderError, next_id
+    from backend.modules.common.describe_cache import describe
+    from backend.modules.common.id_provider import IdProviderError, next_id, next_ids
     from backend.modules.logger import debug, error, info
 except ImportError:  # Fallback for Flask-style imports
     from database.dbconnect import (  # type: ignore
@@ -30,7 +31,8 @@ except ImportError:  # Fallback for Flask-style imports
         detect_db_type,
         get_metadata_table_refs,
     )
-    from modules.common.id_provider import IdProviderError, next_id  # type: ignore
+    from modules.common.describe_cache import describe  # type: ignore
+    from modules.common.id_provider import IdProviderError, next_id, next_ids  # type: ignore
     from modules.logger import debug, error, info  # type: ignore
 
 MAX_PREVIEW_ROWS = 1000
@@ -844,17 +846,30 @@ class ReportMetadataService(_MetadataRepository):
         sql_clean = (sql_text or "").strip().rstrip(";")
         if not sql_clean.lower().startswith("select"):
             raise ReportServiceError("Preview only supports SELECT statements", code="SQL_NOT_SELECT")
-        connection = None
-        cursor = None
+
+        def load_description():
+            connection = None
+            cursor = None
+            try:
+                if connection_id:
+                    connection = create_target_connection(connection_id)
+                else:
+                    connection = create_metadata_connection()
+                cursor = connection.cursor()
+                wrapper = f"SELECT * FROM ({sql_clean}) src WHERE 1=0"
+                cursor.execute(wrapper)
+                return detect_db_type(connection), cursor.description or []
+            finally:
+                if cursor:
+                    with suppress(Exception):
+                        cursor.close()
+                if connection:
+                    with suppress(Exception):
+                        connection.close()
+
         try:
-            if connection_id:
-                connection = create_target_connection(connection_id)
-            else:
-                connection = create_metadata_connection()
-            cursor = connection.cursor()
-            wrapper = f"SELECT * FROM ({sql_clean}) src WHERE 1=0"
-            cursor.execute(wrapper)
-            description = cursor.description or []
+            # Served from the shared describe cache when the same SQL was described recently
+            _, description = describe(connection_id or None, sql_clean, load_description)
             columns: List[Dict[str, Any]] = []
             for desc in description:
                 column_name = desc[0]
@@ -869,13 +884,6 @@ class ReportMetadataService(_MetadataRepository):
         except Exception as exc:  # pragma: no cover - defensive
             error(f"[ReportMetadataService] SQL description failed: {exc}", exc_info=True)
             raise ReportServiceError("Failed to describe SQL", code="SQL_INTROSPECT_FAILED") from exc
-        finally:
-            if cursor:
-                with suppress(Exception):
-                    cursor.close()
-            if connection:
-                with suppress(Exception):
-                    connection.close()
 
     def _apply_row_limit(self, base_sql: str, db_type: str, row_limit: Optional[int]):
         if row_limit is None:
@@ -1861,8 +1869,8 @@ class ReportMetadataService(_MetadataRepository):
 
     def _persist_formulas(self, cursor, tables, db_type, report_id, formulas, username) -> Dict[str, int]:
         id_map: Dict[str, int] = {}
-        for formula in formulas:
-            formula_id = self._next_id(cursor, "DMS_RPRT_FRML_SEQ")
+        formula_ids = self._next_ids(cursor, "DMS_RPRT_FRML_SEQ", len(formulas))
+        for formula, formula_id in zip(formulas, formula_ids):
             columns = ["FRMLA_ID", "RPRTID", "NM", "XPRSN", "SPPRTD_DB_TYP", "HLP_TXT"]
             values = [
                 formula_id,
@@ -1881,8 +1889,8 @@ class ReportMetadataService(_MetadataRepository):
     def _persist_fields(self, cursor, tables, db_type, report_id, fields, formula_map):
         self._ensure_grouping_columns(cursor, tables, db_type)
         grp_col, seq_col, dir_col = self._grouping_column_names(db_type)
-        for index, field in enumerate(fields):
-            field_id = self._next_id(cursor, "DMS_RPRT_FLD_SEQ")
+        field_ids = self._next_ids(cursor, "DMS_RPRT_FLD_SEQ", len(fields))
+        for index, (field, field_id) in enumerate(zip(fields, field_ids)):
             panel_type = (field.get("panelType") or "DETAIL").upper()
             row_order = field.get("rowOrder", index + 1)
             formula_id = self._resolve_formula_id(field, formula_map)
@@ -2183,6 +2191,13 @@ class ReportMetadataService(_MetadataRepository):
             error(f"[ReportMetadataService] Failed to fetch ID for {sequence_name}: {exc}")
             raise ReportServiceError(f"Unable to generate ID for {sequence_name}", code="ID_PROVIDER_ERROR") from exc
 
+    def _next_ids(self, cursor, sequence_name: str, count: int) -> List[int]:
+        try:
+            return next_ids(cursor, sequence_name, count)
+        except IdProviderError as exc:
+            error(f"[ReportMetadataService] Failed to fetch {count} IDs for {sequence_name}: {exc}")
+            raise ReportServiceError(f"Unable to generate ID for {sequence_name}", code="ID_PROVIDER_ERROR") from exc
+
     def _resolve_formula_id(self, field: Dict[str, Any], formula_map: Dict[str, int]) -> Optional[int]:
         if field.get("formulaId"):
             return self._to_int(field.get("formulaId"))
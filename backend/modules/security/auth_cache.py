@@ -0,0 +1,90 @@
+"""
+In-process cache of authenticated user records and resolved permissions.
+
+Every authenticated request used to hit the auth database for the user row
+(and again for admin role / module access checks). These lookups are now
+served from TTL caches; the admin and security endpoints that change users,
+roles, modules or module access call the ``invalidate_*`` helpers so edits
+are visible immediately on this worker. Other workers pick them up once the
+TTL (``AUTH_CACHE_TTL_SECONDS``, default 60, 0 disables caching) elapses.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, List, Optional
+
+try:
+    from backend.modules.common.ttl_cache import TTLCache
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.common.ttl_cache import TTLCache  # type: ignore
+
+
+def _ttl_from_env() -> float:
+    try:
+        return float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    except ValueError:
+        return 60.0
+
+
+_TTL_SECONDS = _ttl_from_env()
+
+# user_id -> users row
+_user_cache = TTLCache(ttl_seconds=_TTL_SECONDS)
+# (kind, user_id, *extra) -> resolved permission data
+_permission_cache = TTLCache(ttl_seconds=_TTL_SECONDS)
+
+
+def get_user(user_id: Any, loader: Callable[[], Any]) -> Any:
+    """Return the cached user row for ``user_id``; missing users are not cached."""
+    user = _user_cache.get(user_id)
+    if user is not None:
+        return user
+    user = loader()
+    if user is not None:
+        _user_cache.set(user_id, user)
+    return user
+
+
+def is_admin(user_id: Any, loader: Callable[[], bool]) -> bool:
+    """Return the cached admin flag for ``user_id``."""
+    return _permission_cache.get_or_load(("admin", user_id), lambda: bool(loader()))
+
+
+def get_module_states(user_id: Any, loader: Callable[[], List[dict]]) -> List[dict]:
+    """Return a copy of the cached module access list for ``user_id``."""
+    states = _permission_cache.get_or_load(("modules", user_id), loader)
+    return [dict(module) for module in states]
+
+
+def get_permissions(
+    user_id: Any, module_name: str, loader: Callable[[], Optional[List[dict]]]
+) -> Optional[List[dict]]:
+    """
+    Return a copy of the cached role permissions of ``user_id`` on ``module_name``.
+    A loader result of None (unknown user) is passed through and not cached.
+    """
+    key = ("permissions", user_id, module_name)
+    permissions = _permission_cache.get(key)
+    if permissions is None:
+        permissions = loader()
+        if permissions is None:
+            return None
+        _permission_cache.set(key, permissions)
+    return [dict(permission) for permission in permissions]
+
+
+def invalidate_user(user_id: Any) -> None:
+    """Forget the user row and every permission entry of one user."""
+    _user_cache.invalidate(user_id)
+    _permission_cache.invalidate_where(lambda key: key[1] == user_id)
+
+
+def invalidate_permissions() -> None:
+    """Forget all resolved permissions (role or module definitions changed)."""
+    _permission_cache.clear()
+
+
+def invalidate_all() -> None:
+    """Forget every cached user and permission."""
+    _user_cache.clear()
+    _permission_cache.clear()
@@ -17,6 +17,7 @@ try:
         ensure_user_module_table,
         get_user_module_states,
     )
+    from backend.modules.security import auth_cache
 except ImportError:  # When running Flask app.py directly inside backend
     from modules.security.utils import (  # type: ignore
         AVAILABLE_MODULES,
@@ -24,6 +25,7 @@ except ImportError:  # When running Flask app.py directly inside backend
         ensure_user_module_table,
         get_user_module_states,
     )
+    from modules.security import auth_cache  # type: ignore
     from sqlalchemy import create_engine  # type: ignore
     engine = create_engine(os.getenv('SQLITE_DATABASE_URL'))  # type: ignore
     Session = sessionmaker(bind=engine)  # type: ignore
@@ -80,7 +82,11 @@ def get_current_user(request: Request):
 
 # Helper function to check admin permission
 def check_admin_permission(user_id: int) -> bool:
-    """Check if user has admin role"""
+    """Check if user has admin role (cached in auth_cache)"""
+    return auth_cache.is_admin(user_id, lambda: _load_admin_flag(user_id))
+
+
+def _load_admin_flag(user_id: int) -> bool:
     session = Session()
     try:
         result = session.execute(
@@ -215,6 +221,7 @@ async def update_user_access(
             )
 
         session.commit()
+        auth_cache.invalidate_user(user_id)
         modules = get_user_module_states(session, user_id)
         return {'message': 'User access updated successfully', 'modules': modules}
     except HTTPException:
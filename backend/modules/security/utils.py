@@ -1,5 +1,10 @@
 from sqlalchemy import text
 
+try:
+    from backend.modules.security import auth_cache
+except ImportError:  # When running Flask app.py directly inside backend
+    from modules.security import auth_cache  # type: ignore
+
 # Define the modules that can be toggled for end users.
 # Other groups (Essentials, Admin) remain universally available.
 AVAILABLE_MODULES = [
@@ -83,7 +88,14 @@ def get_user_module_states(session, user_id):
     """
     Returns a list of available modules with an enabled flag for the given user.
     Missing entries default to enabled (True) to avoid locking out existing users.
+    Results are cached per user in auth_cache.
     """
+    return auth_cache.get_module_states(
+        user_id, lambda: _load_user_module_states(session, user_id)
+    )
+
+
+def _load_user_module_states(session, user_id):
     ensure_user_module_table(session)
 
     results = session.execute(
@@ -0,0 +1,59 @@
+"""Tests for the adaptive batch size controller."""
+import os
+import sys
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.common.adaptive_batch import BatchSizeController, batch_size_controller
+
+
+def test_size_converges_on_target_latency_within_bounds():
+    controller = BatchSizeController(1000, min_size=100, max_size=50000, target_seconds=1.0)
+
+    # 0.1 ms per row: the target is 10,000 rows, reached in 2x steps
+    sizes = [controller.record(controller.size, write_seconds=controller.size * 0.0001) for _ in range(6)]
+    assert sizes[:4] == [2000, 4000, 8000, 10000]
+    assert controller.size == 10000
+
+    # Rows get 10x more expensive: the size settles near the new target (within
+    # the 10% dead band), 2x per step at most
+    for _ in range(10):
+        controller.record(controller.size, fetch_seconds=controller.size * 0.001)
+    assert 1000 <= controller.size <= 1100
+    assert f"converged to {controller.size} rows" in controller.summary()
+
+    fast = BatchSizeController(1000, min_size=100, max_size=3000, target_seconds=1.0)
+    for _ in range(5):
+        fast.record(fast.size, transform_seconds=0.0)
+    assert fast.size == 3000
+
+
+def test_memory_ceiling_shrinks_batches_regardless_of_latency():
+    rss = {"bytes": 100 * 1024 * 1024}
+    controller = BatchSizeController(
+        8000, min_size=500, max_size=100000, target_seconds=10.0,
+        memory_ceiling_mb=200, rss_reader=lambda: rss["bytes"],
+    )
+
+    controller.record(8000, write_seconds=0.8)
+    assert controller.size == 16000
+
+    rss["bytes"] = 170 * 1024 * 1024  # above 80% of the ceiling: no growth
+    controller.record(16000, write_seconds=0.8)
+    assert controller.size == 16000
+
+    rss["bytes"] = 250 * 1024 * 1024
+    controller.record(16000, write_seconds=0.8)
+    assert controller.size == 8000
+
+
+def test_controller_is_opt_in_and_respects_caller_bounds(monkeypatch):
+    monkeypatch.delenv("ADAPTIVE_BATCH_ENABLED", raising=False)
+    assert batch_size_controller("loads", 5000) is None
+
+    monkeypatch.setenv("ADAPTIVE_BATCH_ENABLED", "true")
+    monkeypatch.setenv("ADAPTIVE_BATCH_MAX_ROWS", "200000")
+    controller = batch_size_controller("oracle inserts", 5000, min_size=100, max_size=1000)
+    assert (controller.size, controller.max_size) == (1000, 1000)
@@ -0,0 +1,91 @@
+"""Unit tests for the TTL cache and the auth user/permission cache."""
+import os
+import sys
+import time
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.common.ttl_cache import TTLCache
+from backend.modules.security import auth_cache
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(ttl_seconds=0.05)
+    cache.set("k", 1)
+    assert cache.get("k") == 1
+    time.sleep(0.06)
+    assert cache.get("k") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_user_lookup_is_cached_until_invalidated():
+    auth_cache.invalidate_all()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"user_id": 7}
+
+    assert auth_cache.get_user(7, loader) == {"user_id": 7}
+    assert auth_cache.get_user(7, loader) == {"user_id": 7}
+    assert len(calls) == 1
+
+    auth_cache.invalidate_user(7)
+    auth_cache.get_user(7, loader)
+    assert len(calls) == 2
+
+
+def test_missing_user_is_not_cached():
+    auth_cache.invalidate_all()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert auth_cache.get_user(99, loader) is None
+    assert auth_cache.get_user(99, loader) is None
+    assert len(calls) == 2
+
+
+def test_invalidate_user_drops_permission_entries_of_that_user_only():
+    auth_cache.invalidate_all()
+    auth_cache.is_admin(1, lambda: True)
+    auth_cache.is_admin(2, lambda: False)
+
+    auth_cache.invalidate_user(1)
+
+    assert auth_cache.is_admin(1, lambda: False) is False
+    assert auth_cache.is_admin(2, lambda: True) is False
+
+
+def test_module_states_are_returned_as_copies():
+    auth_cache.invalidate_all()
+    states = auth_cache.get_module_states(3, lambda: [{"key": "jobs", "enabled": True}])
+    states[0]["enabled"] = False
+
+    again = auth_cache.get_module_states(3, lambda: [])
+    assert again == [{"key": "jobs", "enabled": True}]
+
+
+def test_invalidate_permissions_keeps_user_rows():
+    auth_cache.invalidate_all()
+    auth_cache.get_user(5, lambda: {"user_id": 5})
+    auth_cache.get_permissions(5, "jobs", lambda: [{"can_view": "Yes"}])
+
+    auth_cache.invalidate_permissions()
+
+    assert auth_cache.get_user(5, lambda: None) == {"user_id": 5}
+    assert auth_cache.get_permissions(5, "jobs", lambda: []) == []
@@ -0,0 +1,67 @@
+"""Tests for concurrent dashboard export queries and the export log message."""
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+pytest.importorskip("sqlalchemy")
+
+from backend.modules.dashboard import dashboard_creator_service
+from backend.modules.dashboard.dashboard_creator_service import DashboardCreatorService
+
+
+def _service(widgets):
+    service = DashboardCreatorService.__new__(DashboardCreatorService)
+    service.report_service = Mock()
+    service.get_dashboard = Mock(return_value={"dashboardId": 1, "widgets": widgets})
+    return service
+
+
+def test_widget_queries_run_concurrently_within_the_per_connection_limit(monkeypatch):
+    monkeypatch.setattr(dashboard_creator_service, "EXPORT_MAX_WORKERS", 4)
+    monkeypatch.setattr(dashboard_creator_service, "EXPORT_PER_CONNECTION_LIMIT", 1)
+    widgets = [
+        {"widgetName": f"W{index}", "adhocSql": f"SELECT {index} FROM dual", "dbConnectionId": connection_id}
+        for index, connection_id in enumerate([5, 5, 6, 6])
+    ]
+    running, peak, lock = {}, {}, threading.Lock()
+
+    def run_preview_query(connection_id, sql_text, row_limit, parameters):
+        with lock:
+            running[connection_id] = running.get(connection_id, 0) + 1
+            peak[connection_id] = max(peak.get(connection_id, 0), running[connection_id])
+        time.sleep(0.05)
+        with lock:
+            running[connection_id] -= 1
+        return {"columns": ["N"], "rows": [{"N": sql_text.split()[1]}], "dbType": "ORACLE"}
+
+    service = _service(widgets)
+    service.report_service._run_preview_query.side_effect = run_preview_query
+
+    export = service._collect_export_data(1)
+
+    # Widget order is kept, and each connection ran one query at a time
+    assert [widget["widgetName"] for widget in export["widgets"]] == ["W0", "W1", "W2", "W3"]
+    assert [widget["rows"] for widget in export["widgets"]] == [[{"N": str(index)}] for index in range(4)]
+    assert peak == {5: 1, 6: 1}
+    # The two connections ran side by side: about two queries' time instead of four
+    assert export["queryWallMs"] < 180
+
+
+def test_export_log_message_fits_the_column_in_bytes():
+    widgets = [
+        {"widgetName": "Umsätze je Bundesland – Übersicht", "queryMs": 12, "rowCount": 500, "connectionId": 7}
+        for _ in range(80)
+    ]
+    message = _service([])._format_export_timings({"widgets": widgets, "queryWallMs": 40}, render_ms=9)
+
+    assert len(message.encode("utf-8")) <= dashboard_creator_service.EXPORT_LOG_MESSAGE_LIMIT
+    assert message.startswith("Queries 40 ms wall / 960 ms total, render 9 ms")
+    assert message.endswith("...")
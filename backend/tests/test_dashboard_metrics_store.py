@@ -0,0 +1,186 @@
+"""Tests for the incrementally refreshed dashboard metrics store (SQLite stand-in)."""
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.dashboard.dashboard_metrics_store import DashboardMetricsStore
+
+
+@pytest.fixture
+def metadata_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_TYPE", "ORACLE")  # sqlite accepts :named binds
+    monkeypatch.setenv("DMS_SCHEMA", "")
+    path = str(tmp_path / "meta.db")
+    conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.executescript(
+        """
+        CREATE TABLE DMS_PRCLOG (prcid INTEGER, mapref TEXT, status TEXT,
+                                 strtdt TIMESTAMP, enddt TIMESTAMP, sessionid INTEGER);
+        CREATE TABLE DMS_JOBLOG (joblogid INTEGER, prcdt TIMESTAMP, mapref TEXT,
+                                 srcrows INTEGER, trgrows INTEGER, prcid INTEGER, sessionid INTEGER);
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    def factory():
+        return sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+
+    return factory
+
+
+def _add_run(factory, prcid, mapref, status, start, seconds, srcrows, trgrows):
+    conn = factory()
+    end = start + timedelta(seconds=seconds) if status != 'IP' else None
+    conn.execute("INSERT INTO DMS_PRCLOG VALUES (?, ?, ?, ?, ?, ?)", (prcid, mapref, status, start, end, prcid))
+    conn.execute("INSERT INTO DMS_JOBLOG VALUES (?, ?, ?, ?, ?, ?, ?)", (prcid, start, mapref, srcrows, trgrows, prcid, prcid))
+    conn.commit()
+    conn.close()
+
+
+def _finish_run(factory, prcid, status, end):
+    conn = factory()
+    conn.execute("UPDATE DMS_PRCLOG SET status = ?, enddt = ? WHERE prcid = ?", (status, end, prcid))
+    conn.commit()
+    conn.close()
+
+
+def _store(factory, **kwargs):
+    return DashboardMetricsStore(
+        config_loader=lambda connection, cursor: [[1, 1, 1, 1, 1, 1, 1]],
+        refresh_seconds=30,
+        overlap_seconds=300,
+        rebuild_seconds=0,
+        connection_factory=factory,
+        **kwargs,
+    )
+
+
+def test_store_is_cold_until_first_refresh(metadata_db):
+    store = _store(metadata_db)
+    assert store.jobs_overview() is None
+    store.refresh()
+    assert store.jobs_overview() == []
+    assert store.all_metrics() == [[1, 1, 1, 1, 1, 1, 1]]
+
+
+def test_finished_runs_are_folded_once(metadata_db):
+    now = datetime.now().replace(microsecond=0)
+    _add_run(metadata_db, 1, "M1", "PC", now - timedelta(hours=2), 60, 100, 90)
+    _add_run(metadata_db, 2, "M1", "FL", now - timedelta(hours=1), 120, 50, 0)
+    store = _store(metadata_db)
+
+    store.refresh()
+    store.refresh()  # re-reading the overlap window must not double count
+
+    assert store.jobs_overview() == [["M1", 2, 75.0, 45.0, 120.0, 60.0]]
+    assert store.jobs_successful_failed() == [["M1", 1, 1]]
+    assert store.jobs_average_run_duration() == [["M1", 90.0]]
+    durations = store.jobs_executed_duration("M1", "ALL")
+    assert [row[2] for row in durations] == [60.0, 120.0]
+
+
+def test_open_runs_are_overlaid_then_folded_when_finished(metadata_db):
+    now = datetime.now().replace(microsecond=0)
+    _add_run(metadata_db, 1, "M1", "PC", now - timedelta(hours=2), 60, 100, 100)
+    _add_run(metadata_db, 2, "M1", "IP", now - timedelta(minutes=5), 0, 10, 10)
+    store = _store(metadata_db)
+    store.refresh()
+
+    overview = store.jobs_overview()
+    assert overview[0][1] == 2          # running joblog rows count like the live query
+    assert overview[0][4] == 60.0       # but have no duration yet
+    assert store.jobs_successful_failed() == [["M1", 0, 1]]
+
+    _finish_run(metadata_db, 2, "PC", now)
+    store.refresh()
+
+    assert store.jobs_successful_failed() == [["M1", 0, 2]]
+    assert store.jobs_overview()[0][1] == 2
+    assert store.jobs_overview()[0][4] == 300.0
+
+
+def test_processed_rows_respect_period(metadata_db):
+    now = datetime.now().replace(microsecond=0)
+    _add_run(metadata_db, 1, "M1", "PC", now - timedelta(days=10), 1, 5, 5)
+    _add_run(metadata_db, 2, "M1", "PC", now - timedelta(days=3), 1, 7, 6)
+    store = _store(metadata_db)
+    store.refresh()
+
+    assert len(store.jobs_processed_rows("M1", "ALL")) == 2
+    week = store.jobs_processed_rows("M1", "WEEK")
+    assert week == [["M1", (now - timedelta(days=3)).strftime('%Y-%m-%d'), 7, 6]]
+    assert store.jobs_processed_rows("M1", "DAY") == []
+    assert len(store.jobs_executed_duration("M1", "7")) == 1
+
+
+def test_joblog_rows_without_a_run_count_as_processed_rows(metadata_db):
+    now = datetime.now().replace(microsecond=0)
+    _add_run(metadata_db, 1, "M1", "PC", now - timedelta(hours=1), 60, 5, 5)
+    conn = metadata_db()
+    conn.execute("INSERT INTO DMS_JOBLOG VALUES (?, ?, ?, ?, ?, ?, ?)", (2, now, "M1", 3, 2, 99, 99))
+    conn.commit()
+    conn.close()
+    store = _store(metadata_db)
+
+    store.refresh()
+    store.refresh()  # the overlap is re-read, but each JOBLOGID is folded once
+
+    assert store.jobs_processed_rows("M1", "DAY") == [["M1", now.strftime('%Y-%m-%d'), 8, 7]]
+    assert store.jobs_overview()[0][1] == 1
+
+    # Later orphan rows are picked up from the PRCDT watermark on
+    conn = metadata_db()
+    conn.execute("INSERT INTO DMS_JOBLOG VALUES (?, ?, ?, ?, ?, ?, ?)", (3, now, "M1", 4, 4, 98, 98))
+    conn.commit()
+    conn.close()
+    store.refresh()
+
+    assert store.jobs_processed_rows("M1", "DAY") == [["M1", now.strftime('%Y-%m-%d'), 12, 11]]
+
+
+def test_orphan_joblog_rows_before_the_overlap_are_not_re_read(metadata_db):
+    now = datetime.now().replace(microsecond=0)
+    conn = metadata_db()
+    conn.execute("INSERT INTO DMS_JOBLOG VALUES (?, ?, ?, ?, ?, ?, ?)", (1, now - timedelta(hours=1), "M1", 3, 2, 99, 99))
+    conn.execute("INSERT INTO DMS_JOBLOG VALUES (?, ?, ?, ?, ?, ?, ?)", (2, now, "M1", 1, 1, 99, 99))
+    conn.commit()
+    conn.close()
+    queries = []
+
+    def tracing_factory():
+        conn = metadata_db()
+        conn.set_trace_callback(queries.append)
+        return conn
+
+    store = _store(tracing_factory)
+    store.refresh()
+    queries.clear()
+    store.refresh()
+
+    orphan_query = next(query for query in queries if "p.prcid IS NULL" in query)
+    assert "l.prcdt >=" in orphan_query
+    assert sum(row[2] for row in store.jobs_processed_rows("M1", "ALL")) == 4
+
+
+def test_duration_samples_keep_the_latest_runs(metadata_db):
+    now = datetime.now().replace(microsecond=0)
+    for prcid in range(1, 11):
+        _add_run(metadata_db, prcid, "M1", "PC", now - timedelta(hours=20 - prcid), prcid, 1, 1)
+    store = _store(metadata_db, max_duration_samples=4)
+
+    store.refresh()
+
+    # Periods covered by the kept samples are answered from memory
+    durations = [row[2] for row in store.jobs_executed_duration("M1", "0.55")]
+    assert durations == [7.0, 8.0, 9.0, 10.0]
+    # Reaching back past the dropped samples falls back to the live query
+    assert store.jobs_executed_duration("M1", "1") is None
+    assert store.jobs_executed_duration("M1", "ALL") is None
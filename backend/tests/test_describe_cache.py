@@ -0,0 +1,55 @@
+"""Tests for the shared SQL describe cache used by the column pickers."""
+import os
+import sys
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.common import describe_cache
+from backend.modules.common.describe_cache import describe, invalidate_sql
+
+DESCRIPTION = [("ID", "NUMBER", None, None, 10, 0, False), ("NAME", "VARCHAR2", None, 50, None, None, True)]
+
+
+def _loader(calls):
+    def load():
+        calls.append(1)
+        return "ORACLE", DESCRIPTION
+    return load
+
+
+def setup_function():
+    describe_cache.clear_describe_cache()
+
+
+def test_repeat_describes_skip_the_source():
+    calls = []
+    first = describe(5, "SELECT id, name FROM t", _loader(calls))
+    again = describe("5", "SELECT id,  name\n FROM t;", _loader(calls))
+
+    assert first == again == ("ORACLE", [tuple(column) for column in DESCRIPTION])
+    assert len(calls) == 1
+    # Same text on another connection (or the metadata connection) is described separately
+    describe(6, "SELECT id, name FROM t", _loader(calls))
+    describe(None, "SELECT id, name FROM t", _loader(calls))
+    assert len(calls) == 3
+
+
+def test_saving_sql_invalidates_it_on_every_connection():
+    calls = []
+    for conid in (5, 6):
+        describe(conid, "SELECT id, name FROM t", _loader(calls))
+    describe(5, "SELECT 1 FROM dual", lambda: ("ORACLE", [("1", "NUMBER")]))
+
+    assert invalidate_sql(None, "SELECT id, name FROM t") == 2
+    describe(5, "SELECT id, name FROM t", _loader(calls))
+    describe(5, "SELECT 1 FROM dual", _loader(calls))
+    assert len(calls) == 3
+
+
+def test_empty_descriptions_are_not_cached():
+    calls = []
+    describe(5, "SELECT x FROM broken", lambda: (calls.append(1), ("ORACLE", []))[1])
+    describe(5, "SELECT x FROM broken", lambda: (calls.append(1), ("ORACLE", []))[1])
+    assert len(calls) == 2
@@ -0,0 +1,90 @@
+"""Tests for history backfill planning and execution."""
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import date
+from unittest.mock import Mock
+
+import pytest
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.jobs.history_backfill import (
+    BACKFILL_ORDERED,
+    BACKFILL_PARALLEL,
+    BackfillProgress,
+    JobFlowSession,
+    plan_history_backfill,
+)
+
+
+def test_fact_targets_run_day_slices_in_parallel_dimensions_in_order(monkeypatch):
+    monkeypatch.setenv("HISTORY_BACKFILL_MAX_WORKERS", "6")
+
+    plan = plan_history_backfill(date(2024, 2, 27), date(2024, 3, 2), "Y", "FCT")
+    assert (plan.mode, plan.max_workers) == (BACKFILL_PARALLEL, 6)
+    assert [s.params["param1"] for s in plan.slices] == [
+        "27-Feb-2024", "28-Feb-2024", "29-Feb-2024", "01-Mar-2024", "02-Mar-2024",
+    ]
+    assert [s.truncate_flag for s in plan.slices] == ["Y", "N", "N", "N", "N"]
+
+    assert plan_history_backfill(date(2024, 1, 1), date(2024, 1, 9), "N", "DIM").mode == BACKFILL_ORDERED
+    assert plan_history_backfill(date(2024, 1, 1), date(2024, 1, 9), "N", None).mode == BACKFILL_ORDERED
+    assert plan_history_backfill(date(2024, 1, 1), date(2024, 1, 9), "N", "MRT", max_workers=1).mode == BACKFILL_ORDERED
+
+
+def test_progress_and_session_bookkeeping():
+    plan = plan_history_backfill(date(2024, 1, 1), date(2024, 1, 3), "N", "FCT", max_workers=2)
+    progress = BackfillProgress("MAP_HIST", plan)
+    progress.record(plan.slices[2], {"status": "SUCCESS", "prcid": 3, "result": {"source_rows": 5, "target_rows": 4}})
+    progress.record(plan.slices[0], error_message="boom")
+
+    assert [entry["date"] for entry in progress.as_list()] == ["2024-01-01", "2024-01-03"]
+    assert progress.failed[0]["error"] == "boom"
+    assert progress.as_list()[1]["target_rows"] == 4
+
+    connection = Mock()
+    session = JobFlowSession(reuse_connections=True, source_conn=connection, target_conn=connection)
+    session.close()
+    connection.close.assert_called_once()
+
+
+def test_engine_runs_fact_backfill_concurrently_after_truncate_slice():
+    for module in ("oracledb", "sqlalchemy", "apscheduler"):
+        pytest.importorskip(module)
+    from backend.modules.jobs.execution_engine import JobExecutionEngine
+    from backend.modules.jobs.pkgdwprc_python import JobRequestType
+    from backend.modules.jobs.scheduler_models import QueueRequest
+
+    engine = JobExecutionEngine()
+
+    @contextmanager
+    def fake_connection():
+        yield Mock(), Mock()
+
+    engine._db_connection = fake_connection
+    engine._load_job_flow = Mock(return_value={"MAPREF": "MAP_HIST", "TRGTBTYP": "FCT"})
+    calls = []
+    lock = threading.Lock()
+
+    def fake_flow(mapref, payload, shared):
+        with lock:
+            calls.append(payload["params"])
+        if payload["params"]["param1"] == "03-Jan-2024":
+            raise RuntimeError("source offline")
+        return {"status": "SUCCESS", "prcid": len(calls), "result": {"source_rows": 1, "target_rows": 1}}
+
+    engine._execute_job_flow = fake_flow
+    request = Mock(spec=QueueRequest)
+    request.request_type = JobRequestType.HISTORY
+    request.mapref = "MAP_HIST"
+    request.payload = {"start_date": "2024-01-01", "end_date": "2024-01-04", "truncate_flag": "Y"}
+
+    with pytest.raises(Exception, match="1 of 4 days: 2024-01-03"):
+        engine.execute(request)
+
+    assert calls[0] == {"param1": "01-Jan-2024", "truncate_flag": "Y"}
+    assert len(calls) == 4
@@ -0,0 +1,97 @@
+"""Tests for bulk and prefetched ID allocation."""
+import os
+import sys
+
+import pytest
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.common import id_provider
+from backend.modules.common.id_provider import next_id, next_ids
+
+
+class SequenceCursor:
+    """Answers sequence queries from an in-memory counter."""
+
+    def __init__(self):
+        self.value = 100
+        self.statements = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+        count = 1
+        if params:
+            count = params["count"] if isinstance(params, dict) else params[0]
+        self._rows = [(self.value + i + 1,) for i in range(count)]
+        self.value += count
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return list(reversed(self._rows))
+
+
+class IdPoolCursor:
+    """Single DMS_IDPOOL row for the TABLE_COUNTER tests."""
+
+    def __init__(self, current_value, block_size):
+        self.row = (current_value, block_size)
+        self.updates = []
+
+    def execute(self, sql, params=None):
+        if sql.strip().startswith("UPDATE"):
+            self.updates.append(params)
+            self.row = (params[0], params[1])
+
+    def fetchone(self):
+        return self.row
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    def configure(db_type, mode="SEQUENCE", block_size=5):
+        monkeypatch.setattr(id_provider, "_DB_TYPE_CACHE", db_type)
+        monkeypatch.setattr(id_provider, "_config_cache", id_provider._IdConfig(mode, block_size, {}))
+
+    monkeypatch.setattr(id_provider, "_block_cache", {})
+    monkeypatch.setattr(id_provider, "_prefetch_cache", {})
+    return configure
+
+
+@pytest.mark.parametrize("db_type, expected_sql", [
+    ("ORACLE", "SELECT DMS_RPRT_FLD_SEQ.NEXTVAL FROM dual CONNECT BY LEVEL <= :count"),
+    ("POSTGRESQL", "SELECT nextval('DMS_RPRT_FLD_SEQ') FROM generate_series(1, %s)"),
+])
+def test_sequence_values_come_from_one_query(provider, db_type, expected_sql):
+    provider(db_type)
+    cursor = SequenceCursor()
+
+    assert next_ids(cursor, "DMS_RPRT_FLD_SEQ", 4) == [101, 102, 103, 104]
+    assert cursor.statements == [(expected_sql, {"count": 4} if db_type == "ORACLE" else (4,))]
+    assert next_ids(cursor, "DMS_RPRT_FLD_SEQ", 0) == []
+
+
+def test_prefetch_serves_calls_from_the_buffer(provider):
+    provider("POSTGRESQL")
+    cursor = SequenceCursor()
+
+    assert [next_id(cursor, "DMS_JOBERRSEQ", prefetch=3) for _ in range(4)] == [101, 102, 103, 104]
+    assert len(cursor.statements) == 2
+    # Without prefetch the buffer is left alone
+    assert next_id(cursor, "DMS_JOBERRSEQ") == 107
+    assert next_id(cursor, "DMS_JOBERRSEQ", prefetch=3) == 105
+
+
+def test_table_counter_uses_cached_block_then_reserves_the_rest(provider):
+    provider("POSTGRESQL", mode="TABLE_COUNTER", block_size=5)
+    cursor = IdPoolCursor(current_value=0, block_size=5)
+
+    assert next_id(cursor, "DMS_RPRT_FLD_SEQ") == 1
+    assert next_ids(cursor, "DMS_RPRT_FLD_SEQ", 10) == list(range(2, 12))
+    # One reservation of at least the 6 missing values, block size kept
+    assert cursor.updates[-1] == (11, 5, "DMS_RPRT_FLD_SEQ")
+    assert next_ids(cursor, "DMS_RPRT_FLD_SEQ", 2) == [12, 13]
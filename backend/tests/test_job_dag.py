@@ -0,0 +1,93 @@
+"""Tests for the job dependency DAG."""
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+import pytest
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.jobs import job_dag
+from backend.modules.jobs.job_dag import DagCycleError, JobDag, load_job_dag
+
+#   EXTRACT -> STG_A -> DIM_A ---\
+#           \-> STG_B -> DIM_B ----> FCT_SALES -> MRT_SALES
+#                     \-> AUDIT_B
+EDGES = [
+    ("EXTRACT", "STG_A"), ("EXTRACT", "STG_B"),
+    ("STG_A", "DIM_A"), ("STG_B", "DIM_B"), ("STG_B", "AUDIT_B"),
+    ("DIM_A", "FCT_SALES"), ("DIM_B", "FCT_SALES"),
+    ("FCT_SALES", "MRT_SALES"),
+]
+
+
+def _at(hour, minute=0):
+    return datetime(2024, 5, 1, hour, minute)
+
+
+def test_order_cycles_and_critical_path():
+    dag = JobDag(EDGES)
+    assert dag.order.index("FCT_SALES") > max(dag.order.index("DIM_A"), dag.order.index("DIM_B"))
+    assert sorted(dag.descendants("STG_B")) == ["AUDIT_B", "DIM_B", "FCT_SALES", "MRT_SALES"]
+
+    with pytest.raises(DagCycleError, match="cycle"):
+        dag.with_edge("MRT_SALES", "STG_A")
+
+    durations = {"EXTRACT": 10, "STG_A": 5, "STG_B": 20, "DIM_A": 30, "DIM_B": 5, "AUDIT_B": 90, "FCT_SALES": 40}
+    assert dag.critical_path(durations) == (["EXTRACT", "STG_B", "AUDIT_B"], 120.0)
+    durations["MRT_SALES"] = 50
+    assert dag.critical_path(durations) == (["EXTRACT", "STG_A", "DIM_A", "FCT_SALES", "MRT_SALES"], 135.0)
+
+
+def test_fan_in_is_ready_once_per_cycle_after_all_parents_succeeded():
+    dag = JobDag(EDGES)
+    runs = {
+        "DIM_A": ("PC", _at(1), _at(1, 10)),
+        "DIM_B": ("IP", _at(1), None),
+        "FCT_SALES": ("PC", _at(0), _at(0, 30)),
+    }
+    # DIM_A finishing alone does not release FCT_SALES
+    assert dag.ready_cycle("FCT_SALES", runs) is None
+
+    runs["DIM_B"] = ("PC", _at(1), _at(1, 20))
+    # Both parents finishing name the same cycle: the later parent end
+    assert dag.ready_cycle("FCT_SALES", runs) == _at(1, 20)
+
+    # Once FCT_SALES has run, it waits for both parents to succeed again
+    runs["FCT_SALES"] = ("PC", _at(1, 21), _at(1, 40))
+    runs["DIM_A"] = ("PC", _at(2), _at(2, 10))
+    assert dag.ready_cycle("FCT_SALES", runs) is None
+
+    # A failed parent holds the child back
+    runs["DIM_B"] = ("FL", _at(2), _at(2, 5))
+    assert dag.ready_cycle("FCT_SALES", runs) is None
+    assert dag.ready_cycle("EXTRACT", runs) is None
+
+
+def test_load_job_dag_falls_back_to_dpnd_jobschid_without_dms_jobdpnd(monkeypatch):
+    monkeypatch.setenv("DMS_SCHEMA", "")
+    monkeypatch.setattr(job_dag, "_dependency_table", {})
+    connection = sqlite3.connect(":memory:")
+    connection.executescript(
+        """
+        CREATE TABLE DMS_JOBSCH (jobschid INTEGER, mapref TEXT, dpnd_jobschid INTEGER, curflg TEXT, schflg TEXT);
+        INSERT INTO DMS_JOBSCH VALUES (1, 'DIM_A', NULL, 'Y', 'Y'), (2, 'DIM_B', NULL, 'Y', 'Y'),
+                                      (3, 'FCT_SALES', 2, 'Y', 'Y');
+        """
+    )
+
+    # Migration not applied: only the DPND_JOBSCHID parent is known
+    assert load_job_dag(connection.cursor()).edges == [("DIM_B", "FCT_SALES")]
+    assert job_dag._dependency_table == {"ORACLE": False}
+
+    connection.executescript(
+        """
+        CREATE TABLE DMS_JOBDPND (parent_mapref TEXT, child_mapref TEXT, curflg TEXT);
+        INSERT INTO DMS_JOBDPND VALUES ('DIM_A', 'FCT_SALES', 'Y'), ('DIM_B', 'FCT_SALES', 'Y');
+        """
+    )
+    job_dag._dependency_table.clear()
+    assert load_job_dag(connection.cursor()).edges == [("DIM_A", "FCT_SALES"), ("DIM_B", "FCT_SALES")]
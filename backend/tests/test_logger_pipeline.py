@@ -0,0 +1,61 @@
+"""Tests for the queued, lazily formatted logger."""
+import json
+import logging
+import os
+import sys
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules import logger as dwlogger
+from backend.modules.logger import JsonFormatter, RateLimiter, log_context
+
+
+def test_disabled_levels_skip_formatting():
+    calls = []
+
+    def render():
+        calls.append(1)
+        return "expensive"
+
+    previous = dwlogger.logger.logger.level
+    dwlogger.logger.logger.setLevel(logging.INFO)
+    try:
+        dwlogger.debug(render)
+        assert not dwlogger.is_enabled("debug") and dwlogger.is_enabled("warning")
+    finally:
+        dwlogger.logger.logger.setLevel(previous)
+    assert calls == []
+
+
+def test_rate_limiter_reports_suppressed_messages():
+    now = [0.0]
+    limiter = RateLimiter(per_minute=2, clock=lambda: now[0])
+    assert [limiter.allow("row")[0] for _ in range(5)] == [True, True, False, False, False]
+    assert limiter.allow("other") == (True, 0)
+    now[0] = 60.0
+    assert limiter.allow("row") == (True, 3)
+    assert RateLimiter(per_minute=0).allow("row") == (True, 0)
+
+
+def test_json_lines_carry_the_log_context():
+    captured = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            captured.append(record)
+
+    handler = Capture()
+    dwlogger.logger.logger.addHandler(handler)
+    try:
+        with log_context(mapref="MAP_A", jobid=7):
+            dwlogger.warning("row %s rejected", 12)
+        dwlogger.warning("outside")
+    finally:
+        dwlogger.logger.logger.removeHandler(handler)
+
+    inside, outside = (json.loads(JsonFormatter().format(record)) for record in captured)
+    assert inside["message"] == "row 12 rejected" and inside["level"] == "warning"
+    assert (inside["mapref"], inside["jobid"]) == ("MAP_A", 7)
+    assert "mapref" not in outside
@@ -0,0 +1,173 @@
+"""Tests for lease-based claiming of DMS_PRCREQ requests."""
+import os
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.jobs import scheduler_queue_lease
+from backend.modules.jobs.scheduler_queue_lease import LeaseHeartbeat, LeaseSettings, QueueLeaseStore
+
+
+class PostgresConnection:
+    pass
+
+
+class OracleConnection:
+    pass
+
+
+class FakeLob:
+    def __init__(self, data):
+        self.data = data
+
+    def read(self):
+        return self.data
+
+
+def _cursor(connection_class):
+    cursor = Mock()
+    cursor.connection = connection_class()
+    return cursor
+
+
+@pytest.fixture
+def store(monkeypatch):
+    monkeypatch.setenv("DMS_SCHEMA", "TRG")
+    monkeypatch.setattr(scheduler_queue_lease, "get_postgresql_table_name", lambda cursor, schema, table: "DMS_PRCREQ")
+    return QueueLeaseStore("node-a", LeaseSettings(lease_seconds=60, heartbeat_seconds=15, max_attempts=2))
+
+
+def test_settings_keep_heartbeat_inside_the_lease(monkeypatch):
+    monkeypatch.setenv("SCHEDULER_LEASE_SECONDS", "40")
+    monkeypatch.setenv("SCHEDULER_HEARTBEAT_SECONDS", "90")
+    monkeypatch.delenv("SCHEDULER_MAX_ATTEMPTS", raising=False)
+    assert LeaseSettings.from_env() == LeaseSettings(lease_seconds=40, heartbeat_seconds=20, max_attempts=3)
+
+
+def test_postgresql_claim_is_one_skip_locked_update(store):
+    cursor = _cursor(PostgresConnection)
+    cursor.fetchall.return_value = [
+        ("R2", "MAP_B", "IMMEDIATE", None, 2),
+        ("R1", "MAP_A", "HISTORY", '{"start_date": "2024-01-01"}', 1),
+    ]
+
+    rows = store.claim(cursor, limit=5)
+
+    assert rows == [("R1", "MAP_A", "HISTORY", '{"start_date": "2024-01-01"}'), ("R2", "MAP_B", "IMMEDIATE", None)]
+    sql, params = cursor.execute.call_args[0]
+    assert "FOR UPDATE SKIP LOCKED" in sql and "RETURNING" in sql
+    assert 'trg."DMS_PRCREQ"' in sql and '"LEASE_EXPIRES_AT"' in sql
+    assert params == ("node-a", 60, 5)
+
+
+def test_oracle_claim_locks_fetched_rows_and_updates_only_new_ones(store):
+    cursor = _cursor(OracleConnection)
+    cursor.fetchmany.return_value = [("R1", "MAP_A", "REPORT", FakeLob(b'{"report_id": 7}'))]
+
+    rows = store.claim(cursor, limit=3)
+
+    assert rows == [("R1", "MAP_A", "REPORT", '{"report_id": 7}')]
+    assert "FOR UPDATE SKIP LOCKED" in cursor.execute.call_args[0][0]
+    cursor.fetchmany.assert_called_once_with(3)
+    sql, params = cursor.executemany.call_args[0]
+    assert "AND STATUS = 'NEW'" in sql and "NUMTODSINTERVAL" in sql
+    assert params == [{"claimed_by": "node-a", "lease_seconds": 60, "request_id": "R1"}]
+
+
+def test_expired_leases_fail_after_max_attempts_else_requeue(store):
+    cursor = _cursor(OracleConnection)
+    cursor.rowcount = 1
+
+    assert store.reclaim_expired(cursor) == (1, 1)
+
+    (fail_sql, fail_params), (requeue_sql, requeue_params) = [
+        call[0] for call in cursor.execute.call_args_list if call[0][0].lstrip().startswith("UPDATE")
+    ]
+    assert "STATUS = 'FAILED'" in fail_sql and ">= :max_attempts" in fail_sql
+    assert fail_params["max_attempts"] == 2 and "Lease expired 2 times" in fail_params["message"]
+    assert "STATUS = 'NEW'" in requeue_sql and "< :max_attempts" in requeue_sql
+    assert requeue_params == {"max_attempts": 2}
+
+
+def test_heartbeat_renews_only_tracked_requests(store):
+    connection = Mock()
+    cursor = _cursor(OracleConnection)
+    cursor.rowcount = 1
+    connection.cursor.return_value = cursor
+    heartbeat = LeaseHeartbeat(store, lambda: connection)
+
+    assert heartbeat.beat() == 0
+    heartbeat.track("R1")
+    heartbeat.track("R2")
+    heartbeat.release("R2")
+    heartbeat.beat()
+
+    sql, params = cursor.executemany.call_args[0]
+    assert "CLAIMED_BY = :claimed_by" in sql
+    assert params == [{"lease_seconds": 60, "request_id": "R1", "claimed_by": "node-a"}]
+    connection.commit.assert_called_once()
+    connection.close.assert_called_once()
+
+
+def test_queue_keeps_working_without_the_lease_columns(store):
+    cursor = _cursor(PostgresConnection)
+    cursor.execute.side_effect = [Exception('column "lease_expires_at" does not exist'), None]
+    cursor.fetchall.return_value = [("R1", "MAP_A", "IMMEDIATE", None, 1)]
+
+    assert store.reclaim_expired(cursor) == (0, 0)
+    assert store.claim(cursor) == [("R1", "MAP_A", "IMMEDIATE", None)]
+    assert store.renew(cursor, ["R1"]) == 1
+
+    # Detected once; the claim sets no lease and renew/reclaim issue no SQL
+    sql, params = cursor.execute.call_args[0]
+    assert cursor.execute.call_count == 2
+    assert "LEASE_EXPIRES_AT" not in sql and "FOR UPDATE SKIP LOCKED" in sql
+    assert params == ("node-a", 25)
+    cursor.executemany.assert_not_called()
+
+
+def test_completion_requires_this_node_as_owner(store):
+    assert store.owner_condition("ORACLE") == "CLAIMED_BY = :claimed_by"
+    assert store.owner_condition("POSTGRESQL", quoted=True) == '"CLAIMED_BY" = %s'
+
+
+def test_schedule_firings_are_queued_once_across_nodes(monkeypatch):
+    pytest.importorskip("apscheduler")
+    from datetime import datetime, timedelta
+
+    from backend.modules.jobs import pkgdwprc_python
+    from backend.modules.jobs.pkgdwprc_python import JobSchedulerService, schedule_request_id
+    from backend.modules.jobs.scheduler_frequency import last_fire_time
+
+    class EveryFifteenMinutes:
+        def get_next_fire_time(self, previous, now):
+            start = previous + timedelta(microseconds=1) if previous else now
+            base = start.replace(minute=0, second=0, microsecond=0)
+            steps = -(-(start - base) // timedelta(minutes=15))
+            return base + steps * timedelta(minutes=15)
+
+    # Two nodes firing a few seconds apart name the same firing
+    trigger = EveryFifteenMinutes()
+    assert last_fire_time(trigger, datetime(2024, 5, 1, 10, 15, 2)) == datetime(2024, 5, 1, 10, 15)
+    assert last_fire_time(trigger, datetime(2024, 5, 1, 10, 29, 59)) == datetime(2024, 5, 1, 10, 15)
+    assert schedule_request_id("JOBSCH", 42, datetime(2024, 5, 1, 10, 15)) == "JOBSCH:42:20240501101500"
+
+    monkeypatch.setattr(pkgdwprc_python, "get_postgresql_table_name", lambda cursor, schema, table: "dms_prcreq")
+    connection = PostgresConnection()
+    connection.cursor = Mock()
+    connection.commit, connection.rollback = Mock(), Mock()
+    cursor = connection.cursor.return_value
+    service = JobSchedulerService(connection)
+    request = pkgdwprc_python.ImmediateJobRequest(mapref="MAP_A", params={"source": "schedule"})
+
+    cursor.rowcount = 1
+    assert service.queue_immediate_job(request, request_id="JOBSCH:42:20240501101500") == "JOBSCH:42:20240501101500"
+    assert "ON CONFLICT (request_id) DO NOTHING" in cursor.execute.call_args[0][0]
+    cursor.rowcount = 0
+    assert service.queue_immediate_job(request, request_id="JOBSCH:42:20240501101500") is None
+    connection.rollback.assert_called_once()
@@ -0,0 +1,63 @@
+"""Tests for DMS_JOBSCH change detection."""
+import os
+import sys
+from datetime import datetime
+from unittest.mock import Mock
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.jobs.scheduler_sync import (
+    ScheduleSyncState,
+    read_schedule_watermark,
+    schedule_fingerprint,
+)
+
+
+def test_fingerprint_ignores_runtime_columns_only():
+    record = {"JOBSCHID": 7, "MAPREF": "MAP_A", "FRQCD": "DL", "FRQHH": 2, "NXT_RUN_DT": datetime(2024, 1, 1)}
+    rerun = dict(record, NXT_RUN_DT=datetime(2024, 1, 2), LST_RUN_DT=datetime(2024, 1, 1))
+    edited = dict(record, FRQHH=3)
+
+    assert schedule_fingerprint(record) == schedule_fingerprint(rerun)
+    assert schedule_fingerprint(record) != schedule_fingerprint(edited)
+
+
+def test_full_sync_only_when_watermark_moves_refresh_requested_or_interval_passed():
+    now = [0.0]
+    state = ScheduleSyncState(full_sync_seconds=600, clock=lambda: now[0])
+    watermark = (10, datetime(2024, 1, 1, 8))
+
+    assert state.needs_full_sync(watermark)
+    state.mark_synced(watermark)
+    assert not state.needs_full_sync(watermark)
+    assert state.needs_full_sync((11, watermark[1]))
+    assert state.needs_full_sync(watermark, force=True)
+
+    state.request_refresh()
+    assert state.needs_full_sync(watermark)
+    assert not state.needs_full_sync(watermark)
+
+    now[0] = 600.0
+    assert state.needs_full_sync(watermark)
+
+
+def test_changed_reports_edits_of_known_jobs():
+    state = ScheduleSyncState(full_sync_seconds=0)
+    assert not state.changed("schedule:1", "a")
+    state.remember("schedule:1", "a")
+    assert not state.changed("schedule:1", "a")
+    assert state.changed("schedule:1", "b")
+    state.forget("schedule:1")
+    assert not state.changed("schedule:1", "b")
+
+
+def test_watermark_falls_back_to_unquoted_postgresql_columns():
+    cursor = Mock()
+    cursor.execute.side_effect = [Exception('column "RECUPDT" does not exist'), None]
+    cursor.fetchone.return_value = (3, datetime(2024, 5, 1))
+
+    assert read_schedule_watermark(cursor, "POSTGRESQL", "trg.dms_jobsch") == (3, datetime(2024, 5, 1))
+    assert cursor.execute.call_args[0][0] == "SELECT COUNT(*), MAX(recupdt) FROM trg.dms_jobsch"
+    cursor.connection.rollback.assert_called_once()
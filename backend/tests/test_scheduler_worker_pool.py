@@ -0,0 +1,86 @@
+"""Tests for the scheduler's worker process pool."""
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+pytest.importorskip("apscheduler")
+if "fork" not in multiprocessing.get_all_start_methods():
+    pytest.skip("fork start method required", allow_module_level=True)
+
+from backend.modules.jobs.pkgdwprc_python import JobRequestType
+from backend.modules.jobs.scheduler_models import QueueRequest
+from backend.modules.jobs.scheduler_worker_pool import (
+    SchedulerWorkerPool,
+    WorkerCrashedError,
+    WorkerPoolSettings,
+    WorkerRequestError,
+)
+
+
+def _run(request):
+    action = request.payload.get("action")
+    if action == "crash":
+        os._exit(3)
+    if action == "raise":
+        raise ValueError("bad input")
+    if action == "allocate":
+        return {"size": len(bytearray(512 * 1024 * 1024))}
+    return {"status": "SUCCESS", "pid": os.getpid()}
+
+
+def _request(action=None):
+    return QueueRequest("REQ1", "MAP_WORKER", JobRequestType.IMMEDIATE, {"action": action})
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def factory(**settings):
+        pool = SchedulerWorkerPool(
+            WorkerPoolSettings(processes=1, **settings),
+            context=multiprocessing.get_context("fork"),
+            runner=_run,
+        )
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_workers_are_reused_then_recycled_after_max_requests(make_pool):
+    pool = make_pool(max_requests_per_worker=2)
+    pids = [pool.run(_request())["pid"] for _ in range(3)]
+    assert pids[0] == pids[1] != pids[2]
+    assert os.getpid() not in pids
+
+
+def test_crash_fails_only_its_request_and_the_worker_is_replaced(make_pool):
+    pool = make_pool()
+    first = pool.run(_request())["pid"]
+
+    with pytest.raises(WorkerCrashedError, match="exited with code 3"):
+        pool.run(_request("crash"))
+    with pytest.raises(WorkerRequestError, match="ValueError: bad input"):
+        pool.run(_request("raise"))
+
+    assert pool.run(_request())["pid"] != first
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_memory_limit_fails_the_request_and_recycles_the_worker(make_pool):
+    pool = make_pool(request_memory_mb=128)
+    first = pool.run(_request())["pid"]
+
+    with pytest.raises(WorkerRequestError, match="memory limit"):
+        pool.run(_request("allocate"))
+
+    assert pool.run(_request())["pid"] != first
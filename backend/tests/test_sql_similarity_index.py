@@ -0,0 +1,91 @@
+"""Tests for the MinHash/LSH index behind the duplicate SQL check."""
+import os
+import random
+import sys
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.mapper import sql_similarity_index as similarity
+from backend.modules.mapper.sql_similarity_index import SqlSimilarityIndex, normalize_sql
+
+
+class MaprsqlCursor:
+    """Answers the index queries from an in-memory DMS_MAPRSQL."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)  # (maprsqlid, maprsqlcd, maprsql, curflg)
+        self.statements = []
+        self._result = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+        current = [row for row in self.rows if row[3] == "Y"]
+        if sql.startswith("SELECT COUNT(*)"):
+            self._result = [(len(current), max((row[0] for row in current), default=None))]
+        elif "MAPRSQLID >" in sql:
+            floor = int(sql.rsplit(">", 1)[1])
+            self._result = [row[:3] for row in current if row[0] > floor]
+        else:
+            self._result = [row[:3] for row in current]
+
+    def fetchone(self):
+        return self._result[0]
+
+    def fetchall(self):
+        return self._result
+
+
+def _corpus(size):
+    rng = random.Random(11)
+    names = ["".join(rng.choice("ABCDEFGHIKLMNOPRSTUVW") for _ in range(rng.randint(3, 9))) for _ in range(400)]
+    for i in range(size):
+        left, right = rng.sample(names, 2)
+        columns = rng.sample(names, rng.randint(3, 12))
+        yield f"SQL_{i}", (
+            f"SELECT {', '.join('A.' + c for c in columns)} FROM SRC.{left} A "
+            f"LEFT JOIN SRC.{right} B ON A.{columns[0]} = B.{columns[0]}"
+        )
+
+
+def test_normalization_ignores_comments_case_and_whitespace():
+    assert normalize_sql("select a -- note\n  from  t /* x */") == "SELECT A FROM T"
+
+
+def test_shortlist_finds_edited_copies_without_scoring_everything(monkeypatch):
+    index = SqlSimilarityIndex()
+    corpus = dict(_corpus(700))
+    for code, sql in corpus.items():
+        index.upsert(code, sql)
+
+    for code in ("SQL_42", "SQL_420", "SQL_613"):
+        probe = corpus[code].replace("LEFT JOIN", "JOIN") + " WHERE B.X IS NOT NULL"
+        assert len(index.candidates(normalize_sql(probe))) < len(corpus) / 4
+        exact_code, matches = index.search(probe, 0.7)
+        assert exact_code is None and matches[0][0] == code
+        with monkeypatch.context() as m:
+            m.setattr(similarity, "LINEAR_SCAN_MAX", 10_000)
+            assert index.search(probe, 0.7)[1][0] == matches[0]
+    assert index.search(corpus["SQL_7"].lower(), 0.9)[0] == "SQL_7"
+
+
+def test_refresh_loads_new_versions_incrementally_and_rebuilds_on_removal():
+    cursor = MaprsqlCursor([(1, "A", "SELECT 1 FROM DUAL", "Y"), (2, "B", "SELECT X FROM T", "Y")])
+    index = SqlSimilarityIndex()
+    index.refresh(cursor)
+    assert len(index) == 2
+
+    # New version of B plus a new code C: only rows above the known MAPRSQLID are read
+    cursor.rows[1] = (2, "B", "SELECT X FROM T", "N")
+    cursor.rows += [(3, "B", "SELECT X, Y FROM T", "Y"), (4, "C", "SELECT Z FROM U", "Y")]
+    cursor.statements.clear()
+    index.refresh(cursor)
+    assert cursor.statements[-1].endswith("MAPRSQLID > 2")
+    assert index.search("SELECT X, Y FROM T", 0.99)[0] == "B"
+    assert len(index) == 3
+
+    # C deactivated without a new version: the count no longer matches, so rebuild
+    cursor.rows[3] = (4, "C", "SELECT Z FROM U", "N")
+    index.refresh(cursor)
+    assert len(index) == 2 and index.search("SELECT Z FROM U", 0.99) == (None, [])
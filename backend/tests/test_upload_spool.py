@@ -0,0 +1,82 @@
+"""Tests for disk-spooled uploads and memory-mapped head reads."""
+import asyncio
+import hashlib
+import io
+import os
+import sys
+
+import pytest
+
+WORKSPACE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if WORKSPACE_ROOT not in sys.path:
+    sys.path.insert(0, WORKSPACE_ROOT)
+
+from backend.modules.file_upload.upload_spool import (
+    UploadTooLargeError,
+    head_preview_file,
+    read_head,
+    spool_upload,
+)
+
+
+class _FakeUpload:
+    """Minimal async stand-in for FastAPI's UploadFile."""
+
+    def __init__(self, payload: bytes):
+        self._buffer = io.BytesIO(payload)
+        self.reads = 0
+
+    async def seek(self, offset: int):
+        self._buffer.seek(offset)
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads += 1
+        return self._buffer.read(size)
+
+
+def test_spool_upload_streams_in_chunks_with_checksum(tmp_path):
+    payload = b"id,name\n" + b"".join(f"{i},row{i}\n".encode() for i in range(5000))
+    upload = _FakeUpload(payload)
+
+    stored = asyncio.run(spool_upload(upload, str(tmp_path), suffix=".csv", chunk_size=4096))
+
+    assert stored.size_bytes == len(payload)
+    assert stored.sha256 == hashlib.sha256(payload).hexdigest()
+    assert upload.reads > 2
+    with open(stored.path, "rb") as handle:
+        assert handle.read() == payload
+
+
+def test_spool_upload_enforces_size_limit_and_removes_partial_file(tmp_path):
+    upload = _FakeUpload(b"x" * 10000)
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(spool_upload(upload, str(tmp_path), max_bytes=5000, chunk_size=1024))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_read_head_stops_at_line_and_byte_limits(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"a,b\n1,2\n3,4\n5,6\n")
+
+    assert read_head(str(path), max_lines=2) == b"a,b\n1,2\n"
+    assert read_head(str(path), max_lines=2, max_bytes=10) == b"a,b\n1,2\n"
+    assert read_head(str(path), max_bytes=6) == b"a,b\n1,"
+    assert read_head(str(path), max_lines=20) == b"a,b\n1,2\n3,4\n5,6\n"
+
+    empty = tmp_path / "empty.csv"
+    empty.write_bytes(b"")
+    assert read_head(str(empty), max_lines=3) == b""
+
+
+def test_head_preview_file_is_removed_after_use(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"a,b\n1,2\n3,4\n")
+
+    with head_preview_file(str(path), max_lines=2) as head_path:
+        assert head_path.endswith(".csv")
+        with open(head_path, "rb") as handle:
+            assert handle.read() == b"a,b\n1,2\n"
+
+    assert not os.path.exists(head_path)
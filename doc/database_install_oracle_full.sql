@@ -331,6 +331,16 @@ CREATE TABLE DMS_JOBSCH (
     CONSTRAINT FK_DMS_JOBSCH_JOB FOREIGN KEY (JOBID) REFERENCES DMS_JOB(JOBID)
 );
 
+CREATE TABLE DMS_JOBDPND (
+    PARENT_MAPREF VARCHAR2(50) NOT NULL,
+    CHILD_MAPREF VARCHAR2(50) NOT NULL,
+    RECCRDT TIMESTAMP DEFAULT SYSTIMESTAMP,
+    RECUPDT TIMESTAMP DEFAULT SYSTIMESTAMP,
+    CURFLG CHAR(1) DEFAULT 'Y',
+    CONSTRAINT PK_DMS_JOBDPND PRIMARY KEY (PARENT_MAPREF, CHILD_MAPREF)
+);
+CREATE INDEX DMS_JOBDPND_CHILD_IDX ON DMS_JOBDPND (CHILD_MAPREF);
+
 CREATE TABLE DMS_PRCLOG (
     PRCID NUMBER PRIMARY KEY,
     JOBID NUMBER,
@@ -386,11 +396,50 @@ CREATE TABLE DMS_PRCREQ (
     CLAIMED_BY VARCHAR2(64),
     COMPLETED_AT TIMESTAMP,
     RESULT_PAYLOAD CLOB,
+    HEARTBEAT_AT TIMESTAMP,
+    LEASE_EXPIRES_AT TIMESTAMP,
+    ATTEMPTS NUMBER(5) DEFAULT 0,
     CONSTRAINT PK_DMS_PRCREQ PRIMARY KEY (REQUEST_ID)
 );
 CREATE INDEX DMS_PRCREQ_STATUS_IDX ON DMS_PRCREQ (STATUS, REQUESTED_AT);
+CREATE INDEX DMS_PRCREQ_LEASE_IDX ON DMS_PRCREQ (STATUS, LEASE_EXPIRES_AT);
 CREATE INDEX DMS_PRCREQ_MAPREF_IDX ON DMS_PRCREQ (MAPREF);
 
+CREATE TABLE DMS_MAPRCHNK (
+    MAPREF VARCHAR2(100) NOT NULL,
+    RUNKEY VARCHAR2(64) NOT NULL,
+    CHUNKID NUMBER(10) NOT NULL,
+    SESSIONID NUMBER(30),
+    ROWFROM NUMBER(20),
+    ROWTO NUMBER(20),
+    KEYCOL VARCHAR2(128),
+    KEYTYP CHAR(1),
+    KEYFROM VARCHAR2(4000),
+    KEYTO VARCHAR2(4000),
+    STATUS VARCHAR2(10) DEFAULT 'PENDING',
+    SRCROWS NUMBER(20) DEFAULT 0,
+    TRGROWS NUMBER(20) DEFAULT 0,
+    ERRROWS NUMBER(20) DEFAULT 0,
+    RECCRDT TIMESTAMP DEFAULT SYSTIMESTAMP,
+    RECUPDT TIMESTAMP DEFAULT SYSTIMESTAMP,
+    CONSTRAINT PK_DMS_MAPRCHNK PRIMARY KEY (MAPREF, RUNKEY, CHUNKID)
+);
+
+CREATE TABLE DMS_JOBSTGPRF (
+    JOBLOGID NUMBER NOT NULL,
+    MAPREF VARCHAR2(100) NOT NULL,
+    SESSIONID NUMBER(30),
+    STAGE VARCHAR2(30) NOT NULL,
+    WALLSEC NUMBER(18,6) DEFAULT 0,
+    CPUSEC NUMBER(18,6) DEFAULT 0,
+    CALLS NUMBER(20) DEFAULT 0,
+    RNDTRPS NUMBER(20) DEFAULT 0,
+    ROWSCNT NUMBER(20) DEFAULT 0,
+    RECCRDT TIMESTAMP DEFAULT SYSTIMESTAMP,
+    CONSTRAINT PK_DMS_JOBSTGPRF PRIMARY KEY (JOBLOGID, STAGE)
+);
+CREATE INDEX IDX_DMS_JOBSTGPRF_MAPREF ON DMS_JOBSTGPRF(MAPREF, JOBLOGID);
+
 CREATE TABLE DMS_IDPOOL (
     ENTITY_NAME VARCHAR2(64) PRIMARY KEY,
     CURRENT_VALUE NUMBER(20) NOT NULL,
@@ -320,6 +320,16 @@ CREATE TABLE IF NOT EXISTS dms_jobsch (
     CONSTRAINT fk_dms_jobsch_job FOREIGN KEY (jobid) REFERENCES dms_job(jobid)
 );
 
+CREATE TABLE IF NOT EXISTS dms_jobdpnd (
+    parent_mapref VARCHAR(50) NOT NULL,
+    child_mapref VARCHAR(50) NOT NULL,
+    reccrdt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    recupdt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    curflg CHAR(1) DEFAULT 'Y',
+    CONSTRAINT pk_dms_jobdpnd PRIMARY KEY (parent_mapref, child_mapref)
+);
+CREATE INDEX IF NOT EXISTS dms_jobdpnd_child_idx ON dms_jobdpnd(child_mapref);
+
 CREATE TABLE IF NOT EXISTS dms_prclog (
     prcid BIGINT PRIMARY KEY,
     jobid BIGINT,
@@ -374,11 +384,50 @@ CREATE TABLE IF NOT EXISTS dms_prcreq (
     claimed_at TIMESTAMP,
     claimed_by VARCHAR(64),
     completed_at TIMESTAMP,
-    result_payload TEXT
+    result_payload TEXT,
+    heartbeat_at TIMESTAMP,
+    lease_expires_at TIMESTAMP,
+    attempts INTEGER DEFAULT 0
 );
 CREATE INDEX IF NOT EXISTS dms_prcreq_status_idx ON dms_prcreq(status, requested_at);
+CREATE INDEX IF NOT EXISTS dms_prcreq_lease_idx ON dms_prcreq(status, lease_expires_at);
 CREATE INDEX IF NOT EXISTS dms_prcreq_mapref_idx ON dms_prcreq(mapref);
 
+CREATE TABLE IF NOT EXISTS dms_maprchnk (
+    mapref VARCHAR(100) NOT NULL,
+    runkey VARCHAR(64) NOT NULL,
+    chunkid INTEGER NOT NULL,
+    sessionid NUMERIC(30,0),
+    rowfrom BIGINT,
+    rowto BIGINT,
+    keycol VARCHAR(128),
+    keytyp CHAR(1),
+    keyfrom VARCHAR(4000),
+    keyto VARCHAR(4000),
+    status VARCHAR(10) DEFAULT 'PENDING',
+    srcrows BIGINT DEFAULT 0,
+    trgrows BIGINT DEFAULT 0,
+    errrows BIGINT DEFAULT 0,
+    reccrdt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    recupdt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (mapref, runkey, chunkid)
+);
+
+CREATE TABLE IF NOT EXISTS dms_jobstgprf (
+    joblogid BIGINT NOT NULL,
+    mapref VARCHAR(100) NOT NULL,
+    sessionid NUMERIC(30,0),
+    stage VARCHAR(30) NOT NULL,
+    wallsec NUMERIC(18,6) DEFAULT 0,
+    cpusec NUMERIC(18,6) DEFAULT 0,
+    calls BIGINT DEFAULT 0,
+    rndtrps BIGINT DEFAULT 0,
+    rowscnt BIGINT DEFAULT 0,
+    reccrdt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (joblogid, stage)
+);
+CREATE INDEX IF NOT EXISTS idx_dms_jobstgprf_mapref ON dms_jobstgprf(mapref, joblogid);
+
 CREATE TABLE IF NOT EXISTS dms_idpool (
     entity_name VARCHAR(64) PRIMARY KEY,
     current_value BIGINT NOT NULL,
@@ -0,0 +1,31 @@
+-- ============================================================================
+-- Migration: Add DMS_JOBDPND (job dependency edges)
+-- Purpose: Let a scheduled job depend on several parent jobs (fan-in).
+--          DMS_JOBSCH.DPND_JOBSCHID still holds one parent per schedule; the
+--          scheduler builds its dependency DAG from both.
+-- ============================================================================
+
+-- PostgreSQL
+CREATE TABLE IF NOT EXISTS dms_jobdpnd (
+    parent_mapref VARCHAR(50) NOT NULL,
+    child_mapref VARCHAR(50) NOT NULL,
+    reccrdt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    recupdt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    curflg CHAR(1) DEFAULT 'Y',
+    CONSTRAINT pk_dms_jobdpnd PRIMARY KEY (parent_mapref, child_mapref)
+);
+CREATE INDEX IF NOT EXISTS dms_jobdpnd_child_idx ON dms_jobdpnd(child_mapref);
+
+-- Oracle
+-- Note: Run this in Oracle SQL*Plus or SQL Developer
+/*
+CREATE TABLE DMS_JOBDPND (
+    PARENT_MAPREF VARCHAR2(50) NOT NULL,
+    CHILD_MAPREF VARCHAR2(50) NOT NULL,
+    RECCRDT TIMESTAMP DEFAULT SYSTIMESTAMP,
+    RECUPDT TIMESTAMP DEFAULT SYSTIMESTAMP,
+    CURFLG CHAR(1) DEFAULT 'Y',
+    CONSTRAINT PK_DMS_JOBDPND PRIMARY KEY (PARENT_MAPREF, CHILD_MAPREF)
+);
+CREATE INDEX DMS_JOBDPND_CHILD_IDX ON DMS_JOBDPND (CHILD_MAPREF);
+*/
@@ -0,0 +1,30 @@
+-- ============================================================================
+-- Migration: Add lease columns to DMS_PRCREQ
+-- Purpose: Let several scheduler nodes share the request queue. A claim stores
+--          the node id (CLAIMED_BY) and a lease expiry that the node renews
+--          while the request runs; expired leases are requeued until ATTEMPTS
+--          reaches SCHEDULER_MAX_ATTEMPTS.
+-- ============================================================================
+
+-- PostgreSQL
+ALTER TABLE dms_prcreq ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP;
+ALTER TABLE dms_prcreq ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+ALTER TABLE dms_prcreq ADD COLUMN IF NOT EXISTS attempts INTEGER DEFAULT 0;
+CREATE INDEX IF NOT EXISTS dms_prcreq_lease_idx ON dms_prcreq(status, lease_expires_at);
+
+-- Requests claimed before this migration keep a NULL lease and are never reclaimed
+UPDATE dms_prcreq SET attempts = 0 WHERE attempts IS NULL;
+
+-- Oracle
+-- Note: Run this in Oracle SQL*Plus or SQL Developer
+/*
+ALTER TABLE DMS_PRCREQ ADD (
+    HEARTBEAT_AT TIMESTAMP,
+    LEASE_EXPIRES_AT TIMESTAMP,
+    ATTEMPTS NUMBER(5) DEFAULT 0
+);
+CREATE INDEX DMS_PRCREQ_LEASE_IDX ON DMS_PRCREQ (STATUS, LEASE_EXPIRES_AT);
+
+UPDATE DMS_PRCREQ SET ATTEMPTS = 0 WHERE ATTEMPTS IS NULL;
+COMMIT;
+*/